@@ -0,0 +1,84 @@
+"""
+Benchmark de memória da AST.
+Analisa programas gerados com 10 mil a 1 milhão de comandos e mede, com
+tracemalloc, a memória retida pela AST resultante: total, número de nós e
+bytes por nó (incluindo listas e valores que só a AST referencia).
+
+Uso:
+    python3 benchmarks/ast_memory.py [--max=COMANDOS]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.ast_nodes import ASTNode, iter_child_nodes
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+# Cada grupo gera 5 comandos, sendo 2 deles compostos
+STATEMENTS = """    total := total + %(n)d * (i - 1) div 3;
+    if total > %(n)d then
+        v[%(m)d] := total mod 7
+    else
+        writeln('valor ', total, ' em ', %(n)d.5);
+    for i := 1 to %(m)d do
+        total := total - i;
+"""
+
+def generate_source(statements: int) -> str:
+    """Gera um programa Pascal com aproximadamente o número de comandos pedido."""
+    parts = ["program benchmark;\nvar total, i: integer;\n    v: array[10] of integer;\nbegin\n"]
+    for n in range(statements // 5):
+        parts.append(STATEMENTS % {'n': n, 'm': n % 10})
+    parts.append("end.\n")
+    return ''.join(parts)
+
+def count_nodes(program: ASTNode) -> int:
+    count = 0
+    pending = [program]
+    while pending:
+        node = pending.pop()
+        count += 1
+        pending.extend(iter_child_nodes(node))
+    return count
+
+def measure(source: str):
+    """Retorna (memória retida pela AST, número de nós, tempo de análise)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    program = Parser(Lexer(source).iter_tokens()).parse()
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, count_nodes(program), elapsed
+
+def main():
+    maximum = SIZES[-1]
+
+    for arg in sys.argv[1:]:
+        if arg.startswith('--max='):
+            maximum = int(arg.split('=', 1)[1])
+        else:
+            print(f"Opção desconhecida: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    print(f"{'Comandos':>10} {'Nós':>10} {'AST (MB)':>10} {'Bytes/nó':>10} {'Tempo (s)':>10}")
+
+    for statements in SIZES:
+        if statements > maximum:
+            break
+        source = generate_source(statements)
+        retained, nodes, elapsed = measure(source)
+        del source
+        print(f"{statements:>10} {nodes:>10} {retained / 2**20:>10.2f} {retained / nodes:>10.1f} {elapsed:>10.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark de vazão do analisador léxico.
+Gera códigos Pascal de vários megabytes e mede o tempo de Lexer.tokenize,
+em MB/s e tokens/s, para tamanhos crescentes (o tempo deve crescer linearmente).
+
+Uso:
+    python3 benchmarks/lexer_throughput.py [--size=MB] [--repeat=N]
+"""
+
+import os
+import sys
+import time
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+
+ROUTINE = """
+{ Rotina gerada número %(n)d,
+  com comentário de bloco em várias linhas }
+function calcula_%(n)d(valor_%(n)d, limite: integer): integer;
+begin
+    // comentário de linha
+    while (valor_%(n)d <> limite) and not (valor_%(n)d >= 1000) do
+        valor_%(n)d := valor_%(n)d * 3 div 2 + %(n)d mod 7 - 1;
+    writeln('resultado\\t', valor_%(n)d, ' de ', %(n)d.5 / 2.25);
+    return valor_%(n)d;
+end;
+"""
+
+LONG_LITERALS = """
+procedure literais_%(n)d;
+begin
+    writeln('%(text)s');
+    writeln(%(digits)s);
+end;
+"""
+
+def generate_source(size: int) -> str:
+    """Gera um programa Pascal com aproximadamente size bytes."""
+    parts = ["program benchmark;\nvar total: integer;\n"]
+    length = len(parts[0])
+    n = 0
+
+    while length < size:
+        if n % 50 == 0:
+            # Literais longos expõem custo quadrático na montagem de valores
+            part = LONG_LITERALS % {'n': n, 'text': 'x' * 20000, 'digits': '7' * 4000}
+        else:
+            part = ROUTINE % {'n': n}
+        parts.append(part)
+        length += len(part)
+        n += 1
+
+    parts.append("begin\n    total := calcula_1(2, 10);\nend.\n")
+    return ''.join(parts)
+
+def measure(source: str, repeat: int):
+    """Retorna o melhor tempo de tokenização e o número de tokens."""
+    best = None
+    count = 0
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = Lexer(source).tokenize()
+        elapsed = time.perf_counter() - start
+        count = len(tokens)
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, count
+
+def main():
+    size_mb = 4.0
+    repeat = 3
+
+    for arg in sys.argv[1:]:
+        if arg.startswith('--size='):
+            size_mb = float(arg.split('=', 1)[1])
+        elif arg.startswith('--repeat='):
+            repeat = int(arg.split('=', 1)[1])
+        else:
+            print(f"Opção desconhecida: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    print(f"{'Tamanho':>10} {'Tokens':>10} {'Tempo (s)':>10} {'MB/s':>8} {'Tokens/s':>12}")
+
+    for factor in (0.25, 0.5, 1.0):
+        source = generate_source(int(size_mb * factor * 1024 * 1024))
+        megabytes = len(source) / (1024 * 1024)
+        elapsed, count = measure(source, repeat)
+        print(f"{megabytes:>8.2f}MB {count:>10} {elapsed:>10.3f} "
+              f"{megabytes / elapsed:>8.2f} {count / elapsed:>12.0f}")
+
+if __name__ == '__main__':
+    main()
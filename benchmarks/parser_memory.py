@@ -0,0 +1,63 @@
+"""
+Benchmark de memória da análise sintática.
+Compara o pico de memória (tracemalloc) de analisar códigos gerados de
+tamanhos crescentes materializando a lista de tokens (Lexer.tokenize) e
+consumindo-os sob demanda (Lexer.iter_tokens). No modo sob demanda, o
+excedente sobre a própria AST deve se manter constante.
+
+Uso:
+    python3 benchmarks/parser_memory.py [--size=MB]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from lexer_throughput import generate_source
+
+def measure(source: str, streaming: bool):
+    """Retorna (pico, memória retida pela AST, tempo) de uma análise completa."""
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    lexer = Lexer(source)
+    tokens = lexer.iter_tokens() if streaming else lexer.tokenize()
+    ast = Parser(tokens).parse()
+
+    elapsed = time.perf_counter() - start
+    del tokens, lexer
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, retained, elapsed
+
+def main():
+    size_mb = 2.0
+
+    for arg in sys.argv[1:]:
+        if arg.startswith('--size='):
+            size_mb = float(arg.split('=', 1)[1])
+        else:
+            print(f"Opção desconhecida: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    print(f"{'Tamanho':>10} {'Modo':>10} {'Pico (MB)':>10} {'AST (MB)':>10} {'Excedente':>10} {'Tempo (s)':>10}")
+
+    for factor in (0.25, 0.5, 1.0):
+        source = generate_source(int(size_mb * factor * 1024 * 1024))
+        megabytes = len(source) / (1024 * 1024)
+
+        for streaming in (False, True):
+            peak, retained, elapsed = measure(source, streaming)
+            mode = 'stream' if streaming else 'lista'
+            print(f"{megabytes:>8.2f}MB {mode:>10} {peak / 2**20:>10.2f} {retained / 2**20:>10.2f} "
+                  f"{(peak - retained) / 2**20:>10.2f} {elapsed:>10.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+program BenchBubbleSort;
+{
+  Bubble Sort sobre um array preenchido por um gerador congruencial
+  Entrada: n (número de elementos, até 20000)
+}
+var
+    numeros: array[20000] of integer;
+    n, i, j, passo, temp, semente, soma: integer;
+    trocou: boolean;
+
+begin
+    readln(n);
+    semente := 12345;
+    for i := 0 to n - 1 do
+    begin
+        semente := (semente * 1103515245 + 12345) mod 2147483648;
+        numeros[i] := semente mod 100000;
+    end;
+
+    { Cada passagem leva o maior elemento restante ao fim; para sem trocas }
+    passo := 0;
+    trocou := true;
+    while trocou do
+    begin
+        trocou := false;
+        for j := 0 to n - 2 - passo do
+        begin
+            if numeros[j] > numeros[j + 1] then
+            begin
+                temp := numeros[j];
+                numeros[j] := numeros[j + 1];
+                numeros[j + 1] := temp;
+                trocou := true;
+            end;
+        end;
+        passo := passo + 1;
+    end;
+
+    { Soma ponderada confere a ordem final }
+    soma := 0;
+    for i := 0 to n - 1 do
+        soma := (soma + numeros[i] * (i + 1)) mod 1000000007;
+    writeln(soma);
+end.
@@ -0,0 +1,33 @@
+program BenchEarlyReturn;
+{
+  Retornos antecipados: funções curtas que saem de dentro de laços e ifs,
+  custo dominado pela saída das chamadas
+  Entrada: n (número de chamadas de cada função)
+}
+var
+    n, i, total: integer;
+
+function primeiro_divisor(x: integer): integer;
+begin
+    for d := 2 to x do
+        if x mod d = 0 then
+            return d;
+    return x;
+end;
+
+function sinal(x: integer): integer;
+begin
+    if x > 0 then
+        return 1;
+    if x < 0 then
+        return -1;
+    return 0;
+end;
+
+begin
+    readln(n);
+    total := 0;
+    for i := 1 to n do
+        total := total + primeiro_divisor(i mod 10 + 2) + sinal(i mod 3 - 1);
+    writeln(total);
+end.
@@ -0,0 +1,19 @@
+program BenchFibonacci;
+{
+  Fibonacci recursivo: custo dominado por chamadas de função
+  Entrada: n (termo calculado)
+}
+var
+    n: integer;
+
+function fib(k: integer): integer;
+begin
+    if k < 2 then
+        return k;
+    return fib(k - 1) + fib(k - 2);
+end;
+
+begin
+    readln(n);
+    writeln(fib(n));
+end.
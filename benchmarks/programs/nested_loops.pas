@@ -0,0 +1,17 @@
+program BenchNestedLoops;
+{
+  Três laços for aninhados com aritmética inteira no corpo
+  Entrada: n (iterações de cada laço; o corpo executa n^3 vezes)
+}
+var
+    n, i, j, k, total: integer;
+
+begin
+    readln(n);
+    total := 0;
+    for i := 1 to n do
+        for j := 1 to n do
+            for k := 1 to n do
+                total := (total + i * j - k) mod 1000003;
+    writeln(total);
+end.
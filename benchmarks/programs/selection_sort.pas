@@ -0,0 +1,37 @@
+program BenchSelectionSort;
+{
+  Selection Sort sobre um array preenchido por um gerador congruencial
+  Entrada: n (número de elementos, até 20000)
+}
+var
+    numeros: array[20000] of integer;
+    n, i, j, menor, temp, semente, soma: integer;
+
+begin
+    readln(n);
+    semente := 54321;
+    for i := 0 to n - 1 do
+    begin
+        semente := (semente * 1103515245 + 12345) mod 2147483648;
+        numeros[i] := semente mod 100000;
+    end;
+
+    for i := 0 to n - 2 do
+    begin
+        menor := i;
+        for j := i + 1 to n - 1 do
+        begin
+            if numeros[j] < numeros[menor] then
+                menor := j;
+        end;
+        temp := numeros[i];
+        numeros[i] := numeros[menor];
+        numeros[menor] := temp;
+    end;
+
+    { Soma ponderada confere a ordem final }
+    soma := 0;
+    for i := 0 to n - 1 do
+        soma := (soma + numeros[i] * (i + 1)) mod 1000000007;
+    writeln(soma);
+end.
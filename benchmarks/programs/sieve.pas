@@ -0,0 +1,32 @@
+program BenchSieve;
+{
+  Crivo de Eratóstenes: laços while e acesso a array de boolean
+  Entrada: n (limite, até 1000000)
+}
+var
+    composto: array[1000001] of boolean;
+    n, i, j, primos: integer;
+
+begin
+    readln(n);
+    i := 2;
+    while i * i <= n do
+    begin
+        if not composto[i] then
+        begin
+            j := i * i;
+            while j <= n do
+            begin
+                composto[j] := true;
+                j := j + i;
+            end;
+        end;
+        i := i + 1;
+    end;
+
+    primos := 0;
+    for i := 2 to n do
+        if not composto[i] then
+            primos := primos + 1;
+    writeln(primos);
+end.
@@ -0,0 +1,31 @@
+program BenchStringBuilding;
+{
+  Montagem de strings por concatenação, escritas a cada 50 palavras
+  Entrada: n (número de palavras)
+}
+var
+    n, i, linhas: integer;
+    linha, palavra: string;
+
+begin
+    readln(n);
+    linha := '';
+    linhas := 0;
+    for i := 1 to n do
+    begin
+        if i mod 3 = 0 then
+            palavra := 'fizz'
+        else if i mod 5 = 0 then
+            palavra := 'buzz'
+        else
+            palavra := 'pascal';
+        linha := linha + palavra + ' ';
+        if i mod 50 = 0 then
+        begin
+            writeln(linha);
+            linhas := linhas + 1;
+            linha := '';
+        end;
+    end;
+    writeln(linhas, ' ', linha = '');
+end.
@@ -0,0 +1,238 @@
+"""
+Suíte de benchmarks de programas Pascal.
+Executa os programas de benchmarks/programs/ com entradas de tamanho
+escalável e mede separadamente a análise léxica (Lexer.tokenize), a análise
+sintática (Parser.parse) e a execução (interpret do backend escolhido).
+Os tempos são gravados em JSON e comparados com um baseline salvo antes,
+apontando as fases que ficaram mais lentas que o limite de tolerância.
+
+Uso:
+    python3 benchmarks/suite.py [--scale=small|medium|large] [--backend=NOME] [-O]
+                                [--repeat=N] [--only=PROGRAMA,...] [--output=ARQUIVO]
+                                [--baseline=ARQUIVO] [--save-baseline] [--threshold=PCT]
+
+Sem --save-baseline, a execução é comparada com o baseline (se ele existir)
+e termina com código 1 quando há regressões ou saídas diferentes.
+"""
+
+import io
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.optimizer import Optimizer
+from compiler.interpreter import Interpreter
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.vm import VirtualMachine
+from compiler.transpiler import TranspiledInterpreter
+from compiler.output import OutputSink
+from compiler.input import InputSource
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PROGRAMS_DIR = os.path.join(BENCHMARK_DIR, 'programs')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+BACKENDS = {
+    'tree': Interpreter,
+    'closure': ClosureInterpreter,
+    'bytecode': VirtualMachine,
+    'python': TranspiledInterpreter,
+}
+
+# Entrada lida por cada programa (via readln) em cada escala; 'medium' leva
+# cerca de um segundo por programa no backend tree
+WORKLOADS = {
+    'fibonacci': {'small': 15, 'medium': 20, 'large': 24},
+    'bubble_sort': {'small': 100, 'medium': 300, 'large': 1000},
+    'selection_sort': {'small': 100, 'medium': 500, 'large': 1500},
+    'sieve': {'small': 5000, 'medium': 30000, 'large': 300000},
+    'nested_loops': {'small': 15, 'medium': 40, 'large': 80},
+    'string_building': {'small': 5000, 'medium': 50000, 'large': 500000},
+    'early_return': {'small': 2000, 'medium': 20000, 'large': 200000},
+}
+SCALES = ('small', 'medium', 'large')
+PHASES = ('lex', 'parse', 'optimize', 'execute', 'total')
+
+DEFAULT_THRESHOLD = 10.0
+# Diferenças menores que isso (em segundos) são ruído de medição, não regressão
+MIN_REGRESSION = 0.001
+
+def run_program(source: str, value: int, backend_class, optimize: bool):
+    """Executa o programa uma vez; retorna os tempos de cada fase e a última linha escrita."""
+    times = {}
+
+    start = time.perf_counter()
+    tokens = Lexer(source).tokenize()
+    times['lex'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    program = Parser(tokens).parse()
+    times['parse'] = time.perf_counter() - start
+
+    if optimize:
+        start = time.perf_counter()
+        program = Optimizer().optimize(program)
+        times['optimize'] = time.perf_counter() - start
+
+    with open(os.devnull, 'w') as devnull:
+        output = OutputSink('ring', ring_lines=1, stream=devnull)
+        interpreter = backend_class(output, InputSource('batch', io.StringIO(str(value))))
+        start = time.perf_counter()
+        interpreter.interpret(program)
+        times['execute'] = time.perf_counter() - start
+
+    times['total'] = sum(times.values())
+    lines = output.get_output()
+    return times, lines[-1] if lines else ''
+
+def run_suite(names, scale: str, backend: str, optimize: bool, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        with open(os.path.join(PROGRAMS_DIR, f"{name}.pas"), 'r', encoding='utf-8') as file:
+            source = file.read()
+        value = WORKLOADS[name][scale]
+
+        # Melhor tempo de cada fase entre as repetições
+        best = {}
+        for _ in range(repeat):
+            times, last_line = run_program(source, value, BACKENDS[backend], optimize)
+            for phase, elapsed in times.items():
+                best[phase] = min(elapsed, best.get(phase, elapsed))
+
+        results[name] = dict(best, input=value, output=last_line)
+        print(f"{name:<16} {value:>8} " +
+              ' '.join(f"{best[phase]:>9.4f}" if phase in best else f"{'-':>9}" for phase in PHASES))
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    """Mostra a variação em relação ao baseline; retorna o número de problemas encontrados."""
+    problems = 0
+    print()
+    print(f"Comparação com o baseline de {baseline.get('timestamp', '?')} "
+          f"(limite: +{threshold:g}%)")
+
+    for name, result in results.items():
+        previous = baseline['programs'].get(name)
+        if previous is None:
+            print(f"  {name}: ausente no baseline")
+            continue
+        if previous['input'] != result['input']:
+            print(f"  {name}: entrada diferente da do baseline ({previous['input']})")
+            continue
+
+        changes = []
+        for phase in PHASES:
+            if phase not in result or phase not in previous:
+                continue
+            old, new = previous[phase], result[phase]
+            change = (new - old) / old * 100 if old > 0 else 0.0
+            flag = ''
+            if change > threshold and new - old > MIN_REGRESSION:
+                flag = ' REGRESSÃO'
+                problems += 1
+            changes.append(f"{phase} {change:+.1f}%{flag}")
+        print(f"  {name:<16} " + ', '.join(changes))
+
+        if previous['output'] != result['output']:
+            print(f"  {name}: saída diferente do baseline: "
+                  f"{result['output']!r} (esperado {previous['output']!r})")
+            problems += 1
+
+    return problems
+
+def main():
+    scale = 'medium'
+    backend = 'tree'
+    optimize = False
+    repeat = 3
+    names = list(WORKLOADS)
+    output_path = os.path.join(RESULTS_DIR, 'latest.json')
+    baseline_path = os.path.join(RESULTS_DIR, 'baseline.json')
+    save_baseline = False
+    threshold = DEFAULT_THRESHOLD
+
+    for arg in sys.argv[1:]:
+        if arg.startswith('--scale='):
+            scale = arg.split('=', 1)[1]
+        elif arg.startswith('--backend='):
+            backend = arg.split('=', 1)[1]
+        elif arg == '-O':
+            optimize = True
+        elif arg.startswith('--repeat='):
+            repeat = int(arg.split('=', 1)[1])
+        elif arg.startswith('--only='):
+            names = arg.split('=', 1)[1].split(',')
+        elif arg.startswith('--output='):
+            output_path = arg.split('=', 1)[1]
+        elif arg.startswith('--baseline='):
+            baseline_path = arg.split('=', 1)[1]
+        elif arg == '--save-baseline':
+            save_baseline = True
+        elif arg.startswith('--threshold='):
+            threshold = float(arg.split('=', 1)[1])
+        else:
+            print(f"Opção desconhecida: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    if scale not in SCALES:
+        print(f"Escala desconhecida: {scale} (disponíveis: {', '.join(SCALES)})")
+        sys.exit(1)
+    if backend not in BACKENDS:
+        print(f"Backend desconhecido: {backend} (disponíveis: {', '.join(BACKENDS)})")
+        sys.exit(1)
+    unknown = [name for name in names if name not in WORKLOADS]
+    if unknown:
+        print(f"Programas desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(WORKLOADS)})")
+        sys.exit(1)
+
+    print(f"Escala: {scale}, backend: {backend}{' com -O' if optimize else ''}, "
+          f"melhor de {repeat} execuções (segundos)")
+    print(f"{'Programa':<16} {'Entrada':>8} " + ' '.join(f"{phase:>9}" for phase in PHASES))
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'backend': backend,
+        'optimize': optimize,
+        'repeat': repeat,
+        'programs': run_suite(names, scale, backend, optimize, repeat),
+    }
+
+    path = baseline_path if save_baseline else output_path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print()
+    print(f"Resultados gravados em {path}")
+
+    if save_baseline or not os.path.exists(baseline_path):
+        return
+
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    config = ('backend', 'optimize')
+    if any(baseline.get(key) != report[key] for key in config):
+        print(f"Baseline gerado com outra configuração ({baseline.get('backend')}"
+              f"{' com -O' if baseline.get('optimize') else ''}); comparação ignorada")
+        return
+
+    problems = compare(report['programs'], baseline, threshold)
+    if problems:
+        print(f"{problems} problema(s) em relação ao baseline")
+        sys.exit(1)
+    print("Nenhuma regressão em relação ao baseline")
+
+if __name__ == '__main__':
+    main()
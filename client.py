@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cliente do servidor do interpretador Pascal (python3 compiler.py serve).
+Aceita as mesmas opções de compiler.py: envia os argumentos e o diretório
+atual ao servidor pelo socket Unix, escreve a saída à medida que ela chega,
+responde com a entrada padrão quando o programa a lê e termina com o código
+de saída do programa. Sem servidor no socket, executa o próprio compiler.py.
+Os subcomandos batch e serve criam processos e sempre executam localmente.
+
+Só usa a biblioteca padrão, para a partida não carregar o interpretador.
+"""
+
+import codecs
+import json
+import os
+import socket
+import sys
+
+# Subcomandos que não passam pelo servidor: os processos do pool não podem criar
+# processos filhos (batch) nem outro servidor (serve)
+LOCAL_COMMANDS = ('batch', 'serve')
+
+def default_socket_path():
+    """Mesmo caminho de src/compiler/server.py: $PASCAL_SOCKET ou um socket por usuário."""
+    path = os.environ.get('PASCAL_SOCKET')
+    if path:
+        return path
+    directory = os.environ.get('TMPDIR', '/tmp')
+    return os.path.join(directory, f"interpretador-pascal-{os.getuid()}.sock")
+
+def run_local(args):
+    """Executa compiler.py no lugar deste processo"""
+    compiler = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'compiler.py')
+    os.execv(sys.executable, [sys.executable, compiler] + args)
+
+def read_input(decoder):
+    """Próximo bloco da entrada padrão ('' no fim)"""
+    if sys.stdin is None:
+        return ''
+    while True:
+        data = sys.stdin.buffer.read1(65536)
+        text = decoder.decode(data, final=not data)
+        # Um bloco pode terminar no meio de um caractere UTF-8
+        if text or not data:
+            return text
+
+def send(connection, message):
+    connection.sendall((json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8'))
+
+def main():
+    """Função principal do cliente"""
+    path = default_socket_path()
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('--socket='):
+            path = arg.split('=', 1)[1]
+        else:
+            args.append(arg)
+
+    if args[:1] and args[0] in LOCAL_COMMANDS:
+        run_local(args)
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        run_local(args)
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with connection, connection.makefile('rb') as responses:
+        send(connection, {'args': args, 'cwd': os.getcwd()})
+        for line in responses:
+            message = json.loads(line)
+            if 'stdout' in message:
+                sys.stdout.write(message['stdout'])
+                sys.stdout.flush()
+            elif 'read' in message:
+                send(connection, {'stdin': read_input(decoder)})
+            else:
+                sys.exit(message['exit'])
+
+    print("Erro: Conexão com o servidor encerrada antes do fim da execução")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main()
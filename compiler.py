@@ -4,9 +4,23 @@ Interpretador Pascal - Interface Principal
 
 import sys
 import os
+import time
 from src.compiler.lexer import Lexer, TokenType
 from src.compiler.parser import Parser, ParseError
-from src.compiler.interpreter import Interpreter, RuntimeError
+from src.compiler.interpreter import RuntimeError
+from src.compiler.bytecode import BytecodeCompiler, disassemble
+from src.compiler.vm import VirtualMachine, DEFAULT_MAX_DEPTH
+from src.compiler.transpiler import PythonTranspiler, TranspileError
+from src.compiler.backends import BACKENDS
+from src.compiler.cache import ProgramCache
+from src.compiler.optimizer import Optimizer
+from src.compiler.output import OutputSink, CAPTURE_MODES, FLUSH_POLICIES, DEFAULT_RING_LINES
+from src.compiler.input import InputSource
+from src.compiler.profiler import LineProfiler, CallProfiler, CALL_SORT_KEYS, PROFILING_BACKENDS
+from src.compiler.memoizer import Memoizer, DEFAULT_MEMO_SIZE, MEMOIZING_BACKENDS
+from src.compiler.batch import find_jobs, run_batch, DEFAULT_TIMEOUT, DEFAULT_REPORT
+from src.compiler.server import serve, default_socket_path
+from src.compiler.limits import RunLimits, LimitExceeded
 
 class PascalInterpreter:
     """
@@ -14,9 +28,51 @@ class PascalInterpreter:
     
     Utiliza arquitetura tree-walking interpreter:
     Código Pascal → Lexer → Parser → AST → Interpreter → Execução
+    
+    O backend de execução pode ser trocado: 'tree' percorre a AST
+    diretamente, 'closure' a compila antes em closures pré-ligadas,
+    'bytecode' a traduz para bytecode executado em uma VM de pilha e
+    'python' a traduz para código Python executado via compile()/exec.
     """
     
-    def __init__(self):
+    def __init__(self, backend: str = 'tree', cache: ProgramCache = None, optimize: bool = False,
+                 capture: str = 'none', flush: str = 'auto', ring_lines: int = DEFAULT_RING_LINES,
+                 input_path: str = None, profile: bool = False, stacks_path: str = None,
+                 call_sort: str = None, graph_path: str = None, memoize: bool = False,
+                 memo_size: int = DEFAULT_MEMO_SIZE, max_depth: int = DEFAULT_MAX_DEPTH,
+                 limits: RunLimits = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconhecido: {backend}")
+        
+        self.backend = backend
+        # Saída do programa: modo de captura e política de descarga (ver output.py)
+        self.capture = capture
+        self.flush = flush
+        self.ring_lines = ring_lines
+        # Entrada do readln: None pede cada valor com um prompt; um arquivo
+        # (ou '-', a entrada padrão) é lido em lote, sem prompts (ver input.py)
+        self.input_path = input_path
+        # Profiler de linhas (--profile): listagem anotada e pilhas para flame graph
+        self.profile = profile
+        self.stacks_path = stacks_path
+        self.profiler = None
+        # Profiler de chamadas (--profile-calls, --call-graph): tabela por
+        # rotina na ordem call_sort e grafo de chamadas DOT em graph_path
+        self.call_sort = call_sort
+        self.graph_path = graph_path
+        self.call_profiler = None
+        # Memoização das funções puras (--memoize), com memo_size resultados por função
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self.memoizer = None
+        # Chamadas ativas permitidas na VM (backend bytecode)
+        self.max_depth = max_depth
+        # Limites de passos, tempo e arrays da execução (None: sem limites)
+        self.limits = limits
+        # Cache de programas já analisados (None desativa)
+        self.cache = cache
+        # Otimizações da AST antes da execução (-O)
+        self.optimize = optimize
         self.lexer = None
         self.parser = None
         self.interpreter = None
@@ -26,39 +82,144 @@ class PascalInterpreter:
         try:
             print(f"Interpretando {filename}...")
             
-            print("Fase 1: Análise Léxica...")
-            self.lexer = Lexer(source_code)
-            tokens = self.lexer.tokenize()
+            ast = None
+            if self.cache is not None and '--debug' not in sys.argv:
+                ast = self.cache.load(source_code)
+            
+            if ast is not None:
+                print("Fases 1 e 2: Programa carregado do cache")
+            else:
+                ast = self.analyze(source_code)
+                if self.cache is not None:
+                    self.cache.store(source_code, ast)
             
-            if '--debug' in sys.argv:
-                print("Tokens encontrados:")
-                for token in tokens:
-                    if token.type != TokenType.EOF:
-                        print(f"  {token.type.name}: {token.value} (linha {token.line})")
+            if self.optimize:
+                # O cache guarda a AST sem otimizações; ela é otimizada a cada execução
+                optimizer = Optimizer()
+                ast = optimizer.optimize(ast)
+                print(f"Otimização: {optimizer.simplified} expressões simplificadas, "
+                      f"{optimizer.eliminated} comandos e rotinas removidos, "
+                      f"{optimizer.hoisted} expressões retiradas de laços, "
+                      f"{optimizer.vectorized} laços vetorizados")
             
-            print("Fase 2: Análise Sintática...")
-            self.parser = Parser(tokens)
-            ast = self.parser.parse()
+            if '--disassemble' in sys.argv:
+                print("Bytecode gerado:")
+                print(disassemble(BytecodeCompiler().compile(ast)))
+            
+            if '--dump-python' in sys.argv:
+                print("Código Python gerado:")
+                print(PythonTranspiler(self.limits is not None).transpile(ast))
             
             print("Fase 3: Interpretação e Execução...")
             print("-" * 50)
             
-            self.interpreter = Interpreter()
-            self.interpreter.interpret(ast)
+            output = OutputSink(self.capture, self.flush, self.ring_lines)
+            input_file = None
+            if self.input_path is None:
+                source = InputSource()
+            else:
+                if self.input_path != '-':
+                    input_file = open(self.input_path, 'r', encoding='utf-8')
+                source = InputSource('batch', input_file)
+            
+            try:
+                if self.profile or self.call_sort or self.graph_path:
+                    if self.profile:
+                        self.profiler = LineProfiler()
+                    if self.call_sort or self.graph_path:
+                        self.call_profiler = CallProfiler()
+                    self.interpreter = PROFILING_BACKENDS[self.backend](output, source, self.profiler,
+                                                                         self.call_profiler)
+                elif self.memoize:
+                    self.memoizer = Memoizer(self.memo_size)
+                    self.interpreter = MEMOIZING_BACKENDS[self.backend](output, source, self.memoizer)
+                elif self.backend == 'bytecode':
+                    self.interpreter = VirtualMachine(output, source, self.max_depth)
+                else:
+                    self.interpreter = BACKENDS[self.backend](output, source)
+                self.interpreter.limits = self.limits
+                self.interpreter.interpret(ast)
+            finally:
+                if input_file is not None:
+                    input_file.close()
             
             print("-" * 50)
             print("Programa executado com sucesso!")
             
+            if self.profiler is not None:
+                self.report_profile(source_code, filename)
+            if self.call_profiler is not None:
+                self.report_calls()
+            if self.memoizer is not None:
+                print()
+                print("Memoização de funções puras:")
+                print(self.memoizer.report())
+            
         except ParseError as e:
             print(f"Erro de sintaxe: {e}")
             sys.exit(1)
+        except TranspileError as e:
+            print(f"Erro de tradução: {e}")
+            sys.exit(1)
+        except LimitExceeded as e:
+            print(f"Erro de execução: {e}")
+            print(f"Execução até o limite: {e.stats}")
+            sys.exit(1)
         except RuntimeError as e:
             print(f"Erro de execução: {e}")
             sys.exit(1)
+        except RecursionError:
+            # Os outros backends usam a pilha do Python a cada chamada Pascal
+            print(f"Erro de execução: Recursão profunda demais para o backend '{self.backend}'; "
+                  f"use --backend=bytecode")
+            sys.exit(1)
         except Exception as e:
             print(f"Erro inesperado: {e}")
             sys.exit(1)
     
+    def report_profile(self, source_code: str, filename: str):
+        """Mostra a listagem anotada e grava as pilhas colapsadas do profiler"""
+        print()
+        print(f"Perfil de execução (tempo total: {self.profiler.total * 1000:.3f} ms):")
+        print(self.profiler.annotate(source_code))
+        
+        stacks_path = self.stacks_path
+        if stacks_path is None:
+            name = os.path.splitext(os.path.basename(filename))[0].strip('<>') or 'programa'
+            stacks_path = f"{name}.folded"
+        self.profiler.write_stacks(stacks_path)
+        print(f"Pilhas para flame graph gravadas em {stacks_path}")
+    
+    def report_calls(self):
+        """Mostra a tabela de rotinas e grava o grafo de chamadas do profiler"""
+        if self.call_sort:
+            print()
+            print(f"Perfil de chamadas (ordenado por {self.call_sort}):")
+            print(self.call_profiler.table(self.call_sort))
+        
+        if self.graph_path:
+            self.call_profiler.write_call_graph(self.graph_path)
+            print(f"Grafo de chamadas gravado em {self.graph_path}")
+    
+    def analyze(self, source_code: str):
+        """Executa as análises léxica e sintática e retorna a AST"""
+        print("Fase 1: Análise Léxica...")
+        self.lexer = Lexer(source_code)
+        
+        if '--debug' in sys.argv:
+            tokens = self.lexer.tokenize()
+            print("Tokens encontrados:")
+            for token in tokens:
+                if token.type != TokenType.EOF:
+                    print(f"  {token.type.name}: {token.value} (linha {token.line})")
+        else:
+            # Tokens são gerados sob demanda, enquanto o parser os consome
+            tokens = self.lexer.iter_tokens()
+        
+        print("Fase 2: Análise Sintática...")
+        self.parser = Parser(tokens)
+        return self.parser.parse()
+    
     def interpret_file(self, filename: str):
         """Interpreta e executa arquivo Pascal"""
         if not os.path.exists(filename):
@@ -89,31 +250,398 @@ def print_usage():
     print("Interpretador Pascal")
     print()
     print("Uso: python3 compiler.py [opções] [arquivo.pas]")
+    print("     python3 compiler.py batch [opções] CAMINHO  (ver batch --help)")
+    print("     python3 compiler.py serve [opções]          (ver serve --help)")
     print()
     print("Opções:")
     print("  -h, --help       Mostra esta ajuda")
     print("  --debug          Mostra tokens durante interpretação")
+    print("  --backend=NOME   Backend de execução: tree (padrão), closure, bytecode ou python")
+    print("  -O               Otimiza a AST antes da execução (constantes, código morto e laços;")
+    print("                   laços elemento a elemento usam NumPy, se instalado)")
+    print("  --disassemble    Mostra o bytecode gerado antes da execução")
+    print("  --dump-python    Mostra o código Python gerado antes da execução")
+    print("  --no-cache       Não usa o cache de programas já analisados")
+    print("  --cache-dir=DIR  Diretório do cache (padrão: ~/.cache/interpretador-pascal)")
+    print("  --capture=MODO   Linhas da saída guardadas em memória: none (padrão), full ou ring")
+    print(f"  --capture-lines=N  Linhas guardadas no modo ring (padrão: {DEFAULT_RING_LINES})")
+    print("  --flush=MODO     Descarga da saída: auto (padrão), line ou block")
+    print("  --input=ARQUIVO  Lê os valores do readln do arquivo ('-' para a entrada padrão),")
+    print("                   sem prompts, separados por espaços ou quebras de linha")
+    print("  --profile        Mede execuções e tempo por linha (backends tree e closure) e")
+    print("                   grava as pilhas para flame graph em <programa>.folded")
+    print("  --profile-stacks=ARQUIVO  Arquivo das pilhas do --profile")
+    print("  --profile-calls[=ORDEM]  Mostra chamadas e tempo próprio e total por rotina,")
+    print("                   ordenados por self (padrão), total, calls ou name")
+    print("  --call-graph=ARQUIVO  Grava o grafo de chamadas no formato DOT (Graphviz)")
+    print(f"  --max-depth=N    Chamadas ativas permitidas no backend bytecode (padrão: {DEFAULT_MAX_DEPTH});")
+    print("                   chamadas em return f(...) reaproveitam o registro de ativação")
+    print("  --memoize        Guarda os resultados de funções puras (backends tree, closure e python)")
+    print(f"  --memo-size=N    Resultados guardados por função no --memoize (padrão: {DEFAULT_MEMO_SIZE})")
+    print("  --max-steps=N    Interrompe a execução após N passos (voltas de laços e chamadas)")
+    print("  --time-limit=S   Interrompe a execução após S segundos")
+    print("  --max-array=N    Elementos permitidos no total dos arrays declarados")
     print()
     print("Exemplos:")
     print("  python3 compiler.py examples/hello.pas")
     print("  python3 compiler.py --debug examples/exemplo_completo.pas")
+    print("  python3 compiler.py --backend=closure examples/bubble_sort.pas")
+    print("  python3 compiler.py --backend=bytecode --disassemble examples/hello.pas")
+    print("  python3 compiler.py --backend=python --dump-python examples/fibonacci.pas")
+    print("  python3 compiler.py -O --backend=closure examples/bubble_sort.pas")
+    print("  python3 compiler.py --input=dados.txt examples/bubble_sort.pas")
+    print("  python3 compiler.py --profile --input=dados.txt examples/bubble_sort.pas")
+    print("  python3 compiler.py --profile-calls --call-graph=fib.dot examples/fibonacci.pas")
+    print("  python3 compiler.py --memoize --backend=closure examples/fibonacci.pas")
+    print("  python3 compiler.py --max-steps=1000000 --time-limit=2 examples/fibonacci.pas")
+    print("  python3 compiler.py batch --workers=4 --report=notas.jsonl entregas/")
+    print("  python3 compiler.py serve --workers=4")
+    print("  python3 client.py --backend=closure examples/hello.pas")
     print()
     print("Exemplos disponíveis em examples/:")
     print("  hello.pas, fibonacci.pas, procedimentos_simples.pas,")
     print("  exemplo_completo.pas, selection_sort.pas, bubble_sort.pas")
 
+def parse_limits(max_steps, time_limit, max_array):
+    """Valida as opções de limite e retorna os RunLimits (None sem nenhum limite)"""
+    if max_steps is None and time_limit is None and max_array is None:
+        return None
+    
+    if max_steps is not None and not max_steps.isdigit():
+        print(f"Erro: Número de passos inválido '{max_steps}'")
+        sys.exit(1)
+    
+    seconds = None
+    if time_limit is not None:
+        try:
+            seconds = float(time_limit)
+        except ValueError:
+            seconds = 0.0
+        if not seconds > 0:
+            print(f"Erro: Tempo limite inválido '{time_limit}'")
+            sys.exit(1)
+    
+    if max_array is not None and not max_array.isdigit():
+        print(f"Erro: Número de elementos inválido '{max_array}'")
+        sys.exit(1)
+    
+    return RunLimits(int(max_steps) if max_steps is not None else None, seconds,
+                     int(max_array) if max_array is not None else None)
+
+def print_batch_usage():
+    """Mostra informações de uso do subcomando batch"""
+    print("Interpretador Pascal - execução em lote")
+    print()
+    print("Uso: python3 compiler.py batch [opções] CAMINHO")
+    print()
+    print("CAMINHO é um diretório, cujos .pas (também em subdiretórios) leem os valores")
+    print("do readln de <programa>.in quando ele existe, ou um manifesto com uma linha")
+    print("'programa.pas [entrada]' por programa, com caminhos relativos ao manifesto.")
+    print()
+    print("Opções:")
+    print("  --workers=N      Programas executados em paralelo (padrão: um por núcleo)")
+    print(f"  --timeout=S      Segundos permitidos a cada programa (padrão: {DEFAULT_TIMEOUT:g}; 0 desativa)")
+    print("  --max-steps=N    Passos (voltas de laços e chamadas) permitidos a cada programa")
+    print("  --max-array=N    Elementos de arrays permitidos a cada programa")
+    print(f"  --report=ARQUIVO Relatório JSON Lines, uma linha por programa (padrão: {DEFAULT_REPORT})")
+    print(f"  --output-lines=N Últimas linhas da saída guardadas no relatório (padrão: {DEFAULT_RING_LINES})")
+    print("  --backend=NOME   Backend de execução: tree (padrão), closure, bytecode ou python")
+    print("  -O               Otimiza a AST antes da execução")
+
+def batch_main(args):
+    """Executa vários programas Pascal em paralelo e grava o relatório"""
+    if not args or '-h' in args or '--help' in args:
+        print_batch_usage()
+        return
+    
+    backend = 'tree'
+    workers = str(os.cpu_count() or 1)
+    timeout = str(DEFAULT_TIMEOUT)
+    max_steps = None
+    max_array = None
+    report_path = DEFAULT_REPORT
+    output_lines = str(DEFAULT_RING_LINES)
+    path = None
+    for arg in args:
+        if arg.startswith('--backend='):
+            backend = arg.split('=', 1)[1]
+        elif arg.startswith('--workers='):
+            workers = arg.split('=', 1)[1]
+        elif arg.startswith('--timeout='):
+            timeout = arg.split('=', 1)[1]
+        elif arg.startswith('--max-steps='):
+            max_steps = arg.split('=', 1)[1]
+        elif arg.startswith('--max-array='):
+            max_array = arg.split('=', 1)[1]
+        elif arg.startswith('--report='):
+            report_path = arg.split('=', 1)[1]
+        elif arg.startswith('--output-lines='):
+            output_lines = arg.split('=', 1)[1]
+        elif not arg.startswith('-') and path is None:
+            path = arg
+    
+    if backend not in BACKENDS:
+        print(f"Erro: Backend desconhecido '{backend}'")
+        print(f"Backends disponíveis: {', '.join(BACKENDS)}")
+        sys.exit(1)
+    
+    if not workers.isdigit() or int(workers) < 1:
+        print(f"Erro: Número de processos inválido '{workers}'")
+        sys.exit(1)
+    
+    if not output_lines.isdigit() or int(output_lines) < 1:
+        print(f"Erro: Número de linhas da saída inválido '{output_lines}'")
+        sys.exit(1)
+    
+    try:
+        seconds = float(timeout)
+    except ValueError:
+        seconds = -1.0
+    if seconds < 0:
+        print(f"Erro: Limite de tempo inválido '{timeout}'")
+        sys.exit(1)
+    
+    # O tempo de cada programa continua limitado pelo --timeout
+    limits = parse_limits(max_steps, None, max_array)
+    
+    if path is None or not os.path.exists(path):
+        print(f"Erro: Diretório ou manifesto '{path}' não encontrado" if path else
+              "Erro: Nenhum diretório ou manifesto especificado")
+        sys.exit(1)
+    
+    try:
+        jobs = find_jobs(path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        print(f"Erro: Manifesto inválido: {e}")
+        sys.exit(1)
+    
+    if not jobs:
+        print(f"Erro: Nenhum programa .pas encontrado em '{path}'")
+        sys.exit(1)
+    
+    print(f"Executando {len(jobs)} programas em {workers} processos...")
+    start = time.perf_counter()
+    with open(report_path, 'w', encoding='utf-8') as report:
+        statuses = run_batch(jobs, report, int(workers), backend, '-O' in args, seconds or None,
+                             limits, int(output_lines))
+    elapsed = time.perf_counter() - start
+    
+    print(f"Concluído em {elapsed:.2f} s ({len(jobs) / elapsed:.1f} programas/s)")
+    for status, count in sorted(statuses.items()):
+        print(f"  {status}: {count}")
+    print(f"Relatório gravado em {report_path}")
+    
+    # Como na execução de um programa, falhas terminam com código 1
+    if statuses['ok'] != len(jobs):
+        sys.exit(1)
+
+def print_serve_usage():
+    """Mostra informações de uso do subcomando serve"""
+    print("Interpretador Pascal - servidor")
+    print()
+    print("Uso: python3 compiler.py serve [opções]")
+    print()
+    print("Mantém o interpretador carregado em processos prontos e atende, por um socket")
+    print("Unix, o cliente client.py, que aceita as mesmas opções de compiler.py.")
+    print()
+    print("Opções:")
+    print("  --socket=CAMINHO Socket do servidor (padrão: $PASCAL_SOCKET ou")
+    print(f"                   {default_socket_path()})")
+    print("  --workers=N      Programas executados em paralelo (padrão: um por núcleo)")
+
+def serve_request(request, stdin, stdout):
+    """Executa um pedido do servidor como uma chamada de compiler.py e retorna o código de saída"""
+    args = list(request.get('args', []))
+    if args[:1] == ['serve']:
+        stdout.write("Erro: O cliente não pode iniciar outro servidor\n")
+        return 1
+    if args[:1] == ['batch']:
+        # Os processos do servidor são daemons e não podem criar o pool do lote
+        stdout.write("Erro: O lote não é executado pelo servidor; use python3 compiler.py batch\n")
+        return 1
+    
+    saved = sys.argv, sys.stdin, sys.stdout
+    sys.argv = ['compiler.py'] + args
+    sys.stdin = stdin
+    sys.stdout = stdout
+    try:
+        os.chdir(request.get('cwd') or '/')
+        main()
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code)
+        return 1
+    except OSError as e:
+        print(f"Erro: {e}")
+        return 1
+    finally:
+        sys.argv, sys.stdin, sys.stdout = saved
+
+def serve_main(args):
+    """Atende execuções de programas Pascal pelo socket Unix até ser encerrado"""
+    if '-h' in args or '--help' in args:
+        print_serve_usage()
+        return
+    
+    path = default_socket_path()
+    workers = str(os.cpu_count() or 1)
+    for arg in args:
+        if arg.startswith('--socket='):
+            path = arg.split('=', 1)[1]
+        elif arg.startswith('--workers='):
+            workers = arg.split('=', 1)[1]
+    
+    if not workers.isdigit() or int(workers) < 1:
+        print(f"Erro: Número de processos inválido '{workers}'")
+        sys.exit(1)
+    
+    def ready(server):
+        print(f"Servidor ouvindo em {server.path} com {server.size} processos (Ctrl+C encerra)", flush=True)
+    
+    try:
+        serve(serve_request, path, int(workers), ready)
+    except OSError as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+    print("Servidor encerrado")
+
 def main():
     """Função principal do interpretador Pascal"""
     if len(sys.argv) == 1:
         print_usage()
         return
     
-    interpreter = PascalInterpreter()
+    if sys.argv[1] == 'batch':
+        batch_main(sys.argv[2:])
+        return
+    
+    if sys.argv[1] == 'serve':
+        serve_main(sys.argv[2:])
+        return
     
     if '-h' in sys.argv or '--help' in sys.argv:
         print_usage()
         return
     
+    backend = 'tree'
+    cache_dir = None
+    # A interface de linha de comando não lê a saída capturada
+    capture = 'none'
+    ring_lines = str(DEFAULT_RING_LINES)
+    flush = 'auto'
+    input_path = None
+    stacks_path = None
+    call_sort = None
+    graph_path = None
+    memo_size = str(DEFAULT_MEMO_SIZE)
+    max_depth = None
+    max_steps = None
+    time_limit = None
+    max_array = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--backend='):
+            backend = arg.split('=', 1)[1]
+        elif arg.startswith('--cache-dir='):
+            cache_dir = arg.split('=', 1)[1]
+        elif arg.startswith('--capture='):
+            capture = arg.split('=', 1)[1]
+        elif arg.startswith('--capture-lines='):
+            ring_lines = arg.split('=', 1)[1]
+        elif arg.startswith('--flush='):
+            flush = arg.split('=', 1)[1]
+        elif arg.startswith('--input='):
+            input_path = arg.split('=', 1)[1]
+        elif arg.startswith('--profile-stacks='):
+            stacks_path = arg.split('=', 1)[1]
+        elif arg == '--profile-calls':
+            call_sort = 'self'
+        elif arg.startswith('--profile-calls='):
+            call_sort = arg.split('=', 1)[1]
+        elif arg.startswith('--call-graph='):
+            graph_path = arg.split('=', 1)[1]
+        elif arg.startswith('--max-depth='):
+            max_depth = arg.split('=', 1)[1]
+        elif arg.startswith('--memo-size='):
+            memo_size = arg.split('=', 1)[1]
+        elif arg.startswith('--max-steps='):
+            max_steps = arg.split('=', 1)[1]
+        elif arg.startswith('--time-limit='):
+            time_limit = arg.split('=', 1)[1]
+        elif arg.startswith('--max-array='):
+            max_array = arg.split('=', 1)[1]
+    
+    if backend not in BACKENDS:
+        print(f"Erro: Backend desconhecido '{backend}'")
+        print(f"Backends disponíveis: {', '.join(BACKENDS)}")
+        sys.exit(1)
+    
+    if capture not in CAPTURE_MODES:
+        print(f"Erro: Modo de captura desconhecido '{capture}'")
+        print(f"Modos disponíveis: {', '.join(CAPTURE_MODES)}")
+        sys.exit(1)
+    
+    if flush not in FLUSH_POLICIES:
+        print(f"Erro: Política de descarga desconhecida '{flush}'")
+        print(f"Políticas disponíveis: {', '.join(FLUSH_POLICIES)}")
+        sys.exit(1)
+    
+    if not ring_lines.isdigit() or int(ring_lines) < 1:
+        print(f"Erro: Número de linhas inválido '{ring_lines}'")
+        sys.exit(1)
+    
+    profile = '--profile' in sys.argv or stacks_path is not None
+    if profile and backend not in PROFILING_BACKENDS:
+        print(f"Erro: --profile não é suportado pelo backend '{backend}'")
+        print(f"Backends com profiler: {', '.join(PROFILING_BACKENDS)}")
+        sys.exit(1)
+    
+    if call_sort is not None and call_sort not in CALL_SORT_KEYS:
+        print(f"Erro: Ordem desconhecida '{call_sort}'")
+        print(f"Ordens disponíveis: {', '.join(CALL_SORT_KEYS)}")
+        sys.exit(1)
+    
+    if (call_sort or graph_path) and backend not in PROFILING_BACKENDS:
+        print(f"Erro: --profile-calls e --call-graph não são suportados pelo backend '{backend}'")
+        print(f"Backends com profiler: {', '.join(PROFILING_BACKENDS)}")
+        sys.exit(1)
+    
+    memoize = '--memoize' in sys.argv
+    if memoize and backend not in MEMOIZING_BACKENDS:
+        print(f"Erro: --memoize não é suportado pelo backend '{backend}'")
+        print(f"Backends com memoização: {', '.join(MEMOIZING_BACKENDS)}")
+        sys.exit(1)
+    
+    if memoize and (profile or call_sort or graph_path):
+        print("Erro: --memoize não pode ser combinado com os profilers")
+        sys.exit(1)
+    
+    if not memo_size.isdigit() or int(memo_size) < 1:
+        print(f"Erro: Tamanho de cache inválido '{memo_size}'")
+        sys.exit(1)
+    
+    if max_depth is not None:
+        if backend != 'bytecode':
+            print("Erro: --max-depth só se aplica ao backend bytecode")
+            sys.exit(1)
+        if not max_depth.isdigit() or int(max_depth) < 1:
+            print(f"Erro: Profundidade máxima inválida '{max_depth}'")
+            sys.exit(1)
+    
+    limits = parse_limits(max_steps, time_limit, max_array)
+    
+    if input_path not in (None, '-') and not os.path.isfile(input_path):
+        print(f"Erro: Arquivo de entrada '{input_path}' não encontrado")
+        sys.exit(1)
+    
+    cache = None if '--no-cache' in sys.argv else ProgramCache(cache_dir)
+    interpreter = PascalInterpreter(backend, cache, '-O' in sys.argv, capture, flush,
+                                     int(ring_lines), input_path, profile, stacks_path,
+                                     call_sort, graph_path, memoize, int(memo_size),
+                                     int(max_depth) if max_depth is not None else DEFAULT_MAX_DEPTH,
+                                     limits)
+    
     # Encontrar arquivo Pascal
     pascal_file = None
     for arg in sys.argv[1:]:
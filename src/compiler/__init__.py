@@ -8,12 +8,26 @@ __email__ = "lcsgborges@gmail.com"
 
 from .lexer import Lexer, Token, TokenType
 from .parser import Parser, ParseError
-from .interpreter import Interpreter, RuntimeError
+from .interpreter import Interpreter, Frame, RuntimeError
+from .resolver import Resolver, ScopeAnalysis
+from .optimizer import Optimizer
+from .vectorizer import Vectorizer
+from .closure_compiler import ClosureCompiler, ClosureInterpreter
+from .bytecode import BytecodeCompiler, CodeObject, disassemble
+from .vm import VirtualMachine
+from .output import OutputSink
+from .input import InputSource
+from .transpiler import PythonTranspiler, TranspiledInterpreter, TranspileError
 from .ast_nodes import *
 
 __all__ = [
     'Lexer', 'Token', 'TokenType',
     'Parser', 'ParseError', 
-    'Interpreter', 'RuntimeError',
+    'Interpreter', 'Frame', 'RuntimeError',
+    'Resolver', 'ScopeAnalysis', 'Optimizer', 'Vectorizer',
+    'ClosureCompiler', 'ClosureInterpreter',
+    'BytecodeCompiler', 'CodeObject', 'disassemble', 'VirtualMachine',
+    'OutputSink', 'InputSource',
+    'PythonTranspiler', 'TranspiledInterpreter', 'TranspileError',
     'ASTNode', 'Expression', 'Statement', 'Program'
 ]
@@ -3,87 +3,145 @@ Definições dos nós da Árvore Sintática Abstrata (AST)
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Union
+from typing import Any, Iterator, List, Optional, Sequence, Union
 
 class ASTNode(ABC):
-    """Classe base para todos os nós da AST."""
-    pass
+    """
+    Classe base para todos os nós da AST.
+    Nós usam __slots__ (sem __dict__ por instância): cada classe declara seus
+    campos e as anotações gravadas pelo resolver. line é a posição do nó no
+    código fonte (linha em que começa; 0 quando desconhecida).
+    """
+    __slots__ = ('line',)
+    _fields = ()
 
 class Expression(ASTNode):
     """Classe base para expressões."""
-    pass
+    __slots__ = ()
 
 class Statement(ASTNode):
     """Classe base para comandos."""
-    pass
+    __slots__ = ()
 
 # Expressões
 class NumberLiteral(Expression):
-    def __init__(self, value: Union[int, float]):
+    __slots__ = ('value',)
+    _fields = ('value',)
+
+    def __init__(self, value: Union[int, float], line: int = 0):
+        self.line = line
         self.value = value
 
 class StringLiteral(Expression):
-    def __init__(self, value: str):
+    __slots__ = ('value',)
+    _fields = ('value',)
+
+    def __init__(self, value: str, line: int = 0):
+        self.line = line
         self.value = value
     
     def __str__(self):
         return f"StringLiteral({repr(self.value)})"
 
 class BooleanLiteral(Expression):
-    def __init__(self, value: bool):
+    __slots__ = ('value',)
+    _fields = ('value',)
+
+    def __init__(self, value: bool, line: int = 0):
+        self.line = line
         self.value = value
 
 class Variable(Expression):
-    def __init__(self, name: str):
+    __slots__ = ('name', 'depth', 'slot')
+    _fields = ('name',)
+
+    def __init__(self, name: str, line: int = 0):
+        self.line = line
         self.name = name
 
 class ArrayAccess(Expression):
-    def __init__(self, array: Expression, index: Expression):
+    __slots__ = ('array', 'index')
+    _fields = ('array', 'index')
+
+    def __init__(self, array: Expression, index: Expression, line: int = 0):
+        self.line = line
         self.array = array
         self.index = index
 
 class BinaryOperation(Expression):
-    def __init__(self, left: Expression, operator: str, right: Expression):
+    __slots__ = ('left', 'operator', 'right')
+    _fields = ('left', 'operator', 'right')
+
+    def __init__(self, left: Expression, operator: str, right: Expression, line: int = 0):
+        self.line = line
         self.left = left
         self.operator = operator
         self.right = right
 
 class UnaryOperation(Expression):
-    def __init__(self, operator: str, operand: Expression):
+    __slots__ = ('operator', 'operand')
+    _fields = ('operator', 'operand')
+
+    def __init__(self, operator: str, operand: Expression, line: int = 0):
+        self.line = line
         self.operator = operator
         self.operand = operand
 
 class FunctionCall(Expression):
-    def __init__(self, name: str, arguments: List[Expression]):
+    __slots__ = ('name', 'arguments', 'scope', 'routine')
+    _fields = ('name', 'arguments')
+
+    def __init__(self, name: str, arguments: List[Expression], line: int = 0):
+        self.line = line
         self.name = name
         self.arguments = arguments
 
 # Declarações
 class VariableDeclaration(ASTNode):
-    def __init__(self, name: str, var_type: str, value: Optional[Expression] = None):
+    __slots__ = ('name', 'var_type', 'value', 'slot')
+    _fields = ('name', 'var_type', 'value')
+
+    def __init__(self, name: str, var_type: str, value: Optional[Expression] = None, line: int = 0):
+        self.line = line
         self.name = name
         self.var_type = var_type
         self.value = value
 
 class ArrayDeclaration(ASTNode):
-    def __init__(self, name: str, element_type: str, size: int):
+    __slots__ = ('name', 'element_type', 'size', 'slot')
+    _fields = ('name', 'element_type', 'size')
+
+    def __init__(self, name: str, element_type: str, size: int, line: int = 0):
+        self.line = line
         self.name = name
         self.element_type = element_type
         self.size = size
 
 class Parameter(ASTNode):
-    def __init__(self, name: str, param_type: str):
+    __slots__ = ('name', 'param_type')
+    _fields = ('name', 'param_type')
+
+    def __init__(self, name: str, param_type: str, line: int = 0):
+        self.line = line
         self.name = name
         self.param_type = param_type
 
 class ProcedureDeclaration(ASTNode):
-    def __init__(self, name: str, parameters: List[Parameter], body: 'Block'):
+    __slots__ = ('name', 'parameters', 'body', 'frame_size')
+    _fields = ('name', 'parameters', 'body')
+
+    def __init__(self, name: str, parameters: List[Parameter], body: 'Block', line: int = 0):
+        self.line = line
         self.name = name
         self.parameters = parameters
         self.body = body
 
 class FunctionDeclaration(ASTNode):
-    def __init__(self, name: str, parameters: List[Parameter], return_type: str, body: 'Block'):
+    __slots__ = ('name', 'parameters', 'return_type', 'body', 'frame_size')
+    _fields = ('name', 'parameters', 'return_type', 'body')
+
+    def __init__(self, name: str, parameters: List[Parameter], return_type: str, body: 'Block', line: int = 0):
+        self.line = line
         self.name = name
         self.parameters = parameters
         self.return_type = return_type
@@ -91,52 +149,134 @@ class FunctionDeclaration(ASTNode):
 
 # Comandos
 class Assignment(Statement):
-    def __init__(self, target: Expression, value: Expression):
+    __slots__ = ('target', 'value')
+    _fields = ('target', 'value')
+
+    def __init__(self, target: Expression, value: Expression, line: int = 0):
+        self.line = line
         self.target = target
         self.value = value
 
 class IfStatement(Statement):
-    def __init__(self, condition: Expression, then_stmt: Statement, else_stmt: Optional[Statement] = None):
+    __slots__ = ('condition', 'then_stmt', 'else_stmt')
+    _fields = ('condition', 'then_stmt', 'else_stmt')
+
+    def __init__(self, condition: Expression, then_stmt: Statement, else_stmt: Optional[Statement] = None,
+                 line: int = 0):
+        self.line = line
         self.condition = condition
         self.then_stmt = then_stmt
         self.else_stmt = else_stmt
 
 class WhileStatement(Statement):
-    def __init__(self, condition: Expression, body: Statement):
+    __slots__ = ('condition', 'body', 'invariants')
+    _fields = ('condition', 'body')
+
+    def __init__(self, condition: Expression, body: Statement, line: int = 0):
+        self.line = line
         self.condition = condition
         self.body = body
+        # Expressões invariantes retiradas do laço pelo otimizador
+        self.invariants: Sequence['Invariant'] = ()
 
 class ForStatement(Statement):
-    def __init__(self, variable: str, start: Expression, end: Expression, body: Statement):
+    __slots__ = ('variable', 'start', 'end', 'body', 'invariants', 'vector', 'slot')
+    _fields = ('variable', 'start', 'end', 'body')
+
+    def __init__(self, variable: str, start: Expression, end: Expression, body: Statement, line: int = 0):
+        self.line = line
         self.variable = variable
         self.start = start
         self.end = end
         self.body = body
+        # Expressões invariantes retiradas do laço pelo otimizador
+        self.invariants: Sequence['Invariant'] = ()
+        # Forma vetorizada do laço, quando o otimizador a reconhece
+        self.vector: Optional['VectorLoop'] = None
+
+class Invariant(ASTNode):
+    """Temporário de um laço: avaliado uma vez antes do laço e lido dentro dele."""
+    __slots__ = ('name', 'value', 'slot')
+    _fields = ('name', 'value')
+
+    def __init__(self, name: str, value: Expression, line: int = 0):
+        self.line = line
+        self.name = name
+        self.value = value
+
+class VectorLoop(ASTNode):
+    """
+    Laço for vetorizado: operands são lidos uma vez antes do laço e kernel
+    descreve as atribuições elemento a elemento (ver vectorizer.py).
+    """
+    __slots__ = ('operands', 'kernel')
+    _fields = ('operands',)
+
+    def __init__(self, operands: List['Variable'], kernel: tuple, line: int = 0):
+        self.line = line
+        self.operands = operands
+        self.kernel = kernel
 
 class ProcedureCall(Statement):
-    def __init__(self, name: str, arguments: List[Expression]):
+    __slots__ = ('name', 'arguments', 'scope', 'routine')
+    _fields = ('name', 'arguments')
+
+    def __init__(self, name: str, arguments: List[Expression], line: int = 0):
+        self.line = line
         self.name = name
         self.arguments = arguments
 
 class Block(Statement):
-    def __init__(self, statements: List[Statement]):
+    __slots__ = ('statements',)
+    _fields = ('statements',)
+
+    def __init__(self, statements: List[Statement], line: int = 0):
+        self.line = line
         self.statements = statements
 
 class ReadlnStatement(Statement):
-    def __init__(self, targets: List[Expression]):
+    __slots__ = ('targets', 'types')
+    _fields = ('targets',)
+
+    def __init__(self, targets: List[Expression], line: int = 0):
+        self.line = line
         self.targets = targets
 
 class WritelnStatement(Statement):
-    def __init__(self, expressions: List[Expression]):
+    __slots__ = ('expressions',)
+    _fields = ('expressions',)
+
+    def __init__(self, expressions: List[Expression], line: int = 0):
+        self.line = line
         self.expressions = expressions
 
 class ReturnStatement(Statement):
-    def __init__(self, value: Optional[Expression] = None):
+    __slots__ = ('value',)
+    _fields = ('value',)
+
+    def __init__(self, value: Optional[Expression] = None, line: int = 0):
+        self.line = line
         self.value = value
 
 # Programa principal
 class Program(ASTNode):
-    def __init__(self, name: str, declarations: List[ASTNode], body: Block):
+    __slots__ = ('name', 'declarations', 'body', 'frame_size', 'global_slots')
+    _fields = ('name', 'declarations', 'body')
+
+    def __init__(self, name: str, declarations: List[ASTNode], body: Block, line: int = 0):
+        self.line = line
         self.name = name
         self.declarations = declarations
         self.body = body
+
+
+def iter_child_nodes(node: ASTNode) -> Iterator[ASTNode]:
+    """Percorre os filhos diretos de um nó, na ordem dos campos."""
+    for field in node._fields:
+        value = getattr(node, field)
+        if isinstance(value, ASTNode):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, ASTNode):
+                    yield item
@@ -0,0 +1,18 @@
+"""
+Backends de execução do compilador Pascal.
+Tabela única dos backends selecionados com --backend=<nome>, usada pela
+linha de comando e pela execução em lote.
+"""
+
+from .interpreter import Interpreter
+from .closure_compiler import ClosureInterpreter
+from .vm import VirtualMachine
+from .transpiler import TranspiledInterpreter
+
+# Backends de execução disponíveis (selecionados com --backend=<nome>)
+BACKENDS = {
+    'tree': Interpreter,
+    'closure': ClosureInterpreter,
+    'bytecode': VirtualMachine,
+    'python': TranspiledInterpreter,
+}
@@ -0,0 +1,213 @@
+"""
+Execução em lote de programas Pascal para o compilador Pascal.
+Recebe um diretório (todos os .pas, cada um com a entrada opcional em
+<programa>.in) ou um manifesto e executa os programas em um pool de
+processos, com limite de tempo por programa e, opcionalmente, limites de
+passos e de elementos de arrays (RunLimits). O resultado de cada programa
+(últimas linhas da saída, status e tempos) vira uma linha de um relatório
+JSON Lines, gravada assim que o programa termina.
+"""
+
+import io
+import json
+import os
+import signal
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, TextIO
+from .lexer import Lexer
+from .parser import Parser, ParseError
+from .optimizer import Optimizer
+from .interpreter import RuntimeError
+from .transpiler import TranspileError
+from .backends import BACKENDS
+from .limits import RunLimits, LimitExceeded
+from .output import OutputSink, DEFAULT_RING_LINES
+from .input import InputSource
+
+# Segundos de execução permitidos a cada programa
+DEFAULT_TIMEOUT = 10.0
+
+# Relatório gravado quando nenhum arquivo é indicado
+DEFAULT_REPORT = 'batch.jsonl'
+
+# Extensão do arquivo de entrada de um programa encontrado em um diretório
+INPUT_EXTENSION = '.in'
+
+class BatchJob:
+    """Programa do lote e o arquivo opcional com os valores do readln."""
+    __slots__ = ('program', 'input')
+
+    def __init__(self, program: str, input_path: Optional[str] = None):
+        self.program = program
+        self.input = input_path
+
+class ProgramTimeout(BaseException):
+    """
+    Execução que passou do limite de tempo do lote. Como KeyboardInterrupt,
+    não deriva de Exception, para não ser engolida por um 'except Exception'.
+    """
+
+def find_jobs(path: str) -> List[BatchJob]:
+    """Programas de um diretório ou de um arquivo de manifesto."""
+    if os.path.isdir(path):
+        return scan_directory(path)
+    return load_manifest(path)
+
+def scan_directory(directory: str) -> List[BatchJob]:
+    """Todos os .pas do diretório e subdiretórios, em ordem de caminho."""
+    jobs = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith('.pas'):
+                continue
+            program = os.path.join(root, name)
+            input_path = os.path.splitext(program)[0] + INPUT_EXTENSION
+            jobs.append(BatchJob(program, input_path if os.path.isfile(input_path) else None))
+    return jobs
+
+def load_manifest(path: str) -> List[BatchJob]:
+    """
+    Manifesto: uma linha 'programa.pas [entrada]' por programa, com caminhos
+    relativos ao diretório do manifesto; '#' inicia um comentário.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            fields = line.split('#', 1)[0].split()
+            if not fields:
+                continue
+            if len(fields) > 2:
+                raise ValueError(f"Linha {number} do manifesto inválida: {line.strip()}")
+            jobs.append(BatchJob(*(os.path.join(base, field) for field in fields)))
+    return jobs
+
+def _raise_timeout(signum, frame):
+    raise ProgramTimeout()
+
+def set_alarm(seconds: Optional[float]):
+    """
+    Agenda ProgramTimeout no processo atual após seconds (0 ou None cancela).
+    Sem SIGALRM (Windows), os programas executam sem limite de tempo.
+    """
+    if not hasattr(signal, 'setitimer'):
+        return
+    if seconds:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds or 0)
+
+def fail(result: Dict[str, Any], status: str, message: str):
+    result['status'] = status
+    result['exit_code'] = 1
+    result['error'] = message
+
+def run_job(job: BatchJob, backend: str = 'tree', optimize: bool = False,
+            timeout: Optional[float] = DEFAULT_TIMEOUT,
+            limits: Optional[RunLimits] = None,
+            output_lines: int = DEFAULT_RING_LINES) -> Dict[str, Any]:
+    """
+    Executa um programa e retorna sua linha do relatório. Só as últimas
+    output_lines linhas da saída são guardadas (buffer circular do OutputSink),
+    então um programa que escreve sem parar não esgota a memória do processo.
+    """
+    result = {
+        'program': job.program,
+        'input': job.input,
+        'status': 'ok',
+        'exit_code': 0,
+        'output': '',
+        'error': None,
+        'times': {},
+        'worker': os.getpid(),
+    }
+    times = result['times']
+    output = OutputSink('ring', 'block', ring_lines=output_lines, stream=open(os.devnull, 'w'))
+
+    start = time.perf_counter()
+    set_alarm(timeout)
+    try:
+        with open(job.program, 'r', encoding='utf-8') as file:
+            source_code = file.read()
+
+        phase = time.perf_counter()
+        tokens = Lexer(source_code).tokenize()
+        times['lex'] = time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        program = Parser(tokens).parse()
+        times['parse'] = time.perf_counter() - phase
+
+        if optimize:
+            phase = time.perf_counter()
+            program = Optimizer().optimize(program)
+            times['optimize'] = time.perf_counter() - phase
+
+        # Sem arquivo de entrada, o readln já encontra o fim da entrada e não altera as variáveis
+        input_file = open(job.input, 'r', encoding='utf-8') if job.input else io.StringIO()
+        with input_file:
+            interpreter = BACKENDS[backend](output, InputSource('batch', input_file))
+            interpreter.limits = limits
+            phase = time.perf_counter()
+            try:
+                interpreter.interpret(program)
+            finally:
+                times['execute'] = time.perf_counter() - phase
+
+    except ProgramTimeout:
+        fail(result, 'timeout', f"Tempo limite de {timeout:g} s excedido")
+    except ParseError as e:
+        fail(result, 'syntax_error', str(e))
+    except TranspileError as e:
+        fail(result, 'translation_error', str(e))
+    except LimitExceeded as e:
+        fail(result, 'limit_exceeded', f"{e} ({e.stats})")
+    except RuntimeError as e:
+        fail(result, 'runtime_error', str(e))
+    except RecursionError:
+        fail(result, 'runtime_error', f"Recursão profunda demais para o backend '{backend}'")
+    except Exception as e:
+        fail(result, 'error', f"{type(e).__name__}: {e}")
+    finally:
+        set_alarm(None)
+        times['total'] = time.perf_counter() - start
+        # As linhas escritas até o erro também ficam no buffer circular
+        output.stream.close()
+        result['output'] = ''.join(line + '\n' for line in output.get_output())
+
+    return result
+
+def run_batch(jobs: List[BatchJob], report: TextIO, workers: Optional[int] = None,
+              backend: str = 'tree', optimize: bool = False,
+              timeout: Optional[float] = DEFAULT_TIMEOUT,
+              limits: Optional[RunLimits] = None,
+              output_lines: int = DEFAULT_RING_LINES) -> Counter:
+    """
+    Executa os programas em até workers processos (padrão: um por núcleo),
+    gravando no report uma linha JSON por programa na ordem em que terminam.
+    Retorna quantos programas terminaram com cada status.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {backend}")
+    if output_lines < 1:
+        raise ValueError("O relatório precisa guardar ao menos uma linha da saída")
+
+    statuses: Counter = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job, backend, optimize, timeout, limits, output_lines): job
+                   for job in jobs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # O processo do pool morreu (ex.: falta de memória) antes de responder
+                job = futures[future]
+                result = {'program': job.program, 'input': job.input, 'status': 'error',
+                          'exit_code': 1, 'output': '', 'error': f"{type(e).__name__}: {e}",
+                          'times': {}, 'worker': None}
+
+            report.write(json.dumps(result, ensure_ascii=False) + '\n')
+            statuses[result['status']] += 1
+    return statuses
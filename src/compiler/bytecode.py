@@ -0,0 +1,446 @@
+"""
+Compilador de bytecode para o compilador Pascal.
+Converte a AST em um bytecode linear de pilha, com opcodes e operandos
+armazenados em buffers do módulo array, e fornece um disassembler.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .ast_nodes import *
+from .resolver import ScopeAnalysis, Resolver, GLOBAL
+from .runtime import default_value
+
+# Opcodes
+LOAD_CONST = 0        # empilha constants[arg]
+LOAD_NAME = 1         # empilha a variável names[arg]
+STORE_NAME = 2        # desempilha e atribui à variável names[arg]
+DEFINE_NAME = 3       # desempilha e define names[arg] no escopo atual
+LOAD_ELEMENT = 4      # desempilha índice, empilha names[arg][índice]
+STORE_ELEMENT = 5     # desempilha índice e valor, atribui names[arg][índice]
+ADD = 6
+SUB = 7
+MUL = 8
+DIVIDE = 9
+INT_DIV = 10
+MOD = 11
+EQ = 12
+NE = 13
+LT = 14
+GT = 15
+LE = 16
+GE = 17
+AND = 18
+OR = 19
+NEG = 20
+POS = 21
+NOT = 22
+JUMP = 23             # desvia para arg
+JUMP_IF_FALSE = 24    # desempilha condição, desvia para arg se falsa
+FOR_PREP = 25         # desempilha fim e início, abre escopo e empilha iterador
+FOR_ITER = 26         # empilha próximo valor ou fecha escopo e desvia para arg
+NEW_SCOPE = 27        # abre escopo filho do atual (chamadas)
+CALL = 28             # chama a rotina no endereço arg
+RETURN = 29           # retorna o topo da pilha para quem chamou
+POP = 30              # descarta o topo da pilha
+ROT_TWO = 31          # troca os dois elementos do topo
+PRINT = 32            # desempilha arg valores e escreve a linha
+READ_NAME = 33        # desempilha o tipo declarado, lê entrada para names[arg], ou marcador de EOF
+READ_ELEMENT = 34     # desempilha o tipo declarado, lê entrada para names[arg][índice], ou marcador de EOF
+JUMP_IF_EOF = 35      # desempilha marcador de EOF e desvia para arg
+RAISE = 36            # lança RuntimeError com a mensagem constants[arg]
+HALT = 37             # encerra o programa
+MAKE_ARRAY = 38       # desempilha o tipo dos elementos e empilha um array com arg elementos
+FOR_VECTOR = 39       # desempilha um kernel e seus operandos; se o laço vetorizado
+                      # executar, desempilha fim e início e desvia para arg
+TAIL_CALL = 40        # chama a rotina no endereço arg reaproveitando o registro
+                      # de ativação atual (return f(...))
+LOAD_GLOBAL = 41      # empilha a variável global names[arg], sem percorrer os escopos
+STORE_GLOBAL = 42     # desempilha e atribui à variável global names[arg]
+
+OPCODE_NAMES = [
+    'LOAD_CONST', 'LOAD_NAME', 'STORE_NAME', 'DEFINE_NAME', 'LOAD_ELEMENT', 'STORE_ELEMENT',
+    'ADD', 'SUB', 'MUL', 'DIVIDE', 'INT_DIV', 'MOD',
+    'EQ', 'NE', 'LT', 'GT', 'LE', 'GE', 'AND', 'OR',
+    'NEG', 'POS', 'NOT',
+    'JUMP', 'JUMP_IF_FALSE', 'FOR_PREP', 'FOR_ITER', 'NEW_SCOPE', 'CALL', 'RETURN',
+    'POP', 'ROT_TWO', 'PRINT', 'READ_NAME', 'READ_ELEMENT', 'JUMP_IF_EOF', 'RAISE', 'HALT',
+    'MAKE_ARRAY', 'FOR_VECTOR', 'TAIL_CALL', 'LOAD_GLOBAL', 'STORE_GLOBAL',
+]
+
+# Opcodes cujo operando é um endereço de código
+JUMP_OPCODES = {JUMP, JUMP_IF_FALSE, FOR_ITER, JUMP_IF_EOF, CALL, FOR_VECTOR, TAIL_CALL}
+# Opcodes cujo operando indexa a tabela de nomes
+NAME_OPCODES = {LOAD_NAME, STORE_NAME, DEFINE_NAME, LOAD_ELEMENT, STORE_ELEMENT,
+                READ_NAME, READ_ELEMENT, LOAD_GLOBAL, STORE_GLOBAL}
+
+BINARY_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIVIDE, 'div': INT_DIV, 'mod': MOD,
+    '=': EQ, '<>': NE, '<': LT, '>': GT, '<=': LE, '>=': GE,
+    'and': AND, 'or': OR,
+}
+
+UNARY_OPCODES = {'-': NEG, '+': POS, 'not': NOT}
+
+class CodeObject:
+    """Programa compilado: instruções lineares mais tabelas de constantes e nomes."""
+
+    def __init__(self):
+        self.opcodes = array('B')
+        self.operands = array('i')
+        self.constants: List[Any] = []
+        self.names: List[str] = []
+        # Endereço -> rótulo (programa principal e rotinas)
+        self.labels: Dict[int, str] = {}
+        # Endereços das rotinas que não leem nomes do escopo de quem chama: a VM
+        # liga o escopo delas direto ao global, e as buscas não sobem a cadeia de chamadas
+        self.static_routines: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+class BytecodeCompiler:
+    def __init__(self):
+        self.code = CodeObject()
+        self.constant_index: Dict[Tuple[type, Any], int] = {}
+        self.name_index: Dict[str, int] = {}
+        self.procedures: Dict[str, ProcedureDeclaration] = {}
+        self.functions: Dict[str, FunctionDeclaration] = {}
+        # Rotinas compiladas (id -> endereço) e chamadas a corrigir
+        self.routine_addresses: Dict[int, int] = {}
+        self.pending_routines: List[ASTNode] = []
+        self.scheduled_routines = set()
+        self.call_fixups: List[Tuple[int, ASTNode]] = []
+        self.in_routine = False
+        # Nomes ligados no escopo da rotina em compilação (parâmetros, variáveis
+        # de for e temporários), que uma chamada de cauda descarta
+        self.local_names: Set[str] = set()
+        self.analysis: Optional[ScopeAnalysis] = None
+
+    def compile(self, program: Program) -> CodeObject:
+        # Assim como no ambiente global, a última declaração com o nome prevalece
+        for decl in program.declarations:
+            if isinstance(decl, ProcedureDeclaration):
+                self.procedures[decl.name] = decl
+            elif isinstance(decl, FunctionDeclaration):
+                self.functions[decl.name] = decl
+
+        # O resolver grava os tipos declarados dos alvos do readln
+        resolver = Resolver()
+        resolver.resolve(program)
+        self.analysis = resolver.analysis
+        self.code.labels[0] = f"programa {program.name}"
+
+        # Variáveis globais são criadas no início do programa principal
+        for decl in program.declarations:
+            if isinstance(decl, VariableDeclaration):
+                if decl.value:
+                    self.compile_expression(decl.value)
+                else:
+                    self.emit(LOAD_CONST, self.constant(default_value(decl.var_type)))
+                self.emit(DEFINE_NAME, self.name(decl.name))
+            elif isinstance(decl, ArrayDeclaration):
+                self.emit(LOAD_CONST, self.constant(decl.element_type))
+                self.emit(MAKE_ARRAY, decl.size)
+                self.emit(DEFINE_NAME, self.name(decl.name))
+
+        self.compile_statement(program.body)
+        self.emit(HALT)
+
+        self.in_routine = True
+        while self.pending_routines:
+            self.compile_routine(self.pending_routines.pop())
+
+        for position, routine in self.call_fixups:
+            self.code.operands[position] = self.routine_addresses[id(routine)]
+
+        return self.code
+
+    # Emissão de instruções
+    def emit(self, opcode: int, operand: int = 0) -> int:
+        self.code.opcodes.append(opcode)
+        self.code.operands.append(operand)
+        return len(self.code.opcodes) - 1
+
+    def emit_jump(self, opcode: int) -> int:
+        return self.emit(opcode, -1)
+
+    def patch_jump(self, position: int):
+        self.code.operands[position] = len(self.code.opcodes)
+
+    def constant(self, value: Any) -> int:
+        key = (type(value), value)
+        if isinstance(value, float):
+            # 0.0 e -0.0 são iguais, mas são impressos de forma diferente
+            key = (float, value, math.copysign(1.0, value))
+        elif isinstance(value, tuple):
+            # Kernels vetorizados: dentro da tupla, 1, 1.0 e true seriam iguais
+            key = (tuple, id(value))
+        index = self.constant_index.get(key)
+        if index is None:
+            index = self.constant_index[key] = len(self.code.constants)
+            self.code.constants.append(value)
+        return index
+
+    def name(self, name: str) -> int:
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index[name] = len(self.code.names)
+            self.code.names.append(name)
+        return index
+
+    def emit_raise(self, message: str):
+        self.emit(RAISE, self.constant(message))
+
+    # Rotinas
+    def compile_routine(self, routine: ASTNode):
+        address = len(self.code.opcodes)
+        self.routine_addresses[id(routine)] = address
+        kind = 'function' if isinstance(routine, FunctionDeclaration) else 'procedure'
+        self.code.labels[address] = f"{kind} {routine.name}"
+        if not self.analysis.reachable_free_names(routine) & self.analysis.shadowable[id(routine)]:
+            self.code.static_routines.add(address)
+
+        self.local_names = {param.name for param in routine.parameters}
+        pending = [routine.body]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, ForStatement):
+                self.local_names.add(node.variable)
+            if isinstance(node, (ForStatement, WhileStatement)):
+                self.local_names.update(invariant.name for invariant in node.invariants)
+            pending.extend(iter_child_nodes(node))
+
+        self.compile_statement(routine.body)
+
+        # Se chegou ao fim sem return, retornar valor padrão
+        if isinstance(routine, FunctionDeclaration):
+            self.emit(LOAD_CONST, self.constant(default_value(routine.return_type)))
+        else:
+            self.emit(LOAD_CONST, self.constant(None))
+        self.emit(RETURN)
+
+    def is_tail_call(self, expression: Optional[Expression]) -> bool:
+        """
+        Verifica se return <expression> pode reaproveitar o registro de ativação.
+        Com escopo dinâmico, a rotina chamada (ou as que ela chama) poderia ler
+        um nome ligado na rotina atual; nesse caso a chamada continua normal.
+        """
+        if not self.in_routine or not isinstance(expression, FunctionCall):
+            return False
+        function = self.analysis.callee(expression)
+        if function is None:
+            return False
+        return not self.analysis.reachable_free_names(function) & self.local_names
+
+    def compile_call(self, name: str, routine: Optional[ASTNode], arguments: List[Expression],
+                     undefined_message: str, tail: bool = False):
+        if routine is None:
+            self.emit_raise(undefined_message)
+            return
+
+        if len(arguments) != len(routine.parameters):
+            self.emit_raise(f"Número incorreto de argumentos para {name}")
+            return
+
+        # Argumentos são avaliados já no novo escopo, como no tree-walker
+        self.emit(NEW_SCOPE)
+        for param, argument in zip(routine.parameters, arguments):
+            self.compile_expression(argument)
+            self.emit(DEFINE_NAME, self.name(param.name))
+
+        if id(routine) not in self.scheduled_routines:
+            self.scheduled_routines.add(id(routine))
+            self.pending_routines.append(routine)
+        self.call_fixups.append((self.emit(TAIL_CALL if tail else CALL, -1), routine))
+
+    # Comandos
+    def compile_statement(self, statement: Optional[Statement]):
+        if isinstance(statement, Block):
+            for stmt in statement.statements:
+                self.compile_statement(stmt)
+
+        elif isinstance(statement, Assignment):
+            self.compile_expression(statement.value)
+            target = statement.target
+
+            if isinstance(target, Variable):
+                self.emit_store(target)
+            elif isinstance(target, ArrayAccess):
+                self.compile_expression(target.index)
+                self.emit(STORE_ELEMENT, self.name(target.array.name))
+            else:
+                self.emit(POP)
+
+        elif isinstance(statement, IfStatement):
+            self.compile_expression(statement.condition)
+            else_jump = self.emit_jump(JUMP_IF_FALSE)
+            self.compile_statement(statement.then_stmt)
+
+            if statement.else_stmt:
+                end_jump = self.emit_jump(JUMP)
+                self.patch_jump(else_jump)
+                self.compile_statement(statement.else_stmt)
+                self.patch_jump(end_jump)
+            else:
+                self.patch_jump(else_jump)
+
+        elif isinstance(statement, WhileStatement):
+            self.compile_invariants(statement)
+            loop_start = len(self.code.opcodes)
+            self.compile_expression(statement.condition)
+            exit_jump = self.emit_jump(JUMP_IF_FALSE)
+            self.compile_statement(statement.body)
+            self.emit(JUMP, loop_start)
+            self.patch_jump(exit_jump)
+
+        elif isinstance(statement, ForStatement):
+            self.compile_invariants(statement)
+            self.compile_expression(statement.start)
+            self.compile_expression(statement.end)
+            vector_jump = None
+            if statement.vector is not None:
+                for operand in statement.vector.operands:
+                    self.compile_expression(operand)
+                self.emit(LOAD_CONST, self.constant(statement.vector.kernel))
+                vector_jump = self.emit_jump(FOR_VECTOR)
+            self.emit(FOR_PREP)
+            loop_start = self.emit_jump(FOR_ITER)
+            self.emit(DEFINE_NAME, self.name(statement.variable))
+            self.compile_statement(statement.body)
+            self.emit(JUMP, loop_start)
+            self.patch_jump(loop_start)
+            if vector_jump is not None:
+                self.patch_jump(vector_jump)
+
+        elif isinstance(statement, ProcedureCall):
+            procedure = self.procedures.get(statement.name)
+            self.compile_call(statement.name, procedure, statement.arguments,
+                              f"Procedimento não definido: {statement.name}")
+            if procedure is not None and len(statement.arguments) == len(procedure.parameters):
+                self.emit(POP)
+
+        elif isinstance(statement, ReadlnStatement):
+            eof_jumps = []
+            for target, declared in zip(statement.targets, statement.types):
+                if isinstance(target, Variable):
+                    name = self.name(target.name)
+                    self.emit(LOAD_CONST, self.constant(declared))
+                    self.emit(READ_NAME, name)
+                    eof_jumps.append(self.emit_jump(JUMP_IF_EOF))
+                    self.emit_store(target)
+                elif isinstance(target, ArrayAccess):
+                    name = self.name(target.array.name)
+                    self.compile_expression(target.index)
+                    self.emit(LOAD_CONST, self.constant(declared))
+                    self.emit(READ_ELEMENT, name)
+                    eof_jumps.append(self.emit_jump(JUMP_IF_EOF))
+                    self.emit(ROT_TWO)
+                    self.emit(STORE_ELEMENT, name)
+            for jump in eof_jumps:
+                self.patch_jump(jump)
+
+        elif isinstance(statement, WritelnStatement):
+            for expr in statement.expressions:
+                self.compile_expression(expr)
+            self.emit(PRINT, len(statement.expressions))
+
+        elif isinstance(statement, ReturnStatement):
+            value = statement.value
+            if self.is_tail_call(value):
+                # A rotina chamada retorna direto para quem chamou a rotina atual
+                self.compile_call(value.name, self.functions[value.name], value.arguments,
+                                  f"Função não definida: {value.name}", tail=True)
+                return
+
+            if value:
+                self.compile_expression(value)
+            else:
+                self.emit(LOAD_CONST, self.constant(None))
+
+            # Return no programa principal encerra a execução
+            self.emit(RETURN if self.in_routine else HALT)
+
+    def emit_store(self, target: Variable):
+        opcode = STORE_GLOBAL if target.depth == GLOBAL else STORE_NAME
+        self.emit(opcode, self.name(target.name))
+
+    def compile_invariants(self, loop: ASTNode):
+        # Temporários do otimizador são definidos no escopo atual, antes do laço
+        for invariant in loop.invariants:
+            self.compile_expression(invariant.value)
+            self.emit(DEFINE_NAME, self.name(invariant.name))
+
+    # Expressões
+    def compile_expression(self, expression: Expression):
+        if isinstance(expression, (NumberLiteral, StringLiteral, BooleanLiteral)):
+            self.emit(LOAD_CONST, self.constant(expression.value))
+
+        elif isinstance(expression, Variable):
+            # Globais resolvidas estaticamente não dependem da cadeia de chamadas
+            opcode = LOAD_GLOBAL if expression.depth == GLOBAL else LOAD_NAME
+            self.emit(opcode, self.name(expression.name))
+
+        elif isinstance(expression, ArrayAccess):
+            self.compile_expression(expression.index)
+            self.emit(LOAD_ELEMENT, self.name(expression.array.name))
+
+        elif isinstance(expression, BinaryOperation):
+            self.compile_expression(expression.left)
+            self.compile_expression(expression.right)
+
+            opcode = BINARY_OPCODES.get(expression.operator)
+            if opcode is None:
+                self.emit(POP)
+                self.emit(POP)
+                self.emit_raise(f"Operador binário não suportado: {expression.operator}")
+            else:
+                self.emit(opcode)
+
+        elif isinstance(expression, UnaryOperation):
+            self.compile_expression(expression.operand)
+
+            opcode = UNARY_OPCODES.get(expression.operator)
+            if opcode is None:
+                self.emit(POP)
+                self.emit_raise(f"Operador unário não suportado: {expression.operator}")
+            else:
+                self.emit(opcode)
+
+        elif isinstance(expression, FunctionCall):
+            function = self.functions.get(expression.name)
+            self.compile_call(expression.name, function, expression.arguments,
+                              f"Função não definida: {expression.name}")
+
+        else:
+            self.emit_raise(f"Tipo de expressão não suportado: {type(expression)}")
+
+def disassemble(code: CodeObject) -> str:
+    """Gera uma listagem legível do bytecode, com rótulos e operandos resolvidos."""
+    lines = []
+
+    for address in range(len(code.opcodes)):
+        if address in code.labels:
+            if lines:
+                lines.append('')
+            lines.append(f"{code.labels[address]}:")
+
+        opcode = code.opcodes[address]
+        operand = code.operands[address]
+        name = OPCODE_NAMES[opcode]
+
+        if opcode in JUMP_OPCODES:
+            label = code.labels.get(operand)
+            detail = f"{operand} ({label})" if label else f"{operand} (-> {operand})"
+        elif opcode in NAME_OPCODES:
+            detail = f"{operand} ({code.names[operand]})"
+        elif opcode in (LOAD_CONST, RAISE):
+            detail = f"{operand} ({code.constants[operand]!r})"
+        elif opcode in (PRINT, MAKE_ARRAY):
+            detail = str(operand)
+        else:
+            detail = ''
+
+        lines.append(f"  {address:>5}  {name:<14} {detail}".rstrip())
+
+    return '\n'.join(lines)
@@ -0,0 +1,157 @@
+"""
+Cache em disco de programas compilados para o compilador Pascal.
+Guarda a AST pronta para execução, serializada com pickle, em arquivos
+nomeados pelo hash do código fonte e da versão do interpretador, para que
+execuções repetidas do mesmo arquivo pulem as análises léxica e sintática.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import List, Optional, Tuple
+from .ast_nodes import Program
+
+# Tamanho máximo padrão do diretório de cache (bytes)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Módulos cujo código define o formato da AST em cache
+FRONTEND_MODULES = ('ast_nodes.py', 'lexer.py', 'parser.py', 'cache.py')
+
+_version: Optional[str] = None
+
+def interpreter_version() -> str:
+    """
+    Versão do interpretador usada na chave do cache: o número de versão do
+    pacote mais o hash dos módulos do front-end, de modo que qualquer mudança
+    no lexer, no parser ou nos nós da AST invalida as entradas antigas.
+    """
+    global _version
+    if _version is None:
+        from . import __version__
+        digest = hashlib.sha256(__version__.encode())
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in FRONTEND_MODULES:
+            with open(os.path.join(directory, name), 'rb') as file:
+                digest.update(file.read())
+        _version = f"{__version__}-{digest.hexdigest()[:16]}"
+    return _version
+
+def default_cache_dir() -> str:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'interpretador-pascal')
+
+class ProgramCache:
+    """
+    Diretório de programas compilados.
+    Escritas são atômicas (arquivo temporário + os.replace) e o diretório é
+    mantido abaixo de max_bytes removendo as entradas usadas há mais tempo
+    (a data de modificação é atualizada a cada acerto).
+    Falhas de E/S nunca interrompem a execução: o cache apenas deixa de ajudar.
+    """
+
+    SUFFIX = '.ast'
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 version: Optional[str] = None):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.version = version or interpreter_version()
+
+    def key(self, source: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.version.encode())
+        digest.update(b'\0')
+        digest.update(source.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def path(self, source: str) -> str:
+        return os.path.join(self.directory, self.key(source) + self.SUFFIX)
+
+    def load(self, source: str) -> Optional[Program]:
+        """Retorna a AST em cache para o código, ou None se não houver."""
+        path = self.path(source)
+        try:
+            with open(path, 'rb') as file:
+                program = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Entrada corrompida ou incompatível: descartar
+            self.remove(path)
+            return None
+
+        if not isinstance(program, Program):
+            self.remove(path)
+            return None
+
+        try:
+            # Marca a entrada como usada recentemente (LRU)
+            os.utime(path)
+        except OSError:
+            pass
+        return program
+
+    def store(self, source: str, program: Program) -> bool:
+        """Grava a AST do código no cache. Retorna True se a entrada foi gravada."""
+        try:
+            data = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError, TypeError):
+            return False
+
+        temporary = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, self.path(source))
+        except OSError:
+            if temporary is not None:
+                self.remove(temporary)
+            return False
+
+        self.evict()
+        return True
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """Entradas do cache como (data de modificação, tamanho, caminho)."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+
+        for name in names:
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até caber em max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self.remove(path)
+
+    def remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,544 @@
+"""
+Compilador de closures para o compilador Pascal.
+Converte a AST, uma única vez, em uma árvore de funções Python pré-ligadas
+(uma por nó), eliminando o despacho por isinstance durante a execução.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from .ast_nodes import *
+from .interpreter import Interpreter, Frame, Completion, RETURN
+from .resolver import GLOBAL
+from .runtime import (
+    RuntimeError, BINARY_OPERATORS, UNARY_OPERATORS,
+    default_value, is_truthy, load_element, store_element,
+)
+from .vectorizer import run_vectorized
+
+# Closures de comandos devolvem None ou um Completion (ver Interpreter.execute_statement)
+StatementCode = Callable[[], Optional[Completion]]
+ExpressionCode = Callable[[], Any]
+
+# Operadores cujo resultado já é sempre um bool, dispensando is_truthy
+BOOLEAN_OPERATORS = {'=', '<>', '<', '>', '<=', '>=', 'and', 'or', 'not'}
+
+def _noop():
+    pass
+
+# Fábricas especializadas para os operadores mais frequentes
+def _add(left, right): return lambda: left() + right()
+def _sub(left, right): return lambda: left() - right()
+def _mul(left, right): return lambda: left() * right()
+def _eq(left, right): return lambda: left() == right()
+def _ne(left, right): return lambda: left() != right()
+def _lt(left, right): return lambda: left() < right()
+def _gt(left, right): return lambda: left() > right()
+def _le(left, right): return lambda: left() <= right()
+def _ge(left, right): return lambda: left() >= right()
+
+BINARY_FACTORIES = {
+    '+': _add, '-': _sub, '*': _mul,
+    '=': _eq, '<>': _ne, '<': _lt, '>': _gt, '<=': _le, '>=': _ge,
+}
+
+class ClosureCompiler:
+    """Gera closures para os nós da AST de um programa já declarado."""
+
+    def __init__(self, interpreter: Interpreter):
+        self.interpreter = interpreter
+        # Corpos de rotinas compilados sob demanda (célula permite recursão)
+        self.routine_bodies: Dict[int, List[StatementCode]] = {}
+
+        self.statement_compilers = {
+            Block: self.compile_block,
+            Assignment: self.compile_assignment,
+            IfStatement: self.compile_if,
+            WhileStatement: self.compile_while,
+            ForStatement: self.compile_for,
+            ProcedureCall: self.compile_procedure_call,
+            ReadlnStatement: self.compile_readln,
+            WritelnStatement: self.compile_writeln,
+            ReturnStatement: self.compile_return,
+        }
+        self.expression_compilers = {
+            NumberLiteral: self.compile_literal,
+            StringLiteral: self.compile_literal,
+            BooleanLiteral: self.compile_literal,
+            Variable: self.compile_variable,
+            ArrayAccess: self.compile_array_access,
+            BinaryOperation: self.compile_binary,
+            UnaryOperation: self.compile_unary,
+            FunctionCall: self.compile_function_call,
+        }
+
+    # Comandos
+    def compile_statement(self, statement: Statement) -> StatementCode:
+        compiler = self.statement_compilers.get(type(statement))
+        if compiler is None:
+            return _noop
+        return compiler(statement)
+
+    def may_return(self, statement: Optional[Statement]) -> bool:
+        """Verifica se o comando contém um return, que interrompe os comandos seguintes."""
+        pending = [statement]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, ReturnStatement):
+                return True
+            if isinstance(node, Statement):
+                pending.extend(iter_child_nodes(node))
+        return False
+
+    def compile_block(self, statement: Block) -> StatementCode:
+        codes = [self.compile_statement(stmt) for stmt in statement.statements]
+        if not codes:
+            return _noop
+        if len(codes) == 1:
+            return codes[0]
+
+        if not self.may_return(statement):
+            def block():
+                for code in codes:
+                    code()
+            return block
+
+        def block_with_return():
+            for code in codes:
+                completion = code()
+                if completion is not None:
+                    return completion
+        return block_with_return
+
+    def compile_assignment(self, statement: Assignment) -> StatementCode:
+        value_code = self.compile_expression(statement.value)
+        interpreter = self.interpreter
+        target = statement.target
+
+        if isinstance(target, Variable):
+            return self.compile_store(target, value_code)
+
+        elif isinstance(target, ArrayAccess):
+            array_name = target.array.name
+            index_code = self.compile_expression(target.index)
+            array_code = self.compile_variable(target.array)
+
+            def assign_element():
+                value = value_code()
+                index = index_code()
+                store_element(array_code(), array_name, index, value)
+            return assign_element
+
+        def evaluate():
+            value_code()
+        return evaluate
+
+    def compile_if(self, statement: IfStatement) -> StatementCode:
+        condition = self.compile_condition(statement.condition)
+        then_code = self.compile_statement(statement.then_stmt)
+        else_code = self.compile_statement(statement.else_stmt)
+
+        def if_statement():
+            if condition():
+                return then_code()
+            return else_code()
+        return if_statement
+
+    def compile_while(self, statement: WhileStatement) -> StatementCode:
+        condition = self.compile_condition(statement.condition)
+        body = self.count_steps(self.compile_statement(statement.body))
+
+        if not self.may_return(statement.body):
+            def while_statement():
+                while condition():
+                    body()
+            return self.with_invariants(statement, while_statement)
+
+        def while_with_return():
+            while condition():
+                completion = body()
+                if completion is not None:
+                    return completion
+        return self.with_invariants(statement, while_with_return)
+
+    def compile_for(self, statement: ForStatement) -> StatementCode:
+        start_code = self.compile_expression(statement.start)
+        end_code = self.compile_expression(statement.end)
+        body = self.count_steps(self.compile_statement(statement.body))
+        slot = statement.slot
+        interpreter = self.interpreter
+        may_return = self.may_return(statement.body)
+
+        budget = interpreter.budget
+        vector = statement.vector
+        if vector is not None:
+            kernel = vector.kernel
+            operand_codes = [self.compile_expression(operand) for operand in vector.operands]
+
+        def for_statement():
+            start_value = start_code()
+            end_value = end_code()
+
+            if not isinstance(start_value, int) or not isinstance(end_value, int):
+                raise RuntimeError("Valores do loop FOR devem ser inteiros")
+
+            if vector is not None and run_vectorized(kernel, start_value, end_value,
+                                                     [code() for code in operand_codes]):
+                # As voltas executadas de uma vez contam como no laço normal
+                if budget is not None:
+                    budget.charge(end_value - start_value + 1)
+                return
+
+            # Variável de controle vive em um slot próprio do frame atual
+            values = interpreter.frame.values
+            if not may_return:
+                for i in range(start_value, end_value + 1):
+                    values[slot] = i
+                    body()
+                return
+
+            for i in range(start_value, end_value + 1):
+                values[slot] = i
+                completion = body()
+                if completion is not None:
+                    return completion
+        return self.with_invariants(statement, for_statement)
+
+    def count_steps(self, code: StatementCode) -> StatementCode:
+        """
+        Conta um passo do orçamento antes de cada execução de code (corpos de
+        laços e de rotinas). Sem limites o código gerado não muda.
+        """
+        budget = self.interpreter.budget
+        if budget is None:
+            return code
+
+        refuel = budget.refuel
+
+        def counted():
+            # StepBudget.step, expandido
+            budget.fuel -= 1
+            if budget.fuel <= 0:
+                refuel()
+            return code()
+        return counted
+
+    def with_invariants(self, loop: ASTNode, loop_code: StatementCode) -> StatementCode:
+        """Avalia os temporários do otimizador antes de executar o laço."""
+        if not loop.invariants:
+            return loop_code
+
+        invariants = [(invariant.slot, self.compile_expression(invariant.value))
+                      for invariant in loop.invariants]
+        interpreter = self.interpreter
+
+        def hoisted_loop():
+            values = interpreter.frame.values
+            for slot, code in invariants:
+                values[slot] = code()
+            return loop_code()
+        return hoisted_loop
+
+    def compile_procedure_call(self, statement: ProcedureCall) -> StatementCode:
+        name = statement.name
+        procedure = self.interpreter.procedures.get(name)
+
+        if procedure is None:
+            def undefined_procedure():
+                raise RuntimeError(f"Procedimento não definido: {name}")
+            return undefined_procedure
+
+        if len(statement.arguments) != len(procedure.parameters):
+            def wrong_arity():
+                raise RuntimeError(f"Número incorreto de argumentos para {name}")
+            return wrong_arity
+
+        bindings = self.compile_bindings(statement.arguments)
+        body = self.compile_routine_body(procedure)
+        scope = statement.scope
+        interpreter = self.interpreter
+        size = procedure.frame_size
+        pool = interpreter.frame_pools[size]
+        free, empty = pool.free, pool.empty
+
+        def call_procedure():
+            # FramePool.acquire, expandido no ponto de chamada
+            caller = interpreter.frame
+            if free:
+                frame = free.pop()
+                frame.caller = caller
+                frame.scope = scope
+            else:
+                frame = Frame(size, caller, scope)
+            interpreter.frame = frame
+
+            try:
+                # Argumentos são avaliados já no novo frame, como no tree-walker
+                values = frame.values
+                for slot, argument in bindings:
+                    values[slot] = argument()
+
+                # O valor de um return em procedimento é ignorado
+                body[0]()
+
+            finally:
+                # FramePool.release, expandido no ponto de chamada
+                interpreter.frame = caller
+                frame.values[:] = empty
+                frame.caller = frame.scope = None
+                free.append(frame)
+        return call_procedure
+
+    def compile_readln(self, statement: ReadlnStatement) -> StatementCode:
+        readers = [self.compile_read_target(target, declared)
+                   for target, declared in zip(statement.targets, statement.types)]
+
+        def readln():
+            for read in readers:
+                try:
+                    read()
+                except EOFError:
+                    break
+        return readln
+
+    def compile_read_target(self, target: Expression, declared: Optional[str]) -> StatementCode:
+        source = self.interpreter.input
+
+        if isinstance(target, Variable):
+            name = target.name
+            load_code = self.compile_variable(target)
+            return self.compile_store(target, lambda: source.read(name, load_code(), declared))
+
+        elif isinstance(target, ArrayAccess):
+            array_name = target.array.name
+            index_code = self.compile_expression(target.index)
+            array_code = self.compile_variable(target.array)
+
+            def read_element():
+                index = index_code()
+                array = array_code()
+                value = source.read_element(array_name, array, index, declared)
+                store_element(array, array_name, index, value)
+            return read_element
+
+        return _noop
+
+    def compile_writeln(self, statement: WritelnStatement) -> StatementCode:
+        write = self.interpreter.output.write
+        codes = [self.compile_expression(expr) for expr in statement.expressions]
+
+        if not codes:
+            def writeln_empty():
+                write('')
+            return writeln_empty
+
+        def writeln():
+            write(''.join([str(code()) for code in codes]))
+        return writeln
+
+    def compile_return(self, statement: ReturnStatement) -> StatementCode:
+        if not statement.value:
+            completion = Completion(RETURN)
+            return lambda: completion
+
+        value_code = self.compile_expression(statement.value)
+
+        def return_value():
+            return Completion(RETURN, value_code())
+        return return_value
+
+    # Expressões
+    def compile_expression(self, expression: Expression) -> ExpressionCode:
+        compiler = self.expression_compilers.get(type(expression))
+        if compiler is None:
+            def unsupported():
+                raise RuntimeError(f"Tipo de expressão não suportado: {type(expression)}")
+            return unsupported
+        return compiler(expression)
+
+    def compile_condition(self, expression: Expression) -> ExpressionCode:
+        """Compila uma expressão usada como condição, já convertida para bool."""
+        code = self.compile_expression(expression)
+
+        if isinstance(expression, BooleanLiteral):
+            return code
+        if isinstance(expression, (BinaryOperation, UnaryOperation)) and expression.operator in BOOLEAN_OPERATORS:
+            return code
+        return lambda: is_truthy(code())
+
+    def compile_literal(self, expression: Expression) -> ExpressionCode:
+        value = expression.value
+        return lambda: value
+
+    def compile_variable(self, expression: Variable) -> ExpressionCode:
+        interpreter = self.interpreter
+        depth = expression.depth
+        slot = expression.slot
+
+        if depth == 0:
+            return lambda: interpreter.frame.values[slot]
+        if depth == GLOBAL:
+            values = interpreter.global_frame.values
+            return lambda: values[slot]
+
+        def variable():
+            values, slot = interpreter.locate(expression)
+            return values[slot]
+        return variable
+
+    def compile_store(self, target: Variable, value_code: ExpressionCode) -> StatementCode:
+        interpreter = self.interpreter
+        depth = target.depth
+        slot = target.slot
+
+        if depth == 0:
+            def store_local():
+                interpreter.frame.values[slot] = value_code()
+            return store_local
+        if depth == GLOBAL:
+            values = interpreter.global_frame.values
+
+            def store_global():
+                values[slot] = value_code()
+            return store_global
+
+        def store():
+            value = value_code()
+            values, slot = interpreter.locate(target)
+            values[slot] = value
+        return store
+
+    def compile_array_access(self, expression: ArrayAccess) -> ExpressionCode:
+        array_name = expression.array.name
+        index_code = self.compile_expression(expression.index)
+        array_code = self.compile_variable(expression.array)
+
+        def array_access():
+            index = index_code()
+            return load_element(array_code(), array_name, index)
+        return array_access
+
+    def compile_binary(self, expression: BinaryOperation) -> ExpressionCode:
+        left = self.compile_expression(expression.left)
+        right = self.compile_expression(expression.right)
+        operator = expression.operator
+
+        factory = BINARY_FACTORIES.get(operator)
+        if factory is not None:
+            return factory(left, right)
+
+        operation = BINARY_OPERATORS.get(operator)
+        if operation is None:
+            def unsupported():
+                left()
+                right()
+                raise RuntimeError(f"Operador binário não suportado: {operator}")
+            return unsupported
+
+        return lambda: operation(left(), right())
+
+    def compile_unary(self, expression: UnaryOperation) -> ExpressionCode:
+        operand = self.compile_expression(expression.operand)
+        operator = expression.operator
+
+        if operator == '-':
+            return lambda: -operand()
+        elif operator == 'not':
+            return lambda: not is_truthy(operand())
+
+        operation = UNARY_OPERATORS.get(operator)
+        if operation is None:
+            def unsupported():
+                operand()
+                raise RuntimeError(f"Operador unário não suportado: {operator}")
+            return unsupported
+
+        return lambda: operation(operand())
+
+    def compile_function_call(self, expression: FunctionCall) -> ExpressionCode:
+        name = expression.name
+        function = self.interpreter.functions.get(name)
+
+        if function is None:
+            def undefined_function():
+                raise RuntimeError(f"Função não definida: {name}")
+            return undefined_function
+
+        if len(expression.arguments) != len(function.parameters):
+            def wrong_arity():
+                raise RuntimeError(f"Número incorreto de argumentos para {name}")
+            return wrong_arity
+
+        bindings = self.compile_bindings(expression.arguments)
+        body = self.compile_routine_body(function)
+        result = default_value(function.return_type)
+        scope = expression.scope
+        interpreter = self.interpreter
+        size = function.frame_size
+        pool = interpreter.frame_pools[size]
+        free, empty = pool.free, pool.empty
+
+        def call_function():
+            # FramePool.acquire, expandido no ponto de chamada
+            caller = interpreter.frame
+            if free:
+                frame = free.pop()
+                frame.caller = caller
+                frame.scope = scope
+            else:
+                frame = Frame(size, caller, scope)
+            interpreter.frame = frame
+
+            try:
+                values = frame.values
+                for slot, argument in bindings:
+                    values[slot] = argument()
+
+                completion = body[0]()
+                if completion is not None:
+                    return completion.value
+
+                # Se chegou aqui sem return, retornar valor padrão
+                return result
+
+            finally:
+                # FramePool.release, expandido no ponto de chamada
+                interpreter.frame = caller
+                frame.values[:] = empty
+                frame.caller = frame.scope = None
+                free.append(frame)
+        return call_function
+
+    # Rotinas
+    def compile_bindings(self, arguments: List[Expression]):
+        # Parâmetro i ocupa o slot i do frame da rotina
+        return [(slot, self.compile_expression(argument))
+                for slot, argument in enumerate(arguments)]
+
+    def compile_routine_body(self, routine: ASTNode) -> List[StatementCode]:
+        key = id(routine)
+        cell = self.routine_bodies.get(key)
+        if cell is None:
+            cell = self.routine_bodies[key] = [_noop]
+            cell[0] = self.count_steps(self.compile_statement(routine.body))
+        return cell
+
+class ClosureInterpreter(Interpreter):
+    """
+    Backend que executa o programa compilado em closures.
+    Produz a mesma saída do tree-walker, sem despachar por tipo a cada nó.
+    """
+    compiler_class = ClosureCompiler
+
+    def interpret(self, program: Program):
+        self.prepare(program)
+
+        try:
+            for decl in program.declarations:
+                self.execute_declaration(decl)
+
+            # Rotinas já declaradas podem ser ligadas em tempo de compilação
+            body = self.compiler_class(self).compile_statement(program.body)
+            # Return no programa principal apenas encerra a execução
+            body()
+
+        finally:
+            self.output.flush()
@@ -0,0 +1,148 @@
+"""
+Entrada dos programas Pascal (readln) para o compilador Pascal.
+Os backends leem cada alvo do readln de um InputSource: no modo 'prompt'
+cada valor vem de uma linha digitada após um prompt, e no modo 'batch' os
+valores vêm de um stream lido em blocos e separado em palavras, sem prompts.
+"""
+
+import sys
+from typing import Any, List, Optional, TextIO
+from .runtime import RuntimeError, PascalArray, parse_input
+from .output import OutputSink
+
+# Modos de entrada: 'prompt' pede cada valor com input(); 'batch' lê palavras
+# de um arquivo ou da entrada padrão, separadas por espaços ou quebras de linha
+INPUT_MODES = ('prompt', 'batch')
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+def parse_boolean(token: str) -> bool:
+    value = token.lower()
+    if value == 'true':
+        return True
+    if value == 'false':
+        return False
+    raise ValueError(token)
+
+# Tipo dos valores de cada tipo declarado em Pascal
+DECLARED_TYPES = {
+    'integer': int,
+    'real': float,
+    'boolean': bool,
+    'string': str,
+}
+
+# Conversão de uma palavra lida no modo batch, pelo tipo do alvo
+CONVERTERS = {
+    int: int,
+    float: float,
+    bool: parse_boolean,
+    str: str,
+}
+
+TYPE_NAMES = {
+    int: 'integer',
+    float: 'real',
+    bool: 'boolean',
+    str: 'string',
+}
+
+class InputSource:
+    """
+    Origem dos valores do readln. No modo batch, o valor lido é convertido
+    pelo tipo declarado do alvo (ReadlnStatement.types, gravado pelo
+    resolver), que não muda com as atribuições: uma variável integer que
+    recebeu 10/2 continua lendo inteiros. Alvos sem tipo declarado (nomes
+    resolvidos pela cadeia de chamadas) usam o tipo do valor atual, e os
+    sem valor de tipo conhecido, a mesma conversão do modo prompt.
+    """
+
+    def __init__(self, mode: str = 'prompt', stream: Optional[TextIO] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if mode not in INPUT_MODES:
+            raise ValueError(f"Modo de entrada desconhecido: {mode}")
+
+        self.mode = mode
+        # None lê do sys.stdin do momento da leitura
+        self.stream = stream
+        self.chunk_size = chunk_size
+        # Saída do programa, descarregada antes de cada espera por entrada
+        # (para o prompt aparecer depois da saída anterior); ligada pelo backend
+        self.output: Optional[OutputSink] = None
+
+        # Palavras já lidas do stream e ainda não consumidas
+        self.tokens: List[str] = []
+        self.position = 0
+        # Palavra possivelmente incompleta no fim do último bloco
+        self.partial = ''
+        self.exhausted = False
+
+    def read(self, name: str, current: Any = None, declared: Optional[str] = None) -> Any:
+        """Lê o valor de uma variável; current é o valor que ela guarda e declared, seu tipo."""
+        if self.mode == 'prompt':
+            return self.prompt(name)
+        kind = DECLARED_TYPES.get(declared) if declared is not None else type(current)
+        return self.convert(self.next_token(), kind)
+
+    def read_element(self, name: str, array: Any, index: Any, declared: Optional[str] = None) -> Any:
+        """Lê o valor de array[index], sem verificar o acesso (feito ao guardar)."""
+        if self.mode == 'prompt':
+            return self.prompt(f"{name}[{index}]")
+
+        kind = None
+        if isinstance(array, PascalArray):
+            kind = array.element
+            if kind is None:
+                if declared is not None:
+                    kind = DECLARED_TYPES.get(declared)
+                elif isinstance(index, int) and 0 <= index < len(array.items):
+                    kind = type(array.items[index])
+        return self.convert(self.next_token(), kind)
+
+    def prompt(self, label: str) -> Any:
+        if self.output is not None:
+            self.output.flush()
+        return parse_input(input(f"Digite o valor para {label}: "))
+
+    def convert(self, token: str, kind: Optional[type]) -> Any:
+        converter = CONVERTERS.get(kind)
+        if converter is None:
+            return parse_input(token)
+        try:
+            return converter(token)
+        except ValueError:
+            raise RuntimeError(f"Valor inválido para {TYPE_NAMES[kind]}: {token}")
+
+    def next_token(self) -> str:
+        """Próxima palavra da entrada; EOFError quando ela acaba."""
+        position = self.position
+        if position == len(self.tokens):
+            self.fill()
+            position = 0
+        self.position = position + 1
+        return self.tokens[position]
+
+    def fill(self):
+        """Lê blocos do stream até obter ao menos uma palavra completa."""
+        if self.output is not None:
+            self.output.flush()
+        stream = self.stream if self.stream is not None else sys.stdin
+
+        tokens: List[str] = []
+        while not tokens:
+            if self.exhausted:
+                raise EOFError
+            chunk = stream.read(self.chunk_size)
+            data = self.partial + chunk
+            tokens = data.split()
+            if not chunk:
+                self.exhausted = True
+                self.partial = ''
+            elif tokens and not data[-1].isspace():
+                # A última palavra pode continuar no próximo bloco
+                self.partial = tokens.pop()
+            else:
+                self.partial = ''
+
+        self.tokens = tokens
+        self.position = 0
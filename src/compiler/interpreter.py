@@ -3,233 +3,274 @@ Interpretador para o compilador Pascal.
 Responsável por executar o código Pascal a partir da AST.
 """
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from .ast_nodes import *
+from .resolver import Resolver, GLOBAL, DYNAMIC
+from .runtime import RuntimeError, PascalArray, default_value
+from .output import OutputSink
+from .input import InputSource
+from .vectorizer import run_vectorized
+from .limits import RunLimits, StepBudget
 
-class RuntimeError(Exception):
-    def __init__(self, message: str):
-        self.message = message
-        super().__init__(message)
+# Tipos de conclusão abrupta de um comando
+RETURN = 'return'
 
-class ReturnException(Exception):
-    def __init__(self, value: Any):
+class Completion:
+    """
+    Conclusão abrupta de um comando. execute_statement devolve None quando o
+    comando termina normalmente e um Completion quando ele interrompe o fluxo
+    (return), repassado pelos comandos que o contêm até a chamada da rotina.
+    """
+    __slots__ = ('kind', 'value')
+
+    def __init__(self, kind: str, value: Any = None):
+        self.kind = kind
         self.value = value
 
-class Environment:
-    def __init__(self, parent: Optional['Environment'] = None):
-        self.parent = parent
-        self.variables: Dict[str, Any] = {}
-        self.procedures: Dict[str, ProcedureDeclaration] = {}
-        self.functions: Dict[str, FunctionDeclaration] = {}
-    
-    def define(self, name: str, value: Any):
-        self.variables[name] = value
-    
-    def get(self, name: str) -> Any:
-        if name in self.variables:
-            return self.variables[name]
-        elif self.parent:
-            return self.parent.get(name)
-        else:
-            raise RuntimeError(f"Variável não definida: {name}")
-    
-    def set(self, name: str, value: Any):
-        if name in self.variables:
-            self.variables[name] = value
-        elif self.parent and self.parent.has(name):
-            self.parent.set(name, value)
-        else:
-            raise RuntimeError(f"Variável não definida: {name}")
-    
-    def has(self, name: str) -> bool:
-        return name in self.variables or (self.parent and self.parent.has(name))
-    
-    def define_procedure(self, name: str, procedure: ProcedureDeclaration):
-        self.procedures[name] = procedure
-    
-    def get_procedure(self, name: str) -> Optional[ProcedureDeclaration]:
-        if name in self.procedures:
-            return self.procedures[name]
-        elif self.parent:
-            return self.parent.get_procedure(name)
-        else:
-            return None
-    
-    def define_function(self, name: str, function: FunctionDeclaration):
-        self.functions[name] = function
-    
-    def get_function(self, name: str) -> Optional[FunctionDeclaration]:
-        if name in self.functions:
-            return self.functions[name]
-        elif self.parent:
-            return self.parent.get_function(name)
-        else:
-            return None
+class Frame:
+    """Registro de ativação: slots de tamanho fixo e o elo com o frame de quem chamou."""
+    __slots__ = ('values', 'caller', 'scope')
+
+    def __init__(self, size: int, caller: Optional['Frame'] = None,
+                 scope: Optional[Dict[str, int]] = None):
+        self.values: List[Any] = [None] * size
+        self.caller = caller
+        # Nomes -> slots ligados no frame de quem chamou, no ponto da chamada
+        self.scope = scope
+
+class FramePool:
+    """
+    Frames livres de um mesmo tamanho, reaproveitados entre chamadas em vez de
+    alocar um Frame e sua lista de slots a cada chamada. Na devolução, os slots
+    e os elos são limpos para que um frame livre não mantenha vivos valores da
+    última chamada (por exemplo, um array grande passado como argumento).
+    """
+    __slots__ = ('size', 'free', 'empty')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.free: List[Frame] = []
+        # Slots vazios copiados sobre os de um frame devolvido
+        self.empty: List[Any] = [None] * size
+
+    def acquire(self, caller: Frame, scope: Dict[str, int]) -> Frame:
+        free = self.free
+        if free:
+            frame = free.pop()
+            frame.caller = caller
+            frame.scope = scope
+            return frame
+        return Frame(self.size, caller, scope)
+
+    def release(self, frame: Frame):
+        frame.values[:] = self.empty
+        frame.caller = frame.scope = None
+        self.free.append(frame)
 
 class Interpreter:
-    def __init__(self):
-        self.global_env = Environment()
-        self.current_env = self.global_env
-        self.output_buffer = []
+    def __init__(self, output: Optional[OutputSink] = None, source: Optional[InputSource] = None):
+        self.global_frame = Frame(0)
+        self.frame = self.global_frame
+        self.global_slots: Dict[str, int] = {}
+        self.procedures: Dict[str, ProcedureDeclaration] = {}
+        self.functions: Dict[str, FunctionDeclaration] = {}
+        # Pools de frames indexados pelo tamanho do frame das rotinas
+        self.frame_pools: List[FramePool] = []
+        # Linhas do writeln: bufferizadas e capturadas conforme o OutputSink
+        self.output = output if output is not None else OutputSink()
+        # Valores do readln: digitados após um prompt ou lidos em lote (InputSource)
+        self.input = source if source is not None else InputSource()
+        self.input.output = self.output
+        # Limites de passos, tempo e arrays (definidos antes de interpret) e o
+        # orçamento que os controla durante a execução
+        self.limits: Optional[RunLimits] = None
+        self.budget: Optional[StepBudget] = None
     
     def interpret(self, program: Program):
+        self.prepare(program)
+        
         try:
             # Primeiro, declarar todas as variáveis, procedimentos e funções
             for decl in program.declarations:
                 self.execute_declaration(decl)
             
-            # Executar o corpo principal
+            # Executar o corpo principal (return apenas encerra a execução)
             self.execute_statement(program.body)
             
-        except ReturnException:
-            # Return no programa principal é ignorado
-            pass
+        finally:
+            self.output.flush()
+    
+    def prepare(self, program: Program):
+        """Resolve os escopos do programa e cria o frame global."""
+        Resolver().resolve(program)
+        self.global_slots = program.global_slots
+        self.global_frame = self.frame = Frame(program.frame_size)
+
+        sizes = [decl.frame_size for decl in program.declarations
+                 if isinstance(decl, (ProcedureDeclaration, FunctionDeclaration))]
+        self.frame_pools = [FramePool(size) for size in range(max(sizes, default=0) + 1)]
+        self.start_budget()
+    
+    def start_budget(self):
+        """Cria o orçamento da execução a partir de self.limits (None sem limites)."""
+        self.budget = StepBudget(self.limits) if self.limits is not None else None
     
     def execute_declaration(self, declaration: ASTNode):
         if isinstance(declaration, VariableDeclaration):
-            # Inicializar variável com valor padrão baseado no tipo
-            if declaration.var_type == 'integer':
-                default_value = 0
-            elif declaration.var_type == 'real':
-                default_value = 0.0
-            elif declaration.var_type == 'boolean':
-                default_value = False
-            elif declaration.var_type == 'string':
-                default_value = ""
-            else:
-                default_value = None
-            
             if declaration.value:
                 value = self.evaluate_expression(declaration.value)
             else:
-                value = default_value
+                # Inicializar variável com valor padrão baseado no tipo
+                value = default_value(declaration.var_type)
             
-            self.current_env.define(declaration.name, value)
+            self.global_frame.values[declaration.slot] = value
         
         elif isinstance(declaration, ArrayDeclaration):
-            # Criar array com valores padrão
-            if declaration.element_type == 'integer':
-                default_value = 0
-            elif declaration.element_type == 'real':
-                default_value = 0.0
-            elif declaration.element_type == 'boolean':
-                default_value = False
-            elif declaration.element_type == 'string':
-                default_value = ""
-            else:
-                default_value = None
-            
-            array = [default_value] * declaration.size
-            self.current_env.define(declaration.name, array)
+            # Criar array com valores padrão (buffer tipado para integer, real e boolean)
+            if self.budget is not None:
+                self.budget.allocate(declaration.size)
+            array = PascalArray(declaration.element_type, declaration.size)
+            self.global_frame.values[declaration.slot] = array
         
         elif isinstance(declaration, ProcedureDeclaration):
-            self.current_env.define_procedure(declaration.name, declaration)
+            self.procedures[declaration.name] = declaration
         
         elif isinstance(declaration, FunctionDeclaration):
-            self.current_env.define_function(declaration.name, declaration)
+            self.functions[declaration.name] = declaration
+    
+    def locate(self, variable: Variable) -> Tuple[List[Any], int]:
+        """Retorna a lista de slots e o slot que guardam a variável."""
+        depth = variable.depth
+        if depth == 0:
+            return self.frame.values, variable.slot
+        if depth == GLOBAL:
+            return self.global_frame.values, variable.slot
+        if depth is DYNAMIC:
+            return self.lookup_dynamic(variable.name)
+        
+        frame = self.frame
+        for _ in range(depth):
+            frame = frame.caller
+        return frame.values, variable.slot
+    
+    def lookup_dynamic(self, name: str) -> Tuple[List[Any], int]:
+        # Escopo dinâmico: procura nos frames de quem chamou, até o global
+        frame = self.frame
+        while frame.caller is not None:
+            slot = frame.scope.get(name)
+            if slot is not None:
+                return frame.caller.values, slot
+            frame = frame.caller
+        
+        slot = self.global_slots.get(name)
+        if slot is None:
+            raise RuntimeError(f"Variável não definida: {name}")
+        return self.global_frame.values, slot
     
-    def execute_statement(self, statement: Statement):
+    def execute_statement(self, statement: Statement) -> Optional[Completion]:
         if isinstance(statement, Block):
             for stmt in statement.statements:
-                self.execute_statement(stmt)
+                completion = self.execute_statement(stmt)
+                if completion is not None:
+                    return completion
         
         elif isinstance(statement, Assignment):
             value = self.evaluate_expression(statement.value)
             
             if isinstance(statement.target, Variable):
-                self.current_env.set(statement.target.name, value)
+                values, slot = self.locate(statement.target)
+                values[slot] = value
             elif isinstance(statement.target, ArrayAccess):
                 array_name = statement.target.array.name
                 index = self.evaluate_expression(statement.target.index)
-                array = self.current_env.get(array_name)
+                array = self.load(statement.target.array)
                 
-                if not isinstance(array, list):
+                if not isinstance(array, PascalArray):
                     raise RuntimeError(f"{array_name} não é um array")
                 
                 if not isinstance(index, int):
                     raise RuntimeError("Índice do array deve ser um inteiro")
                 
-                if index < 0 or index >= len(array):
+                if index < 0 or index >= len(array.items):
                     raise RuntimeError(f"Índice do array fora dos limites: {index}")
                 
-                array[index] = value
+                array.store(index, value)
         
         elif isinstance(statement, IfStatement):
             condition = self.evaluate_expression(statement.condition)
             if self.is_truthy(condition):
-                self.execute_statement(statement.then_stmt)
+                return self.execute_statement(statement.then_stmt)
             elif statement.else_stmt:
-                self.execute_statement(statement.else_stmt)
+                return self.execute_statement(statement.else_stmt)
         
         elif isinstance(statement, WhileStatement):
+            if statement.invariants:
+                self.bind_invariants(statement.invariants)
+            budget = self.budget
             while self.is_truthy(self.evaluate_expression(statement.condition)):
-                self.execute_statement(statement.body)
+                # Cada volta do laço é um passo do orçamento
+                if budget is not None:
+                    budget.step()
+                completion = self.execute_statement(statement.body)
+                if completion is not None:
+                    return completion
         
         elif isinstance(statement, ForStatement):
+            if statement.invariants:
+                self.bind_invariants(statement.invariants)
             start_value = self.evaluate_expression(statement.start)
             end_value = self.evaluate_expression(statement.end)
             
             if not isinstance(start_value, int) or not isinstance(end_value, int):
                 raise RuntimeError("Valores do loop FOR devem ser inteiros")
             
-            # Criar nova variável de controle do loop
-            previous_env = self.current_env
-            self.current_env = Environment(previous_env)
+            vector = statement.vector
+            if vector is not None and run_vectorized(
+                    vector.kernel, start_value, end_value,
+                    [self.evaluate_expression(operand) for operand in vector.operands]):
+                # As voltas executadas de uma vez contam como no laço normal
+                if self.budget is not None:
+                    self.budget.charge(end_value - start_value + 1)
+                return
             
-            try:
-                for i in range(start_value, end_value + 1):
-                    self.current_env.define(statement.variable, i)
-                    self.execute_statement(statement.body)
-            finally:
-                self.current_env = previous_env
+            # Variável de controle do loop ocupa um slot próprio do frame atual
+            values = self.frame.values
+            slot = statement.slot
+            budget = self.budget
+            for i in range(start_value, end_value + 1):
+                if budget is not None:
+                    budget.step()
+                values[slot] = i
+                completion = self.execute_statement(statement.body)
+                if completion is not None:
+                    return completion
         
         elif isinstance(statement, ProcedureCall):
-            self.call_procedure(statement.name, statement.arguments)
+            self.call_procedure(statement)
         
         elif isinstance(statement, ReadlnStatement):
-            for target in statement.targets:
+            for target, declared in zip(statement.targets, statement.types):
                 try:
                     if isinstance(target, Variable):
-                        var_name = target.name
-                        value = input(f"Digite o valor para {var_name}: ")
-                        # Tentar converter para número se possível
-                        try:
-                            if '.' in value:
-                                value = float(value)
-                            else:
-                                value = int(value)
-                        except ValueError:
-                            # Se não conseguir converter, manter como string
-                            pass
-                        
-                        self.current_env.set(var_name, value)
+                        values, slot = self.locate(target)
+                        values[slot] = self.input.read(target.name, values[slot], declared)
                     
                     elif isinstance(target, ArrayAccess):
                         array_name = target.array.name
                         index = self.evaluate_expression(target.index)
+                        array = self.load(target.array)
+                        value = self.input.read_element(array_name, array, index, declared)
                         
-                        value = input(f"Digite o valor para {array_name}[{index}]: ")
-                        # Tentar converter para número se possível
-                        try:
-                            if '.' in value:
-                                value = float(value)
-                            else:
-                                value = int(value)
-                        except ValueError:
-                            # Se não conseguir converter, manter como string
-                            pass
-                        
-                        array = self.current_env.get(array_name)
-                        if not isinstance(array, list):
+                        if not isinstance(array, PascalArray):
                             raise RuntimeError(f"{array_name} não é um array")
                         
                         if not isinstance(index, int):
                             raise RuntimeError("Índice do array deve ser um inteiro")
                         
-                        if index < 0 or index >= len(array):
+                        if index < 0 or index >= len(array.items):
                             raise RuntimeError(f"Índice do array fora dos limites: {index}")
                         
-                        array[index] = value
+                        array.store(index, value)
                     
                 except EOFError:
                     break
@@ -241,19 +282,22 @@ class Interpreter:
                     value = self.evaluate_expression(expr)
                     output_parts.append(str(value))
                 
-                output = ''.join(output_parts)
-                print(output)
-                self.output_buffer.append(output)
+                self.output.write(''.join(output_parts))
             else:
-                print()
-                self.output_buffer.append('')
+                self.output.write('')
         
         elif isinstance(statement, ReturnStatement):
             if statement.value:
                 value = self.evaluate_expression(statement.value)
             else:
                 value = None
-            raise ReturnException(value)
+            return Completion(RETURN, value)
+    
+    def bind_invariants(self, invariants: List[Invariant]):
+        # Temporários do otimizador ocupam slots do frame atual durante o laço
+        values = self.frame.values
+        for invariant in invariants:
+            values[invariant.slot] = self.evaluate_expression(invariant.value)
     
     def evaluate_expression(self, expression: Expression) -> Any:
         if isinstance(expression, NumberLiteral):
@@ -266,20 +310,20 @@ class Interpreter:
             return expression.value
         
         elif isinstance(expression, Variable):
-            return self.current_env.get(expression.name)
+            return self.load(expression)
         
         elif isinstance(expression, ArrayAccess):
             array_name = expression.array.name
             index = self.evaluate_expression(expression.index)
-            array = self.current_env.get(array_name)
+            array = self.load(expression.array)
             
-            if not isinstance(array, list):
+            if not isinstance(array, PascalArray):
                 raise RuntimeError(f"{array_name} não é um array")
             
             if not isinstance(index, int):
                 raise RuntimeError("Índice do array deve ser um inteiro")
             
-            if index < 0 or index >= len(array):
+            if index < 0 or index >= len(array.items):
                 raise RuntimeError(f"Índice do array fora dos limites: {index}")
             
             return array[index]
@@ -338,79 +382,85 @@ class Interpreter:
                 raise RuntimeError(f"Operador unário não suportado: {expression.operator}")
         
         elif isinstance(expression, FunctionCall):
-            return self.call_function(expression.name, expression.arguments)
+            return self.call_function(expression)
         
         else:
             raise RuntimeError(f"Tipo de expressão não suportado: {type(expression)}")
     
-    def call_procedure(self, name: str, arguments: List[Expression]):
-        procedure = self.current_env.get_procedure(name)
+    def call_procedure(self, call: ProcedureCall):
+        # Rotina resolvida uma vez por ponto de chamada (Resolver.resolve_call)
+        procedure = call.routine
         
         if procedure is None:
-            raise RuntimeError(f"Procedimento não definido: {name}")
-        
-        if len(arguments) != len(procedure.parameters):
-            raise RuntimeError(f"Número incorreto de argumentos para {name}")
+            if call.name not in self.procedures:
+                raise RuntimeError(f"Procedimento não definido: {call.name}")
+            raise RuntimeError(f"Número incorreto de argumentos para {call.name}")
         
-        # Criar novo ambiente para a execução do procedimento
-        previous_env = self.current_env
-        self.current_env = Environment(previous_env)
+        # Frame para a execução do procedimento, reaproveitado do pool
+        pool = self.frame_pools[procedure.frame_size]
+        caller = self.frame
+        frame = self.frame = pool.acquire(caller, call.scope)
         
         try:
-            # Avaliar argumentos e definir parâmetros
-            for i, param in enumerate(procedure.parameters):
-                arg_value = self.evaluate_expression(arguments[i])
-                self.current_env.define(param.name, arg_value)
+            # Avaliar argumentos e definir parâmetros (slots 0..n-1)
+            values = frame.values
+            for i, argument in enumerate(call.arguments):
+                values[i] = self.evaluate_expression(argument)
             
-            # Executar corpo do procedimento
-            self.execute_statement(procedure.body)
-        
-        except ReturnException:
-            # Return em procedimento é ignorado
-            pass
+            # Executar corpo do procedimento (o valor de um return é ignorado)
+            self.execute_routine(procedure)
         
         finally:
-            self.current_env = previous_env
+            self.frame = caller
+            pool.release(frame)
     
-    def call_function(self, name: str, arguments: List[Expression]) -> Any:
-        function = self.current_env.get_function(name)
+    def call_function(self, call: FunctionCall) -> Any:
+        # Rotina resolvida uma vez por ponto de chamada (Resolver.resolve_call)
+        function = call.routine
         
         if function is None:
-            raise RuntimeError(f"Função não definida: {name}")
-        
-        if len(arguments) != len(function.parameters):
-            raise RuntimeError(f"Número incorreto de argumentos para {name}")
+            if call.name not in self.functions:
+                raise RuntimeError(f"Função não definida: {call.name}")
+            raise RuntimeError(f"Número incorreto de argumentos para {call.name}")
         
-        # Criar novo ambiente para a execução da função
-        previous_env = self.current_env
-        self.current_env = Environment(previous_env)
+        # Frame para a execução da função, reaproveitado do pool
+        pool = self.frame_pools[function.frame_size]
+        caller = self.frame
+        frame = self.frame = pool.acquire(caller, call.scope)
         
         try:
-            # Avaliar argumentos e definir parâmetros
-            for i, param in enumerate(function.parameters):
-                arg_value = self.evaluate_expression(arguments[i])
-                self.current_env.define(param.name, arg_value)
+            # Avaliar argumentos e definir parâmetros (slots 0..n-1)
+            values = frame.values
+            for i, argument in enumerate(call.arguments):
+                values[i] = self.evaluate_expression(argument)
             
             # Executar corpo da função
-            self.execute_statement(function.body)
+            completion = self.execute_routine(function)
+            if completion is not None:
+                return completion.value
             
             # Se chegou aqui sem return, retornar valor padrão
-            if function.return_type == 'integer':
-                return 0
-            elif function.return_type == 'real':
-                return 0.0
-            elif function.return_type == 'boolean':
-                return False
-            elif function.return_type == 'string':
-                return ""
-            else:
-                return None
-        
-        except ReturnException as e:
-            return e.value
+            return default_value(function.return_type)
         
         finally:
-            self.current_env = previous_env
+            self.frame = caller
+            pool.release(frame)
+    
+    def execute_routine(self, routine: ASTNode) -> Optional[Completion]:
+        """Executa o corpo de uma rotina, com os argumentos já nos parâmetros."""
+        # A chamada conta um passo depois dos argumentos, como nos demais backends
+        if self.budget is not None:
+            self.budget.step()
+        return self.execute_statement(routine.body)
+    
+    def load(self, variable: Variable) -> Any:
+        depth = variable.depth
+        if depth == 0:
+            return self.frame.values[variable.slot]
+        if depth == GLOBAL:
+            return self.global_frame.values[variable.slot]
+        values, slot = self.locate(variable)
+        return values[slot]
     
     def is_truthy(self, value: Any) -> bool:
         if isinstance(value, bool):
@@ -423,7 +473,7 @@ class Interpreter:
             return value is not None
     
     def get_output(self) -> List[str]:
-        return self.output_buffer.copy()
+        return self.output.get_output()
     
     def clear_output(self):
-        self.output_buffer.clear()
+        self.output.clear()
@@ -3,8 +3,10 @@ Analisador Léxico para o compilador Pascal.
 Responsável por converter o código fonte em tokens.
 """
 
+import re
+from sys import intern
 from enum import Enum, auto
-from typing import List, Optional, NamedTuple
+from typing import Iterator, List, NamedTuple
 
 class TokenType(Enum):
     # Literais
@@ -82,6 +84,54 @@ class Token(NamedTuple):
     line: int
     column: int
 
+# Expressão mestre: um grupo nomeado por classe de lexema. Cada token é
+# reconhecido com um único match e seu valor é fatiado direto do código fonte.
+TOKEN_PATTERN = re.compile(r"""
+    [ \t\r]*                    # espaços em branco antes do token
+    (?:
+    (?P<NEWLINE>\n)
+  | (?P<COMMENT>\{[^}]*\}?|//[^\n]*)
+  | (?P<NUMBER>[0-9][0-9.]*)
+  | (?P<IDENTIFIER>[A-Za-z_]\w*)
+  | (?P<STRING>"(?P<DOUBLE>(?:[^"\\]|\\.)*)"?|'(?P<SINGLE>(?:[^'\\]|\\.)*)'?)
+  | (?P<OPERATOR>:=|<=|<>|>=|[-+*/=<>:;,.()\[\]])
+  | (?P<OTHER>.)
+  | (?P<END>\Z)
+    )
+""", re.VERBOSE | re.DOTALL)
+
+# Continuação de identificadores (letras, dígitos e '_', inclusive Unicode)
+WORD_PATTERN = re.compile(r'\w*')
+
+ESCAPE_PATTERN = re.compile(r'\\(.)', re.DOTALL)
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+def unescape(match) -> str:
+    char = match.group(1)
+    return ESCAPES.get(char, char)
+
+OPERATORS = {
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    ':=': TokenType.ASSIGN,
+    '=': TokenType.EQUAL,
+    '<>': TokenType.NOT_EQUAL,
+    '<': TokenType.LESS_THAN,
+    '>': TokenType.GREATER_THAN,
+    '<=': TokenType.LESS_EQUAL,
+    '>=': TokenType.GREATER_EQUAL,
+    ';': TokenType.SEMICOLON,
+    ',': TokenType.COMMA,
+    '.': TokenType.DOT,
+    ':': TokenType.COLON,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+}
+
 class Lexer:
     def __init__(self, source: str):
         self.source = source
@@ -123,187 +173,104 @@ class Lexer:
             'string': TokenType.STRING_TYPE,
         }
     
-    def current_char(self) -> Optional[str]:
-        if self.position >= len(self.source):
-            return None
-        return self.source[self.position]
-    
-    def peek_char(self, offset: int = 1) -> Optional[str]:
-        peek_pos = self.position + offset
-        if peek_pos >= len(self.source):
-            return None
-        return self.source[peek_pos]
-    
-    def advance(self):
-        if self.position < len(self.source):
-            if self.source[self.position] == '\n':
-                self.line += 1
-                self.column = 1
-            else:
-                self.column += 1
-            self.position += 1
-    
-    def skip_whitespace(self):
-        while self.current_char() and self.current_char() in ' \t\r':
-            self.advance()
-    
-    def skip_comment(self):
-        if self.current_char() == '{':
-            self.advance()
-            while self.current_char() and self.current_char() != '}':
-                self.advance()
-            if self.current_char() == '}':
-                self.advance()
-        elif self.current_char() == '/' and self.peek_char() == '/':
-            self.advance()
-            self.advance()
-            while self.current_char() and self.current_char() != '\n':
-                self.advance()
-    
-    def read_number(self) -> Token:
-        start_pos = (self.line, self.column)
-        value = ''
-        
-        while self.current_char() and (self.current_char().isdigit() or self.current_char() == '.'):
-            value += self.current_char()
-            self.advance()
-        
-        if '.' in value:
-            return Token(TokenType.REAL, value, start_pos[0], start_pos[1])
-        else:
-            return Token(TokenType.INTEGER, value, start_pos[0], start_pos[1])
-    
-    def read_string(self) -> Token:
-        start_pos = (self.line, self.column)
-        value = ''
-        quote_char = self.current_char()
-        self.advance()  # Skip opening quote
-        
-        while self.current_char() and self.current_char() != quote_char:
-            if self.current_char() == '\\':
-                self.advance()
-                if self.current_char() == 'n':
-                    value += '\n'
-                elif self.current_char() == 't':
-                    value += '\t'
-                elif self.current_char() == 'r':
-                    value += '\r'
-                elif self.current_char() == '\\':
-                    value += '\\'
-                elif self.current_char() == quote_char:
-                    value += quote_char
-                else:
-                    value += self.current_char()
-                self.advance()
-            else:
-                value += self.current_char()
-                self.advance()
-        
-        if self.current_char() == quote_char:
-            self.advance()  # Skip closing quote
-        
-        return Token(TokenType.STRING, value, start_pos[0], start_pos[1])
+    def tokenize(self) -> List[Token]:
+        self.tokens.extend(self.iter_tokens())
+        return self.tokens
     
-    def read_identifier(self) -> Token:
-        start_pos = (self.line, self.column)
-        value = ''
+    def iter_tokens(self) -> Iterator[Token]:
+        """
+        Gera os tokens sob demanda, sem montar a lista completa.
+        Permite que o parser consuma os tokens enquanto o código é analisado.
+        """
+        source = self.source
+        end = len(source)
+        match = TOKEN_PATTERN.match
+        keywords = self.keywords
         
-        while (self.current_char() and 
-               (self.current_char().isalnum() or self.current_char() == '_')):
-            value += self.current_char()
-            self.advance()
+        position = self.position
+        line = self.line
+        # Offset do primeiro caractere da linha atual (coluna = offset - line_start + 1)
+        line_start = position - self.column + 1
         
-        # Verificar se é uma palavra-chave
-        token_type = self.keywords.get(value.lower(), TokenType.IDENTIFIER)
-        return Token(token_type, value, start_pos[0], start_pos[1])
-    
-    def tokenize(self) -> List[Token]:
-        while self.current_char():
-            self.skip_whitespace()
+        while position < end:
+            found = match(source, position)
+            kind = found.lastgroup
+            position = found.start(kind)
+            next_position = found.end()
+            column = position - line_start + 1
             
-            if not self.current_char():
-                break
+            # Identificadores e palavras-chave
+            if kind == 'IDENTIFIER':
+                # Nomes internados: os nós da AST compartilham uma única string por nome
+                value = intern(found.group(kind))
+                yield Token(keywords.get(value.lower(), TokenType.IDENTIFIER), value, line, column)
             
-            # Comentários
-            if self.current_char() == '{' or (self.current_char() == '/' and self.peek_char() == '/'):
-                self.skip_comment()
-                continue
+            # Operadores e delimitadores
+            elif kind == 'OPERATOR':
+                value = found.group(kind)
+                yield Token(OPERATORS[value], value, line, column)
             
             # Nova linha
-            if self.current_char() == '\n':
-                token = Token(TokenType.NEWLINE, '\n', self.line, self.column)
-                self.tokens.append(token)
-                self.advance()
-                continue
+            elif kind == 'NEWLINE':
+                yield Token(TokenType.NEWLINE, '\n', line, column)
+                line += 1
+                line_start = next_position
             
             # Números
-            if self.current_char().isdigit():
-                self.tokens.append(self.read_number())
-                continue
+            elif kind == 'NUMBER':
+                if next_position < end and source[next_position] > '\x7f':
+                    next_position = self.scan_number(next_position)
+                yield self.number_token(source[position:next_position], line, column)
             
-            # Strings
-            if self.current_char() in '"\'':
-                self.tokens.append(self.read_string())
-                continue
+            # Strings e comentários podem ocupar várias linhas
+            elif kind == 'STRING' or kind == 'COMMENT':
+                if kind == 'STRING':
+                    body = found.group('DOUBLE')
+                    if body is None:
+                        body = found.group('SINGLE')
+                    if '\\' in body:
+                        body = ESCAPE_PATTERN.sub(unescape, body)
+                    yield Token(TokenType.STRING, body, line, column)
+                
+                newlines = source.count('\n', position, next_position)
+                if newlines:
+                    line += newlines
+                    line_start = source.rindex('\n', position, next_position) + 1
             
-            # Identificadores e palavras-chave
-            if self.current_char().isalpha() or self.current_char() == '_':
-                self.tokens.append(self.read_identifier())
-                continue
-            
-            # Operadores e delimitadores
-            char = self.current_char()
-            pos = (self.line, self.column)
+            # Espaços em branco no fim do código
+            elif kind == 'END':
+                pass
             
-            if char == '+':
-                self.tokens.append(Token(TokenType.PLUS, char, pos[0], pos[1]))
-            elif char == '-':
-                self.tokens.append(Token(TokenType.MINUS, char, pos[0], pos[1]))
-            elif char == '*':
-                self.tokens.append(Token(TokenType.MULTIPLY, char, pos[0], pos[1]))
-            elif char == '/':
-                self.tokens.append(Token(TokenType.DIVIDE, char, pos[0], pos[1]))
-            elif char == '=':
-                self.tokens.append(Token(TokenType.EQUAL, char, pos[0], pos[1]))
-            elif char == '<':
-                if self.peek_char() == '=':
-                    self.advance()
-                    self.tokens.append(Token(TokenType.LESS_EQUAL, '<=', pos[0], pos[1]))
-                elif self.peek_char() == '>':
-                    self.advance()
-                    self.tokens.append(Token(TokenType.NOT_EQUAL, '<>', pos[0], pos[1]))
-                else:
-                    self.tokens.append(Token(TokenType.LESS_THAN, char, pos[0], pos[1]))
-            elif char == '>':
-                if self.peek_char() == '=':
-                    self.advance()
-                    self.tokens.append(Token(TokenType.GREATER_EQUAL, '>=', pos[0], pos[1]))
-                else:
-                    self.tokens.append(Token(TokenType.GREATER_THAN, char, pos[0], pos[1]))
-            elif char == ':':
-                if self.peek_char() == '=':
-                    self.advance()
-                    self.tokens.append(Token(TokenType.ASSIGN, ':=', pos[0], pos[1]))
-                else:
-                    self.tokens.append(Token(TokenType.COLON, char, pos[0], pos[1]))
-            elif char == ';':
-                self.tokens.append(Token(TokenType.SEMICOLON, char, pos[0], pos[1]))
-            elif char == ',':
-                self.tokens.append(Token(TokenType.COMMA, char, pos[0], pos[1]))
-            elif char == '.':
-                self.tokens.append(Token(TokenType.DOT, char, pos[0], pos[1]))
-            elif char == '(':
-                self.tokens.append(Token(TokenType.LPAREN, char, pos[0], pos[1]))
-            elif char == ')':
-                self.tokens.append(Token(TokenType.RPAREN, char, pos[0], pos[1]))
-            elif char == '[':
-                self.tokens.append(Token(TokenType.LBRACKET, char, pos[0], pos[1]))
-            elif char == ']':
-                self.tokens.append(Token(TokenType.RBRACKET, char, pos[0], pos[1]))
+            # Caracteres fora do ASCII: dígitos e letras Unicode
             else:
-                raise SyntaxError(f"Caractere inesperado '{char}' na linha {self.line}, coluna {self.column}")
+                char = found.group(kind)
+                if char.isdigit():
+                    next_position = self.scan_number(next_position)
+                    yield self.number_token(source[position:next_position], line, column)
+                elif char.isalpha():
+                    next_position = WORD_PATTERN.match(source, next_position).end()
+                    value = source[position:next_position]
+                    yield Token(keywords.get(value.lower(), TokenType.IDENTIFIER), value, line, column)
+                else:
+                    raise SyntaxError(f"Caractere inesperado '{char}' na linha {line}, coluna {column}")
             
-            self.advance()
+            position = next_position
         
-        self.tokens.append(Token(TokenType.EOF, '', self.line, self.column))
-        return self.tokens
+        self.position = position
+        self.line = line
+        self.column = position - line_start + 1
+        yield Token(TokenType.EOF, '', self.line, self.column)
+    
+    def scan_number(self, position: int) -> int:
+        """Avança sobre dígitos (inclusive Unicode) e pontos a partir de position."""
+        source = self.source
+        end = len(source)
+        while position < end and (source[position].isdigit() or source[position] == '.'):
+            position += 1
+        return position
+    
+    def number_token(self, value: str, line: int, column: int) -> Token:
+        if '.' in value:
+            return Token(TokenType.REAL, value, line, column)
+        else:
+            return Token(TokenType.INTEGER, value, line, column)
@@ -0,0 +1,135 @@
+"""
+Limites de execução para o compilador Pascal.
+Uma execução pode receber um orçamento de passos, contados nas voltas de
+laços e nas chamadas de rotinas, um tempo máximo de relógio e um limite de
+elementos alocados em arrays. Passar de um limite levanta LimitExceeded com
+as estatísticas da execução.
+
+Os backends descontam cada passo de um lote e só chamam refuel() quando o
+lote acaba: o custo por passo é um decremento e uma comparação, e o relógio
+é lido apenas na troca de lote. Sem limites (Interpreter.limits = None) os
+backends nem contam os passos.
+"""
+
+import time
+from typing import Callable, Optional
+from .runtime import RuntimeError
+
+# Passos entre leituras do relógio quando há tempo limite
+CHECK_INTERVAL = 1024
+
+# Lote usado quando nenhum limite depende da contagem de passos
+UNLIMITED = 1 << 62
+
+# Limites que podem ser excedidos (LimitExceeded.limit)
+LIMIT_KINDS = ('steps', 'time', 'memory')
+
+class RunLimits:
+    """Limites de uma execução; None desativa cada um."""
+    __slots__ = ('max_steps', 'time_limit', 'max_array_elements')
+
+    def __init__(self, max_steps: Optional[int] = None, time_limit: Optional[float] = None,
+                 max_array_elements: Optional[int] = None):
+        if max_steps is not None and max_steps < 0:
+            raise ValueError(f"Número de passos inválido: {max_steps}")
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError(f"Tempo limite inválido: {time_limit}")
+        if max_array_elements is not None and max_array_elements < 0:
+            raise ValueError(f"Número de elementos inválido: {max_array_elements}")
+
+        self.max_steps = max_steps
+        self.time_limit = time_limit
+        self.max_array_elements = max_array_elements
+
+class RunStats:
+    """Passos executados, tempo decorrido e elementos de arrays alocados."""
+    __slots__ = ('steps', 'elapsed', 'array_elements')
+
+    def __init__(self, steps: int, elapsed: float, array_elements: int):
+        self.steps = steps
+        self.elapsed = elapsed
+        self.array_elements = array_elements
+
+    def __str__(self) -> str:
+        return (f"{self.steps} passos, {self.elapsed:.3f} s, "
+                f"{self.array_elements} elementos de arrays")
+
+class LimitExceeded(RuntimeError):
+    """
+    Execução interrompida por um limite ('steps', 'time' ou 'memory'). Deriva
+    do RuntimeError do runtime, então é tratada como os demais erros de
+    execução por quem não a distingue.
+    """
+
+    def __init__(self, limit: str, message: str, stats: RunStats):
+        super().__init__(message)
+        self.limit = limit
+        self.stats = stats
+
+class StepBudget:
+    """Contagem de passos, relógio e arrays de uma execução com limites."""
+    __slots__ = ('limits', 'clock', 'interval', 'start', 'deadline',
+                 'used', 'batch', 'fuel', 'array_elements')
+
+    def __init__(self, limits: RunLimits, clock: Callable[[], float] = time.perf_counter,
+                 interval: int = CHECK_INTERVAL):
+        self.limits = limits
+        self.clock = clock
+        self.interval = interval
+        self.start = clock()
+        self.deadline = None if limits.time_limit is None else self.start + limits.time_limit
+        # Passos de lotes anteriores; o lote atual tem batch passos, dos quais restam fuel
+        self.used = 0
+        self.batch = 0
+        self.fuel = 0
+        self.array_elements = 0
+        self.refuel()
+
+    def step(self):
+        """Conta um passo (volta de laço ou chamada de rotina)."""
+        self.fuel -= 1
+        if self.fuel <= 0:
+            self.refuel()
+
+    def charge(self, count: int):
+        """
+        Conta de uma vez os passos de um trabalho que não passou pelos laços e
+        chamadas contados (voltas de um laço vetorizado, chamadas memoizadas).
+        """
+        self.fuel -= count
+        if self.fuel <= 0:
+            self.refuel()
+
+    def refuel(self):
+        """Soma o lote consumido, verifica os limites e começa o próximo lote."""
+        self.used += self.batch - self.fuel
+        self.batch = self.fuel = 0
+
+        max_steps = self.limits.max_steps
+        if max_steps is not None and self.used > max_steps:
+            raise LimitExceeded('steps', f"Limite de {max_steps} passos excedido", self.stats())
+        if self.deadline is not None and self.clock() > self.deadline:
+            raise LimitExceeded('time', f"Tempo limite de {self.limits.time_limit:g} s excedido",
+                                self.stats())
+
+        batch = UNLIMITED if self.deadline is None else self.interval
+        if max_steps is not None:
+            # Com o orçamento esgotado, o próximo passo já passa do limite
+            batch = max(1, min(batch, max_steps - self.used))
+        self.batch = self.fuel = batch
+
+    def allocate(self, size: int):
+        """Conta os elementos de um array antes de criá-lo."""
+        total = self.array_elements + size
+        max_elements = self.limits.max_array_elements
+        if max_elements is not None and total > max_elements:
+            raise LimitExceeded('memory', f"Limite de {max_elements} elementos de arrays excedido "
+                                f"(array de {size} elementos)", self.stats())
+        self.array_elements = total
+
+    @property
+    def steps(self) -> int:
+        return self.used + self.batch - self.fuel
+
+    def stats(self) -> RunStats:
+        return RunStats(self.steps, self.clock() - self.start, self.array_elements)
@@ -0,0 +1,311 @@
+"""
+Memoização automática de funções puras para o compilador Pascal.
+Uma análise de pureza encontra as funções cujo resultado depende só dos
+argumentos: sem leituras ou escritas de variáveis globais (ou do escopo de
+quem chama), sem readln/writeln, sem alterar arrays e chamando apenas outras
+funções puras. Com --memoize, os backends guardam os resultados dessas
+funções em caches LRU indexados pelos argumentos; chamadas com algum
+argumento que não é integer, real, boolean ou string não usam o cache.
+
+Cada entrada guarda o resultado e os passos do orçamento (limits.py) que a
+chamada consumiu. Um acerto conta de novo esses passos, então --memoize não
+permite passar de --max-steps: a execução conta os mesmos passos que teria
+sem o cache.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+from .ast_nodes import *
+from .resolver import ScopeAnalysis
+from .interpreter import Interpreter
+from .closure_compiler import ClosureCompiler, ClosureInterpreter
+from .transpiler import TranspiledInterpreter
+from .runtime import default_value
+from .output import OutputSink
+from .input import InputSource
+from .limits import StepBudget
+
+# Resultados guardados por função antes de descartar os usados há mais tempo
+DEFAULT_MEMO_SIZE = 100000
+
+# Marca de ausência no cache (None não serve: é um resultado possível)
+MISSING = object()
+
+# Tipos dos argumentos que podem formar uma chave do cache
+KEY_TYPES = frozenset((int, float, bool, str))
+
+def find_pure_functions(program: Program) -> Set[str]:
+    """
+    Nomes das funções puras do programa. Arrays são declarados só como
+    variáveis globais, então uma função sem nomes livres não lê estado
+    externo. Um parâmetro ainda pode receber um array global, que a chamada
+    não copia; essas chamadas não usam o cache (argument_key).
+    """
+    analysis = ScopeAnalysis(program)
+    callees: Dict[str, Set[str]] = {}
+
+    for name, function in analysis.functions.items():
+        if analysis.free_names[id(function)]:
+            continue
+
+        calls: Set[str] = set()
+        pending: List[ASTNode] = [function.body]
+        pure = True
+        while pending and pure:
+            node = pending.pop()
+            if isinstance(node, (ReadlnStatement, WritelnStatement, ProcedureCall)):
+                pure = False
+            elif isinstance(node, FunctionCall):
+                callee = analysis.callee(node)
+                if callee is None:
+                    # Chamada que sempre falha: o erro não pode ser guardado
+                    pure = False
+                else:
+                    calls.add(callee.name)
+            if isinstance(node, (WhileStatement, ForStatement)):
+                pending.extend(invariant.value for invariant in node.invariants)
+            pending.extend(iter_child_nodes(node))
+
+        if pure:
+            callees[name] = calls
+
+    # Funções que chamam funções impuras também são impuras (até um ponto fixo)
+    changed = True
+    while changed:
+        changed = False
+        for name, calls in list(callees.items()):
+            if not calls <= callees.keys():
+                del callees[name]
+                changed = True
+
+    return set(callees)
+
+def argument_key(arguments: tuple) -> Optional[tuple]:
+    """Chave do cache para os argumentos, ou None se algum não é escalar (ex.: um array)."""
+    types = tuple(map(type, arguments))
+    if not KEY_TYPES.issuperset(types):
+        return None
+    # 1, 1.0 e True são a mesma chave em um dicionário, mas não o mesmo valor Pascal
+    return arguments + types
+
+class MemoCache:
+    """Resultados de uma função por argumentos, com descarte LRU."""
+
+    def __init__(self, max_size: int = DEFAULT_MEMO_SIZE):
+        if max_size < 1:
+            raise ValueError(f"Tamanho de cache inválido: {max_size}")
+
+        self.max_size = max_size
+        self.results: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> Any:
+        """Resultado guardado para key, ou MISSING."""
+        result = self.results.get(key, MISSING)
+        if result is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.results.move_to_end(key)
+        return result
+
+    def put(self, key: tuple, result: Any):
+        results = self.results
+        results[key] = result
+        if len(results) > self.max_size:
+            results.popitem(last=False)
+            self.evictions += 1
+
+class Memoizer:
+    """Caches das funções puras de um programa e suas estatísticas."""
+
+    def __init__(self, max_size: int = DEFAULT_MEMO_SIZE):
+        self.max_size = max_size
+        self.caches: Dict[str, MemoCache] = {}
+
+    def analyze(self, program: Program) -> Dict[str, MemoCache]:
+        self.caches = {name: MemoCache(self.max_size) for name in sorted(find_pure_functions(program))}
+        return self.caches
+
+    def report(self) -> str:
+        """Tabela de acertos e falhas por função memoizada."""
+        if not self.caches:
+            return "Nenhuma função pura encontrada"
+
+        lines = [f"{'Função':<24} {'Acertos':>10} {'Falhas':>10} {'Taxa':>7} "
+                 f"{'Entradas':>10} {'Descartes':>10}"]
+        for name, cache in self.caches.items():
+            calls = cache.hits + cache.misses
+            rate = cache.hits / calls * 100 if calls else 0.0
+            lines.append(f"{name:<24} {cache.hits:>10} {cache.misses:>10} {rate:>6.1f}% "
+                         f"{len(cache.results):>10} {cache.evictions:>10}")
+        return '\n'.join(lines)
+
+class MemoizingInterpreter(Interpreter):
+    """Tree-walker que consulta o cache antes de executar uma função pura."""
+
+    def __init__(self, output: Optional[OutputSink] = None, source: Optional[InputSource] = None,
+                 memoizer: Optional[Memoizer] = None):
+        super().__init__(output, source)
+        self.memoizer = memoizer if memoizer is not None else Memoizer()
+        self.memo_caches: Dict[str, MemoCache] = {}
+
+    def interpret(self, program: Program):
+        self.memo_caches = self.memoizer.analyze(program)
+        super().interpret(program)
+
+    def call_function(self, call: FunctionCall) -> Any:
+        function = call.routine
+        cache = self.memo_caches.get(call.name)
+        if cache is None or function is None:
+            return super().call_function(call)
+
+        budget = self.budget
+        pool = self.frame_pools[function.frame_size]
+        caller = self.frame
+        frame = self.frame = pool.acquire(caller, call.scope)
+
+        try:
+            # Argumentos são avaliados no frame novo, como em Interpreter.call_function
+            values = frame.values
+            count = len(call.arguments)
+            for i, argument in enumerate(call.arguments):
+                values[i] = self.evaluate_expression(argument)
+
+            key = argument_key(tuple(values[:count]))
+            entry = MISSING if key is None else cache.get(key)
+            if entry is not MISSING:
+                result, steps = entry
+                if budget is not None:
+                    budget.charge(steps)
+                return result
+
+            before = budget.steps if budget is not None else 0
+            completion = self.execute_routine(function)
+            if completion is not None:
+                result = completion.value
+            else:
+                result = default_value(function.return_type)
+            if key is not None:
+                cache.put(key, (result, budget.steps - before if budget is not None else 0))
+            return result
+
+        finally:
+            self.frame = caller
+            pool.release(frame)
+
+class MemoizingClosureCompiler(ClosureCompiler):
+    """Gera chamadas de funções puras que consultam o cache antes de executar o corpo."""
+
+    def compile_function_call(self, expression: FunctionCall):
+        name = expression.name
+        cache = self.interpreter.memo_caches.get(name)
+        function = self.interpreter.functions.get(name)
+        if cache is None or function is None or len(expression.arguments) != len(function.parameters):
+            return super().compile_function_call(expression)
+
+        bindings = self.compile_bindings(expression.arguments)
+        body = self.compile_routine_body(function)
+        default = default_value(function.return_type)
+        count = len(bindings)
+        scope = expression.scope
+        interpreter = self.interpreter
+        pool = interpreter.frame_pools[function.frame_size]
+        acquire, release = pool.acquire, pool.release
+        get, put = cache.get, cache.put
+        budget = interpreter.budget
+
+        def call_memoized():
+            caller = interpreter.frame
+            frame = interpreter.frame = acquire(caller, scope)
+
+            try:
+                values = frame.values
+                for slot, argument in bindings:
+                    values[slot] = argument()
+
+                key = argument_key(tuple(values[:count]))
+                entry = MISSING if key is None else get(key)
+                if entry is not MISSING:
+                    result, steps = entry
+                    if budget is not None:
+                        budget.charge(steps)
+                    return result
+
+                # O corpo conta o passo da chamada, como em compile_routine_body
+                before = budget.steps if budget is not None else 0
+                completion = body[0]()
+                result = completion.value if completion is not None else default
+                if key is not None:
+                    put(key, (result, budget.steps - before if budget is not None else 0))
+                return result
+
+            finally:
+                interpreter.frame = caller
+                release(frame)
+        return call_memoized
+
+class MemoizingClosureInterpreter(ClosureInterpreter):
+    """Backend de closures com memoização das funções puras."""
+    compiler_class = MemoizingClosureCompiler
+
+    def __init__(self, output: Optional[OutputSink] = None, source: Optional[InputSource] = None,
+                 memoizer: Optional[Memoizer] = None):
+        super().__init__(output, source)
+        self.memoizer = memoizer if memoizer is not None else Memoizer()
+        self.memo_caches: Dict[str, MemoCache] = {}
+
+    def interpret(self, program: Program):
+        self.memo_caches = self.memoizer.analyze(program)
+        super().interpret(program)
+
+class MemoizingTranspiledInterpreter(TranspiledInterpreter):
+    """
+    Backend traduzido para Python com memoização: cada função pura gerada é
+    trocada no namespace por um invólucro com cache, que as chamadas
+    recursivas também usam, pois buscam a função pelo nome global.
+    """
+
+    def __init__(self, output: Optional[OutputSink] = None, source: Optional[InputSource] = None,
+                 memoizer: Optional[Memoizer] = None):
+        super().__init__(output, source)
+        self.memoizer = memoizer if memoizer is not None else Memoizer()
+        self.memo_caches: Dict[str, MemoCache] = {}
+
+    def interpret(self, program: Program):
+        self.memo_caches = self.memoizer.analyze(program)
+        super().interpret(program)
+
+    def link(self, namespace: Dict[str, Any]):
+        # Nome Python da função gerada: ver PythonTranspiler.routine_name
+        for name, cache in self.memo_caches.items():
+            namespace[f"f_{name}"] = memoize(namespace[f"f_{name}"], cache, self.budget)
+
+def memoize(function, cache: MemoCache, budget: Optional[StepBudget] = None):
+    get, put = cache.get, cache.put
+
+    def memoized(*arguments):
+        key = argument_key(arguments)
+        if key is None:
+            return function(*arguments)
+        entry = get(key)
+        if entry is not MISSING:
+            result, steps = entry
+            if budget is not None:
+                budget.charge(steps)
+            return result
+
+        before = budget.steps if budget is not None else 0
+        result = function(*arguments)
+        put(key, (result, budget.steps - before if budget is not None else 0))
+        return result
+    return memoized
+
+# Backends com suporte a --memoize (selecionados com --backend=<nome>)
+MEMOIZING_BACKENDS = {
+    'tree': MemoizingInterpreter,
+    'closure': MemoizingClosureInterpreter,
+    'python': MemoizingTranspiledInterpreter,
+}
@@ -0,0 +1,808 @@
+"""
+Otimizador da AST para o compilador Pascal.
+Executado entre a análise sintática e a execução (opção -O): dobra
+expressões constantes, simplifica identidades algébricas, propaga o valor
+de variáveis atribuídas uma única vez, remove código inalcançável, retira
+código invariante de laços e marca laços vetorizáveis. Toda
+transformação preserva a saída e os erros de execução de qualquer backend.
+"""
+
+import math
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from .ast_nodes import *
+from .resolver import ScopeAnalysis
+from .runtime import BINARY_OPERATORS, UNARY_OPERATORS, default_value, is_truthy
+from .vectorizer import Vectorizer
+
+# Tipos dos valores em tempo de execução; ANY cobre arrays, None e entradas desconhecidas
+INTEGER = 'integer'
+REAL = 'real'
+BOOLEAN = 'boolean'
+STRING = 'string'
+ANY = 'any'
+
+NUMERIC = frozenset({INTEGER, REAL})
+NOTHING: FrozenSet[str] = frozenset()
+
+COMPARISON_OPERATORS = {'=', '<>', '<', '>', '<=', '>='}
+
+# Prefixo dos temporários criados pelo otimizador: não é um identificador válido em Pascal
+TEMPORARY_PREFIX = '$'
+
+# Literais maiores que isso não são gerados pelo dobramento (bits de inteiros, tamanho de strings)
+MAX_FOLDED_SIZE = 4096
+
+Literal = (NumberLiteral, StringLiteral, BooleanLiteral)
+
+def value_kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return BOOLEAN
+    elif isinstance(value, int):
+        return INTEGER
+    elif isinstance(value, float):
+        return REAL
+    elif isinstance(value, str):
+        return STRING
+    return ANY
+
+def make_literal(value: Any, line: int = 0) -> Optional[Expression]:
+    """Literal com o valor dado, ou None se o valor não pode virar literal."""
+    if isinstance(value, bool):
+        return BooleanLiteral(value, line)
+    elif isinstance(value, int):
+        if value.bit_length() > MAX_FOLDED_SIZE:
+            return None
+        return NumberLiteral(value, line)
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return NumberLiteral(value, line)
+    elif isinstance(value, str):
+        if len(value) > MAX_FOLDED_SIZE:
+            return None
+        return StringLiteral(value, line)
+    return None
+
+def is_int_literal(expression: Expression, value: int) -> bool:
+    return (isinstance(expression, NumberLiteral) and type(expression.value) is int
+            and expression.value == value)
+
+def arithmetic_kinds(operator: str, left: str, right: str) -> FrozenSet[str]:
+    """Tipos possíveis de left op right para + - *, vazio se a operação sempre falha."""
+    if ANY in (left, right):
+        return frozenset({ANY})
+    numbers = {INTEGER, REAL, BOOLEAN}
+    if left in numbers and right in numbers:
+        return frozenset({REAL if REAL in (left, right) else INTEGER})
+    if operator == '+' and left == right == STRING:
+        return frozenset({STRING})
+    if operator == '*' and {left, right} in ({STRING, INTEGER}, {STRING, BOOLEAN}):
+        return frozenset({STRING})
+    return NOTHING
+
+class TypeInference:
+    """
+    Tipos que cada expressão pode produzir durante a execução.
+    Como o tree-walker usa escopo dinâmico, a análise é feita por nome: o
+    conjunto de tipos de um nome reúne todas as suas escritas no programa
+    (declarações, parâmetros, variáveis de for, atribuições e readln).
+    """
+
+    def __init__(self, program: Program):
+        self.scopes = ScopeAnalysis(program)
+        self.names: Dict[str, FrozenSet[str]] = {}
+        self.returns: Dict[str, FrozenSet[str]] = {}
+        self.writes: List[Tuple[str, Any]] = []
+        self.results: List[Tuple[str, Any]] = []
+        self.collect(program)
+        self.solve()
+
+    def collect(self, program: Program):
+        for decl in program.declarations:
+            if isinstance(decl, VariableDeclaration):
+                if decl.value is not None:
+                    self.writes.append((decl.name, decl.value))
+                else:
+                    self.writes.append((decl.name, frozenset({value_kind(default_value(decl.var_type))})))
+            elif isinstance(decl, ArrayDeclaration):
+                self.writes.append((decl.name, frozenset({ANY})))
+
+        for name, function in self.scopes.functions.items():
+            self.results.append((name, frozenset({value_kind(default_value(function.return_type))})))
+            for node in self.walk(function.body):
+                if isinstance(node, ReturnStatement):
+                    self.results.append((name, node.value if node.value is not None else frozenset({ANY})))
+
+        for routine in self.scopes.routines + [program]:
+            for node in self.walk(routine.body):
+                if isinstance(node, Assignment) and isinstance(node.target, Variable):
+                    self.writes.append((node.target.name, node.value))
+                elif isinstance(node, ForStatement):
+                    self.writes.append((node.variable, frozenset({INTEGER})))
+                elif isinstance(node, ReadlnStatement):
+                    for target in node.targets:
+                        if isinstance(target, Variable):
+                            self.writes.append((target.name, frozenset({INTEGER, REAL, STRING})))
+                elif isinstance(node, (ProcedureCall, FunctionCall)):
+                    callee = self.scopes.callee(node)
+                    if callee is not None:
+                        for param, argument in zip(callee.parameters, node.arguments):
+                            self.writes.append((param.name, argument))
+
+    def walk(self, node: ASTNode):
+        yield node
+        for child in iter_child_nodes(node):
+            yield from self.walk(child)
+
+    def solve(self):
+        # Os tipos só crescem, então a iteração termina em um ponto fixo
+        changed = True
+        while changed:
+            changed = False
+            for table, sources in ((self.names, self.writes), (self.returns, self.results)):
+                for name, source in sources:
+                    kinds = source if isinstance(source, frozenset) else self.kind(source)
+                    current = table.get(name, NOTHING)
+                    if not kinds <= current:
+                        table[name] = current | kinds
+                        changed = True
+
+    def kind(self, expression: Expression) -> FrozenSet[str]:
+        if isinstance(expression, Literal):
+            return frozenset({value_kind(expression.value)})
+
+        elif isinstance(expression, Variable):
+            return self.names.get(expression.name, NOTHING)
+
+        elif isinstance(expression, BinaryOperation):
+            operator = expression.operator
+            if operator in COMPARISON_OPERATORS or operator in ('and', 'or'):
+                return frozenset({BOOLEAN})
+            elif operator == '/':
+                return frozenset({REAL})
+            elif operator in ('div', 'mod'):
+                return frozenset({INTEGER})
+            elif operator in ('+', '-', '*'):
+                kinds = set()
+                for left in self.kind(expression.left):
+                    for right in self.kind(expression.right):
+                        kinds |= arithmetic_kinds(operator, left, right)
+                return frozenset(kinds)
+            return NOTHING
+
+        elif isinstance(expression, UnaryOperation):
+            if expression.operator == 'not':
+                return frozenset({BOOLEAN})
+            elif expression.operator in ('-', '+'):
+                kinds = set()
+                for operand in self.kind(expression.operand):
+                    if operand in (INTEGER, BOOLEAN):
+                        kinds.add(INTEGER)
+                    elif operand in (REAL, ANY):
+                        kinds.add(operand)
+                return frozenset(kinds)
+            return NOTHING
+
+        elif isinstance(expression, FunctionCall):
+            if self.scopes.callee(expression) is None:
+                return NOTHING
+            return self.returns.get(expression.name, NOTHING)
+
+        return frozenset({ANY})
+
+    def is_kind(self, expression: Expression, kinds: FrozenSet[str]) -> bool:
+        """True se a expressão sempre produz um valor de um dos tipos dados."""
+        found = self.kind(expression)
+        return bool(found) and found <= kinds
+
+class Optimizer:
+    """
+    Otimizações sobre a AST, aplicadas antes da resolução de escopo:
+    - dobramento de constantes: subárvores só com literais viram um literal,
+      exceto quando a avaliação falharia (divisão por zero, tipos inválidos),
+      para que o erro continue acontecendo em tempo de execução
+    - identidades algébricas: x + 0, x - 0, x * 1, x div 1, -(-x), not not b,
+      b and true, b or false e (x + c1) + c2, aplicadas só quando os tipos
+      garantem o mesmo resultado
+    - propagação de constantes: variáveis globais escritas uma única vez com
+      um literal (na declaração ou em um comando do programa principal) são
+      substituídas pelo valor nos pontos em que ele já foi atribuído
+    - eliminação de código morto: ramos de if com condição constante, laços
+      que nunca executam, comandos depois de um return (ou de um while que
+      nunca termina) e rotinas que nunca são chamadas
+    - movimentação de código invariante: subexpressões de while e for cujos
+      operandos o laço não escreve, e que não podem falhar, são calculadas uma
+      vez antes do laço em temporários (Invariant) ligados ao frame
+    - vetorização: laços for elemento a elemento sobre arrays numéricos são
+      anotados para execução com NumPy (ver vectorizer.py)
+    """
+
+    def __init__(self):
+        self.types: Optional[TypeInference] = None
+        self.scopes: Optional[ScopeAnalysis] = None
+        self.constants: Dict[str, Expression] = {}
+        self.simplified = 0
+        self.eliminated = 0
+        self.hoisted = 0
+        self.vectorized = 0
+        self.temporaries = 0
+        # Estado da movimentação de código do laço sendo otimizado
+        self.routine_writes: Dict[int, Set[str]] = {}
+        self.loop_written: Set[str] = set()
+        self.loop_defined: Set[str] = set()
+        self.loop_invariants: Dict[Tuple, Invariant] = {}
+
+    def optimize(self, program: Program) -> Program:
+        self.types = TypeInference(program)
+        self.scopes = self.types.scopes
+        self.constants = {}
+        self.visit(program)
+        self.propagate(program)
+
+        # Um ramo removido pode deixar uma única atribuição para outra variável
+        while self.eliminate(program):
+            self.propagate(program)
+
+        self.hoist_invariants(program)
+
+        vectorizer = Vectorizer()
+        vectorizer.vectorize(program)
+        self.vectorized = vectorizer.vectorized
+        return program
+
+    def propagate(self, program: Program):
+        # Cada propagação pode tornar literal o valor de outra variável
+        known: Set[str] = set()
+        while True:
+            main_constants, routine_constants = self.find_constants(program)
+            if set(main_constants) <= known:
+                break
+            known = set(main_constants)
+
+            for routine in self.scopes.routines:
+                self.constants = routine_constants
+                self.visit(routine.body)
+
+            statements = program.body.statements
+            for index, statement in enumerate(statements):
+                self.constants = {name: literal for name, (start, literal) in main_constants.items()
+                                  if index >= start}
+                statements[index] = self.visit(statement)
+            self.constants = {}
+
+    def find_constants(self, program: Program) -> Tuple[Dict[str, Tuple[int, Expression]], Dict[str, Expression]]:
+        """
+        Variáveis globais com um único valor literal.
+        Retorna, para o programa principal, o índice do primeiro comando em que
+        cada valor vale e, para as rotinas, os valores válidos em qualquer chamada.
+        """
+        declarations: Dict[str, List[ASTNode]] = {}
+        for decl in program.declarations:
+            if isinstance(decl, (VariableDeclaration, ArrayDeclaration)):
+                declarations.setdefault(decl.name, []).append(decl)
+
+        # Nomes ligados por parâmetros, laços ou readln nunca são constantes
+        excluded = set()
+        for routine in self.scopes.routines:
+            excluded.update(param.name for param in routine.parameters)
+
+        assignments: Dict[str, List[ASTNode]] = {}
+        for routine in self.scopes.routines + [program]:
+            for node in self.types.walk(routine.body):
+                if isinstance(node, Assignment) and isinstance(node.target, Variable):
+                    assignments.setdefault(node.target.name, []).append(node)
+                elif isinstance(node, ForStatement):
+                    excluded.add(node.variable)
+                elif isinstance(node, ReadlnStatement):
+                    excluded.update(target.name for target in node.targets if isinstance(target, Variable))
+
+        # Rotinas chamadas antes de uma atribuição veriam o valor anterior
+        first_call = len(program.body.statements)
+        for index, statement in enumerate(program.body.statements):
+            if self.has_call(statement):
+                first_call = index
+                break
+        for decl in program.declarations:
+            if isinstance(decl, VariableDeclaration) and decl.value is not None and self.has_call(decl.value):
+                first_call = -1
+
+        positions = {id(statement): index for index, statement in enumerate(program.body.statements)}
+        main_constants: Dict[str, Tuple[int, Expression]] = {}
+        routine_constants: Dict[str, Expression] = {}
+
+        for name, decls in declarations.items():
+            decl = decls[0]
+            if len(decls) != 1 or not isinstance(decl, VariableDeclaration) or name in excluded:
+                continue
+
+            writes = assignments.get(name, [])
+            if not writes:
+                if decl.value is None:
+                    literal = make_literal(default_value(decl.var_type), decl.line)
+                else:
+                    literal = decl.value if isinstance(decl.value, Literal) else None
+                if literal is not None:
+                    main_constants[name] = (0, literal)
+                    if first_call >= 0:
+                        routine_constants[name] = literal
+
+            elif len(writes) == 1 and id(writes[0]) in positions and isinstance(writes[0].value, Literal):
+                index = positions[id(writes[0])]
+                main_constants[name] = (index + 1, writes[0].value)
+                if first_call > index:
+                    routine_constants[name] = writes[0].value
+
+        return main_constants, routine_constants
+
+    def has_call(self, node: ASTNode) -> bool:
+        return any(isinstance(child, (ProcedureCall, FunctionCall)) for child in self.types.walk(node))
+
+    # Percurso da árvore
+    def visit(self, node: Optional[ASTNode]) -> Optional[ASTNode]:
+        if node is None:
+            return None
+
+        if isinstance(node, Assignment):
+            self.visit_target(node.target)
+            node.value = self.visit(node.value)
+            return node
+        elif isinstance(node, ReadlnStatement):
+            for target in node.targets:
+                self.visit_target(target)
+            return node
+        elif isinstance(node, ArrayAccess):
+            node.index = self.visit(node.index)
+            return node
+        elif isinstance(node, Variable):
+            literal = self.constants.get(node.name)
+            if literal is None:
+                return node
+            self.simplified += 1
+            return make_literal(literal.value, node.line)
+
+        for field in node._fields:
+            value = getattr(node, field)
+            if isinstance(value, ASTNode):
+                setattr(node, field, self.visit(value))
+            elif isinstance(value, list):
+                value[:] = [self.visit(item) if isinstance(item, ASTNode) else item for item in value]
+
+        if isinstance(node, BinaryOperation):
+            return self.simplify_binary(node)
+        elif isinstance(node, UnaryOperation):
+            return self.simplify_unary(node)
+        return node
+
+    def visit_target(self, target: Expression):
+        # O destino de uma escrita nunca é substituído, só o índice é otimizado
+        if isinstance(target, ArrayAccess):
+            target.index = self.visit(target.index)
+
+    # Simplificações
+    def simplify_binary(self, node: BinaryOperation) -> Expression:
+        left, operator, right = node.left, node.operator, node.right
+
+        if isinstance(left, Literal) and isinstance(right, Literal):
+            function = BINARY_OPERATORS.get(operator)
+            if function is not None:
+                try:
+                    literal = make_literal(function(left.value, right.value), node.line)
+                except Exception:
+                    # O erro deve acontecer na execução, se o código for alcançado
+                    literal = None
+                if literal is not None:
+                    self.simplified += 1
+                    return literal
+
+        simplified = self.simplify_identity(left, operator, right)
+        if simplified is not None:
+            self.simplified += 1
+            return simplified
+        return node
+
+    def simplify_identity(self, left: Expression, operator: str, right: Expression) -> Optional[Expression]:
+        types = self.types
+        integer = frozenset({INTEGER})
+        boolean = frozenset({BOOLEAN})
+
+        if operator in ('+', '-'):
+            offset = self.split_offset(left)
+            if offset is not None and isinstance(right, NumberLiteral) and type(right.value) is int:
+                base, value = offset
+                value = value + right.value if operator == '+' else value - right.value
+                return self.build_offset(base, value)
+
+        if operator == '+':
+            if is_int_literal(right, 0) and types.is_kind(left, integer):
+                return left
+            if is_int_literal(left, 0) and types.is_kind(right, integer):
+                return right
+        elif operator == '-':
+            if is_int_literal(right, 0) and types.is_kind(left, NUMERIC):
+                return left
+        elif operator == '*':
+            if is_int_literal(right, 1) and types.is_kind(left, NUMERIC):
+                return left
+            if is_int_literal(left, 1) and types.is_kind(right, NUMERIC):
+                return right
+        elif operator == 'div':
+            if is_int_literal(right, 1) and types.is_kind(left, integer):
+                return left
+        elif operator in ('and', 'or'):
+            neutral = operator == 'and'
+            if isinstance(right, BooleanLiteral) and right.value is neutral and types.is_kind(left, boolean):
+                return left
+            if isinstance(left, BooleanLiteral) and left.value is neutral and types.is_kind(right, boolean):
+                return right
+        return None
+
+    def split_offset(self, expression: Expression) -> Optional[Tuple[Expression, int]]:
+        """Decompõe uma expressão inteira da forma x + c ou x - c em (x, ±c)."""
+        if not isinstance(expression, BinaryOperation) or expression.operator not in ('+', '-'):
+            return None
+        left, right = expression.left, expression.right
+        if isinstance(right, NumberLiteral) and type(right.value) is int:
+            if self.types.is_kind(left, frozenset({INTEGER})):
+                return left, right.value if expression.operator == '+' else -right.value
+        if expression.operator == '+' and isinstance(left, NumberLiteral) and type(left.value) is int:
+            if self.types.is_kind(right, frozenset({INTEGER})):
+                return right, left.value
+        return None
+
+    def build_offset(self, base: Expression, offset: int) -> Expression:
+        if offset == 0:
+            return base
+        elif offset > 0:
+            return BinaryOperation(base, '+', NumberLiteral(offset, base.line), base.line)
+        return BinaryOperation(base, '-', NumberLiteral(-offset, base.line), base.line)
+
+    def simplify_unary(self, node: UnaryOperation) -> Expression:
+        operator, operand = node.operator, node.operand
+
+        if isinstance(operand, Literal):
+            function = UNARY_OPERATORS.get(operator)
+            if function is not None:
+                try:
+                    literal = make_literal(function(operand.value), node.line)
+                except Exception:
+                    literal = None
+                if literal is not None:
+                    self.simplified += 1
+                    return literal
+
+        simplified = None
+        if operator == '+' and self.types.is_kind(operand, NUMERIC):
+            simplified = operand
+        elif isinstance(operand, UnaryOperation) and operand.operator == operator:
+            inner = operand.operand
+            if operator == 'not' and self.types.is_kind(inner, frozenset({BOOLEAN})):
+                simplified = inner
+            elif operator == '-' and self.types.is_kind(inner, NUMERIC):
+                simplified = inner
+
+        if simplified is not None:
+            self.simplified += 1
+            return simplified
+        return node
+
+    # Eliminação de código morto
+    def eliminate(self, program: Program) -> bool:
+        """Remove comandos e rotinas inalcançáveis. Retorna True se algo foi removido."""
+        eliminated = self.eliminated
+        for routine in self.scopes.routines:
+            self.prune(routine.body)
+        self.prune(program.body)
+        self.remove_unused_routines(program)
+        return self.eliminated > eliminated
+
+    def prune(self, statement: Statement) -> Optional[Statement]:
+        """Versão do comando sem partes inalcançáveis, ou None se ele não faz nada."""
+        if isinstance(statement, Block):
+            statement.statements = self.prune_statements(statement.statements)
+            return statement
+
+        elif isinstance(statement, IfStatement):
+            if isinstance(statement.condition, Literal):
+                self.eliminated += 1
+                if is_truthy(statement.condition.value):
+                    return self.prune(statement.then_stmt)
+                elif statement.else_stmt is not None:
+                    return self.prune(statement.else_stmt)
+                return None
+            statement.then_stmt = self.prune_required(statement.then_stmt)
+            if statement.else_stmt is not None:
+                statement.else_stmt = self.prune(statement.else_stmt)
+            return statement
+
+        elif isinstance(statement, WhileStatement):
+            if isinstance(statement.condition, Literal) and not is_truthy(statement.condition.value):
+                self.eliminated += 1
+                return None
+            statement.body = self.prune_required(statement.body)
+            return statement
+
+        elif isinstance(statement, ForStatement):
+            start, end = statement.start, statement.end
+            if (isinstance(start, NumberLiteral) and isinstance(end, NumberLiteral)
+                    and type(start.value) is int and type(end.value) is int and start.value > end.value):
+                self.eliminated += 1
+                return None
+            statement.body = self.prune_required(statement.body)
+            return statement
+
+        return statement
+
+    def prune_required(self, statement: Statement) -> Statement:
+        # Corpos de if, while e for não podem ficar vazios na AST
+        pruned = self.prune(statement)
+        return pruned if pruned is not None else Block([], statement.line)
+
+    def prune_statements(self, statements: List[Statement]) -> List[Statement]:
+        result: List[Statement] = []
+        for index, statement in enumerate(statements):
+            pruned = self.prune(statement)
+            if pruned is None:
+                continue
+
+            # Blocos aninhados não criam escopo: seus comandos são incorporados
+            if isinstance(pruned, Block):
+                result.extend(pruned.statements)
+            else:
+                result.append(pruned)
+
+            if self.never_completes(pruned):
+                self.eliminated += len(statements) - index - 1
+                break
+        return result
+
+    def never_completes(self, statement: Statement) -> bool:
+        """True se a execução nunca passa para o comando seguinte."""
+        if isinstance(statement, ReturnStatement):
+            return True
+        elif isinstance(statement, Block):
+            return any(self.never_completes(stmt) for stmt in statement.statements)
+        elif isinstance(statement, IfStatement):
+            return (statement.else_stmt is not None and self.never_completes(statement.then_stmt)
+                    and self.never_completes(statement.else_stmt))
+        elif isinstance(statement, WhileStatement):
+            # Não há break: um laço com condição sempre verdadeira só sai por return ou erro
+            return isinstance(statement.condition, Literal) and is_truthy(statement.condition.value)
+        return False
+
+    def remove_unused_routines(self, program: Program):
+        """Remove as rotinas que nunca são chamadas a partir do programa principal."""
+        used: Set[int] = set()
+        pending: List[ASTNode] = [program.body]
+        pending.extend(decl.value for decl in program.declarations
+                       if isinstance(decl, VariableDeclaration) and decl.value is not None)
+
+        while pending:
+            for node in self.types.walk(pending.pop()):
+                if isinstance(node, (ProcedureCall, FunctionCall)):
+                    table = self.scopes.procedures if isinstance(node, ProcedureCall) else self.scopes.functions
+                    # Chamadas com aridade errada também precisam da rotina para o erro
+                    routine = table.get(node.name)
+                    if routine is not None and id(routine) not in used:
+                        used.add(id(routine))
+                        pending.append(routine.body)
+
+        declarations = [decl for decl in program.declarations
+                        if not isinstance(decl, (ProcedureDeclaration, FunctionDeclaration)) or id(decl) in used]
+        if len(declarations) < len(program.declarations):
+            self.eliminated += len(program.declarations) - len(declarations)
+            program.declarations = declarations
+            self.scopes = ScopeAnalysis(program)
+
+    # Movimentação de código invariante
+    def hoist_invariants(self, program: Program):
+        self.routine_writes = self.find_routine_writes()
+        global_names = {decl.name for decl in program.declarations
+                        if isinstance(decl, (VariableDeclaration, ArrayDeclaration))}
+
+        for routine in self.scopes.routines:
+            params = {param.name for param in routine.parameters}
+            self.hoist_statement(routine.body, global_names | params)
+        self.hoist_statement(program.body, global_names)
+
+    def written_names(self, node: ASTNode) -> Set[str]:
+        """Nomes escritos diretamente pelo nó (sem contar rotinas chamadas)."""
+        if isinstance(node, Assignment) and isinstance(node.target, Variable):
+            return {node.target.name}
+        elif isinstance(node, ReadlnStatement):
+            return {target.name for target in node.targets if isinstance(target, Variable)}
+        elif isinstance(node, ForStatement):
+            return {node.variable}
+        return set()
+
+    def find_routine_writes(self) -> Dict[int, Set[str]]:
+        """
+        Nomes que cada rotina pode escrever fora do próprio frame, incluindo as
+        rotinas que ela chama: com escopo dinâmico, uma escrita em um nome que
+        não é parâmetro da rotina alcança o frame de quem chamou.
+        """
+        direct: Dict[int, Set[str]] = {}
+        calls: Dict[int, Set[int]] = {}
+        params: Dict[int, Set[str]] = {}
+        for routine in self.scopes.routines:
+            key = id(routine)
+            direct[key], calls[key] = set(), set()
+            params[key] = {param.name for param in routine.parameters}
+            for node in self.types.walk(routine.body):
+                direct[key] |= self.written_names(node)
+                if isinstance(node, (ProcedureCall, FunctionCall)):
+                    callee = self.scopes.callee(node)
+                    if callee is not None:
+                        calls[key].add(id(callee))
+
+        writes = {key: names - params[key] for key, names in direct.items()}
+        changed = True
+        while changed:
+            changed = False
+            for key in writes:
+                names = set(writes[key])
+                for callee in calls[key]:
+                    names |= writes[callee]
+                names -= params[key]
+                if names != writes[key]:
+                    writes[key] = names
+                    changed = True
+        return writes
+
+    def hoist_statement(self, statement: Optional[Statement], defined: Set[str]):
+        """Procura laços no comando; defined são os nomes com valor garantido ali."""
+        if isinstance(statement, (WhileStatement, ForStatement)):
+            self.hoist_loop(statement, defined)
+        elif isinstance(statement, Block):
+            for stmt in statement.statements:
+                self.hoist_statement(stmt, defined)
+        elif isinstance(statement, IfStatement):
+            self.hoist_statement(statement.then_stmt, defined)
+            self.hoist_statement(statement.else_stmt, defined)
+
+    def hoist_loop(self, loop: ASTNode, defined: Set[str]):
+        # Tudo que o laço (ou uma rotina chamada nele) pode escrever varia entre iterações
+        written: Set[str] = set()
+        for node in self.types.walk(loop):
+            written |= self.written_names(node)
+            if isinstance(node, (ProcedureCall, FunctionCall)):
+                callee = self.scopes.callee(node)
+                if callee is not None:
+                    written |= self.routine_writes[id(callee)]
+
+        self.loop_written, self.loop_defined, self.loop_invariants = written, defined, {}
+        if isinstance(loop, WhileStatement):
+            loop.condition = self.hoist_expression(loop.condition, frozenset())
+        self.hoist_body(loop.body)
+
+        loop.invariants = list(self.loop_invariants.values())
+        for invariant in loop.invariants:
+            self.types.names[invariant.name] = self.types.kind(invariant.value)
+
+        # Laços internos: o que não varia neles já pode ter ido para fora do externo
+        inner = defined | {invariant.name for invariant in loop.invariants}
+        if isinstance(loop, ForStatement):
+            inner = inner | {loop.variable}
+        self.hoist_statement(loop.body, inner)
+
+    def hoist_body(self, node: ASTNode):
+        """Troca as subexpressões invariantes dos comandos do laço por temporários."""
+        if isinstance(node, ProcedureCall):
+            self.hoist_arguments(node, frozenset())
+            return
+
+        for field in node._fields:
+            value = getattr(node, field)
+            if isinstance(value, Expression):
+                setattr(node, field, self.hoist_expression(value, frozenset()))
+            elif isinstance(value, ASTNode):
+                self.hoist_body(value)
+            elif isinstance(value, list):
+                for index, item in enumerate(value):
+                    if isinstance(item, Expression):
+                        value[index] = self.hoist_expression(item, frozenset())
+                    elif isinstance(item, ASTNode):
+                        self.hoist_body(item)
+
+    def hoist_expression(self, expression: Expression, shadowed: FrozenSet[str]) -> Expression:
+        if isinstance(expression, (BinaryOperation, UnaryOperation)) and self.is_invariant(expression, shadowed):
+            return self.temporary(expression)
+
+        if isinstance(expression, BinaryOperation):
+            expression.left = self.hoist_expression(expression.left, shadowed)
+            expression.right = self.hoist_expression(expression.right, shadowed)
+        elif isinstance(expression, UnaryOperation):
+            expression.operand = self.hoist_expression(expression.operand, shadowed)
+        elif isinstance(expression, ArrayAccess):
+            expression.index = self.hoist_expression(expression.index, shadowed)
+        elif isinstance(expression, FunctionCall):
+            self.hoist_arguments(expression, shadowed)
+        return expression
+
+    def hoist_arguments(self, call: ASTNode, shadowed: FrozenSet[str]):
+        callee = self.scopes.callee(call)
+        params = [param.name for param in callee.parameters] if callee is not None else []
+        for position, argument in enumerate(call.arguments):
+            # Argumentos são avaliados com os parâmetros anteriores já ligados
+            call.arguments[position] = self.hoist_expression(argument, shadowed | frozenset(params[:position]))
+
+    def is_invariant(self, expression: Expression, shadowed: FrozenSet[str]) -> bool:
+        names = {node.name for node in self.types.walk(expression) if isinstance(node, Variable)}
+        if names & self.loop_written or names & shadowed or not names <= self.loop_defined:
+            return False
+        return self.cannot_fail(expression)
+
+    def cannot_fail(self, expression: Expression) -> bool:
+        """
+        True se a expressão nunca lança erro, dados os tipos dos operandos.
+        Só expressões assim podem ser calculadas antes do laço, já que o laço
+        pode não executar nenhuma vez.
+        """
+        types = self.types
+        numbers = frozenset({INTEGER, BOOLEAN, REAL})
+        integers = frozenset({INTEGER, BOOLEAN})
+        reals = frozenset({REAL})
+        strings = frozenset({STRING})
+
+        if isinstance(expression, (NumberLiteral, StringLiteral, BooleanLiteral, Variable)):
+            return True
+
+        elif isinstance(expression, BinaryOperation):
+            left, operator, right = expression.left, expression.operator, expression.right
+            if not self.cannot_fail(left) or not self.cannot_fail(right):
+                return False
+
+            if operator in ('=', '<>', 'and', 'or'):
+                return True
+            elif operator in COMPARISON_OPERATORS:
+                return ((types.is_kind(left, numbers) and types.is_kind(right, numbers))
+                        or (types.is_kind(left, strings) and types.is_kind(right, strings)))
+            elif operator in ('+', '-', '*'):
+                # Inteiros e reais misturados podem estourar na conversão para float
+                if types.is_kind(left, integers) and types.is_kind(right, integers):
+                    return True
+                if types.is_kind(left, reals) and types.is_kind(right, reals):
+                    return True
+                return operator == '+' and types.is_kind(left, strings) and types.is_kind(right, strings)
+            elif operator in ('div', 'mod'):
+                return (isinstance(right, NumberLiteral) and type(right.value) is int and right.value != 0
+                        and types.is_kind(left, integers))
+            elif operator == '/':
+                return (isinstance(right, NumberLiteral) and right.value != 0
+                        and (type(right.value) is float or abs(right.value) < 2 ** 53)
+                        and types.is_kind(left, reals))
+            return False
+
+        elif isinstance(expression, UnaryOperation):
+            if not self.cannot_fail(expression.operand):
+                return False
+            if expression.operator == 'not':
+                return True
+            elif expression.operator in ('-', '+'):
+                return types.is_kind(expression.operand, numbers)
+            return False
+
+        return False
+
+    def temporary(self, expression: Expression) -> Variable:
+        # Ocorrências iguais da mesma expressão compartilham o temporário
+        key = self.expression_key(expression)
+        invariant = self.loop_invariants.get(key)
+        if invariant is None:
+            self.temporaries += 1
+            invariant = Invariant(f"{TEMPORARY_PREFIX}{self.temporaries}", expression, expression.line)
+            self.loop_invariants[key] = invariant
+        self.hoisted += 1
+        return Variable(invariant.name, expression.line)
+
+    def expression_key(self, expression: Expression) -> Tuple:
+        if isinstance(expression, Literal):
+            # O tipo distingue 1, 1.0 e true; repr distingue 0.0 de -0.0
+            return ('literal', type(expression.value).__name__, repr(expression.value))
+        elif isinstance(expression, Variable):
+            return ('variable', expression.name)
+        elif isinstance(expression, BinaryOperation):
+            return ('binary', expression.operator,
+                    self.expression_key(expression.left), self.expression_key(expression.right))
+        elif isinstance(expression, UnaryOperation):
+            return ('unary', expression.operator, self.expression_key(expression.operand))
+        return ('node', id(expression))
@@ -0,0 +1,86 @@
+"""
+Saída dos programas Pascal (writeln) para o compilador Pascal.
+Os backends escrevem cada linha em um OutputSink, que as acumula em um
+buffer grande e as envia ao stream de saída conforme a política de
+descarga, guardando uma cópia conforme o modo de captura (get_output()).
+"""
+
+import sys
+from collections import deque
+from typing import List, Optional, TextIO
+
+# Modos de captura: nenhuma linha, todas ou só as últimas N (buffer circular)
+CAPTURE_MODES = ('none', 'full', 'ring')
+# Políticas de descarga: 'line' envia cada linha, 'block' só quando o buffer
+# enche, e 'auto' escolhe 'line' em terminais e 'block' em arquivos e pipes
+FLUSH_POLICIES = ('auto', 'line', 'block')
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+DEFAULT_RING_LINES = 1000
+
+class OutputSink:
+    """
+    Destino das linhas escritas pelo programa. O buffer também é descarregado
+    antes de cada leitura de entrada (para o prompt aparecer depois da saída
+    anterior) e ao fim da execução, inclusive quando ela termina com erro.
+    """
+
+    def __init__(self, capture: str = 'full', flush: str = 'auto',
+                 ring_lines: int = DEFAULT_RING_LINES, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 stream: Optional[TextIO] = None):
+        if capture not in CAPTURE_MODES:
+            raise ValueError(f"Modo de captura desconhecido: {capture}")
+        if flush not in FLUSH_POLICIES:
+            raise ValueError(f"Política de descarga desconhecida: {flush}")
+        if ring_lines < 1:
+            raise ValueError("O buffer circular precisa guardar ao menos uma linha")
+
+        self.capture = capture
+        # None escreve no sys.stdout do momento da descarga
+        self.stream = stream
+
+        if flush == 'auto':
+            target = stream if stream is not None else sys.stdout
+            isatty = getattr(target, 'isatty', None)
+            flush = 'line' if isatty is not None and isatty() else 'block'
+        self.flush_policy = flush
+        # Tamanho pendente (em caracteres) que provoca a descarga
+        self.limit = 0 if flush == 'line' else buffer_size
+
+        self.pending: List[str] = []
+        self.pending_size = 0
+
+        if capture == 'full':
+            self.lines = []
+        elif capture == 'ring':
+            self.lines = deque(maxlen=ring_lines)
+        else:
+            self.lines = None
+
+    def write(self, line: str):
+        """Escreve uma linha (sem o '\\n' final)."""
+        if self.lines is not None:
+            self.lines.append(line)
+        self.pending.append(line)
+        self.pending_size += len(line) + 1
+        if self.pending_size >= self.limit:
+            self.flush()
+
+    def flush(self):
+        stream = self.stream if self.stream is not None else sys.stdout
+        if self.pending:
+            self.pending.append('')
+            stream.write('\n'.join(self.pending))
+            self.pending.clear()
+            self.pending_size = 0
+        stream.flush()
+
+    def get_output(self) -> List[str]:
+        """Linhas capturadas, conforme o modo de captura."""
+        if self.lines is None:
+            return []
+        return list(self.lines)
+
+    def clear(self):
+        if self.lines is not None:
+            self.lines.clear()
@@ -3,7 +3,8 @@ Analisador Sintático para o compilador Pascal.
 Responsável por converter tokens em uma Árvore Sintática Abstrata (AST).
 """
 
-from typing import List, Optional
+from collections import deque
+from typing import Deque, Iterable, List, Optional
 from .lexer import Token, TokenType
 from .ast_nodes import *
 
@@ -13,30 +14,59 @@ class ParseError(Exception):
         self.token = token
         super().__init__(f"Erro sintático na linha {token.line}, coluna {token.column}: {message}")
 
+# Maior deslocamento aceito por peek_token
+MAX_LOOKAHEAD = 4
+
 class Parser:
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    """
+    Parser recursive descent sobre um fluxo de tokens.
+    Aceita a lista de Lexer.tokenize() ou o gerador de Lexer.iter_tokens():
+    os tokens são puxados sob demanda para um buffer de lookahead limitado,
+    então a memória de tokens não cresce com o tamanho do arquivo.
+    """
+    
+    def __init__(self, tokens: Iterable[Token]):
+        self.tokens = iter(tokens)
+        self.lookahead: Deque[Token] = deque()
+        # Número de tokens já consumidos
         self.current = 0
+        self.token = self.next_token()
+        if self.token is None:
+            raise ValueError("Fluxo de tokens vazio")
+    
+    def next_token(self) -> Optional[Token]:
+        if self.lookahead:
+            return self.lookahead.popleft()
+        return next(self.tokens, None)
     
     def current_token(self) -> Token:
-        if self.current >= len(self.tokens):
-            return self.tokens[-1]  # EOF token
-        return self.tokens[self.current]
+        return self.token
     
     def peek_token(self, offset: int = 1) -> Token:
-        pos = self.current + offset
-        if pos >= len(self.tokens):
-            return self.tokens[-1]  # EOF token
-        return self.tokens[pos]
+        if offset == 0:
+            return self.token
+        if not 0 < offset <= MAX_LOOKAHEAD:
+            raise ValueError(f"Lookahead fora do limite: {offset}")
+        
+        while len(self.lookahead) < offset:
+            token = next(self.tokens, None)
+            if token is None:
+                # Além do fim, o último token (EOF) se repete
+                return self.lookahead[-1] if self.lookahead else self.token
+            self.lookahead.append(token)
+        return self.lookahead[offset - 1]
     
     def advance(self) -> Token:
-        token = self.current_token()
-        if self.current < len(self.tokens) - 1:
+        token = self.token
+        following = self.next_token()
+        # O último token (EOF) nunca é consumido
+        if following is not None:
+            self.token = following
             self.current += 1
         return token
     
     def match(self, *token_types: TokenType) -> bool:
-        return self.current_token().type in token_types
+        return self.token.type in token_types
     
     def consume(self, token_type: TokenType, message: str = None) -> Token:
         if self.current_token().type != token_type:
@@ -57,7 +87,7 @@ class Parser:
     
     def parse_program(self) -> Program:
         self.skip_newlines()
-        self.consume(TokenType.PROGRAM, "Esperado 'program'")
+        line = self.consume(TokenType.PROGRAM, "Esperado 'program'").line
         
         name_token = self.consume(TokenType.IDENTIFIER, "Esperado nome do programa")
         program_name = name_token.value
@@ -87,7 +117,7 @@ class Parser:
         
         self.consume(TokenType.DOT, "Esperado '.' no final do programa")
         
-        return Program(program_name, declarations, body)
+        return Program(program_name, declarations, body, line)
     
     def parse_variable_declarations(self) -> List[VariableDeclaration]:
         declarations = []
@@ -96,6 +126,7 @@ class Parser:
         
         while not self.match(TokenType.BEGIN, TokenType.PROCEDURE, TokenType.FUNCTION, TokenType.EOF):
             if self.match(TokenType.IDENTIFIER):
+                line = self.token.line
                 var_names = [self.consume(TokenType.IDENTIFIER).value]
                 
                 while self.match(TokenType.COMMA):
@@ -118,13 +149,13 @@ class Parser:
                     element_type = self.parse_type()
                     
                     for name in var_names:
-                        declarations.append(ArrayDeclaration(name, element_type, size))
+                        declarations.append(ArrayDeclaration(name, element_type, size, line))
                 else:
                     # Regular variable declaration
                     var_type = self.parse_type()
                     
                     for name in var_names:
-                        declarations.append(VariableDeclaration(name, var_type))
+                        declarations.append(VariableDeclaration(name, var_type, line=line))
                 
                 self.consume(TokenType.SEMICOLON)
                 self.skip_newlines()
@@ -150,7 +181,7 @@ class Parser:
             raise ParseError("Tipo esperado", self.current_token())
     
     def parse_procedure_declaration(self) -> ProcedureDeclaration:
-        self.consume(TokenType.PROCEDURE)
+        line = self.consume(TokenType.PROCEDURE).line
         name = self.consume(TokenType.IDENTIFIER).value
         
         parameters = []
@@ -171,10 +202,10 @@ class Parser:
         
         body = self.parse_block()
         
-        return ProcedureDeclaration(name, parameters, body)
+        return ProcedureDeclaration(name, parameters, body, line)
     
     def parse_function_declaration(self) -> FunctionDeclaration:
-        self.consume(TokenType.FUNCTION)
+        line = self.consume(TokenType.FUNCTION).line
         name = self.consume(TokenType.IDENTIFIER).value
         
         parameters = []
@@ -198,7 +229,7 @@ class Parser:
         
         body = self.parse_block()
         
-        return FunctionDeclaration(name, parameters, return_type, body)
+        return FunctionDeclaration(name, parameters, return_type, body, line)
     
     def parse_parameters(self) -> List[Parameter]:
         parameters = []
@@ -206,6 +237,7 @@ class Parser:
         
         if not self.match(TokenType.RPAREN):
             while True:
+                line = self.token.line
                 param_names = [self.consume(TokenType.IDENTIFIER).value]
                 
                 while self.match(TokenType.COMMA):
@@ -216,7 +248,7 @@ class Parser:
                 param_type = self.parse_type()
                 
                 for name in param_names:
-                    parameters.append(Parameter(name, param_type))
+                    parameters.append(Parameter(name, param_type, line))
                 
                 if not self.match(TokenType.SEMICOLON):
                     break
@@ -226,6 +258,7 @@ class Parser:
         return parameters
     
     def parse_block(self) -> Block:
+        line = self.token.line
         statements = []
         
         while not self.match(TokenType.END, TokenType.EOF):
@@ -241,7 +274,7 @@ class Parser:
                 self.advance()
         
         self.consume(TokenType.END)
-        return Block(statements)
+        return Block(statements, line)
     
     def parse_statement(self, require_semicolon=True) -> Optional[Statement]:
         self.skip_newlines()
@@ -272,7 +305,8 @@ class Parser:
             return None
     
     def parse_assignment_or_call(self, require_semicolon=True) -> Statement:
-        name = self.consume(TokenType.IDENTIFIER).value
+        token = self.consume(TokenType.IDENTIFIER)
+        name, line = token.value, token.line
         
         if self.match(TokenType.ASSIGN):
             # Assignment
@@ -280,7 +314,7 @@ class Parser:
             value = self.parse_expression()
             if require_semicolon:
                 self.consume(TokenType.SEMICOLON)
-            return Assignment(Variable(name), value)
+            return Assignment(Variable(name, line), value, line)
         elif self.match(TokenType.LBRACKET):
             # Array assignment
             self.advance()
@@ -290,7 +324,7 @@ class Parser:
             value = self.parse_expression()
             if require_semicolon:
                 self.consume(TokenType.SEMICOLON)
-            return Assignment(ArrayAccess(Variable(name), index), value)
+            return Assignment(ArrayAccess(Variable(name, line), index, line), value, line)
         elif self.match(TokenType.LPAREN):
             # Procedure call
             self.advance()
@@ -305,15 +339,15 @@ class Parser:
             self.consume(TokenType.RPAREN)
             if require_semicolon:
                 self.consume(TokenType.SEMICOLON)
-            return ProcedureCall(name, arguments)
+            return ProcedureCall(name, arguments, line)
         else:
             # Simple procedure call without parameters
             if require_semicolon:
                 self.consume(TokenType.SEMICOLON)
-            return ProcedureCall(name, [])
+            return ProcedureCall(name, [], line)
     
     def parse_if_statement(self) -> IfStatement:
-        self.consume(TokenType.IF)
+        line = self.consume(TokenType.IF).line
         condition = self.parse_expression()
         self.consume(TokenType.THEN)
         self.skip_newlines()
@@ -344,19 +378,19 @@ class Parser:
                 # Se não for BEGIN, não requer semicolon
                 else_stmt = self.parse_statement(require_semicolon=False)
         
-        return IfStatement(condition, then_stmt, else_stmt)
+        return IfStatement(condition, then_stmt, else_stmt, line)
     
     def parse_while_statement(self) -> WhileStatement:
-        self.consume(TokenType.WHILE)
+        line = self.consume(TokenType.WHILE).line
         condition = self.parse_expression()
         self.consume(TokenType.DO)
         self.skip_newlines()
         
         body = self.parse_statement()
-        return WhileStatement(condition, body)
+        return WhileStatement(condition, body, line)
     
     def parse_for_statement(self) -> ForStatement:
-        self.consume(TokenType.FOR)
+        line = self.consume(TokenType.FOR).line
         variable = self.consume(TokenType.IDENTIFIER).value
         self.consume(TokenType.ASSIGN)
         start = self.parse_expression()
@@ -366,10 +400,10 @@ class Parser:
         self.skip_newlines()
         
         body = self.parse_statement()
-        return ForStatement(variable, start, end, body)
+        return ForStatement(variable, start, end, body, line)
     
     def parse_readln_statement(self, require_semicolon=True) -> ReadlnStatement:
-        self.consume(TokenType.READLN)
+        line = self.consume(TokenType.READLN).line
         targets = []
         
         if self.match(TokenType.LPAREN):
@@ -385,10 +419,10 @@ class Parser:
         if require_semicolon:
             self.consume(TokenType.SEMICOLON)
         
-        return ReadlnStatement(targets)
+        return ReadlnStatement(targets, line)
     
     def parse_writeln_statement(self, require_semicolon=True) -> WritelnStatement:
-        self.consume(TokenType.WRITELN)
+        line = self.consume(TokenType.WRITELN).line
         expressions = []
         
         if self.match(TokenType.LPAREN):
@@ -406,10 +440,10 @@ class Parser:
         if require_semicolon:
             self.consume(TokenType.SEMICOLON)
         
-        return WritelnStatement(expressions)
+        return WritelnStatement(expressions, line)
     
     def parse_return_statement(self, require_semicolon=True) -> ReturnStatement:
-        self.consume(TokenType.RETURN)
+        line = self.consume(TokenType.RETURN).line
         
         value = None
         if not self.match(TokenType.SEMICOLON) and not self.match(TokenType.NEWLINE, TokenType.END, TokenType.ELSE):
@@ -418,7 +452,7 @@ class Parser:
         if require_semicolon:
             self.consume(TokenType.SEMICOLON)
         
-        return ReturnStatement(value)
+        return ReturnStatement(value, line)
     
     def parse_expression(self) -> Expression:
         return self.parse_or_expression()
@@ -429,7 +463,7 @@ class Parser:
         while self.match(TokenType.OR):
             operator = self.advance().value
             right = self.parse_and_expression()
-            expr = BinaryOperation(expr, operator, right)
+            expr = BinaryOperation(expr, operator, right, expr.line)
         
         return expr
     
@@ -439,7 +473,7 @@ class Parser:
         while self.match(TokenType.AND):
             operator = self.advance().value
             right = self.parse_equality_expression()
-            expr = BinaryOperation(expr, operator, right)
+            expr = BinaryOperation(expr, operator, right, expr.line)
         
         return expr
     
@@ -449,7 +483,7 @@ class Parser:
         while self.match(TokenType.EQUAL, TokenType.NOT_EQUAL):
             operator = self.advance().value
             right = self.parse_relational_expression()
-            expr = BinaryOperation(expr, operator, right)
+            expr = BinaryOperation(expr, operator, right, expr.line)
         
         return expr
     
@@ -460,7 +494,7 @@ class Parser:
                          TokenType.LESS_EQUAL, TokenType.GREATER_EQUAL):
             operator = self.advance().value
             right = self.parse_additive_expression()
-            expr = BinaryOperation(expr, operator, right)
+            expr = BinaryOperation(expr, operator, right, expr.line)
         
         return expr
     
@@ -470,7 +504,7 @@ class Parser:
         while self.match(TokenType.PLUS, TokenType.MINUS):
             operator = self.advance().value
             right = self.parse_multiplicative_expression()
-            expr = BinaryOperation(expr, operator, right)
+            expr = BinaryOperation(expr, operator, right, expr.line)
         
         return expr
     
@@ -480,34 +514,35 @@ class Parser:
         while self.match(TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.DIV, TokenType.MOD):
             operator = self.advance().value
             right = self.parse_unary_expression()
-            expr = BinaryOperation(expr, operator, right)
+            expr = BinaryOperation(expr, operator, right, expr.line)
         
         return expr
     
     def parse_unary_expression(self) -> Expression:
         if self.match(TokenType.NOT, TokenType.PLUS, TokenType.MINUS):
-            operator = self.advance().value
+            token = self.advance()
             operand = self.parse_unary_expression()
-            return UnaryOperation(operator, operand)
+            return UnaryOperation(token.value, operand, token.line)
         
         return self.parse_primary_expression()
     
     def parse_primary_expression(self) -> Expression:
+        line = self.token.line
         if self.match(TokenType.INTEGER):
             value = int(self.advance().value)
-            return NumberLiteral(value)
+            return NumberLiteral(value, line)
         elif self.match(TokenType.REAL):
             value = float(self.advance().value)
-            return NumberLiteral(value)
+            return NumberLiteral(value, line)
         elif self.match(TokenType.STRING):
             value = self.advance().value
-            return StringLiteral(value)
+            return StringLiteral(value, line)
         elif self.match(TokenType.TRUE):
             self.advance()
-            return BooleanLiteral(True)
+            return BooleanLiteral(True, line)
         elif self.match(TokenType.FALSE):
             self.advance()
-            return BooleanLiteral(False)
+            return BooleanLiteral(False, line)
         elif self.match(TokenType.IDENTIFIER):
             name = self.advance().value
             
@@ -523,16 +558,16 @@ class Parser:
                         arguments.append(self.parse_expression())
                 
                 self.consume(TokenType.RPAREN)
-                return FunctionCall(name, arguments)
+                return FunctionCall(name, arguments, line)
             elif self.match(TokenType.LBRACKET):
                 # Array access
                 self.advance()
                 index = self.parse_expression()
                 self.consume(TokenType.RBRACKET)
-                return ArrayAccess(Variable(name), index)
+                return ArrayAccess(Variable(name, line), index, line)
             else:
                 # Variable
-                return Variable(name)
+                return Variable(name, line)
         elif self.match(TokenType.LPAREN):
             self.advance()
             expr = self.parse_expression()
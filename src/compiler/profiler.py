@@ -0,0 +1,338 @@
+"""
+Profilers de linhas e de chamadas para o compilador Pascal.
+O de linhas conta as execuções e o tempo acumulado de cada linha do
+código-fonte, usando a linha guardada nos nós da AST, e gera uma listagem
+anotada do código e um arquivo de pilhas colapsadas para flame graphs.
+O de chamadas mede cada procedimento e função (chamadas, tempo próprio e
+total, profundidade de recursão e arestas chamador -> chamado) e gera uma
+tabela ordenável e um grafo de chamadas no formato DOT.
+
+Só os backends criados por este módulo fazem medições: sem --profile os
+backends normais executam sem nenhum custo adicional.
+"""
+
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+from .ast_nodes import *
+from .interpreter import Interpreter
+from .closure_compiler import ClosureCompiler, ClosureInterpreter
+from .output import OutputSink
+from .input import InputSource
+
+class LineProfiler:
+    """
+    Medições por linha. O tempo acumulado de uma linha inclui os comandos
+    aninhados e as rotinas chamadas por ela, contado uma única vez quando a
+    linha já está ativa mais acima na pilha (recursão). As pilhas colapsadas
+    guardam o tempo exclusivo de cada linha, identificada pela cadeia de
+    chamadas (rotina:linha de cada chamada ainda ativa).
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.hits: Dict[int, int] = defaultdict(int)
+        self.times: Dict[int, float] = defaultdict(float)
+        # (cadeia de chamadas, rotina, linha) -> tempo exclusivo
+        self.stacks: Dict[Tuple[Tuple[str, ...], str, int], float] = defaultdict(float)
+        self.total = 0.0
+
+        # Comandos em execução: [linha, tempo dos comandos aninhados, início]
+        self.active: List[list] = []
+        # Quantas vezes cada linha está ativa na pilha
+        self.depth: Dict[int, int] = defaultdict(int)
+        self.routine = ''
+        self.calls: Tuple[str, ...] = ()
+        self.saved: List[Tuple[str, Tuple[str, ...]]] = []
+        self.started = 0.0
+
+    def start(self, program_name: str):
+        self.routine = program_name
+        self.started = self.clock()
+
+    def stop(self):
+        self.total += self.clock() - self.started
+
+    def enter(self, line: int):
+        self.hits[line] += 1
+        self.depth[line] += 1
+        self.active.append([line, 0.0, self.clock()])
+
+    def exit(self):
+        now = self.clock()
+        line, children, start = self.active.pop()
+        elapsed = now - start
+
+        depth = self.depth[line] - 1
+        self.depth[line] = depth
+        if depth == 0:
+            self.times[line] += elapsed
+
+        if self.active:
+            self.active[-1][1] += elapsed
+        self.stacks[self.calls, self.routine, line] += elapsed - children
+
+    def enter_routine(self, name: str):
+        line = self.active[-1][0] if self.active else 0
+        self.saved.append((self.routine, self.calls))
+        self.calls = self.calls + (f"{self.routine}:{line}",)
+        self.routine = name
+
+    def exit_routine(self):
+        self.routine, self.calls = self.saved.pop()
+
+    def annotate(self, source: str) -> str:
+        """Listagem do código com execuções, tempo acumulado e porcentagem do total por linha."""
+        total = self.total or sum(self.times.values()) or 1.0
+        lines = [f"{'Linha':>6} {'Execuções':>10} {'Tempo (ms)':>12} {'%':>6}  Código"]
+        for number, text in enumerate(source.splitlines(), 1):
+            if number in self.hits:
+                elapsed = self.times[number]
+                lines.append(f"{number:>6} {self.hits[number]:>10} {elapsed * 1000:>12.3f} "
+                             f"{elapsed / total * 100:>6.1f}  {text}")
+            else:
+                lines.append(f"{number:>6} {'':>10} {'':>12} {'':>6}  {text}")
+        return '\n'.join(lines)
+
+    def collapsed_stacks(self) -> List[str]:
+        """Pilhas no formato 'quadro;quadro;... valor' (microssegundos de tempo exclusivo)."""
+        lines = []
+        for (calls, routine, line), elapsed in sorted(self.stacks.items()):
+            microseconds = round(elapsed * 1_000_000)
+            if microseconds > 0:
+                lines.append(';'.join(calls + (f"{routine}:{line}",)) + f" {microseconds}")
+        return lines
+
+    def write_stacks(self, path: str):
+        with open(path, 'w', encoding='utf-8') as file:
+            for line in self.collapsed_stacks():
+                file.write(line + '\n')
+
+# Ordens aceitas pela tabela do profiler de chamadas
+CALL_SORT_KEYS = ('self', 'total', 'calls', 'name')
+
+class CallProfiler:
+    """
+    Medições por rotina. O programa principal é a raiz, com uma chamada.
+    O tempo total de uma rotina é contado só na ativação mais externa
+    (recursão não soma o mesmo intervalo várias vezes); o tempo próprio
+    desconta o tempo das rotinas chamadas. As arestas contam as chamadas
+    de cada par chamador -> chamado e quantas execuções do chamador fizeram
+    essas chamadas; a razão entre os dois é o leque (fan-out) da recursão.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.self_times: Dict[str, float] = defaultdict(float)
+        self.total_times: Dict[str, float] = defaultdict(float)
+        self.max_depth: Dict[str, int] = defaultdict(int)
+        self.edges: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.edge_callers: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.program = ''
+
+        # Rotinas em execução: [nome, tempo das rotinas chamadas, início,
+        # rotinas já chamadas por esta execução]
+        self.active: List[list] = []
+        self.depth: Dict[str, int] = defaultdict(int)
+
+    def start(self, program_name: str):
+        self.program = program_name
+        self.calls[program_name] += 1
+        self.depth[program_name] += 1
+        self.max_depth[program_name] = max(self.max_depth[program_name], 1)
+        self.active.append([program_name, 0.0, self.clock(), set()])
+
+    def stop(self):
+        self.exit_routine()
+
+    def enter_routine(self, name: str):
+        self.calls[name] += 1
+        caller = self.active[-1]
+        edge = (caller[0], name)
+        self.edges[edge] += 1
+        if name not in caller[3]:
+            caller[3].add(name)
+            self.edge_callers[edge] += 1
+        depth = self.depth[name] + 1
+        self.depth[name] = depth
+        if depth > self.max_depth[name]:
+            self.max_depth[name] = depth
+        self.active.append([name, 0.0, self.clock(), set()])
+
+    def exit_routine(self):
+        now = self.clock()
+        name, children, start, _ = self.active.pop()
+        elapsed = now - start
+
+        self.self_times[name] += elapsed - children
+        depth = self.depth[name] - 1
+        self.depth[name] = depth
+        if depth == 0:
+            self.total_times[name] += elapsed
+        if self.active:
+            self.active[-1][1] += elapsed
+
+    def table(self, sort: str = 'self') -> str:
+        """Tabela das rotinas, ordenada por tempo próprio, tempo total, chamadas ou nome."""
+        if sort not in CALL_SORT_KEYS:
+            raise ValueError(f"Ordem desconhecida: {sort}")
+
+        keys = {
+            'self': lambda name: -self.self_times[name],
+            'total': lambda name: -self.total_times[name],
+            'calls': lambda name: -self.calls[name],
+            'name': lambda name: name,
+        }
+        names = sorted(sorted(self.calls), key=keys[sort])
+        total = self.total_times[self.program] or 1.0
+
+        lines = [f"{'Rotina':<24} {'Chamadas':>10} {'Próprio (ms)':>13} {'Total (ms)':>12} "
+                 f"{'% próprio':>10} {'Prof. máx.':>10}"]
+        for name in names:
+            lines.append(f"{name:<24} {self.calls[name]:>10} {self.self_times[name] * 1000:>13.3f} "
+                         f"{self.total_times[name] * 1000:>12.3f} "
+                         f"{self.self_times[name] / total * 100:>10.1f} {self.max_depth[name]:>10}")
+        return '\n'.join(lines)
+
+    def call_graph(self) -> str:
+        """Grafo de chamadas no formato DOT (Graphviz)."""
+        total = self.total_times[self.program] or 1.0
+        lines = ["digraph chamadas {", "    node [shape=box, fontname=\"monospace\"];"]
+
+        for name in sorted(self.calls):
+            share = self.self_times[name] / total
+            label = (f"{name}\\n{self.calls[name]} chamadas\\n"
+                     f"próprio {self.self_times[name] * 1000:.3f} ms ({share * 100:.1f}%)\\n"
+                     f"total {self.total_times[name] * 1000:.3f} ms")
+            # Quanto maior o tempo próprio, mais forte a cor do nó
+            color = f"0.000 {min(share, 1.0):.3f} 1.000"
+            lines.append(f"    \"{name}\" [label=\"{label}\", style=filled, fillcolor=\"{color}\"];")
+
+        for (caller, callee), count in sorted(self.edges.items()):
+            # Chamadas por execução do chamador que chamou: o leque da recursão
+            callers = self.edge_callers[caller, callee]
+            label = f"{count} chamadas\\nde {callers} execuções ({count / callers:.2f} por execução)"
+            lines.append(f"    \"{caller}\" -> \"{callee}\" [label=\"{label}\"];")
+
+        lines.append("}")
+        return '\n'.join(lines)
+
+    def write_call_graph(self, path: str):
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.call_graph() + '\n')
+
+class ProfilingInterpreter(Interpreter):
+    """
+    Tree-walker com profilers: o de linhas mede cada comando executado
+    (exceto blocos begin/end) e o de chamadas mede execute_routine. Como no
+    backend de closures, a medição de uma rotina começa depois da avaliação
+    dos argumentos, que fica com quem chama.
+    """
+
+    def __init__(self, output: Optional[OutputSink] = None, source: Optional[InputSource] = None,
+                 profiler: Optional[LineProfiler] = None, call_profiler: Optional[CallProfiler] = None):
+        super().__init__(output, source)
+        if profiler is None and call_profiler is None:
+            profiler = LineProfiler()
+        self.profiler = profiler
+        self.call_profiler = call_profiler
+        # Profilers avisados do início e do fim de cada rotina
+        self.routine_profilers = [p for p in (profiler, call_profiler) if p is not None]
+
+    def interpret(self, program: Program):
+        for profiler in self.routine_profilers:
+            profiler.start(program.name)
+        try:
+            super().interpret(program)
+        finally:
+            for profiler in self.routine_profilers:
+                profiler.stop()
+
+    def execute_statement(self, statement: Statement):
+        profiler = self.profiler
+        if profiler is None or type(statement) is Block:
+            return super().execute_statement(statement)
+
+        profiler.enter(statement.line)
+        try:
+            return super().execute_statement(statement)
+        finally:
+            profiler.exit()
+
+    def execute_routine(self, routine: ASTNode):
+        for profiler in self.routine_profilers:
+            profiler.enter_routine(routine.name)
+        try:
+            return super().execute_routine(routine)
+        finally:
+            for profiler in reversed(self.routine_profilers):
+                profiler.exit_routine()
+
+class ProfilingClosureCompiler(ClosureCompiler):
+    """Envolve as closures de cada comando e corpo de rotina com as medições."""
+
+    def compile_statement(self, statement: Statement):
+        code = super().compile_statement(statement)
+        profiler = self.interpreter.profiler
+        if profiler is None or statement is None or type(statement) is Block:
+            return code
+
+        enter, leave = profiler.enter, profiler.exit
+        line = statement.line
+
+        def profiled():
+            enter(line)
+            try:
+                return code()
+            finally:
+                leave()
+        return profiled
+
+    def compile_routine_body(self, routine: ASTNode):
+        if id(routine) in self.routine_bodies:
+            return self.routine_bodies[id(routine)]
+
+        cell = super().compile_routine_body(routine)
+        body = cell[0]
+        profilers = self.interpreter.routine_profilers
+        name = routine.name
+
+        def routine_body():
+            for profiler in profilers:
+                profiler.enter_routine(name)
+            try:
+                return body()
+            finally:
+                for profiler in reversed(profilers):
+                    profiler.exit_routine()
+        cell[0] = routine_body
+        return cell
+
+class ProfilingClosureInterpreter(ClosureInterpreter):
+    """Backend de closures com os profilers de linhas e de chamadas."""
+    compiler_class = ProfilingClosureCompiler
+
+    def __init__(self, output: Optional[OutputSink] = None, source: Optional[InputSource] = None,
+                 profiler: Optional[LineProfiler] = None, call_profiler: Optional[CallProfiler] = None):
+        super().__init__(output, source)
+        if profiler is None and call_profiler is None:
+            profiler = LineProfiler()
+        self.profiler = profiler
+        self.call_profiler = call_profiler
+        self.routine_profilers = [p for p in (profiler, call_profiler) if p is not None]
+
+    def interpret(self, program: Program):
+        for profiler in self.routine_profilers:
+            profiler.start(program.name)
+        try:
+            super().interpret(program)
+        finally:
+            for profiler in self.routine_profilers:
+                profiler.stop()
+
+# Backends com suporte aos profilers (selecionados com --backend=<nome>)
+PROFILING_BACKENDS = {
+    'tree': ProfilingInterpreter,
+    'closure': ProfilingClosureInterpreter,
+}
@@ -0,0 +1,315 @@
+"""
+Resolução estática de escopo para o compilador Pascal.
+Antes da execução, liga cada variável a um par (profundidade, slot), de modo
+que os registros de ativação possam ser listas de tamanho fixo em vez de
+cadeias de dicionários.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+from .ast_nodes import *
+
+# Profundidade das variáveis do programa, guardadas no frame global
+GLOBAL = -1
+# Profundidade dos nomes que só podem ser resolvidos pelo nome, em tempo de execução
+DYNAMIC = None
+
+class ScopeAnalysis:
+    """
+    Análise de escopo dinâmico do programa.
+    O tree-walker resolve nomes livres de uma rotina no ambiente de quem a
+    chamou. Para cada rotina alcançável, calcula os nomes livres que ela lê e
+    os nomes que podem estar ligados localmente (parâmetros ou variáveis de
+    for) em algum frame da cadeia de chamadas enquanto ela executa.
+    """
+
+    def __init__(self, program: Program):
+        self.program = program
+        # Assim como no ambiente global, a última declaração com o nome prevalece
+        self.procedures: Dict[str, ProcedureDeclaration] = {}
+        self.functions: Dict[str, FunctionDeclaration] = {}
+        for decl in program.declarations:
+            if isinstance(decl, ProcedureDeclaration):
+                self.procedures[decl.name] = decl
+            elif isinstance(decl, FunctionDeclaration):
+                self.functions[decl.name] = decl
+
+        self.routines: List[ASTNode] = list(self.procedures.values()) + list(self.functions.values())
+        self.free_names: Dict[int, Set[str]] = {}
+        self.shadowable: Dict[int, Set[str]] = {}
+        # Rotinas chamadas diretamente por cada rotina (e pelo programa principal)
+        self.callees: Dict[int, Set[int]] = {}
+        self.analyze()
+
+    def callee(self, call: ASTNode) -> Optional[ASTNode]:
+        """Rotina executada pela chamada, ou None se a chamada sempre falha."""
+        table = self.procedures if isinstance(call, ProcedureCall) else self.functions
+        routine = table.get(call.name)
+        if routine is None or len(routine.parameters) != len(call.arguments):
+            return None
+        return routine
+
+    def dynamic_names(self, routine: ASTNode) -> Set[str]:
+        """Nomes lidos pela rotina que podem pertencer ao escopo de quem chama."""
+        key = id(routine)
+        return self.free_names.get(key, set()) & self.shadowable.get(key, set())
+
+    def reachable_free_names(self, routine: ASTNode) -> Set[str]:
+        """Nomes livres lidos pela rotina e pelas rotinas que ela pode chamar."""
+        names: Set[str] = set()
+        seen = {id(routine)}
+        pending = [id(routine)]
+        while pending:
+            key = pending.pop()
+            names |= self.free_names.get(key, set())
+            for callee in self.callees.get(key, ()):
+                if callee not in seen:
+                    seen.add(callee)
+                    pending.append(callee)
+        return names
+
+    def analyze(self):
+        call_sites: List[Tuple[int, int, Set[str]]] = []
+
+        def visit(node: Optional[ASTNode], bound: Set[str], owner: int):
+            if node is None:
+                return
+            if isinstance(node, (WhileStatement, ForStatement)) and node.invariants:
+                # Temporários do otimizador são ligados no frame, antes do laço
+                for invariant in node.invariants:
+                    visit(invariant.value, bound, owner)
+                bound = bound | {invariant.name for invariant in node.invariants}
+
+            if isinstance(node, Variable):
+                if node.name not in bound:
+                    self.free_names[owner].add(node.name)
+            elif isinstance(node, ForStatement):
+                visit(node.start, bound, owner)
+                visit(node.end, bound, owner)
+                visit(node.body, bound | {node.variable}, owner)
+            elif isinstance(node, (ProcedureCall, FunctionCall)):
+                routine = self.callee(node)
+                if routine is None:
+                    return
+                call_sites.append((owner, id(routine), bound))
+                # Argumentos são avaliados no novo ambiente da rotina chamada
+                params = [param.name for param in routine.parameters]
+                for position, argument in enumerate(node.arguments):
+                    visit(argument, bound | set(params[:position]), owner)
+            else:
+                for child in iter_child_nodes(node):
+                    visit(child, bound, owner)
+
+        for routine in self.routines + [self.program]:
+            key = id(routine)
+            self.free_names[key] = set()
+            self.shadowable[key] = set()
+            params = {param.name for param in getattr(routine, 'parameters', [])}
+            visit(routine.body, params, key)
+
+        for owner, callee, _ in call_sites:
+            self.callees.setdefault(owner, set()).add(callee)
+
+        # Propaga as ligações de cada ponto de chamada até atingir um ponto fixo
+        changed = True
+        while changed:
+            changed = False
+            for owner, callee, bound in call_sites:
+                names = bound | self.shadowable[owner]
+                if not names <= self.shadowable[callee]:
+                    self.shadowable[callee] |= names
+                    changed = True
+
+class FrameLayout:
+    """Slots de um registro de ativação enquanto ele é resolvido."""
+
+    def __init__(self, size: int = 0):
+        self.size = size
+        self.next_slot = size
+        self.scopes: List[Dict[str, int]] = [{}]
+        self.snapshot: Optional[Dict[str, int]] = None
+        # Tipo declarado do nome ligado atualmente a cada slot (None se não tem)
+        self.types: Dict[int, Optional[str]] = {}
+
+    def lookup(self, name: str) -> Optional[int]:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def bind(self, name: str, slot: int, type_name: Optional[str] = None):
+        self.scopes[-1][name] = slot
+        self.types[slot] = type_name
+        self.snapshot = None
+
+    def push(self, name: str, type_name: Optional[str] = None) -> int:
+        # Laços irmãos reaproveitam o slot de um laço já encerrado
+        slot = self.next_slot
+        self.next_slot += 1
+        self.size = max(self.size, self.next_slot)
+        self.scopes.append({name: slot})
+        self.types[slot] = type_name
+        self.snapshot = None
+        return slot
+
+    def pop(self):
+        self.scopes.pop()
+        self.next_slot -= 1
+        self.snapshot = None
+
+    def bindings(self) -> Dict[str, int]:
+        """Nomes ligados neste frame no ponto atual, compartilhado entre chamadas."""
+        if self.snapshot is None:
+            self.snapshot = {}
+            for scope in self.scopes:
+                self.snapshot.update(scope)
+        return self.snapshot
+
+class Resolver:
+    """
+    Anota a AST com a disposição dos frames:
+    - Program.frame_size / global_slots e slot de cada declaração global
+    - frame_size de cada rotina (parâmetros ocupam os slots 0..n-1)
+    - ForStatement.slot, no frame da rotina que contém o laço
+    - Invariant.slot dos temporários criados pelo otimizador, ligados enquanto
+      o laço executa; operandos de VectorLoop são resolvidos fora do laço
+    - Variable.depth / slot: depth 0 é o frame atual, k sobe k frames na
+      cadeia de chamadas, GLOBAL é o frame global e DYNAMIC faz a busca pelo nome
+    - ProcedureCall/FunctionCall.scope: nomes ligados no frame de quem chama,
+      usados pelas buscas dinâmicas feitas dentro da rotina chamada
+    - ProcedureCall/FunctionCall.routine: declaração executada pela chamada,
+      resolvida uma vez por ponto de chamada (None se a chamada sempre falha)
+    - ReadlnStatement.types: tipo declarado de cada alvo (o dos elementos para
+      arrays), usado na conversão da entrada; None quando o alvo é resolvido
+      pelo nome ou não tem tipo declarado
+    """
+
+    def __init__(self):
+        self.analysis: Optional[ScopeAnalysis] = None
+        self.global_slots: Dict[str, int] = {}
+        # Tipos das variáveis e dos elementos dos arrays globais (a última declaração prevalece)
+        self.global_types: Dict[str, str] = {}
+        self.array_types: Dict[str, str] = {}
+        self.frames: List[FrameLayout] = []
+        self.dynamic: Set[str] = set()
+
+    def resolve(self, program: Program) -> Program:
+        self.analysis = ScopeAnalysis(program)
+        self.global_slots = {}
+
+        self.global_types = {}
+        self.array_types = {}
+        for decl in program.declarations:
+            if isinstance(decl, (VariableDeclaration, ArrayDeclaration)):
+                decl.slot = self.global_slots.setdefault(decl.name, len(self.global_slots))
+            if isinstance(decl, VariableDeclaration):
+                self.global_types[decl.name] = decl.var_type
+                self.array_types.pop(decl.name, None)
+            elif isinstance(decl, ArrayDeclaration):
+                self.array_types[decl.name] = decl.element_type
+                self.global_types.pop(decl.name, None)
+
+        for routine in self.analysis.routines:
+            layout = FrameLayout(len(routine.parameters))
+            for slot, param in enumerate(routine.parameters):
+                layout.bind(param.name, slot, param.param_type)
+            self.frames = [layout]
+            self.dynamic = self.analysis.dynamic_names(routine)
+            self.visit(routine.body)
+            routine.frame_size = layout.size
+
+        # O programa principal executa no próprio frame global
+        layout = FrameLayout(len(self.global_slots))
+        self.frames = [layout]
+        self.dynamic = set()
+        for decl in program.declarations:
+            if isinstance(decl, VariableDeclaration):
+                self.visit(decl.value)
+        self.visit(program.body)
+
+        program.frame_size = layout.size
+        program.global_slots = self.global_slots
+        return program
+
+    def visit(self, node: Optional[ASTNode]):
+        if node is None:
+            return
+        if isinstance(node, Variable):
+            self.resolve_variable(node)
+        elif isinstance(node, (WhileStatement, ForStatement)):
+            self.visit_loop(node)
+        elif isinstance(node, (ProcedureCall, FunctionCall)):
+            self.resolve_call(node)
+        else:
+            for child in iter_child_nodes(node):
+                self.visit(child)
+            if isinstance(node, ReadlnStatement):
+                node.types = [self.declared_type(target) for target in node.targets]
+
+    def visit_loop(self, loop: ASTNode):
+        layout = self.frames[-1]
+        # Temporários do otimizador: avaliados antes do laço e ligados enquanto ele executa
+        for invariant in loop.invariants:
+            self.visit(invariant.value)
+        for invariant in loop.invariants:
+            invariant.slot = layout.push(invariant.name)
+
+        if isinstance(loop, ForStatement):
+            # Operandos da forma vetorizada são lidos antes do laço
+            if loop.vector is not None:
+                for operand in loop.vector.operands:
+                    self.visit(operand)
+            self.visit(loop.start)
+            self.visit(loop.end)
+            loop.slot = layout.push(loop.variable, 'integer')
+            self.visit(loop.body)
+            layout.pop()
+        else:
+            self.visit(loop.condition)
+            self.visit(loop.body)
+
+        for _ in loop.invariants:
+            layout.pop()
+
+    def resolve_variable(self, variable: Variable):
+        name = variable.name
+        for depth, layout in enumerate(reversed(self.frames)):
+            slot = layout.lookup(name)
+            if slot is not None:
+                variable.depth, variable.slot = depth, slot
+                return
+
+        if name in self.dynamic or name not in self.global_slots:
+            variable.depth, variable.slot = DYNAMIC, None
+        else:
+            variable.depth, variable.slot = GLOBAL, self.global_slots[name]
+
+    def declared_type(self, target: Expression) -> Optional[str]:
+        """Tipo declarado de um alvo do readln já resolvido."""
+        if isinstance(target, ArrayAccess):
+            variable = target.array
+            # Só arrays globais são arrays declarados; parâmetros e variáveis são escalares
+            if isinstance(variable, Variable) and variable.depth == GLOBAL:
+                return self.array_types.get(variable.name)
+            return None
+
+        if not isinstance(target, Variable) or target.depth is DYNAMIC:
+            return None
+        if target.depth == GLOBAL:
+            return self.global_types.get(target.name)
+        return self.frames[-1 - target.depth].types.get(target.slot)
+
+    def resolve_call(self, call: ASTNode):
+        call.scope = self.frames[-1].bindings()
+
+        routine = call.routine = self.analysis.callee(call)
+        if routine is None:
+            # Argumentos nunca chegam a ser avaliados
+            return
+
+        # Argumentos são avaliados no frame novo, já com os parâmetros anteriores
+        layout = FrameLayout(len(routine.parameters))
+        self.frames.append(layout)
+        for slot, (param, argument) in enumerate(zip(routine.parameters, call.arguments)):
+            self.visit(argument)
+            layout.bind(param.name, slot, param.param_type)
+        self.frames.pop()
@@ -0,0 +1,204 @@
+"""
+Rotinas de suporte em tempo de execução para o compilador Pascal.
+Concentra a semântica compartilhada pelos backends de execução
+(valores padrão, veracidade, operadores, arrays e suas verificações).
+"""
+
+import operator
+from array import array
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+class RuntimeError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(message)
+
+# Valores iniciais de variáveis e retorno padrão de funções
+DEFAULT_VALUES: Dict[str, Any] = {
+    'integer': 0,
+    'real': 0.0,
+    'boolean': False,
+    'string': "",
+}
+
+def default_value(type_name: str) -> Any:
+    return DEFAULT_VALUES.get(type_name)
+
+def is_truthy(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    elif isinstance(value, (int, float)):
+        return value != 0
+    elif isinstance(value, str):
+        return value != ""
+    else:
+        return value is not None
+
+# Operadores com semântica própria do Pascal
+def divide(left: Any, right: Any) -> Any:
+    if right == 0:
+        raise RuntimeError("Divisão por zero")
+    return left / right
+
+def int_divide(left: Any, right: Any) -> int:
+    if right == 0:
+        raise RuntimeError("Divisão por zero")
+    return int(left) // int(right)
+
+def modulo(left: Any, right: Any) -> int:
+    if right == 0:
+        raise RuntimeError("Divisão por zero")
+    return int(left) % int(right)
+
+def logical_and(left: Any, right: Any) -> bool:
+    return is_truthy(left) and is_truthy(right)
+
+def logical_or(left: Any, right: Any) -> bool:
+    return is_truthy(left) or is_truthy(right)
+
+def logical_not(operand: Any) -> bool:
+    return not is_truthy(operand)
+
+BINARY_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': divide,
+    'div': int_divide,
+    'mod': modulo,
+    '=': operator.eq,
+    '<>': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    'and': logical_and,
+    'or': logical_or,
+}
+
+UNARY_OPERATORS: Dict[str, Callable[[Any], Any]] = {
+    '+': operator.pos,
+    '-': operator.neg,
+    'not': logical_not,
+}
+
+# Armazenamento dos arrays por tipo dos elementos: construtor do buffer e
+# tipo exato dos valores que ele guarda sem alterar
+TYPED_STORAGE: Dict[str, Tuple[Callable[[int], Any], type]] = {
+    'integer': (lambda size: array('q', bytes(8 * size)), int),
+    'real': (lambda size: array('d', bytes(8 * size)), float),
+    'boolean': (bytearray, bool),
+}
+
+class PascalArray:
+    """
+    Array Pascal.
+    Arrays de integer, real e boolean guardam os elementos em buffers
+    contíguos (array('q'), array('d') e bytearray) em vez de uma lista de
+    objetos; arrays de string usam lista. A linguagem não verifica o tipo do
+    valor atribuído, então um valor que o buffer não representa exatamente
+    (real em array de integer, inteiro além de 64 bits, texto lido por readln)
+    converte o armazenamento para lista e o programa segue como antes.
+    """
+    __slots__ = ('items', 'element')
+
+    def __init__(self, element_type: str, size: int):
+        storage = TYPED_STORAGE.get(element_type)
+        if storage is not None:
+            factory, self.element = storage
+            self.items = factory(size)
+        else:
+            # Tipo exato aceito pelo buffer; None quando items já é uma lista
+            self.element = None
+            self.items = [default_value(element_type)] * size
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, index: int) -> Any:
+        value = self.items[index]
+        # bytearray guarda booleanos como 0 e 1
+        return value != 0 if self.element is bool else value
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.element is bool:
+            return (value != 0 for value in self.items)
+        return iter(self.items)
+
+    def store(self, index: int, value: Any):
+        if type(value) is self.element:
+            try:
+                self.items[index] = value
+                return
+            except OverflowError:
+                pass
+        if self.element is not None:
+            self.items = list(self)
+            self.element = None
+        self.items[index] = value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PascalArray):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+def check_array_index(array: Any, array_name: str, index: Any):
+    """Valida o acesso array[index] com as mensagens de erro do interpretador."""
+    if not isinstance(array, PascalArray):
+        raise RuntimeError(f"{array_name} não é um array")
+
+    if not isinstance(index, int):
+        raise RuntimeError("Índice do array deve ser um inteiro")
+
+    if index < 0 or index >= len(array.items):
+        raise RuntimeError(f"Índice do array fora dos limites: {index}")
+
+# load_element e store_element repetem as verificações de check_array_index
+# em vez de chamá-la: são usadas a cada acesso pelos backends compilados
+def load_element(array: Any, array_name: str, index: Any) -> Any:
+    """Lê array[index] com as verificações de check_array_index."""
+    if not isinstance(array, PascalArray):
+        raise RuntimeError(f"{array_name} não é um array")
+    if not isinstance(index, int):
+        raise RuntimeError("Índice do array deve ser um inteiro")
+    items = array.items
+    if index < 0 or index >= len(items):
+        raise RuntimeError(f"Índice do array fora dos limites: {index}")
+
+    if array.element is bool:
+        return items[index] != 0
+    return items[index]
+
+def store_element(array: Any, array_name: str, index: Any, value: Any):
+    """Atribui array[index] := value com as verificações de check_array_index."""
+    if not isinstance(array, PascalArray):
+        raise RuntimeError(f"{array_name} não é um array")
+    if not isinstance(index, int):
+        raise RuntimeError("Índice do array deve ser um inteiro")
+    if index < 0 or index >= len(array.items):
+        raise RuntimeError(f"Índice do array fora dos limites: {index}")
+
+    element = array.element
+    if element is None or type(value) is element:
+        try:
+            array.items[index] = value
+            return
+        except OverflowError:
+            pass
+    array.store(index, value)
+
+def parse_input(value: str) -> Any:
+    """Converte a entrada do readln para número quando possível."""
+    try:
+        if '.' in value:
+            return float(value)
+        else:
+            return int(value)
+    except ValueError:
+        # Se não conseguir converter, manter como string
+        return value
@@ -0,0 +1,332 @@
+"""
+Servidor do interpretador Pascal em um socket Unix.
+Mantém o interpretador carregado entre execuções: o processo principal
+(asyncio) aceita conexões e repassa cada pedido a um processo de um pool
+criado com fork na partida, que já tem todos os módulos importados. A saída
+do programa volta ao cliente em blocos, à medida que é escrita.
+
+O protocolo usa uma mensagem JSON por linha. O cliente envia um pedido
+{"args": [...], "cwd": "..."} com os argumentos de compiler.py e o
+diretório atual; o servidor responde com mensagens {"stdout": "..."} e
+termina com {"exit": código}. Quando o programa lê a entrada, o servidor
+envia {"read": true} e o cliente responde {"stdin": "..."} com o próximo
+bloco da sua entrada padrão ("" no fim), como se o programa a lesse direto.
+"""
+
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import signal
+import socket
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+# Socket usado quando nenhum é indicado (client.py calcula o mesmo caminho)
+SOCKET_ENV = 'PASCAL_SOCKET'
+
+# Caracteres de saída acumulados antes de enviar um bloco ao cliente
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Tamanho máximo de uma mensagem
+MESSAGE_LIMIT = 1 << 24
+
+# Executa um pedido com a entrada e a saída recebidas; retorna o código de saída
+Handler = Callable[[Dict[str, Any], io.TextIOBase, io.TextIOBase], int]
+
+def default_socket_path() -> str:
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    directory = os.environ.get('TMPDIR', '/tmp')
+    return os.path.join(directory, f"interpretador-pascal-{os.getuid()}.sock")
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8')
+
+class StreamedOutput(io.TextIOBase):
+    """
+    stdout de um processo do pool: o texto escrito é enviado ao cliente em
+    mensagens {"stdout": ...} a cada chunk_size caracteres e a cada flush().
+    """
+
+    def __init__(self, send: Callable[[bytes], Any], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.send = send
+        self.chunk_size = chunk_size
+        self.parts: List[str] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, text: str) -> int:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.chunk_size:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self.parts:
+            text = ''.join(self.parts)
+            self.parts.clear()
+            self.size = 0
+            self.send(encode({'stdout': text}))
+
+class StreamedInput(io.TextIOBase):
+    """
+    stdin de um processo do pool: cada leitura sem dados guardados pede ao
+    cliente o próximo bloco da entrada, depois de enviar a saída pendente
+    (para o prompt aparecer antes da espera).
+    """
+
+    def __init__(self, send: Callable[[bytes], Any], replies: BinaryIO, stdout: StreamedOutput):
+        self.send = send
+        self.replies = replies
+        self.stdout = stdout
+        self.buffer = ''
+        self.eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def fill(self):
+        self.stdout.flush()
+        self.send(encode({'read': True}))
+        reply = self.replies.readline()
+        data = json.loads(reply).get('stdin', '') if reply else ''
+        if data:
+            self.buffer += data
+        else:
+            self.eof = True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            while not self.eof:
+                self.fill()
+            size = len(self.buffer)
+        elif not self.buffer and not self.eof:
+            self.fill()
+        text, self.buffer = self.buffer[:size], self.buffer[size:]
+        return text
+
+    def readline(self, size: Optional[int] = -1) -> str:
+        while '\n' not in self.buffer and not self.eof:
+            self.fill()
+        end = self.buffer.find('\n') + 1 or len(self.buffer)
+        if size is not None and size >= 0:
+            end = min(end, size)
+        text, self.buffer = self.buffer[:end], self.buffer[end:]
+        return text
+
+def worker_loop(connection: socket.socket, handler: Handler):
+    """Laço de um processo do pool: atende os pedidos um por vez até o socket fechar."""
+    # Ctrl+C no terminal do servidor é tratado pelo processo principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # Processos recriados durante o serviço herdam o descritor de sinais do asyncio
+    signal.set_wakeup_fd(-1)
+
+    send = connection.sendall
+    with connection, connection.makefile('rb') as messages:
+        for line in messages:
+            stdout = StreamedOutput(send)
+            stdin = StreamedInput(send, messages, stdout)
+            try:
+                code = handler(json.loads(line), stdin, stdout)
+            except Exception as e:
+                stdout.write(f"Erro inesperado no servidor: {type(e).__name__}: {e}\n")
+                code = 1
+            stdout.flush()
+            send(encode({'exit': code}))
+
+class Worker:
+    """Processo do pool e as pontas assíncronas do seu socket."""
+    __slots__ = ('process', 'connection', 'reader', 'writer')
+
+    def __init__(self, process: multiprocessing.Process, connection: socket.socket):
+        self.process = process
+        self.connection = connection
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_unix_connection(
+            sock=self.connection, limit=MESSAGE_LIMIT)
+
+class Server:
+    """Aceita conexões no socket Unix e distribui os pedidos entre os processos do pool."""
+
+    def __init__(self, handler: Handler, path: Optional[str] = None, workers: Optional[int] = None):
+        if workers is not None and workers < 1:
+            raise ValueError(f"Número de processos inválido: {workers}")
+
+        self.handler = handler
+        self.path = path or default_socket_path()
+        self.size = workers or os.cpu_count() or 1
+        self.context = multiprocessing.get_context('fork')
+        self.workers: List[Worker] = []
+        self.idle: Optional[asyncio.Queue] = None
+        self.listener: Optional[socket.socket] = None
+
+    def spawn(self) -> Worker:
+        """Cria um processo do pool com fork (herdando os módulos já importados)."""
+        parent, child = socket.socketpair()
+        process = self.context.Process(target=worker_loop, args=(child, self.handler), daemon=True)
+        process.start()
+        child.close()
+        worker = Worker(process, parent)
+        self.workers.append(worker)
+        return worker
+
+    def bind(self):
+        """Cria o socket e os processos do pool, antes de iniciar o laço de eventos."""
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                # Socket deixado por um servidor que não terminou normalmente
+                os.unlink(self.path)
+            else:
+                raise OSError(f"Já existe um servidor em {self.path}")
+            finally:
+                probe.close()
+
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self.listener.listen(128)
+
+        for _ in range(self.size):
+            self.spawn()
+
+    def replace(self, worker: Worker) -> Worker:
+        """Encerra um processo (se ainda vivo) e cria outro no lugar."""
+        self.workers.remove(worker)
+        worker.writer.close()
+        worker.process.kill()
+        worker.process.join(timeout=1)
+        return self.spawn()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Repassa um pedido ao próximo processo livre e as mensagens entre ele e o cliente."""
+        request = await self.receive(reader)
+        if request is None:
+            writer.close()
+            return
+
+        worker = await self.idle.get()
+        # O cliente só fala quando o programa pede entrada: fora disso, uma leitura
+        # que termina indica que ele desconectou (ex.: Ctrl+C)
+        client = asyncio.ensure_future(self.receive(reader))
+        response = None
+        waiting_input = False
+        try:
+            await self.send(worker, request)
+            while True:
+                if response is None:
+                    response = asyncio.ensure_future(worker.reader.readline())
+                done, _ = await asyncio.wait({response, client}, return_when=asyncio.FIRST_COMPLETED)
+
+                if response in done:
+                    message = response.result()
+                    response = None
+                    if message:
+                        finished = 'exit' in json.loads(message)
+                        waiting_input = message.startswith(b'{"read"')
+                    else:
+                        worker = self.replace(worker)
+                        await worker.connect()
+                        message = encode({'stdout': "Erro: O processo do servidor terminou durante a execução\n"})
+                        message += encode({'exit': 1})
+                        finished = True
+
+                    try:
+                        writer.write(message)
+                        await writer.drain()
+                    except ConnectionError:
+                        # A leitura pendente do cliente também termina e encerra o processo
+                        pass
+                    if finished:
+                        break
+
+                if client.done():
+                    reply = client.result()
+                    if not waiting_input or reply is None:
+                        # Cliente desconectado: o programa é interrompido com seu processo
+                        if response is not None:
+                            response.cancel()
+                        worker = self.replace(worker)
+                        await worker.connect()
+                        break
+                    await self.send(worker, reply)
+                    waiting_input = False
+                    client = asyncio.ensure_future(self.receive(reader))
+        finally:
+            client.cancel()
+            self.idle.put_nowait(worker)
+            writer.close()
+
+    async def receive(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """Próxima mensagem do cliente, ou None se ele desconectou."""
+        try:
+            message = await reader.readline()
+        except (ConnectionError, ValueError):
+            return None
+        return message if message.endswith(b'\n') else None
+
+    async def send(self, worker: Worker, message: bytes):
+        try:
+            worker.writer.write(message)
+            await worker.writer.drain()
+        except ConnectionError:
+            # O processo morreu; a próxima leitura encontra o fim do socket
+            pass
+
+    async def serve(self, ready: Optional[Callable[[], Any]] = None):
+        """Atende pedidos até SIGINT ou SIGTERM."""
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        self.idle = asyncio.Queue()
+        for worker in self.workers:
+            await worker.connect()
+            self.idle.put_nowait(worker)
+
+        server = await asyncio.start_unix_server(self.handle, sock=self.listener, limit=MESSAGE_LIMIT)
+        if ready is not None:
+            ready()
+        async with server:
+            await stop.wait()
+
+    def close(self):
+        for worker in self.workers:
+            worker.connection.close()
+            worker.process.terminate()
+        for worker in self.workers:
+            worker.process.join(timeout=1)
+        self.workers.clear()
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+def serve(handler: Handler, path: Optional[str] = None, workers: Optional[int] = None,
+          ready: Optional[Callable[['Server'], Any]] = None):
+    """Cria o pool e atende pedidos no socket até o servidor ser encerrado."""
+    server = Server(handler, path, workers)
+    try:
+        server.bind()
+        asyncio.run(server.serve(ready and (lambda: ready(server))))
+    finally:
+        server.close()
@@ -0,0 +1,486 @@
+"""
+Tradutor de Pascal para Python para o compilador Pascal.
+Gera código Python equivalente ao programa (rotinas viram funções, for vira
+range, variáveis locais viram locais Python) e o executa via compile()/exec.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+from .ast_nodes import *
+from .resolver import ScopeAnalysis, Resolver
+from .interpreter import Interpreter
+from .output import OutputSink
+from .input import InputSource
+from .runtime import (
+    RuntimeError, PascalArray, default_value, divide, int_divide, is_truthy,
+    load_element, logical_and, logical_or, modulo, store_element,
+)
+from .vectorizer import run_vectorized
+
+class TranspileError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(message)
+
+# Operadores traduzidos diretamente para a sintaxe Python
+PYTHON_OPERATORS = {
+    '+': '+', '-': '-', '*': '*',
+    '=': '==', '<>': '!=', '<': '<', '>': '>', '<=': '<=', '>=': '>=',
+}
+
+# Operadores com semântica própria, traduzidos para chamadas ao runtime
+HELPER_OPERATORS = {
+    '/': '_divide', 'div': '_int_divide', 'mod': '_modulo',
+    'and': '_and', 'or': '_or',
+}
+
+BOOLEAN_OPERATORS = {'=', '<>', '<', '>', '<=', '>=', 'and', 'or', 'not'}
+
+def _fail(message: str):
+    raise RuntimeError(message)
+
+def _range(start_value: Any, end_value: Any) -> range:
+    if not isinstance(start_value, int) or not isinstance(end_value, int):
+        raise RuntimeError("Valores do loop FOR devem ser inteiros")
+    return range(start_value, end_value + 1)
+
+def _binary_fail(left: Any, right: Any, operator: str):
+    raise RuntimeError(f"Operador binário não suportado: {operator}")
+
+def _unary_fail(operand: Any, operator: str):
+    raise RuntimeError(f"Operador unário não suportado: {operator}")
+
+class RoutineContext:
+    """Estado da tradução de uma função Python (rotina ou programa principal)."""
+
+    def __init__(self, kind: str, return_type: Optional[str] = None):
+        self.kind = kind
+        self.return_type = return_type
+        self.scopes: List[Dict[str, str]] = [{}]
+        self.globals_written: Set[str] = set()
+        self.counter = 0
+
+    def temporary(self, prefix: str = '_t') -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def lookup(self, name: str) -> Optional[str]:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+class PythonTranspiler:
+    def __init__(self, count_steps: bool = False):
+        # Com limites de execução, cada volta de laço e cada rotina conta um passo em _budget
+        self.count_steps = count_steps
+        self.lines: List[str] = []
+        self.procedures: Dict[str, ProcedureDeclaration] = {}
+        self.functions: Dict[str, FunctionDeclaration] = {}
+        self.global_names: Set[str] = set()
+        self.context: Optional[RoutineContext] = None
+
+    def transpile(self, program: Program) -> str:
+        for decl in program.declarations:
+            if isinstance(decl, (VariableDeclaration, ArrayDeclaration)):
+                self.global_names.add(decl.name)
+            elif isinstance(decl, ProcedureDeclaration):
+                self.procedures[decl.name] = decl
+            elif isinstance(decl, FunctionDeclaration):
+                self.functions[decl.name] = decl
+
+        # O resolver grava os tipos declarados dos alvos do readln
+        resolver = Resolver()
+        resolver.resolve(program)
+        self.check_dynamic_scope(resolver.analysis)
+
+        self.lines = [f"# Código Python gerado a partir do programa Pascal '{program.name}'"]
+
+        for routine in list(self.procedures.values()) + list(self.functions.values()):
+            self.lines.append('')
+            self.translate_routine(routine)
+
+        # Variáveis globais, inicializadas na ordem de declaração
+        self.lines.append('')
+        self.context = RoutineContext('global')
+        for decl in program.declarations:
+            if isinstance(decl, VariableDeclaration):
+                if decl.value:
+                    value = self.translate_expression(decl.value)
+                else:
+                    value = repr(default_value(decl.var_type))
+                self.lines.append(f"{self.global_name(decl.name)} = {value}")
+            elif isinstance(decl, ArrayDeclaration):
+                self.lines.append(f"{self.global_name(decl.name)} = _array({decl.element_type!r}, {decl.size})")
+
+        self.lines.append('')
+        self.translate_function('_main', [], program.body, RoutineContext('main'))
+        return '\n'.join(self.lines) + '\n'
+
+    # Nomes Python
+    def global_name(self, name: str) -> str:
+        return f"v_{name}"
+
+    def routine_name(self, routine: ASTNode) -> str:
+        prefix = 'f' if isinstance(routine, FunctionDeclaration) else 'p'
+        return f"{prefix}_{routine.name}"
+
+    # Análise de escopo
+    def check_dynamic_scope(self, analysis: ScopeAnalysis):
+        """
+        O tree-walker resolve nomes livres de uma rotina no ambiente de quem
+        a chamou (escopo dinâmico). A tradução usa escopo léxico, então é
+        recusada quando uma rotina alcançável lê um nome que pode estar
+        ligado localmente (parâmetro ou variável de for) no ponto da chamada.
+        """
+        for routine in analysis.routines:
+            shadowed = analysis.dynamic_names(routine)
+            if shadowed:
+                name = sorted(shadowed)[0]
+                raise TranspileError(
+                    f"'{name}' em {routine.name} depende do escopo de quem chama "
+                    f"(escopo dinâmico); use outro backend")
+
+    # Rotinas
+    def translate_routine(self, routine: ASTNode):
+        if isinstance(routine, FunctionDeclaration):
+            context = RoutineContext('function', routine.return_type)
+        else:
+            context = RoutineContext('procedure')
+
+        # Parâmetros repetidos: o último prevalece, como em Environment.define
+        params = []
+        names = [param.name for param in routine.parameters]
+        for position, name in enumerate(names):
+            if name in names[position + 1:]:
+                params.append(context.temporary('_unused'))
+            else:
+                local = self.global_name(name)
+                context.scopes[0][name] = local
+                params.append(local)
+
+        self.translate_function(self.routine_name(routine), params, routine.body, context)
+
+    def translate_function(self, name: str, params: List[str], body: Statement, context: RoutineContext):
+        self.context = context
+        header = len(self.lines)
+        self.lines.append(f"def {name}({', '.join(params)}):")
+
+        start = len(self.lines)
+        if self.count_steps and context.kind != 'main':
+            self.emit_step(1)
+        self.translate_statement(body, 1)
+
+        if context.kind == 'function':
+            # Se chegou ao fim sem return, retornar valor padrão
+            self.emit(f"return {default_value(context.return_type)!r}", 1)
+        elif len(self.lines) == start:
+            self.emit("pass", 1)
+
+        if context.globals_written:
+            names = ', '.join(sorted(self.global_name(n) for n in context.globals_written))
+            self.lines.insert(header + 1, f"    global {names}")
+
+    def emit(self, line: str, level: int):
+        self.lines.append('    ' * level + line)
+
+    def emit_body(self, statement: Optional[Statement], level: int):
+        start = len(self.lines)
+        self.translate_statement(statement, level)
+        if len(self.lines) == start:
+            self.emit("pass", level)
+
+    def emit_step(self, level: int):
+        # StepBudget.step, expandido no código gerado
+        self.emit("_budget.fuel -= 1", level)
+        self.emit("if _budget.fuel <= 0: _budget.refuel()", level)
+
+    def emit_loop_body(self, statement: Optional[Statement], level: int):
+        if self.count_steps:
+            self.emit_step(level)
+        self.emit_body(statement, level)
+
+    # Comandos
+    def translate_statement(self, statement: Optional[Statement], level: int):
+        if isinstance(statement, Block):
+            for stmt in statement.statements:
+                self.translate_statement(stmt, level)
+
+        elif isinstance(statement, Assignment):
+            value = self.translate_expression(statement.value)
+            target = statement.target
+
+            if isinstance(target, Variable):
+                self.emit_store(target.name, value, level)
+            elif isinstance(target, ArrayAccess):
+                index = self.translate_expression(target.index)
+                self.emit_store_element(target.array.name, index, value, level)
+            else:
+                self.emit(value, level)
+
+        elif isinstance(statement, IfStatement):
+            self.emit(f"if {self.translate_condition(statement.condition)}:", level)
+            self.emit_body(statement.then_stmt, level + 1)
+            if statement.else_stmt:
+                self.emit("else:", level)
+                self.emit_body(statement.else_stmt, level + 1)
+
+        elif isinstance(statement, WhileStatement):
+            self.translate_invariants(statement, level)
+            self.emit(f"while {self.translate_condition(statement.condition)}:", level)
+            self.emit_loop_body(statement.body, level + 1)
+            if statement.invariants:
+                self.context.scopes.pop()
+
+        elif isinstance(statement, ForStatement):
+            self.translate_invariants(statement, level)
+            start = self.translate_expression(statement.start)
+            end = self.translate_expression(statement.end)
+
+            vector = statement.vector
+            if vector is not None:
+                # O laço normal só executa se a forma vetorizada não puder ser usada
+                start_value, end_value = self.context.temporary(), self.context.temporary()
+                self.emit(f"{start_value} = {start}", level)
+                self.emit(f"{end_value} = {end}", level)
+                operands = ', '.join(self.translate_expression(operand) for operand in vector.operands)
+                self.emit(f"if not _vector({vector.kernel!r}, {start_value}, {end_value}, [{operands}]):", level)
+                start, end, loop_level = start_value, end_value, level + 1
+            else:
+                loop_level = level
+
+            # Variável de controle é uma local própria do laço
+            local = self.context.temporary(f"l_{statement.variable}_")
+            self.emit(f"for {local} in _range({start}, {end}):", loop_level)
+            self.context.scopes.append({statement.variable: local})
+            self.emit_loop_body(statement.body, loop_level + 1)
+            self.context.scopes.pop()
+            if vector is not None and self.count_steps:
+                # As voltas executadas de uma vez contam como no laço normal
+                self.emit("else:", level)
+                self.emit(f"_budget.charge({end_value} - {start_value} + 1)", level + 1)
+            if statement.invariants:
+                self.context.scopes.pop()
+
+        elif isinstance(statement, ProcedureCall):
+            self.emit(self.translate_call(statement.name, self.procedures.get(statement.name),
+                                          statement.arguments,
+                                          f"Procedimento não definido: {statement.name}"), level)
+
+        elif isinstance(statement, ReadlnStatement):
+            targets = [target for target in statement.targets
+                       if isinstance(target, (Variable, ArrayAccess))]
+            if not targets:
+                return
+
+            # O fim da entrada interrompe a leitura dos alvos restantes
+            self.emit("try:", level)
+            for target, declared in zip(statement.targets, statement.types):
+                if isinstance(target, Variable):
+                    current = self.translate_name(target.name)
+                    self.emit_store(target.name, f"_read({target.name!r}, {current}, {declared!r})",
+                                    level + 1)
+                elif isinstance(target, ArrayAccess):
+                    array_name = target.array.name
+                    index = self.context.temporary()
+                    value = self.context.temporary()
+                    self.emit(f"{index} = {self.translate_expression(target.index)}", level + 1)
+                    array = self.translate_name(array_name)
+                    self.emit(f"{value} = _read_element({array_name!r}, {array}, {index}, {declared!r})",
+                              level + 1)
+                    self.emit_store_element(array_name, index, value, level + 1)
+            self.emit("except EOFError:", level)
+            self.emit("pass", level + 1)
+
+        elif isinstance(statement, WritelnStatement):
+            parts = [f"str({self.translate_expression(expr)})" for expr in statement.expressions]
+            if not parts:
+                self.emit("_write('')", level)
+            elif len(parts) == 1:
+                self.emit(f"_write({parts[0]})", level)
+            else:
+                self.emit(f"_write(''.join(({', '.join(parts)})))", level)
+
+        elif isinstance(statement, ReturnStatement):
+            value = self.translate_expression(statement.value) if statement.value else None
+
+            if self.context.kind == 'function':
+                self.emit(f"return {value if value else 'None'}", level)
+            else:
+                # Procedimentos e programa principal descartam o valor
+                if value:
+                    self.emit(value, level)
+                self.emit("return", level)
+
+    def translate_invariants(self, loop: ASTNode, level: int):
+        """Temporários do otimizador viram locais Python, visíveis enquanto o laço executa."""
+        if not loop.invariants:
+            return
+
+        scope = {}
+        for invariant in loop.invariants:
+            local = self.context.temporary('_inv')
+            self.emit(f"{local} = {self.translate_expression(invariant.value)}", level)
+            scope[invariant.name] = local
+        self.context.scopes.append(scope)
+
+    def emit_store(self, name: str, value: str, level: int):
+        local = self.context.lookup(name)
+        if local is not None:
+            self.emit(f"{local} = {value}", level)
+        elif name in self.global_names:
+            self.context.globals_written.add(name)
+            self.emit(f"{self.global_name(name)} = {value}", level)
+        else:
+            self.emit(value, level)
+            self.emit(f"_fail({f'Variável não definida: {name}'!r})", level)
+
+    def emit_store_element(self, array_name: str, index: str, value: str, level: int):
+        array = self.translate_name(array_name)
+        self.emit(f"_store({array}, {array_name!r}, {index}, {value})", level)
+
+    # Expressões
+    def translate_condition(self, expression: Expression) -> str:
+        code = self.translate_expression(expression)
+
+        if isinstance(expression, BooleanLiteral):
+            return code
+        if isinstance(expression, (BinaryOperation, UnaryOperation)) and expression.operator in BOOLEAN_OPERATORS:
+            return code
+        return f"_truthy({code})"
+
+    def translate_name(self, name: str) -> str:
+        local = self.context.lookup(name)
+        if local is not None:
+            return local
+        if name in self.global_names:
+            return self.global_name(name)
+        return f"_fail({f'Variável não definida: {name}'!r})"
+
+    def translate_expression(self, expression: Expression) -> str:
+        if isinstance(expression, (NumberLiteral, StringLiteral, BooleanLiteral)):
+            return repr(expression.value)
+
+        elif isinstance(expression, Variable):
+            return self.translate_name(expression.name)
+
+        elif isinstance(expression, ArrayAccess):
+            array_name = expression.array.name
+            array = self.translate_name(array_name)
+            index = self.translate_expression(expression.index)
+            return f"_load({array}, {array_name!r}, {index})"
+
+        elif isinstance(expression, BinaryOperation):
+            left = self.translate_expression(expression.left)
+            right = self.translate_expression(expression.right)
+            operator = expression.operator
+
+            if operator in PYTHON_OPERATORS:
+                return f"({left} {PYTHON_OPERATORS[operator]} {right})"
+            elif operator in HELPER_OPERATORS:
+                return f"{HELPER_OPERATORS[operator]}({left}, {right})"
+            return f"_binary_fail({left}, {right}, {operator!r})"
+
+        elif isinstance(expression, UnaryOperation):
+            operand = self.translate_expression(expression.operand)
+            operator = expression.operator
+
+            if operator in ('-', '+'):
+                return f"({operator}{operand})"
+            elif operator == 'not':
+                return f"(not _truthy({operand}))"
+            return f"_unary_fail({operand}, {operator!r})"
+
+        elif isinstance(expression, FunctionCall):
+            return self.translate_call(expression.name, self.functions.get(expression.name),
+                                       expression.arguments,
+                                       f"Função não definida: {expression.name}")
+
+        return f"_fail({f'Tipo de expressão não suportado: {type(expression)}'!r})"
+
+    def translate_call(self, name: str, routine: Optional[ASTNode], arguments: List[Expression],
+                       undefined_message: str) -> str:
+        if routine is None:
+            return f"_fail({undefined_message!r})"
+
+        if len(arguments) != len(routine.parameters):
+            return f"_fail({f'Número incorreto de argumentos para {name}'!r})"
+
+        # Argumentos enxergam os parâmetros anteriores já definidos, como no tree-walker
+        args = []
+        bound: Dict[str, str] = {}
+        for position, (param, argument) in enumerate(zip(routine.parameters, arguments)):
+            self.context.scopes.append(dict(bound))
+            code = self.translate_expression(argument)
+            self.context.scopes.pop()
+
+            if self.references_name(arguments[position + 1:], param.name):
+                temp = self.context.temporary()
+                bound[param.name] = temp
+                code = f"({temp} := {code})"
+            args.append(code)
+
+        return f"{self.routine_name(routine)}({', '.join(args)})"
+
+    def references_name(self, expressions: List[Expression], name: str) -> bool:
+        """Verifica se alguma das expressões lê diretamente a variável name."""
+        pending = list(expressions)
+        while pending:
+            node = pending.pop()
+            if isinstance(node, Variable) and node.name == name:
+                return True
+            pending.extend(iter_child_nodes(node))
+        return False
+
+class TranspiledInterpreter(Interpreter):
+    """
+    Backend que traduz o programa para Python e o executa com compile()/exec,
+    aproveitando o compilador de bytecode e as variáveis locais do CPython.
+    """
+
+    def __init__(self, output: Optional[OutputSink] = None, source: Optional[InputSource] = None):
+        super().__init__(output, source)
+        self.source: Optional[str] = None
+
+    def interpret(self, program: Program):
+        self.start_budget()
+        self.source = PythonTranspiler(self.budget is not None).transpile(program)
+        code = compile(self.source, f"<pascal {program.name}>", 'exec')
+
+        namespace = self.runtime_namespace()
+        try:
+            exec(code, namespace)
+            self.link(namespace)
+            namespace['_main']()
+        finally:
+            self.output.flush()
+
+    def link(self, namespace: Dict[str, Any]):
+        """Chamado com as rotinas já definidas no namespace, antes de executar _main."""
+        pass
+
+    def counted_array(self, element_type: str, size: int) -> PascalArray:
+        self.budget.allocate(size)
+        return PascalArray(element_type, size)
+
+    def runtime_namespace(self) -> Dict[str, Any]:
+        return {
+            '__builtins__': __builtins__,
+            '_write': self.output.write,
+            '_read': self.input.read,
+            '_read_element': self.input.read_element,
+            '_truthy': is_truthy,
+            '_divide': divide,
+            '_int_divide': int_divide,
+            '_modulo': modulo,
+            '_and': logical_and,
+            '_or': logical_or,
+            '_array': PascalArray if self.budget is None else self.counted_array,
+            '_load': load_element,
+            '_store': store_element,
+            '_range': _range,
+            '_vector': run_vectorized,
+            '_fail': _fail,
+            '_binary_fail': _binary_fail,
+            '_unary_fail': _unary_fail,
+            '_budget': self.budget,
+        }
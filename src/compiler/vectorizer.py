@@ -0,0 +1,323 @@
+"""
+Vetorização de laços for para o compilador Pascal.
+O Vectorizer é o último estágio do otimizador (-O): reconhece laços cujo
+corpo só faz atribuições elemento a elemento sobre arrays de inteiros ou
+reais, sem dependências entre iterações, e os anota com um VectorLoop.
+Em tempo de execução, run_vectorized executa o laço inteiro como operações
+NumPy sobre o armazenamento dos arrays. NumPy é opcional: o módulo só é
+importado quando um laço vetorizado executa, e sem ele (ou quando o
+resultado poderia diferir do laço normal) os backends executam o laço
+normalmente.
+
+Kernel de um laço: (nomes dos operandos, atribuições), em que cada
+atribuição é (posição do array alvo, expressão) e as expressões são tuplas:
+    ('index',)                     variável de controle do laço
+    ('const', valor)               literal inteiro ou real
+    ('scalar', posição)            operando lido uma vez antes do laço
+    ('element', posição, deslocamento)  array[variável + deslocamento]
+    ('neg', e), ('pos', e)         operadores unários - e +
+    (operador, e1, e2)             operadores binários +, -, * e /
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from .ast_nodes import *
+from .runtime import PascalArray
+
+# Operadores que têm a mesma semântica elemento a elemento no NumPy
+VECTOR_OPERATORS = {'+', '-', '*', '/'}
+VECTOR_ELEMENT_TYPES = {'integer', 'real'}
+
+# Abaixo deste número de iterações o laço normal é mais rápido que o NumPy
+MIN_VECTOR_LENGTH = 64
+
+INT64_MAX = 2 ** 63 - 1
+# Inteiros até 2**53 são convertidos para float sem arredondamento
+EXACT_FLOAT_INT = 2 ** 53
+
+DTYPES = {int: 'int64', float: 'float64'}
+
+class NotVectorizable(Exception):
+    """O laço (ou esta execução dele) precisa seguir pelo caminho normal."""
+
+class Vectorizer:
+    """
+    Anota com ForStatement.vector os laços for em que:
+    - o corpo é uma atribuição, ou um bloco de atribuições, a array[i], em
+      que i é a variável de controle e o array é de inteiros ou reais
+    - os valores só usam literais numéricos, i, arrays indexados por i mais
+      uma constante, variáveis que o laço não escreve e +, -, * e /
+    - arrays escritos pelo laço só são lidos na posição i
+    Com essas condições, executar cada atribuição sobre todo o intervalo,
+    uma depois da outra, dá o mesmo resultado que o laço.
+    """
+
+    def __init__(self):
+        self.arrays: Set[str] = set()
+        self.vectorized = 0
+        # Estado do laço sendo analisado
+        self.variable = ''
+        self.defined: Set[str] = set()
+        self.written: Set[str] = set()
+        self.names: List[str] = []
+
+    def vectorize(self, program: Program) -> Program:
+        self.arrays = {decl.name for decl in program.declarations
+                       if isinstance(decl, ArrayDeclaration) and decl.element_type in VECTOR_ELEMENT_TYPES}
+        global_names = {decl.name for decl in program.declarations
+                        if isinstance(decl, (VariableDeclaration, ArrayDeclaration))}
+
+        # Operandos são lidos antes do laço: só nomes com valor garantido ali
+        for decl in program.declarations:
+            if isinstance(decl, (ProcedureDeclaration, FunctionDeclaration)):
+                params = {param.name for param in decl.parameters}
+                self.visit(decl.body, global_names | params)
+        self.visit(program.body, global_names)
+        return program
+
+    def visit(self, statement: Optional[Statement], defined: Set[str]):
+        if isinstance(statement, Block):
+            for stmt in statement.statements:
+                self.visit(stmt, defined)
+        elif isinstance(statement, IfStatement):
+            self.visit(statement.then_stmt, defined)
+            self.visit(statement.else_stmt, defined)
+        elif isinstance(statement, WhileStatement):
+            self.visit(statement.body, defined | {invariant.name for invariant in statement.invariants})
+        elif isinstance(statement, ForStatement):
+            defined = defined | {invariant.name for invariant in statement.invariants}
+            statement.vector = self.vectorize_loop(statement, defined)
+            if statement.vector is not None:
+                self.vectorized += 1
+            else:
+                self.visit(statement.body, defined | {statement.variable})
+
+    def vectorize_loop(self, loop: ForStatement, defined: Set[str]) -> Optional[VectorLoop]:
+        assignments = self.assignments(loop.body)
+        if not assignments:
+            return None
+
+        self.variable, self.defined, self.names = loop.variable, defined, []
+        self.written = {assignment.target.array.name for assignment in assignments}
+        try:
+            kernel = []
+            for assignment in assignments:
+                target = assignment.target
+                if self.offset(target.index) != 0:
+                    raise NotVectorizable()
+                kernel.append((self.array_operand(target.array.name), self.translate(assignment.value)))
+        except NotVectorizable:
+            return None
+
+        operands = [Variable(name, loop.line) for name in self.names]
+        return VectorLoop(operands, (tuple(self.names), tuple(kernel)), loop.line)
+
+    def assignments(self, statement: Statement) -> Optional[List[Assignment]]:
+        if isinstance(statement, Assignment):
+            return [statement] if isinstance(statement.target, ArrayAccess) else None
+        elif isinstance(statement, Block):
+            assignments = []
+            for stmt in statement.statements:
+                inner = self.assignments(stmt)
+                if inner is None:
+                    return None
+                assignments.extend(inner)
+            return assignments
+        return None
+
+    def operand(self, name: str) -> int:
+        if name == self.variable or name not in self.defined:
+            raise NotVectorizable()
+        if name not in self.names:
+            self.names.append(name)
+        return self.names.index(name)
+
+    def array_operand(self, name: str) -> int:
+        if name not in self.arrays:
+            raise NotVectorizable()
+        return self.operand(name)
+
+    def offset(self, index: Expression) -> int:
+        """Deslocamento de um índice da forma i, i + c, i - c ou c + i."""
+        if isinstance(index, Variable) and index.name == self.variable:
+            return 0
+        if isinstance(index, BinaryOperation) and index.operator in ('+', '-'):
+            left, right = index.left, index.right
+            if isinstance(right, NumberLiteral) and type(right.value) is int:
+                if isinstance(left, Variable) and left.name == self.variable:
+                    return right.value if index.operator == '+' else -right.value
+            elif isinstance(left, NumberLiteral) and type(left.value) is int and index.operator == '+':
+                if isinstance(right, Variable) and right.name == self.variable:
+                    return left.value
+        raise NotVectorizable()
+
+    def translate(self, expression: Expression) -> tuple:
+        if isinstance(expression, NumberLiteral) and type(expression.value) in (int, float):
+            return ('const', expression.value)
+        elif isinstance(expression, Variable):
+            if expression.name == self.variable:
+                return ('index',)
+            return ('scalar', self.operand(expression.name))
+        elif isinstance(expression, ArrayAccess):
+            offset = self.offset(expression.index)
+            name = expression.array.name
+            # Ler outra posição de um array escrito cria dependência entre iterações
+            if name in self.written and offset != 0:
+                raise NotVectorizable()
+            return ('element', self.array_operand(name), offset)
+        elif isinstance(expression, BinaryOperation) and expression.operator in VECTOR_OPERATORS:
+            return (expression.operator, self.translate(expression.left), self.translate(expression.right))
+        elif isinstance(expression, UnaryOperation) and expression.operator in ('-', '+'):
+            return ('neg' if expression.operator == '-' else 'pos', self.translate(expression.operand))
+        raise NotVectorizable()
+
+# Execução
+_numpy: Any = None
+
+def load_numpy() -> Any:
+    """Importa o NumPy na primeira chamada; None se ele não estiver instalado."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+def run_vectorized(kernel: tuple, start: Any, end: Any, operands: Sequence[Any]) -> bool:
+    """
+    Executa um laço vetorizado com os operandos já avaliados. Retorna False,
+    sem alterar nenhum array, quando o laço deve seguir pelo caminho normal:
+    NumPy indisponível, poucas iterações, valores fora do armazenamento
+    tipado, índices fora dos limites, um array escrito com mais de um nome,
+    divisão por zero ou inteiros que podem passar de 64 bits.
+    """
+    if type(start) is not int or type(end) is not int or end - start + 1 < MIN_VECTOR_LENGTH:
+        return False
+    numpy = load_numpy()
+    if numpy is None:
+        return False
+
+    evaluation = VectorEvaluation(numpy, start, end, operands)
+    try:
+        with numpy.errstate(all='ignore'):
+            writes = evaluation.run(kernel[1])
+    except NotVectorizable:
+        return False
+
+    for array, values in writes:
+        numpy.frombuffer(array.items, DTYPES[array.element])[start:end + 1] = values
+    return True
+
+class VectorEvaluation:
+    """
+    Avalia as atribuições de um kernel sobre o intervalo start..end. Cada
+    valor vem com o tipo Python correspondente (int ou float) e, para
+    inteiros, um limite do valor absoluto, usado para garantir que o
+    resultado em int64 é exato.
+    """
+
+    def __init__(self, numpy: Any, start: int, end: int, operands: Sequence[Any]):
+        self.numpy = numpy
+        self.start = start
+        self.end = end
+        self.length = end - start + 1
+        self.operands = operands
+        # Valores já atribuídos pelo kernel, ainda não escritos nos arrays
+        self.assigned: Dict[int, Tuple[Any, type, Optional[int]]] = {}
+
+    def run(self, assignments: tuple) -> List[Tuple[PascalArray, Any]]:
+        for position, _ in assignments:
+            array = self.array(position, 0)
+            if any(operand is array for other, operand in enumerate(self.operands) if other != position):
+                raise NotVectorizable()
+
+        for position, expression in assignments:
+            values, kind, bound = self.evaluate(expression)
+            # Um valor de outro tipo tiraria o array do armazenamento tipado
+            if kind is not self.operands[position].element:
+                raise NotVectorizable()
+            if not isinstance(values, self.numpy.ndarray):
+                values = self.numpy.full(self.length, values, DTYPES[kind])
+            self.assigned[position] = (values, kind, bound)
+
+        return [(self.operands[position], values) for position, (values, _, _) in self.assigned.items()]
+
+    def array(self, position: int, offset: int) -> PascalArray:
+        array = self.operands[position]
+        if type(array) is not PascalArray or array.element not in DTYPES:
+            raise NotVectorizable()
+        if self.start + offset < 0 or self.end + offset >= len(array.items):
+            raise NotVectorizable()
+        return array
+
+    def check(self, bound: int) -> int:
+        if bound > INT64_MAX:
+            raise NotVectorizable()
+        return bound
+
+    def scalar(self, value: Any) -> Tuple[Any, type, Optional[int]]:
+        kind = type(value)
+        if kind is float:
+            return value, float, None
+        elif kind is int:
+            return value, int, self.check(abs(value))
+        raise NotVectorizable()
+
+    def evaluate(self, expression: tuple) -> Tuple[Any, type, Optional[int]]:
+        numpy = self.numpy
+        tag = expression[0]
+
+        if tag == 'element':
+            _, position, offset = expression
+            if offset == 0 and position in self.assigned:
+                return self.assigned[position]
+            array = self.array(position, offset)
+            values = numpy.frombuffer(array.items, DTYPES[array.element])
+            values = values[self.start + offset:self.end + offset + 1]
+            if array.element is float:
+                return values, float, None
+            return values, int, self.check(max(int(values.max()), -int(values.min())))
+
+        elif tag == 'scalar':
+            return self.scalar(self.operands[expression[1]])
+
+        elif tag == 'const':
+            return self.scalar(expression[1])
+
+        elif tag == 'index':
+            bound = self.check(max(abs(self.start), abs(self.end)))
+            return numpy.arange(self.start, self.end + 1, dtype=DTYPES[int]), int, bound
+
+        elif tag in ('neg', 'pos'):
+            values, kind, bound = self.evaluate(expression[1])
+            return (-values if tag == 'neg' else +values), kind, bound
+
+        operator, left, right = expression
+        left_values, left_kind, left_bound = self.evaluate(left)
+        right_values, right_kind, right_bound = self.evaluate(right)
+
+        if operator == '/':
+            if isinstance(right_values, numpy.ndarray):
+                has_zero = numpy.count_nonzero(right_values) < self.length
+            else:
+                has_zero = right_values == 0
+            if has_zero:
+                raise NotVectorizable()
+            # Python divide inteiros com arredondamento exato; o NumPy os converte antes
+            if left_kind is int and right_kind is int and max(left_bound, right_bound) > EXACT_FLOAT_INT:
+                raise NotVectorizable()
+            return left_values / right_values, float, None
+
+        if left_kind is float or right_kind is float:
+            kind, bound = float, None
+        elif operator == '*':
+            kind, bound = int, self.check(left_bound * right_bound)
+        else:
+            kind, bound = int, self.check(left_bound + right_bound)
+
+        if operator == '+':
+            return left_values + right_values, kind, bound
+        elif operator == '-':
+            return left_values - right_values, kind, bound
+        return left_values * right_values, kind, bound
@@ -0,0 +1,338 @@
+"""
+Máquina virtual de pilha para o compilador Pascal.
+Executa o bytecode gerado por BytecodeCompiler em um único laço de despacho,
+mantendo os registros de ativação em uma pilha explícita (sem recursão Python).
+"""
+
+from typing import Any, Dict, List, Optional
+from .ast_nodes import Program
+from .bytecode import *
+from .bytecode import BytecodeCompiler, CodeObject
+from .interpreter import Interpreter
+from .output import OutputSink
+from .input import InputSource
+from .runtime import (
+    RuntimeError, PascalArray, is_truthy, divide, int_divide, modulo,
+    load_element, store_element,
+)
+from .vectorizer import run_vectorized
+
+# Marcador empilhado por READ_NAME/READ_ELEMENT quando a entrada acaba
+_EOF = object()
+# Valor sentinela para iteradores esgotados
+_DONE = object()
+
+# Chamadas ativas permitidas antes de um erro de execução (chamadas de cauda
+# reaproveitam o registro de ativação e não contam)
+DEFAULT_MAX_DEPTH = 1000000
+
+class Environment:
+    """Escopo de nomes da VM, encadeado ao escopo de quem o criou."""
+    __slots__ = ('parent', 'variables')
+
+    def __init__(self, parent: Optional['Environment'] = None):
+        self.parent = parent
+        self.variables: Dict[str, Any] = {}
+
+class VirtualMachine(Interpreter):
+    """
+    Backend que compila o programa para bytecode e o executa em uma VM de pilha.
+    Chamadas Pascal não consomem frames Python, permitindo recursão profunda
+    até max_depth chamadas ativas.
+    """
+
+    def __init__(self, output: Optional[OutputSink] = None, source: Optional[InputSource] = None,
+                 max_depth: int = DEFAULT_MAX_DEPTH):
+        super().__init__(output, source)
+        self.max_depth = max_depth
+        self.code: Optional[CodeObject] = None
+        self.global_env = Environment()
+
+    def interpret(self, program: Program):
+        # Declarações globais fazem parte do próprio bytecode
+        self.code = BytecodeCompiler().compile(program)
+        self.start_budget()
+        try:
+            self.run(self.code)
+        finally:
+            self.output.flush()
+
+    def run(self, code: CodeObject):
+        opcodes = code.opcodes
+        operands = code.operands
+        constants = code.constants
+        names = code.names
+        write = self.output.write
+        source = self.input
+        max_depth = self.max_depth
+        # Passos contados nos desvios para trás (voltas de laços) e nas chamadas
+        budget = self.budget
+        global_env = self.global_env
+        global_variables = global_env.variables
+        static_routines = code.static_routines
+
+        stack: List[Any] = []
+        push = stack.append
+        pop = stack.pop
+        # Registros de ativação: (endereço de retorno, escopo de quem chamou, base da pilha)
+        frames = []
+        env = self.global_env
+        pc = 0
+
+        while True:
+            opcode = opcodes[pc]
+            arg = operands[pc]
+            pc += 1
+
+            if opcode == LOAD_NAME:
+                name = names[arg]
+                scope = env
+                while scope is not None:
+                    variables = scope.variables
+                    if name in variables:
+                        push(variables[name])
+                        break
+                    scope = scope.parent
+                else:
+                    raise RuntimeError(f"Variável não definida: {name}")
+
+            elif opcode == LOAD_GLOBAL:
+                name = names[arg]
+                if name in global_variables:
+                    push(global_variables[name])
+                else:
+                    raise RuntimeError(f"Variável não definida: {name}")
+
+            elif opcode == LOAD_CONST:
+                push(constants[arg])
+
+            elif opcode == STORE_NAME:
+                name = names[arg]
+                scope = env
+                while scope is not None:
+                    variables = scope.variables
+                    if name in variables:
+                        variables[name] = pop()
+                        break
+                    scope = scope.parent
+                else:
+                    raise RuntimeError(f"Variável não definida: {name}")
+
+            elif opcode == STORE_GLOBAL:
+                name = names[arg]
+                if name in global_variables:
+                    global_variables[name] = pop()
+                else:
+                    raise RuntimeError(f"Variável não definida: {name}")
+
+            elif opcode == JUMP_IF_FALSE:
+                condition = pop()
+                if condition is not True and (condition is False or not is_truthy(condition)):
+                    pc = arg
+
+            elif opcode == JUMP:
+                if arg < pc and budget is not None:
+                    budget.step()
+                pc = arg
+
+            elif opcode == ADD:
+                right = pop()
+                stack[-1] = stack[-1] + right
+
+            elif opcode == SUB:
+                right = pop()
+                stack[-1] = stack[-1] - right
+
+            elif opcode == MUL:
+                right = pop()
+                stack[-1] = stack[-1] * right
+
+            elif opcode == LT:
+                right = pop()
+                stack[-1] = stack[-1] < right
+
+            elif opcode == GT:
+                right = pop()
+                stack[-1] = stack[-1] > right
+
+            elif opcode == LE:
+                right = pop()
+                stack[-1] = stack[-1] <= right
+
+            elif opcode == GE:
+                right = pop()
+                stack[-1] = stack[-1] >= right
+
+            elif opcode == EQ:
+                right = pop()
+                stack[-1] = stack[-1] == right
+
+            elif opcode == NE:
+                right = pop()
+                stack[-1] = stack[-1] != right
+
+            elif opcode == LOAD_ELEMENT:
+                name = names[arg]
+                index = pop()
+                push(load_element(self.lookup(env, name), name, index))
+
+            elif opcode == STORE_ELEMENT:
+                name = names[arg]
+                index = pop()
+                value = pop()
+                store_element(self.lookup(env, name), name, index, value)
+
+            elif opcode == FOR_ITER:
+                value = next(stack[-1], _DONE)
+                if value is _DONE:
+                    pop()
+                    env = env.parent
+                    pc = arg
+                else:
+                    push(value)
+
+            elif opcode == DEFINE_NAME:
+                env.variables[names[arg]] = pop()
+
+            elif opcode == NEW_SCOPE:
+                env = Environment(env)
+
+            elif opcode == CALL:
+                if budget is not None:
+                    budget.step()
+                if len(frames) >= max_depth:
+                    raise RuntimeError(f"Profundidade máxima de recursão excedida ({max_depth} chamadas)")
+                frames.append((pc, env.parent, len(stack)))
+                # Argumentos já foram avaliados: rotinas que não leem o escopo de
+                # quem chama buscam nomes só nos próprios escopos e no global
+                if arg in static_routines:
+                    env.parent = global_env
+                pc = arg
+
+            elif opcode == TAIL_CALL:
+                # O escopo da rotina chamada passa a descender do escopo de quem chamou
+                # a rotina atual, que é descartada junto com sua parte da pilha
+                if budget is not None:
+                    budget.step()
+                _, caller_env, base = frames[-1]
+                env.parent = global_env if arg in static_routines else caller_env
+                del stack[base:]
+                pc = arg
+
+            elif opcode == RETURN:
+                value = pop()
+                pc, env, base = frames.pop()
+                del stack[base:]
+                push(value)
+
+            elif opcode == POP:
+                pop()
+
+            elif opcode == FOR_PREP:
+                end_value = pop()
+                start_value = pop()
+
+                if not isinstance(start_value, int) or not isinstance(end_value, int):
+                    raise RuntimeError("Valores do loop FOR devem ser inteiros")
+
+                # Variável de controle vive em um escopo próprio
+                env = Environment(env)
+                push(iter(range(start_value, end_value + 1)))
+
+            elif opcode == FOR_VECTOR:
+                kernel = pop()
+                base = len(stack) - len(kernel[0])
+                vector_operands = stack[base:]
+                del stack[base:]
+                if run_vectorized(kernel, stack[-2], stack[-1], vector_operands):
+                    # As voltas executadas de uma vez contam como no laço normal
+                    if budget is not None:
+                        budget.charge(stack[-1] - stack[-2] + 1)
+                    del stack[-2:]
+                    pc = arg
+
+            elif opcode == DIVIDE:
+                right = pop()
+                stack[-1] = divide(stack[-1], right)
+
+            elif opcode == INT_DIV:
+                right = pop()
+                stack[-1] = int_divide(stack[-1], right)
+
+            elif opcode == MOD:
+                right = pop()
+                stack[-1] = modulo(stack[-1], right)
+
+            elif opcode == AND:
+                right = pop()
+                stack[-1] = is_truthy(stack[-1]) and is_truthy(right)
+
+            elif opcode == OR:
+                right = pop()
+                stack[-1] = is_truthy(stack[-1]) or is_truthy(right)
+
+            elif opcode == NEG:
+                stack[-1] = -stack[-1]
+
+            elif opcode == POS:
+                stack[-1] = +stack[-1]
+
+            elif opcode == NOT:
+                stack[-1] = not is_truthy(stack[-1])
+
+            elif opcode == PRINT:
+                if arg:
+                    values = stack[-arg:]
+                    del stack[-arg:]
+                    output = ''.join([str(value) for value in values])
+                else:
+                    output = ''
+                write(output)
+
+            elif opcode == READ_NAME:
+                declared = pop()
+                try:
+                    name = names[arg]
+                    push(source.read(name, self.lookup(env, name), declared))
+                except EOFError:
+                    push(_EOF)
+
+            elif opcode == READ_ELEMENT:
+                declared = pop()
+                try:
+                    name = names[arg]
+                    index = stack[-1]
+                    push(source.read_element(name, self.lookup(env, name), index, declared))
+                except EOFError:
+                    pop()
+                    push(_EOF)
+
+            elif opcode == JUMP_IF_EOF:
+                if stack[-1] is _EOF:
+                    pop()
+                    pc = arg
+
+            elif opcode == ROT_TWO:
+                stack[-1], stack[-2] = stack[-2], stack[-1]
+
+            elif opcode == MAKE_ARRAY:
+                if budget is not None:
+                    budget.allocate(arg)
+                stack[-1] = PascalArray(stack[-1], arg)
+
+            elif opcode == RAISE:
+                raise RuntimeError(constants[arg])
+
+            elif opcode == HALT:
+                return
+
+            else:
+                raise RuntimeError(f"Opcode inválido: {opcode}")
+
+    def lookup(self, env: Environment, name: str) -> Any:
+        while env is not None:
+            variables = env.variables
+            if name in variables:
+                return variables[name]
+            env = env.parent
+        raise RuntimeError(f"Variável não definida: {name}")
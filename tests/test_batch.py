@@ -0,0 +1,176 @@
+"""
+Testes unitários para a execução em lote de programas
+"""
+
+import io
+import json
+import os
+import signal
+import sys
+import tempfile
+import unittest
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.batch import BatchJob, find_jobs, run_job, run_batch
+from compiler.backends import BACKENDS
+
+PROGRAMS = {
+    'soma.pas': """program soma;
+var a, b: integer;
+begin
+    readln(a, b);
+    writeln(a + b);
+end.
+""",
+    'ola.pas': """program ola;
+begin
+    writeln('olá');
+    writeln('mundo');
+end.
+""",
+    'sintaxe.pas': """program sintaxe;
+begin
+    writeln(1
+end.
+""",
+    'divisao.pas': """program divisao;
+var x: integer;
+begin
+    writeln('antes');
+    x := 1 div 0;
+end.
+""",
+    'longa.pas': """program longa;
+begin
+    for i := 1 to 20000 do
+        writeln('linha ', i);
+end.
+""",
+    'laco.pas': """program laco;
+var i: integer;
+begin
+    i := 0;
+    while true do
+        i := i + 1;
+end.
+""",
+}
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = self.directory.name
+
+    def write(self, name, text):
+        """Cria um arquivo no diretório temporário e retorna seu caminho"""
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def test_scan_directory(self):
+        """Testa a busca de .pas em subdiretórios, com o arquivo .in de cada um"""
+        self.write('b.pas', PROGRAMS['ola.pas'])
+        self.write('a.pas', PROGRAMS['soma.pas'])
+        self.write('a.in', '2 3\n')
+        self.write('turma/c.pas', PROGRAMS['ola.pas'])
+        self.write('notas.txt', 'ignorado')
+
+        jobs = find_jobs(self.root)
+        names = [os.path.relpath(job.program, self.root) for job in jobs]
+        self.assertEqual(names, ['a.pas', 'b.pas', os.path.join('turma', 'c.pas')])
+        self.assertEqual(jobs[0].input, os.path.join(self.root, 'a.in'))
+        self.assertIsNone(jobs[1].input)
+
+    def test_manifest(self):
+        """Testa o manifesto com entradas, comentários e caminhos relativos"""
+        manifest = self.write('lista/manifesto.txt', """# programas da turma
+../a.pas   entradas/a1.txt
+../a.pas   entradas/a2.txt   # mesmo programa, outra entrada
+
+../b.pas
+""")
+        jobs = find_jobs(manifest)
+        base = os.path.join(self.root, 'lista')
+        self.assertEqual([(job.program, job.input) for job in jobs], [
+            (os.path.join(base, '../a.pas'), os.path.join(base, 'entradas/a1.txt')),
+            (os.path.join(base, '../a.pas'), os.path.join(base, 'entradas/a2.txt')),
+            (os.path.join(base, '../b.pas'), None),
+        ])
+
+        invalid = self.write('invalido.txt', "a.pas b.in c.in\n")
+        with self.assertRaises(ValueError):
+            find_jobs(invalid)
+
+    def test_job_results(self):
+        """Testa status, código de saída e saída capturada de cada programa"""
+        paths = {name: self.write(name, text) for name, text in PROGRAMS.items()}
+        entrada = self.write('soma.in', '2\n40\n')
+
+        result = run_job(BatchJob(paths['soma.pas'], entrada), 'closure')
+        self.assertEqual((result['status'], result['exit_code'], result['output']), ('ok', 0, '42\n'))
+        self.assertIsNone(result['error'])
+        self.assertEqual(set(result['times']), {'lex', 'parse', 'execute', 'total'})
+
+        result = run_job(BatchJob(paths['sintaxe.pas']))
+        self.assertEqual((result['status'], result['exit_code']), ('syntax_error', 1))
+        self.assertNotIn('execute', result['times'])
+
+        # A saída escrita antes do erro de execução é mantida
+        result = run_job(BatchJob(paths['divisao.pas']), 'bytecode')
+        self.assertEqual((result['status'], result['output']), ('runtime_error', 'antes\n'))
+        self.assertEqual(result['error'], 'Divisão por zero')
+
+        result = run_job(BatchJob(os.path.join(self.root, 'ausente.pas')))
+        self.assertEqual(result['status'], 'error')
+
+        # Só as últimas linhas da saída entram no relatório, em todos os backends
+        for backend in BACKENDS:
+            result = run_job(BatchJob(paths['longa.pas']), backend, output_lines=2)
+            self.assertEqual((result['status'], result['output']),
+                             ('ok', 'linha 19999\nlinha 20000\n'), backend)
+
+    @unittest.skipUnless(hasattr(signal, 'setitimer'), "limite de tempo requer SIGALRM")
+    def test_timeout(self):
+        """Testa o limite de tempo por programa"""
+        path = self.write('laco.pas', PROGRAMS['laco.pas'])
+        result = run_job(BatchJob(path), timeout=0.2)
+        self.assertEqual((result['status'], result['exit_code']), ('timeout', 1))
+        self.assertGreaterEqual(result['times']['total'], 0.2)
+        self.assertLess(result['times']['total'], 5)
+
+        # O alarme é cancelado ao fim de cada programa
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+
+    def test_run_batch_report(self):
+        """Testa o relatório JSON Lines do pool de processos"""
+        for name, text in PROGRAMS.items():
+            self.write(name, text)
+        self.write('soma.in', '1 2')
+        jobs = find_jobs(self.root)
+
+        report = io.StringIO()
+        statuses = run_batch(jobs, report, workers=2, timeout=1)
+        self.assertEqual(dict(statuses), {'ok': 3, 'syntax_error': 1, 'runtime_error': 1, 'timeout': 1})
+
+        results = {os.path.basename(line['program']): line
+                   for line in map(json.loads, report.getvalue().splitlines())}
+        self.assertEqual(len(results), len(PROGRAMS))
+        self.assertEqual(results['soma.pas']['output'], '3\n')
+        self.assertEqual(results['ola.pas']['output'], 'olá\nmundo\n')
+        self.assertEqual(len(results['longa.pas']['output'].splitlines()), 1000)
+        self.assertEqual(results['laco.pas']['status'], 'timeout')
+        self.assertNotEqual(results['ola.pas']['worker'], os.getpid())
+
+        with self.assertRaises(ValueError):
+            run_batch(jobs, report, backend='jit')
+        with self.assertRaises(ValueError):
+            run_batch(jobs, report, output_lines=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Testes unitários para o compilador de bytecode e a máquina virtual
+"""
+
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.bytecode import BytecodeCompiler, disassemble, OPCODE_NAMES
+from compiler.vm import VirtualMachine
+
+class TestBytecode(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_backend(self, backend_class, source):
+        """Helper para executar código em um backend"""
+        interpreter = backend_class()
+        interpreter.interpret(self.parse_source(source))
+        return interpreter.get_output()
+
+    def test_compact_buffers(self):
+        """Testa que opcodes e operandos ficam em buffers array"""
+        source = """
+        program test;
+        var i: integer;
+        begin
+            for i := 1 to 3 do
+                writeln(i);
+        end.
+        """
+
+        code = BytecodeCompiler().compile(self.parse_source(source))
+        self.assertEqual(code.opcodes.typecode, 'B')
+        self.assertEqual(code.operands.typecode, 'i')
+        self.assertEqual(len(code.opcodes), len(code.operands))
+        self.assertEqual(OPCODE_NAMES[code.opcodes[-1]], 'HALT')
+
+    def test_disassemble(self):
+        """Testa a listagem do disassembler"""
+        source = """
+        program test;
+        function dobro(x: integer): integer;
+        begin
+            return x * 2;
+        end;
+        begin
+            writeln(dobro(21));
+        end.
+        """
+
+        listing = disassemble(BytecodeCompiler().compile(self.parse_source(source)))
+        self.assertIn('programa test:', listing)
+        self.assertIn('function dobro:', listing)
+        self.assertIn('CALL', listing)
+        self.assertIn('(x)', listing)
+
+    def test_same_output_as_tree_walker(self):
+        """Testa controle de fluxo, arrays e rotinas contra o tree-walker"""
+        source = """
+        program test;
+        var v: array[5] of integer;
+        var i, j, temp: integer;
+        var achou: boolean;
+
+        procedure mostrar(k: integer);
+        begin
+            if k > 3 then
+                return;
+            writeln('v[', k, '] = ', v[k]);
+        end;
+
+        begin
+            for i := 0 to 4 do
+                v[i] := (i * 3) mod 5;
+            for i := 0 to 3 do
+                for j := 0 to 3 - i do
+                    if v[j] > v[j + 1] then
+                    begin
+                        temp := v[j];
+                        v[j] := v[j + 1];
+                        v[j + 1] := temp;
+                    end;
+            i := 0;
+            achou := false;
+            while (i < 5) and not achou do
+            begin
+                mostrar(i);
+                achou := v[i] = 3;
+                i := i + 1;
+            end;
+            writeln(i, ' ', achou, ' ', 7 / 2, ' ', -i);
+        end.
+        """
+
+        expected = self.run_backend(Interpreter, source)
+        self.assertEqual(self.run_backend(VirtualMachine, source), expected)
+
+    def test_deep_recursion(self):
+        """Testa recursão além do limite de recursão do Python, lendo globais sem subir a cadeia"""
+        source = """
+        program test;
+        var k: integer;
+
+        function soma(n: integer): integer;
+        begin
+            if n = 0 then
+                return 0;
+            return n + k + soma(n - 1);
+        end;
+
+        function le_k(n: integer): integer;
+        begin
+            return n + k;
+        end;
+
+        function liga_k(k: integer): integer;
+        begin
+            return le_k(1) + 0;
+        end;
+
+        begin
+            k := 1;
+            writeln(soma(40000));
+            writeln(liga_k(7), ' ', le_k(5));
+        end.
+        """
+
+        output = self.run_backend(VirtualMachine, source)
+        self.assertEqual(output, [str(sum(range(40001)) + 40000), '8 6'])
+
+        # k é global em soma; le_k pode ler o k de liga_k e continua na cadeia de quem chama
+        code = BytecodeCompiler().compile(self.parse_source(source))
+        routines = {label: address for address, label in code.labels.items()}
+        self.assertEqual(code.static_routines,
+                         {routines['function soma'], routines['function liga_k']})
+        listing = disassemble(code)
+        self.assertIn('LOAD_GLOBAL', listing)
+        self.assertIn('STORE_GLOBAL', listing)
+
+    def test_runtime_errors(self):
+        """Testa erros de execução com as mesmas mensagens"""
+        sources = [
+            "program t; var a: array[2] of integer; begin a[5] := 1; end.",
+            "program t; var x: integer; begin x := 1 mod 0; end.",
+            "program t; begin writeln(z); end.",
+            "program t; begin writeln(f(1)); end.",
+        ]
+
+        for source in sources:
+            with self.assertRaises(RuntimeError) as expected:
+                self.run_backend(Interpreter, source)
+            with self.assertRaises(RuntimeError) as actual:
+                self.run_backend(VirtualMachine, source)
+            self.assertEqual(str(actual.exception), str(expected.exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Testes unitários para o cache de programas compilados
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter
+from compiler.cache import ProgramCache
+
+SOURCE = """
+program test;
+var i, total: integer;
+begin
+    total := 0;
+    for i := 1 to 10 do
+        total := total + i;
+    writeln('total = ', total);
+end.
+"""
+
+class TestProgramCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_program(self, program):
+        """Helper para executar uma AST"""
+        interpreter = Interpreter()
+        interpreter.interpret(program)
+        return interpreter.get_output()
+
+    def cache_files(self):
+        return sorted(os.listdir(self.directory.name))
+
+    def test_miss_then_hit(self):
+        """Testa que a AST gravada é carregada e executa igual"""
+        cache = ProgramCache(self.directory.name)
+        self.assertIsNone(cache.load(SOURCE))
+
+        self.assertTrue(cache.store(SOURCE, self.parse_source(SOURCE)))
+        cached = cache.load(SOURCE)
+
+        self.assertIsNotNone(cached)
+        self.assertEqual(self.run_program(cached), ['total = 55'])
+
+    def test_key_depends_on_source_and_version(self):
+        """Testa que a chave muda com o código fonte e com a versão"""
+        cache = ProgramCache(self.directory.name, version='1')
+        other_version = ProgramCache(self.directory.name, version='2')
+
+        self.assertNotEqual(cache.key(SOURCE), cache.key(SOURCE + ' '))
+        self.assertNotEqual(cache.key(SOURCE), other_version.key(SOURCE))
+
+        cache.store(SOURCE, self.parse_source(SOURCE))
+        self.assertIsNone(other_version.load(SOURCE))
+        self.assertIsNotNone(cache.load(SOURCE))
+
+    def test_atomic_write_and_corrupt_entry(self):
+        """Testa que não sobram temporários e entradas corrompidas são descartadas"""
+        cache = ProgramCache(self.directory.name)
+        cache.store(SOURCE, self.parse_source(SOURCE))
+        self.assertEqual(self.cache_files(), [os.path.basename(cache.path(SOURCE))])
+
+        with open(cache.path(SOURCE), 'wb') as file:
+            file.write(b'corrompido')
+
+        self.assertIsNone(cache.load(SOURCE))
+        self.assertEqual(self.cache_files(), [])
+
+    def test_lru_eviction(self):
+        """Testa que as entradas usadas há mais tempo são removidas primeiro"""
+        cache = ProgramCache(self.directory.name)
+        sources = [SOURCE.replace('total = ', f'total {n} = ') for n in range(4)]
+
+        for age, source in enumerate(sources):
+            cache.store(source, self.parse_source(source))
+            os.utime(cache.path(source), (1000 + age, 1000 + age))
+
+        # Acesso recente protege a entrada mais antiga
+        self.assertIsNotNone(cache.load(sources[0]))
+
+        entry_size = os.path.getsize(cache.path(sources[0]))
+        cache.max_bytes = entry_size * 2
+        cache.evict()
+
+        self.assertIsNotNone(cache.load(sources[0]))
+        self.assertIsNotNone(cache.load(sources[3]))
+        self.assertIsNone(cache.load(sources[1]))
+        self.assertIsNone(cache.load(sources[2]))
+
+    def test_unwritable_directory(self):
+        """Testa que falhas de escrita não interrompem a execução"""
+        blocker = os.path.join(self.directory.name, 'arquivo')
+        with open(blocker, 'w') as file:
+            file.write('não é um diretório')
+
+        cache = ProgramCache(os.path.join(blocker, 'cache'))
+        self.assertFalse(cache.store(SOURCE, self.parse_source(SOURCE)))
+        self.assertIsNone(cache.load(SOURCE))
+
+if __name__ == '__main__':
+    unittest.main()
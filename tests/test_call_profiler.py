@@ -0,0 +1,166 @@
+"""
+Testes unitários para o profiler de chamadas
+"""
+
+import io
+import unittest
+import sys
+import os
+import itertools
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.output import OutputSink
+from compiler.profiler import LineProfiler, CallProfiler, PROFILING_BACKENDS
+
+SOURCE = """program chamadas;
+var i, total: integer;
+
+function fib(n: integer): integer;
+begin
+    if n < 2 then
+        return n;
+    return fib(n - 1) + fib(n - 2);
+end;
+
+procedure acumula(limite: integer);
+begin
+    for i := 1 to limite do
+        total := total + fib(i);
+end;
+
+begin
+    total := 0;
+    acumula(5);
+    writeln(total);
+end.
+"""
+
+class TestCallProfiler(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def profile(self, backend, source=SOURCE, clock=None):
+        """Executa o programa só com o profiler de chamadas e retorna (profiler, interpretador)"""
+        profiler = CallProfiler(clock) if clock is not None else CallProfiler()
+        interpreter = PROFILING_BACKENDS[backend](OutputSink(stream=io.StringIO()), None, None, profiler)
+        interpreter.interpret(self.parse_source(source))
+        return profiler, interpreter
+
+    def test_calls_and_edges(self):
+        """Testa a contagem de chamadas, as arestas e o leque da recursão"""
+        for backend in PROFILING_BACKENDS:
+            profiler, interpreter = self.profile(backend)
+            self.assertEqual(interpreter.get_output(), ['12'])
+            # fib(1..5) faz 1 + 3 + 5 + 9 + 15 chamadas
+            self.assertEqual(dict(profiler.calls), {'chamadas': 1, 'acumula': 1, 'fib': 33})
+            self.assertEqual(dict(profiler.edges), {
+                ('chamadas', 'acumula'): 1,
+                ('acumula', 'fib'): 5,
+                ('fib', 'fib'): 28,
+            })
+            # Cada execução de fib que recorre faz duas chamadas
+            self.assertEqual(profiler.edge_callers['fib', 'fib'], 14)
+            self.assertEqual(profiler.edge_callers['acumula', 'fib'], 1)
+            self.assertEqual(profiler.max_depth['fib'], 5)
+            self.assertEqual(profiler.max_depth['acumula'], 1)
+
+    def test_self_and_total_time(self):
+        """Testa que o tempo próprio desconta as rotinas chamadas e a recursão conta uma vez"""
+        for backend in PROFILING_BACKENDS:
+            # Relógio que avança 1 a cada leitura torna os tempos determinísticos
+            profiler, _ = self.profile(backend, clock=itertools.count().__next__)
+
+            # Os tempos próprios somam o tempo total do programa
+            self.assertEqual(sum(profiler.self_times.values()), profiler.total_times['chamadas'])
+            self.assertEqual(profiler.total_times['acumula'],
+                             profiler.self_times['acumula'] + profiler.total_times['fib'])
+            # fib recursiva não soma o mesmo intervalo mais de uma vez
+            self.assertLessEqual(profiler.total_times['fib'], profiler.total_times['acumula'])
+            self.assertEqual(profiler.total_times['fib'], profiler.self_times['fib'])
+
+        # Argumentos são avaliados por quem chama: dobro(dobro(3)) são duas chamadas
+        # feitas por soma, com os mesmos tempos nos dois backends
+        source = """program aninhadas;
+var x: integer;
+
+function dobro(n: integer): integer;
+begin
+    return n * 2;
+end;
+
+function soma(a, b: integer): integer;
+begin
+    return a + dobro(dobro(b));
+end;
+
+begin
+    x := soma(dobro(1), 3);
+    writeln(x);
+end.
+"""
+        results = []
+        for backend in PROFILING_BACKENDS:
+            profiler, interpreter = self.profile(backend, source, clock=itertools.count().__next__)
+            self.assertEqual(interpreter.get_output(), ['14'])
+            self.assertEqual(dict(profiler.edges), {
+                ('aninhadas', 'soma'): 1,
+                ('aninhadas', 'dobro'): 1,
+                ('soma', 'dobro'): 2,
+            })
+            results.append((dict(profiler.self_times), dict(profiler.total_times)))
+        self.assertEqual(results[0], results[1])
+
+    def test_table_sorting(self):
+        """Testa a ordem das linhas da tabela por cada chave"""
+        profiler, _ = self.profile('tree', clock=itertools.count().__next__)
+
+        def names(sort):
+            return [line.split()[0] for line in profiler.table(sort).splitlines()[1:]]
+
+        self.assertEqual(names('calls'), ['fib', 'acumula', 'chamadas'])
+        self.assertEqual(names('total'), ['chamadas', 'acumula', 'fib'])
+        self.assertEqual(names('name'), ['acumula', 'chamadas', 'fib'])
+        self.assertEqual(names('self')[0], 'fib')
+        self.assertEqual(profiler.table('calls').splitlines()[1].split()[1], '33')
+
+        with self.assertRaises(ValueError):
+            profiler.table('linhas')
+
+    def test_call_graph(self):
+        """Testa o grafo de chamadas no formato DOT"""
+        profiler, _ = self.profile('closure')
+        graph = profiler.call_graph().splitlines()
+
+        self.assertEqual(graph[0], "digraph chamadas {")
+        self.assertEqual(graph[-1], "}")
+        self.assertEqual(sum(1 for line in graph if '->' in line), 3)
+        self.assertIn('    "fib" -> "fib" [label="28 chamadas\\nde 14 execuções (2.00 por execução)"];',
+                      graph)
+        self.assertTrue(any(line.startswith('    "fib" [label="fib\\n33 chamadas') for line in graph))
+
+    def test_combined_with_line_profiler(self):
+        """Testa os dois profilers juntos e o profiler de linhas desligado"""
+        for backend in PROFILING_BACKENDS:
+            lines, calls = LineProfiler(), CallProfiler()
+            interpreter = PROFILING_BACKENDS[backend](OutputSink(stream=io.StringIO()), None, lines, calls)
+            interpreter.interpret(self.parse_source(SOURCE))
+            self.assertEqual(interpreter.get_output(), ['12'])
+            self.assertEqual(calls.calls['fib'], 33)
+            self.assertEqual(lines.hits[14], 5)
+            self.assertEqual(lines.hits[8], 14)
+
+            # Só com o profiler de chamadas, nenhuma linha é medida
+            _, interpreter = self.profile(backend)
+            self.assertIsNone(interpreter.profiler)
+
+if __name__ == '__main__':
+    unittest.main()
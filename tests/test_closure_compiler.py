@@ -0,0 +1,145 @@
+"""
+Testes unitários para o backend de closures
+"""
+
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+
+class TestClosureCompiler(unittest.TestCase):
+
+    def run_backend(self, backend_class, source):
+        """Helper para executar código em um backend"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        interpreter = backend_class()
+        interpreter.interpret(ast)
+        return interpreter.get_output()
+
+    def assert_same_output(self, source):
+        """Compara a saída do backend de closures com a do tree-walker"""
+        expected = self.run_backend(Interpreter, source)
+        output = self.run_backend(ClosureInterpreter, source)
+        self.assertEqual(output, expected)
+        return output
+
+    def test_arithmetic_and_logic(self):
+        """Testa operadores aritméticos, relacionais e lógicos"""
+        source = """
+        program test;
+        var x, y: integer;
+        begin
+            x := 17;
+            y := 5;
+            writeln(x + y, ' ', x - y, ' ', x * y, ' ', x / y);
+            writeln(x div y, ' ', x mod y, ' ', -x, ' ', +y);
+            writeln(x > y, x < y, x = y, x <> y, x >= 17, y <= 4);
+            writeln((x > 0) and (y > 0), ' ', (x < 0) or (y < 0), ' ', not (x > y));
+        end.
+        """
+
+        output = self.assert_same_output(source)
+        self.assertEqual(output[0], '22 12 85 3.4')
+
+    def test_recursive_function(self):
+        """Testa função recursiva com return"""
+        source = """
+        program test;
+        var i: integer;
+
+        function fib(n: integer): integer;
+        begin
+            if n < 2 then
+                return n;
+            return fib(n - 1) + fib(n - 2);
+        end;
+
+        begin
+            for i := 0 to 10 do
+                writeln(fib(i));
+        end.
+        """
+
+        output = self.assert_same_output(source)
+        self.assertEqual(output[-1], '55')
+
+    def test_sort_with_arrays(self):
+        """Testa ordenação com arrays e loops aninhados"""
+        source = """
+        program test;
+        var v: array[6] of integer;
+        var n, i, j, temp: integer;
+        begin
+            n := 6;
+            for i := 0 to n - 1 do
+                v[i] := (i * 7) mod 5;
+            for i := 0 to n - 2 do
+                for j := 0 to n - 2 - i do
+                    if v[j] > v[j + 1] then
+                    begin
+                        temp := v[j];
+                        v[j] := v[j + 1];
+                        v[j + 1] := temp;
+                    end;
+            for i := 0 to n - 1 do
+                writeln(v[i]);
+        end.
+        """
+
+        output = self.assert_same_output(source)
+        self.assertEqual(output, ['0', '0', '1', '2', '3', '4'])
+
+    def test_procedure_scoping(self):
+        """Testa escopo de procedimentos e variável de controle do for"""
+        source = """
+        program test;
+        var i, total: integer;
+
+        procedure acumular(valor: integer);
+        begin
+            total := total + valor * i;
+            if valor > 2 then
+                return;
+            writeln('parcial ', total);
+        end;
+
+        begin
+            i := 100;
+            total := 0;
+            for i := 1 to 4 do
+                acumular(i);
+            writeln(total, ' ', i);
+        end.
+        """
+
+        self.assert_same_output(source)
+
+    def test_runtime_errors(self):
+        """Testa erros de execução com as mesmas mensagens"""
+        sources = [
+            "program t; var a: array[2] of integer; begin a[2] := 1; end.",
+            "program t; var x: integer; begin x := 1 div 0; end.",
+            "program t; begin y := 1; end.",
+            "program t; begin nada(1); end.",
+        ]
+
+        for source in sources:
+            with self.assertRaises(RuntimeError) as expected:
+                self.run_backend(Interpreter, source)
+            with self.assertRaises(RuntimeError) as actual:
+                self.run_backend(ClosureInterpreter, source)
+            self.assertEqual(str(actual.exception), str(expected.exception))
+
+if __name__ == '__main__':
+    unittest.main()
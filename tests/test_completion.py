@@ -0,0 +1,170 @@
+"""
+Testes unitários para o retorno de rotinas sem exceções (Completion)
+"""
+
+import io
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.ast_nodes import ReturnStatement, Assignment
+from compiler.interpreter import Interpreter, Completion, RETURN
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.vm import VirtualMachine
+from compiler.transpiler import TranspiledInterpreter
+from compiler.output import OutputSink
+from compiler.profiler import PROFILING_BACKENDS
+from compiler.memoizer import MEMOIZING_BACKENDS
+
+BACKENDS = [Interpreter, ClosureInterpreter, VirtualMachine, TranspiledInterpreter]
+
+class TestCompletion(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_all(self, source, backends=BACKENDS):
+        """Executa o programa em cada backend e retorna as saídas"""
+        outputs = []
+        for backend in backends:
+            interpreter = backend(OutputSink(stream=io.StringIO()))
+            interpreter.interpret(self.parse_source(source))
+            outputs.append(interpreter.get_output())
+        return outputs
+
+    def test_return_from_nested_loops(self):
+        """Testa o return de dentro de laços aninhados, em todos os backends"""
+        source = """
+        program test;
+        var j: integer;
+
+        function posicao(alvo: integer): integer;
+        begin
+            for i := 0 to 9 do
+            begin
+                j := 0;
+                while j < 10 do
+                begin
+                    if i * 10 + j = alvo then
+                        return i * 100 + j;
+                    j := j + 1;
+                end;
+            end;
+            return -1;
+        end;
+
+        begin
+            writeln(posicao(0), ' ', posicao(37), ' ', posicao(99), ' ', posicao(500));
+        end.
+        """
+
+        expected = [['0 307 909 -1']]
+        self.assertEqual(self.run_all(source), expected * len(BACKENDS))
+
+        # Profilers e memoização repassam o retorno do corpo da função
+        self.assertEqual(self.run_all(source, PROFILING_BACKENDS.values()),
+                         expected * len(PROFILING_BACKENDS))
+        self.assertEqual(self.run_all(source, MEMOIZING_BACKENDS.values()),
+                         expected * len(MEMOIZING_BACKENDS))
+
+    def test_return_in_procedure(self):
+        """Testa que return encerra só o procedimento e seu valor é ignorado"""
+        source = """
+        program test;
+        procedure mostra(n: integer);
+        begin
+            for i := 1 to n do
+            begin
+                if i = 3 then
+                    return 99;
+                writeln(i);
+            end;
+            writeln('não alcançado');
+        end;
+
+        begin
+            mostra(5);
+            writeln('fim');
+        end.
+        """
+
+        self.assertEqual(self.run_all(source), [['1', '2', 'fim']] * len(BACKENDS))
+
+    def test_return_in_main_program(self):
+        """Testa que return no programa principal encerra a execução"""
+        source = """
+        program test;
+        var i: integer;
+        begin
+            for i := 1 to 10 do
+            begin
+                writeln(i);
+                if i = 2 then
+                    return;
+            end;
+            writeln('não alcançado');
+        end.
+        """
+
+        self.assertEqual(self.run_all(source), [['1', '2']] * len(BACKENDS))
+
+    def test_default_value_without_return(self):
+        """Testa o valor padrão de funções que terminam sem executar um return"""
+        source = """
+        program test;
+        function talvez(x: integer): integer;
+        begin
+            if x > 0 then
+                return x;
+        end;
+
+        function nome(x: integer): string;
+        begin
+            while x > 0 do
+                x := x - 1;
+        end;
+
+        begin
+            writeln(talvez(5), ' ', talvez(-5), ' [', nome(3), ']');
+        end.
+        """
+
+        self.assertEqual(self.run_all(source, BACKENDS[:2]), [['5 0 []']] * 2)
+
+    def test_execute_statement_result(self):
+        """Testa o status de conclusão devolvido por execute_statement"""
+        program = self.parse_source("""
+        program test;
+        var x: integer;
+        begin
+            x := 1;
+            return x + 1;
+        end.
+        """)
+        assignment, return_statement = program.body.statements
+        self.assertIsInstance(assignment, Assignment)
+        self.assertIsInstance(return_statement, ReturnStatement)
+
+        interpreter = Interpreter()
+        interpreter.interpret(program)
+        self.assertIsNone(interpreter.execute_statement(assignment))
+
+        completion = interpreter.execute_statement(return_statement)
+        self.assertIsInstance(completion, Completion)
+        self.assertEqual((completion.kind, completion.value), (RETURN, 2))
+
+        # O bloco repassa o return do comando que o interrompeu
+        completion = interpreter.execute_statement(program.body)
+        self.assertEqual((completion.kind, completion.value), (RETURN, 2))
+
+if __name__ == '__main__':
+    unittest.main()
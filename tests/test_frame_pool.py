@@ -0,0 +1,186 @@
+"""
+Testes unitários para o cache de rotinas por ponto de chamada e o pool de frames
+"""
+
+import io
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.resolver import Resolver
+from compiler.interpreter import Interpreter, Frame, FramePool, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.output import OutputSink
+from compiler.profiler import CallProfiler, PROFILING_BACKENDS
+from compiler.memoizer import Memoizer, MEMOIZING_BACKENDS
+
+BACKENDS = [Interpreter, ClosureInterpreter]
+
+SOURCE = """
+program test;
+var total: integer;
+
+function fib(n: integer): integer;
+begin
+    if n < 2 then
+        return n;
+    return fib(n - 1) + fib(n - 2);
+end;
+
+function dobro(n: integer): integer;
+begin
+    return n * 2;
+end;
+
+procedure soma(k: integer);
+begin
+    for i := 1 to k do
+        total := total + dobro(i);
+end;
+
+begin
+    total := 0;
+    soma(4);
+    writeln(fib(10), ' ', total);
+end.
+"""
+
+class TestFramePool(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_backend(self, backend, source=SOURCE):
+        """Executa o programa e retorna o interpretador"""
+        interpreter = backend(OutputSink(stream=io.StringIO()))
+        interpreter.interpret(self.parse_source(source))
+        return interpreter
+
+    def test_call_sites_resolved(self):
+        """Testa a rotina gravada pelo resolver em cada ponto de chamada"""
+        program = Resolver().resolve(self.parse_source(SOURCE))
+        fib, dobro, soma = program.declarations[1:]
+
+        main = program.body.statements
+        self.assertIs(main[1].routine, soma)
+        self.assertIs(main[2].expressions[0].routine, fib)
+        self.assertIs(soma.body.statements[0].body.value.right.routine, dobro)
+
+        recursive = fib.body.statements[1].value
+        self.assertIs(recursive.left.routine, fib)
+        self.assertIs(recursive.right.routine, fib)
+
+    def test_failing_calls(self):
+        """Testa os erros de chamadas sem rotina resolvida"""
+        cases = [
+            ("x := f(1);", "Função não definida: f"),
+            ("x := g(1, 2);", "Número incorreto de argumentos para g"),
+            ("p;", "Procedimento não definido: p"),
+            ("q;", "Número incorreto de argumentos para q"),
+        ]
+        for call, message in cases:
+            source = f"""
+            program test;
+            var x: integer;
+            function g(a: integer): integer;
+            begin
+                return a;
+            end;
+            procedure q(a: integer);
+            begin
+            end;
+            begin
+                {call}
+            end.
+            """
+            program = Resolver().resolve(self.parse_source(source))
+            statement = program.body.statements[0]
+            self.assertIsNone(getattr(statement, 'value', statement).routine)
+
+            for backend in BACKENDS:
+                with self.assertRaises(RuntimeError) as context:
+                    self.run_backend(backend, source)
+                self.assertEqual(str(context.exception), message)
+
+    def test_frames_reused(self):
+        """Testa que cada chamada ativa ganha um frame e os frames voltam limpos ao pool"""
+        for backend in BACKENDS:
+            interpreter = self.run_backend(backend)
+            self.assertEqual(interpreter.get_output(), ['55 20'])
+            self.assertIs(interpreter.frame, interpreter.global_frame)
+
+            # fib(10) chega a 10 chamadas ativas; soma e dobro têm frames de tamanhos
+            # diferentes (variável do for) e usam um frame cada
+            self.assertEqual(len(interpreter.frame_pools[1].free), 10)
+            self.assertEqual(len(interpreter.frame_pools[2].free), 1)
+            self.assertEqual(len(interpreter.frame_pools[0].free), 0)
+
+            # Frames livres não guardam valores nem elos da última chamada
+            for pool in interpreter.frame_pools:
+                for frame in pool.free:
+                    self.assertEqual(frame.values, [None] * pool.size)
+                    self.assertIsNone(frame.caller)
+                    self.assertIsNone(frame.scope)
+
+        pool = FramePool(2)
+        caller, scope = Frame(1), {'n': 0}
+        frame = pool.acquire(caller, scope)
+        self.assertEqual((len(frame.values), frame.caller, frame.scope), (2, caller, scope))
+        frame.values[0] = list(range(1000))
+        pool.release(frame)
+        self.assertEqual(frame.values, [None, None])
+        self.assertIs(pool.acquire(None, None), frame)
+        self.assertIsNone(frame.caller)
+
+    def test_dynamic_scope_with_pooled_frames(self):
+        """Testa buscas dinâmicas nos frames reaproveitados de quem chamou"""
+        source = """
+        program test;
+        var n: integer;
+
+        function le_n(k: integer): integer;
+        begin
+            return k + n;
+        end;
+
+        function com_n(n: integer): integer;
+        begin
+            return le_n(1);
+        end;
+
+        begin
+            n := 100;
+            writeln(com_n(5), ' ', le_n(1), ' ', com_n(7), ' ', le_n(2));
+        end.
+        """
+
+        for backend in BACKENDS:
+            self.assertEqual(self.run_backend(backend, source).get_output(), ['6 101 8 102'])
+
+    def test_profiling_and_memoizing_backends(self):
+        """Testa o cache de chamadas nos backends com profiler e memoização"""
+        for backend in PROFILING_BACKENDS.values():
+            profiler = CallProfiler()
+            interpreter = backend(OutputSink(stream=io.StringIO()), None, None, profiler)
+            interpreter.interpret(self.parse_source(SOURCE))
+            self.assertEqual(interpreter.get_output(), ['55 20'])
+            self.assertEqual((profiler.calls['fib'], profiler.calls['dobro']), (177, 4))
+
+        for backend in MEMOIZING_BACKENDS.values():
+            memoizer = Memoizer()
+            interpreter = backend(OutputSink(stream=io.StringIO()), None, memoizer)
+            interpreter.interpret(self.parse_source(SOURCE))
+            self.assertEqual(interpreter.get_output(), ['55 20'])
+            self.assertEqual(memoizer.caches['fib'].misses, 11)
+
+if __name__ == '__main__':
+    unittest.main()
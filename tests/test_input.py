@@ -0,0 +1,182 @@
+"""
+Testes unitários para a entrada em lote do readln
+"""
+
+import io
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.vm import VirtualMachine
+from compiler.transpiler import TranspiledInterpreter
+from compiler.output import OutputSink
+from compiler.input import InputSource
+
+BACKENDS = (Interpreter, ClosureInterpreter, VirtualMachine, TranspiledInterpreter)
+
+class TestInputSource(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_batch(self, backend_class, source, data, chunk_size=1 << 16):
+        """Executa o programa lendo data em lote e retorna o interpretador"""
+        interpreter = backend_class(OutputSink(stream=io.StringIO()),
+                                    InputSource('batch', io.StringIO(data), chunk_size))
+        interpreter.interpret(self.parse_source(source))
+        return interpreter
+
+    def test_tokenizer(self):
+        """Testa a separação em palavras com blocos de qualquer tamanho"""
+        data = "  12 abc\n\n3.5\t-7\nfim"
+        for chunk_size in (1, 2, 3, 64):
+            source = InputSource('batch', io.StringIO(data), chunk_size)
+            tokens = [source.next_token() for _ in range(5)]
+            self.assertEqual(tokens, ['12', 'abc', '3.5', '-7', 'fim'])
+            with self.assertRaises(EOFError):
+                source.next_token()
+
+        with self.assertRaises(ValueError):
+            InputSource('file')
+
+    def test_conversion_by_declared_type(self):
+        """Testa a conversão pelo tipo declarado de variáveis e elementos de arrays"""
+        source = """
+        program test;
+        var n: integer;
+            r: real;
+            b: boolean;
+            s: string;
+            a: array[2] of integer;
+            x: array[2] of real;
+            f: array[2] of boolean;
+            w: array[2] of string;
+        begin
+            readln(n, r, b, s);
+            readln(a[0], a[1], x[0], x[1], f[0], f[1], w[0], w[1]);
+            writeln(n, ' ', r, ' ', b, ' ', s);
+            writeln(a[0], ' ', a[1], ' ', x[0], ' ', x[1], ' ', f[0], ' ', f[1], ' ', w[0], ' ', w[1]);
+        end.
+        """
+        data = "7 2 TRUE 1.5\n-1 +2 3 2.5e1 false True 10 texto\n"
+
+        for backend_class in BACKENDS:
+            interpreter = self.run_batch(backend_class, source, data, chunk_size=5)
+            self.assertEqual(interpreter.get_output(), [
+                '7 2.0 True 1.5',
+                '-1 2 3.0 25.0 False True 10 texto',
+            ])
+
+        # O tipo declarado vale mesmo depois de atribuições de outro tipo, também
+        # para parâmetros e variáveis de for
+        source = """
+        program test;
+        var n: integer;
+            w: array[2] of string;
+
+        procedure ler(r: real);
+        begin
+            readln(r);
+            writeln(r);
+        end;
+
+        begin
+            n := 10 / 2;
+            w[0] := 5;
+            readln(n, w[0]);
+            writeln(n, ' ', w[0], '!');
+            ler(1);
+            for i := 1 to 1 do
+            begin
+                readln(i);
+                writeln(i);
+            end;
+        end.
+        """
+        for backend_class in BACKENDS:
+            interpreter = self.run_batch(backend_class, source, "7 42 8 9")
+            self.assertEqual(interpreter.get_output(), ['7 42!', '8.0', '9'], backend_class.__name__)
+
+    def test_invalid_value(self):
+        """Testa o erro para valores que não convertem para o tipo declarado"""
+        source = """
+        program test;
+        var n: integer;
+            f: array[1] of boolean;
+        begin
+            readln(n);
+            readln(f[0]);
+        end.
+        """
+
+        for backend_class in BACKENDS:
+            with self.assertRaises(RuntimeError) as context:
+                self.run_batch(backend_class, source, "2.5")
+            self.assertEqual(str(context.exception), "Valor inválido para integer: 2.5")
+
+            with self.assertRaises(RuntimeError) as context:
+                self.run_batch(backend_class, source, "1 sim")
+            self.assertEqual(str(context.exception), "Valor inválido para boolean: sim")
+
+    def test_end_of_input(self):
+        """Testa que o fim da entrada interrompe o readln sem alterar os alvos restantes"""
+        source = """
+        program test;
+        var i, n, m: integer;
+            a: array[5] of integer;
+        begin
+            n := -1;
+            m := -1;
+            for i := 0 to 4 do
+                readln(a[i]);
+            readln(n, m);
+            writeln(a[0], ' ', a[2], ' ', a[4], ' ', n, ' ', m);
+        end.
+        """
+
+        for backend_class in BACKENDS:
+            interpreter = self.run_batch(backend_class, source, "5 6 7")
+            self.assertEqual(interpreter.get_output(), ['5 7 0 -1 -1'])
+
+    def test_bulk_array(self):
+        """Testa a leitura de um array grande, sem prompts e sem chamar input()"""
+        size = 20000
+        source = f"""
+        program test;
+        var i, s: integer;
+            a: array[{size}] of integer;
+        begin
+            writeln('lendo');
+            for i := 0 to {size - 1} do
+                readln(a[i]);
+            s := 0;
+            for i := 0 to {size - 1} do
+                s := s + a[i];
+            writeln(s);
+        end.
+        """
+        data = '\n'.join(str(i) for i in range(size))
+
+        for backend_class in BACKENDS:
+            stream = io.StringIO()
+            interpreter = backend_class(OutputSink(flush='block', stream=stream),
+                                        InputSource('batch', io.StringIO(data), chunk_size=4096))
+            with mock.patch('builtins.input', side_effect=AssertionError):
+                interpreter.interpret(self.parse_source(source))
+
+            self.assertEqual(stream.getvalue(), f"lendo\n{size * (size - 1) // 2}\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,7 +11,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from compiler.lexer import Lexer
 from compiler.parser import Parser
-from compiler.interpreter import Interpreter
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.vm import VirtualMachine
+from compiler.transpiler import TranspiledInterpreter
+from compiler.runtime import PascalArray
 
 class TestInterpreter(unittest.TestCase):
     
@@ -140,6 +144,53 @@ class TestInterpreter(unittest.TestCase):
         
         output = self.interpret_source(source)
         self.assertEqual(output, ['10', '20', '30'])
+    
+    def test_typed_array_storage(self):
+        """Testa o armazenamento tipado de arrays de integer, real e boolean"""
+        integers = PascalArray('integer', 4)
+        reals = PascalArray('real', 4)
+        booleans = PascalArray('boolean', 4)
+        strings = PascalArray('string', 2)
+        
+        self.assertEqual(integers.items.typecode, 'q')
+        self.assertEqual(reals.items.typecode, 'd')
+        self.assertIsInstance(booleans.items, bytearray)
+        self.assertEqual(strings.items, ['', ''])
+        
+        integers.store(1, 2 ** 40)
+        reals.store(2, -0.0)
+        booleans.store(3, True)
+        self.assertEqual(list(integers), [0, 2 ** 40, 0, 0])
+        self.assertEqual(repr(reals[2]), '-0.0')
+        self.assertEqual(list(booleans), [False, False, False, True])
+        self.assertEqual(integers.items.itemsize * len(integers), 32)
+    
+    def test_array_values_outside_storage_type(self):
+        """Testa que valores fora do tipo do buffer mantêm o comportamento em todos os backends"""
+        source = """
+        program test;
+        var v: array[3] of integer;
+            r: array[2] of real;
+            b: array[2] of boolean;
+        begin
+            v[0] := 2;
+            v[1] := true;
+            v[2] := 9223372036854775807 + 1;
+            r[0] := 3;
+            b[0] := true;
+            b[1] := 'x';
+            writeln(v[0], ' ', v[1], ' ', v[2], ' ', r[0], ' ', r[1], ' ', b[0], ' ', b[1]);
+            writeln(v[3]);
+        end.
+        """
+        
+        for backend_class in (Interpreter, ClosureInterpreter, VirtualMachine, TranspiledInterpreter):
+            interpreter = backend_class()
+            with self.assertRaises(RuntimeError) as context:
+                interpreter.interpret(Parser(Lexer(source).tokenize()).parse())
+            
+            self.assertEqual(str(context.exception), "Índice do array fora dos limites: 3")
+            self.assertEqual(interpreter.get_output(), ['2 True 9223372036854775808 3 0.0 True x'])
 
 if __name__ == '__main__':
     unittest.main()
@@ -92,5 +92,35 @@ class TestLexer(unittest.TestCase):
         
         self.assertEqual(token_types, expected_types)
 
+    def test_positions(self):
+        """Testa linha e coluna após comentários e strings de várias linhas"""
+        source = "x := 1; { a\nb }\n  y := 'c\\\nd' + z\n"
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+
+        positions = [(token.value, token.line, token.column) for token in tokens
+                     if token.type != TokenType.NEWLINE]
+        self.assertEqual(positions, [
+            ('x', 1, 1), (':=', 1, 3), ('1', 1, 6), (';', 1, 7),
+            ('y', 3, 3), (':=', 3, 5), ('c\nd', 3, 8), ('+', 4, 4), ('z', 4, 6),
+            ('', 5, 1),
+        ])
+
+    def test_escapes_and_long_literals(self):
+        """Testa escapes, identificadores Unicode e literais longos"""
+        source = "'a\\tb\\'c' ação_1 " + "9" * 100000 + " '" + "x" * 100000 + "'"
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+
+        self.assertEqual(tokens[0].value, "a\tb'c")
+        self.assertEqual(tokens[1].type, TokenType.IDENTIFIER)
+        self.assertEqual(tokens[1].value, "ação_1")
+        self.assertEqual(tokens[2].type, TokenType.INTEGER)
+        self.assertEqual(len(tokens[2].value), 100000)
+        self.assertEqual(len(tokens[3].value), 100000)
+
+        with self.assertRaises(SyntaxError):
+            Lexer("x := 1 ? 2").tokenize()
+
 if __name__ == '__main__':
     unittest.main()
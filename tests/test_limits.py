@@ -0,0 +1,251 @@
+"""
+Testes unitários para os limites de passos, tempo e arrays de uma execução
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.vm import VirtualMachine
+from compiler.transpiler import TranspiledInterpreter, PythonTranspiler
+from compiler.optimizer import Optimizer
+from compiler.memoizer import Memoizer, MEMOIZING_BACKENDS
+from compiler.output import OutputSink
+from compiler.limits import RunLimits, LimitExceeded, StepBudget
+from compiler.batch import BatchJob, run_job
+
+BACKENDS = [Interpreter, ClosureInterpreter, VirtualMachine, TranspiledInterpreter]
+
+COMPILER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'compiler.py')
+
+# 10 voltas do for, 10 chamadas de dobro, 10 voltas do while e 5 chamadas de fib
+SOURCE = """
+program passos;
+var s: integer;
+
+function dobro(n: integer): integer;
+begin
+    return n * 2;
+end;
+
+function fib(n: integer): integer;
+begin
+    if n < 2 then
+        return n;
+    return fib(n - 1) + fib(n - 2);
+end;
+
+begin
+    s := 0;
+    for i := 1 to 10 do
+        s := s + dobro(i);
+    while s > 100 do
+        s := s - 1;
+    writeln(s, ' ', fib(3));
+end.
+"""
+
+STEPS = 35
+
+LACO = """
+program laco;
+var i: integer;
+    a: array[10] of integer;
+    b: array[20] of integer;
+begin
+    i := 0;
+    while true do
+        i := i + 1;
+end.
+"""
+
+# Laços que o otimizador vetoriza (com NumPy, executados de uma vez)
+VETOR = """
+program vetor;
+var i: integer;
+    a, b: array[200] of integer;
+begin
+    for i := 0 to 199 do
+        b[i] := i * 3;
+    for i := 0 to 199 do
+        a[i] := b[i] * 2 + i;
+    writeln(a[199]);
+end.
+"""
+
+# O passo de p só é contado depois do argumento, que chama f e escreve
+ORDEM = """
+program ordem;
+
+function f(n: integer): integer;
+begin
+    writeln('f');
+    return n;
+end;
+
+procedure p(n: integer);
+begin
+    writeln('p');
+end;
+
+begin
+    p(f(1));
+end.
+"""
+
+class TestLimits(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_program(self, backend, source, limits):
+        """Executa o programa com os limites e retorna o interpretador"""
+        interpreter = backend(OutputSink(stream=io.StringIO()))
+        interpreter.limits = limits
+        interpreter.interpret(self.parse_source(source))
+        return interpreter
+
+    def test_same_steps_in_all_backends(self):
+        """Testa que os quatro backends contam os mesmos passos, com a mesma saída"""
+        for backend in BACKENDS:
+            interpreter = self.run_program(backend, SOURCE, RunLimits())
+            self.assertEqual(interpreter.get_output(), ["100 2"], backend.__name__)
+            self.assertEqual(interpreter.budget.steps, STEPS, backend.__name__)
+            stats = interpreter.budget.stats()
+            self.assertEqual((stats.steps, stats.array_elements), (STEPS, 0))
+
+    def test_step_limit_is_exact(self):
+        """Testa que o orçamento permite exatamente max_steps passos"""
+        for backend in BACKENDS:
+            interpreter = self.run_program(backend, SOURCE, RunLimits(max_steps=STEPS))
+            self.assertEqual(interpreter.get_output(), ["100 2"], backend.__name__)
+
+            with self.assertRaises(LimitExceeded) as context:
+                self.run_program(backend, SOURCE, RunLimits(max_steps=STEPS - 1))
+            error = context.exception
+            self.assertEqual(error.limit, 'steps', backend.__name__)
+            self.assertEqual(error.stats.steps, STEPS)
+            self.assertEqual(str(error), f"Limite de {STEPS - 1} passos excedido")
+            # Quem não distingue os limites trata como um erro de execução comum
+            self.assertIsInstance(error, RuntimeError)
+
+        with self.assertRaises(ValueError):
+            RunLimits(max_steps=-1)
+
+    def test_shortcuts_are_charged(self):
+        """Testa que memoização, laços vetorizados e chamadas contam os mesmos passos em todos os backends"""
+        # Um acerto do cache conta os passos que a chamada consumiu
+        for name, backend in MEMOIZING_BACKENDS.items():
+            interpreter = backend(OutputSink(stream=io.StringIO()), None, Memoizer())
+            interpreter.limits = RunLimits()
+            interpreter.interpret(self.parse_source(SOURCE))
+            self.assertEqual(interpreter.get_output(), ["100 2"], name)
+            self.assertEqual(interpreter.budget.steps, STEPS, name)
+            self.assertEqual(interpreter.memoizer.caches['fib'].hits, 1, name)
+
+            interpreter = backend(OutputSink(stream=io.StringIO()), None, Memoizer())
+            interpreter.limits = RunLimits(max_steps=STEPS - 1)
+            with self.assertRaises(LimitExceeded):
+                interpreter.interpret(self.parse_source(SOURCE))
+
+        # Um laço vetorizado conta uma volta por iteração
+        program = Optimizer().optimize(self.parse_source(VETOR))
+        for backend in BACKENDS:
+            interpreter = backend(OutputSink(stream=io.StringIO()))
+            interpreter.limits = RunLimits()
+            interpreter.interpret(program)
+            self.assertEqual(interpreter.get_output(), ["1393"], backend.__name__)
+            self.assertEqual(interpreter.budget.steps, 400, backend.__name__)
+
+        # Todos os backends contam a chamada depois de avaliar os argumentos
+        for backend in BACKENDS:
+            interpreter = backend(OutputSink(stream=io.StringIO()))
+            interpreter.limits = RunLimits(max_steps=1)
+            with self.assertRaises(LimitExceeded):
+                interpreter.interpret(self.parse_source(ORDEM))
+            self.assertEqual(interpreter.get_output(), ['f'], backend.__name__)
+
+        budget = StepBudget(RunLimits(max_steps=10))
+        budget.charge(10)
+        with self.assertRaises(LimitExceeded) as context:
+            budget.charge(5)
+        self.assertEqual(context.exception.stats.steps, 15)
+
+    def test_time_limit(self):
+        """Testa o tempo limite em um laço infinito, com o relógio lido a cada lote"""
+        for backend in BACKENDS:
+            with self.assertRaises(LimitExceeded) as context:
+                self.run_program(backend, LACO, RunLimits(time_limit=0.1))
+            stats = context.exception.stats
+            self.assertEqual(context.exception.limit, 'time', backend.__name__)
+            self.assertGreaterEqual(stats.elapsed, 0.1)
+            self.assertLess(stats.elapsed, 5)
+            self.assertGreater(stats.steps, 0)
+
+        now = [0.0]
+        budget = StepBudget(RunLimits(time_limit=1.0), clock=lambda: now[0], interval=4)
+        for _ in range(10):
+            budget.step()
+        now[0] = 2.0
+        with self.assertRaises(LimitExceeded):
+            for _ in range(4):
+                budget.step()
+        self.assertEqual(budget.steps, 12)
+
+    def test_array_limit(self):
+        """Testa o limite de elementos alocados em arrays"""
+        for backend in BACKENDS:
+            with self.assertRaises(LimitExceeded) as context:
+                self.run_program(backend, LACO, RunLimits(max_array_elements=25))
+            error = context.exception
+            self.assertEqual(error.limit, 'memory', backend.__name__)
+            self.assertEqual(error.stats.array_elements, 10)
+            self.assertIn("array de 20 elementos", str(error))
+
+        # Alocar exatamente o limite é permitido
+        budget = StepBudget(RunLimits(max_array_elements=30))
+        budget.allocate(10)
+        budget.allocate(20)
+        self.assertEqual(budget.stats().array_elements, 30)
+
+    def test_without_limits_and_reports(self):
+        """Testa a ausência de contagem sem limites e o erro no lote e na linha de comando"""
+        for backend in BACKENDS:
+            interpreter = self.run_program(backend, SOURCE, None)
+            self.assertIsNone(interpreter.budget)
+        program = self.parse_source(SOURCE)
+        self.assertNotIn('_budget', PythonTranspiler().transpile(program))
+        self.assertIn('_budget', PythonTranspiler(True).transpile(program))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'laco.pas')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(LACO)
+
+            result = run_job(BatchJob(path), 'bytecode', limits=RunLimits(max_steps=1000))
+            self.assertEqual((result['status'], result['exit_code']), ('limit_exceeded', 1))
+            self.assertIn("Limite de 1000 passos excedido (1001 passos", result['error'])
+
+            completed = subprocess.run(
+                [sys.executable, COMPILER, '--no-cache', '--backend=closure', '--max-steps=1000', path],
+                capture_output=True, text=True, stdin=subprocess.DEVNULL, timeout=30)
+            self.assertEqual(completed.returncode, 1)
+            self.assertIn("Erro de execução: Limite de 1000 passos excedido", completed.stdout)
+            self.assertIn("Execução até o limite: 1001 passos", completed.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,265 @@
+"""
+Testes unitários para a memoização de funções puras
+"""
+
+import io
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter
+from compiler.output import OutputSink
+from compiler.memoizer import (
+    MemoCache, Memoizer, MISSING, MEMOIZING_BACKENDS, find_pure_functions,
+)
+
+SOURCE = """program memo;
+var n, contador: integer;
+    a: array[3] of integer;
+
+function fib(k: integer): integer;
+begin
+    if k < 2 then
+        return k;
+    return fib(k - 1) + fib(k - 2);
+end;
+
+function dobro(x: integer): integer;
+begin
+    return 2 * x;
+end;
+
+function soma_fib(k, s: integer): integer;
+begin
+    for i := 0 to k do
+        s := s + dobro(fib(i));
+    return s;
+end;
+
+function conta(x: integer): integer;
+begin
+    contador := contador + 1;
+    return x;
+end;
+
+function le_global(x: integer): integer;
+begin
+    return x + n;
+end;
+
+function elemento(x: integer): integer;
+begin
+    a[0] := x;
+    return x;
+end;
+
+function mostra(x: integer): integer;
+begin
+    writeln(x);
+    return x;
+end;
+
+function usa_impura(x: integer): integer;
+begin
+    return conta(x) + 1;
+end;
+
+begin
+    n := 20;
+    contador := 0;
+    writeln(fib(n), ' ', soma_fib(10, 0));
+    writeln(conta(1) + conta(1), ' ', contador);
+    writeln(le_global(1), ' ', usa_impura(2), ' ', contador);
+end.
+"""
+
+class TestMemoizer(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_memoized(self, backend, source=SOURCE, max_size=1000):
+        """Executa o programa com memoização e retorna (memoizer, saída)"""
+        memoizer = Memoizer(max_size)
+        interpreter = MEMOIZING_BACKENDS[backend](OutputSink(stream=io.StringIO()), None, memoizer)
+        interpreter.interpret(self.parse_source(source))
+        return memoizer, interpreter.get_output()
+
+    def test_purity_analysis(self):
+        """Testa quais funções são consideradas puras"""
+        pure = find_pure_functions(self.parse_source(SOURCE))
+        # conta escreve uma global, le_global lê uma, elemento altera um array,
+        # mostra faz E/S e usa_impura chama uma função impura
+        self.assertEqual(pure, {'fib', 'dobro', 'soma_fib'})
+
+    def test_same_output_as_plain_backend(self):
+        """Testa que a memoização não muda a saída, nem os efeitos de funções impuras"""
+        expected = Interpreter(OutputSink(stream=io.StringIO()))
+        expected.interpret(self.parse_source(SOURCE))
+        self.assertEqual(expected.get_output(), ['6765 286', '2 2', '21 3 3'])
+
+        for backend in MEMOIZING_BACKENDS:
+            _, output = self.run_memoized(backend)
+            self.assertEqual(output, expected.get_output())
+
+    def test_hit_and_miss_statistics(self):
+        """Testa acertos e falhas: cada argumento distinto é calculado uma vez"""
+        for backend in MEMOIZING_BACKENDS:
+            memoizer, _ = self.run_memoized(backend)
+            fib = memoizer.caches['fib']
+            # fib(0..20) é calculado uma vez: fib(k - 2) acerta para k de 3 a 20,
+            # e soma_fib reaproveita os 11 primeiros
+            self.assertEqual(fib.misses, 21)
+            self.assertEqual(len(fib.results), 21)
+            self.assertEqual(fib.hits, 18 + 11)
+            self.assertEqual(memoizer.caches['soma_fib'].misses, 1)
+            self.assertNotIn('conta', memoizer.caches)
+
+            report = memoizer.report().splitlines()
+            self.assertEqual(report[0].split()[:3], ['Função', 'Acertos', 'Falhas'])
+            self.assertEqual([line.split()[0] for line in report[1:]], ['dobro', 'fib', 'soma_fib'])
+
+    def test_lru_eviction(self):
+        """Testa o limite de tamanho e o descarte do resultado usado há mais tempo"""
+        cache = MemoCache(2)
+        cache.put((1,), 'a')
+        cache.put((2,), 'b')
+        self.assertEqual(cache.get((1,)), 'a')
+        cache.put((3,), 'c')
+
+        self.assertIs(cache.get((2,)), MISSING)
+        self.assertEqual(cache.get((1,)), 'a')
+        self.assertEqual(cache.get((3,)), 'c')
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (3, 1, 1))
+        with self.assertRaises(ValueError):
+            MemoCache(0)
+
+        # Um cache pequeno continua correto, só com mais falhas
+        for backend in MEMOIZING_BACKENDS:
+            memoizer, output = self.run_memoized(backend, max_size=3)
+            self.assertEqual(output[0], '6765 286')
+            self.assertLessEqual(len(memoizer.caches['fib'].results), 3)
+            self.assertGreater(memoizer.caches['fib'].evictions, 0)
+
+    def test_argument_types_in_key(self):
+        """Testa que argumentos iguais de tipos diferentes ou arrays não compartilham resultado"""
+        source = """program tipos;
+function metade(x: real): real;
+begin
+    return x / 2;
+end;
+
+function id(x: integer): integer;
+begin
+    return x;
+end;
+
+begin
+    writeln(id(1), ' ', id(1.0), ' ', id(1 = 1));
+    writeln(metade(3), ' ', metade(3));
+end.
+"""
+        for backend in MEMOIZING_BACKENDS:
+            memoizer, output = self.run_memoized(backend, source)
+            self.assertEqual(output, ['1 1.0 True', '1.5 1.5'])
+            self.assertEqual(memoizer.caches['id'].misses, 3)
+            self.assertEqual(memoizer.caches['metade'].hits, 1)
+
+        # Um array global passado a um parâmetro escalar não vira chave do cache
+        source = """program arrays;
+var n: integer;
+    a: array[2] of integer;
+
+function primeiro(x: integer): integer;
+begin
+    return x[0] + 1;
+end;
+
+function repassa(x: integer): integer;
+begin
+    return primeiro(x);
+end;
+
+function id(x: integer): integer;
+begin
+    return x;
+end;
+
+begin
+    a[0] := 1;
+    writeln(primeiro(a), ' ', repassa(a));
+    a[0] := 5;
+    n := id(a);
+    writeln(primeiro(a), ' ', repassa(a), ' ', n[0], ' ', id(2), ' ', id(2));
+end.
+"""
+        self.assertEqual(find_pure_functions(self.parse_source(source)), {'primeiro', 'repassa', 'id'})
+        for backend in MEMOIZING_BACKENDS:
+            memoizer, output = self.run_memoized(backend, source)
+            self.assertEqual(output, ['2 2', '6 6 5 2 2'], backend)
+            self.assertEqual((memoizer.caches['id'].hits, memoizer.caches['id'].misses), (1, 1))
+            for name in ('primeiro', 'repassa'):
+                cache = memoizer.caches[name]
+                self.assertEqual((cache.hits, cache.misses, len(cache.results)), (0, 0, 0), backend)
+
+        # Parâmetros repassados e expressões com parâmetros continuam memoizados. Os
+        # argumentos são avaliados no frame novo, então mdc alterna com mdc_passo
+        # para que o segundo argumento não leia o primeiro parâmetro já ligado
+        source = """program repasse;
+function mdc(a: integer; b: integer): integer;
+begin
+    if b = 0 then
+        return a;
+    return mdc_passo(b, a mod b);
+end;
+
+function mdc_passo(c: integer; d: integer): integer;
+begin
+    if d = 0 then
+        return c;
+    return mdc(d, c mod d);
+end;
+
+function binom(n: integer; k: integer): integer;
+begin
+    if (k = 0) or (k = n) then
+        return 1;
+    return binom(n - 1, k - 1) + binom(n - 1, k);
+end;
+
+function ack(m: integer; n: integer): integer;
+begin
+    if m = 0 then
+        return n + 1;
+    if n = 0 then
+        return ack(m - 1, 1);
+    return ack(m - 1, ack(m, n - 1));
+end;
+
+begin
+    writeln(mdc(84, 36), ' ', mdc(84, 36), ' ', binom(12, 5), ' ', ack(2, 3));
+end.
+"""
+        self.assertEqual(find_pure_functions(self.parse_source(source)),
+                         {'mdc', 'mdc_passo', 'binom', 'ack'})
+        expected = Interpreter(OutputSink(stream=io.StringIO()))
+        expected.interpret(self.parse_source(source))
+        self.assertEqual(expected.get_output()[0].split()[:3], ['12', '12', '792'])
+        for backend in MEMOIZING_BACKENDS:
+            memoizer, output = self.run_memoized(backend, source)
+            self.assertEqual(output, expected.get_output(), backend)
+            self.assertEqual(memoizer.caches['mdc'].hits, 1, backend)
+            self.assertGreater(memoizer.caches['binom'].hits, 0, backend)
+            self.assertGreater(memoizer.caches['ack'].hits, 0, backend)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,400 @@
+"""
+Testes unitários para o otimizador da AST
+"""
+
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.vm import VirtualMachine
+from compiler.transpiler import TranspiledInterpreter
+from compiler.optimizer import Optimizer
+from compiler.ast_nodes import *
+
+class TestOptimizer(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def optimize(self, source):
+        """Helper que retorna a AST otimizada"""
+        return Optimizer().optimize(self.parse_source(source))
+
+    def test_constant_folding(self):
+        """Testa o dobramento de subárvores só com literais"""
+        source = """
+        program test;
+        var x: integer;
+        begin
+            x := 1 + 2 * 3 - 10 div 3;
+            x := -(2 + 3);
+            x := 'ab' + 'cd';
+            x := not (1 < 2) or true;
+            x := 1 div 0;
+        end.
+        """
+
+        statements = self.optimize(source).body.statements
+        values = [stmt.value for stmt in statements]
+
+        self.assertIsInstance(values[0], NumberLiteral)
+        self.assertEqual(values[0].value, 4)
+        self.assertEqual(values[1].value, -5)
+        self.assertIsInstance(values[2], StringLiteral)
+        self.assertEqual(values[2].value, 'abcd')
+        self.assertIsInstance(values[3], BooleanLiteral)
+        self.assertTrue(values[3].value)
+        # Divisão por zero continua acontecendo em tempo de execução
+        self.assertIsInstance(values[4], BinaryOperation)
+
+    def test_algebraic_identities(self):
+        """Testa identidades algébricas sobre expressões inteiras e booleanas"""
+        source = """
+        program test;
+        var i, x: integer;
+            b, c: boolean;
+        begin
+            for i := 1 to 3 do
+            begin
+                x := i * 1 + 0;
+                x := i + 1 + 1 - 2;
+                x := i - 2 - 3;
+                c := not not (i > 1);
+                c := (i > 1) and true;
+            end;
+        end.
+        """
+
+        loop = self.optimize(source).body.statements[0]
+        values = [stmt.value for stmt in loop.body.statements]
+
+        self.assertIsInstance(values[0], Variable)
+        self.assertIsInstance(values[1], Variable)
+        self.assertEqual(values[2].operator, '-')
+        self.assertEqual(values[2].right.value, 5)
+        self.assertEqual(values[3].operator, '>')
+        self.assertEqual(values[4].operator, '>')
+
+    def test_identities_respect_types(self):
+        """Testa que identidades não mudam o tipo do resultado"""
+        source = """
+        program test;
+        var b: boolean;
+            s: string;
+            r: real;
+        begin
+            b := true;
+            s := 'abc';
+            readln(r);
+            writeln(b + 0, ' ', b * 1, ' ', s * 1);
+            writeln(r + 0, ' ', r * 1.0);
+        end.
+        """
+
+        program = self.optimize(source)
+        first, second = program.body.statements[3:5]
+
+        # true + 0 é 1 e -0.0 + 0 é 0.0: as somas não podem ser removidas
+        self.assertEqual(first.expressions[0].value, 1)
+        self.assertEqual(first.expressions[2].value, 1)
+        self.assertEqual(first.expressions[4].value, 'abc')
+        self.assertIsInstance(second.expressions[0], BinaryOperation)
+        self.assertIsInstance(second.expressions[2], BinaryOperation)
+
+    def test_constant_propagation(self):
+        """Testa a propagação de variáveis atribuídas uma única vez"""
+        source = """
+        program test;
+        var n, m, k: integer;
+
+        procedure mostra;
+        begin
+            writeln(n, ' ', k);
+        end;
+
+        begin
+            m := n;
+            n := 10;
+            mostra;
+            k := 2 * n;
+            writeln(k + 1);
+        end.
+        """
+
+        program = self.optimize(source)
+        statements = program.body.statements
+        procedure = program.declarations[-1]
+
+        # Leitura anterior à atribuição continua lendo a variável
+        self.assertIsInstance(statements[0].value, Variable)
+        self.assertEqual(statements[3].value.value, 20)
+        self.assertEqual(statements[4].expressions[0].value, 21)
+        # A rotina é chamada depois de n := 10, mas antes de k := 2 * n
+        self.assertEqual(procedure.body.statements[0].expressions[0].value, 10)
+        self.assertIsInstance(procedure.body.statements[0].expressions[2], Variable)
+
+    def test_same_output_all_backends(self):
+        """Testa que a saída otimizada é igual à original em todos os backends"""
+        source = """
+        program test;
+        var n, i, total: integer;
+            r: real;
+            v: array[10] of integer;
+
+        function dobro(x: integer): integer;
+        begin
+            return x * 2 + 0;
+        end;
+
+        begin
+            n := 10 - 2 - 3;
+            r := -0.0;
+            total := 0;
+            for i := 1 to n + 1 - 1 do
+            begin
+                total := total + i + 1 + 1 - 2;
+                v[i - 1 + 1] := i * 1;
+            end;
+            writeln(total, ' ', v[n], ' ', dobro(n - 0), ' ', 7 / 2);
+            writeln(r - 0, ' ', r + 0, ' ', -(-r), ' ', 0.1 + 0.2);
+            writeln(n div 0);
+        end.
+        """
+
+        for backend_class in (Interpreter, ClosureInterpreter, VirtualMachine):
+            outputs = []
+            for optimize in (False, True):
+                interpreter = backend_class()
+                ast = self.optimize(source) if optimize else self.parse_source(source)
+                with self.assertRaises(RuntimeError):
+                    interpreter.interpret(ast)
+                outputs.append(interpreter.get_output())
+
+            self.assertEqual(outputs[0], outputs[1])
+            self.assertEqual(outputs[1], ['15 5 10 3.5', '-0.0 0.0 -0.0 0.30000000000000004'])
+
+    def test_constant_branches(self):
+        """Testa a remoção de ramos e laços que nunca executam"""
+        source = """
+        program test;
+        var i, n: integer;
+        begin
+            n := 3;
+            if n > 5 then
+                writeln('grande')
+            else
+                writeln('pequeno');
+            while n < 0 do
+                writeln(n);
+            for i := n to 1 do
+                writeln(i);
+            if n = 3 then
+            begin
+                writeln('tres');
+            end;
+        end.
+        """
+
+        statements = self.optimize(source).body.statements
+
+        self.assertEqual(len(statements), 3)
+        self.assertIsInstance(statements[1], WritelnStatement)
+        self.assertEqual(statements[1].expressions[0].value, 'pequeno')
+        self.assertEqual(statements[2].expressions[0].value, 'tres')
+
+    def test_statements_after_return(self):
+        """Testa a remoção de comandos que nunca são alcançados"""
+        source = """
+        program test;
+        var x: integer;
+
+        function f(a: integer): integer;
+        begin
+            if a > 0 then
+                return 1
+            else
+                return 2;
+            writeln('nunca');
+        end;
+
+        begin
+            x := f(1);
+            while true do
+            begin
+                writeln(x);
+                return;
+            end;
+            writeln('depois');
+        end.
+        """
+
+        program = self.optimize(source)
+        function = program.declarations[-1]
+
+        self.assertEqual(len(function.body.statements), 1)
+        self.assertEqual(len(program.body.statements), 2)
+        self.assertIsInstance(program.body.statements[1], WhileStatement)
+
+    def test_unused_routines(self):
+        """Testa a remoção de rotinas que nunca são chamadas"""
+        source = """
+        program test;
+        var x: integer;
+
+        procedure nunca;
+        begin
+            writeln('nunca');
+        end;
+
+        procedure morta;
+        begin
+            nunca;
+        end;
+
+        function usada(a: integer): integer;
+        begin
+            return a;
+        end;
+
+        procedure errada(a: integer);
+        begin
+            writeln(a);
+        end;
+
+        begin
+            if false then
+                morta;
+            x := usada(1);
+            errada;
+        end.
+        """
+
+        program = self.optimize(source)
+        names = [decl.name for decl in program.declarations
+                 if isinstance(decl, (ProcedureDeclaration, FunctionDeclaration))]
+        self.assertEqual(names, ['usada', 'errada'])
+
+        # A chamada com número errado de argumentos continua falhando igual
+        interpreter = Interpreter()
+        with self.assertRaises(RuntimeError) as context:
+            interpreter.interpret(program)
+        self.assertEqual(str(context.exception), "Número incorreto de argumentos para errada")
+
+    def test_loop_invariants(self):
+        """Testa a retirada de expressões invariantes de laços aninhados"""
+        source = """
+        program test;
+        var n, i, j, total: integer;
+        begin
+            n := 2;
+            n := n + 3;
+            total := 0;
+            for i := 1 to n * 2 do
+                for j := 1 to n do
+                    total := total + (n * 10 + 1) + i * n + j;
+            writeln(total);
+        end.
+        """
+
+        optimizer = Optimizer()
+        outer = optimizer.optimize(self.parse_source(source)).body.statements[3]
+        inner = outer.body
+
+        # n * 10 + 1 sai dos dois laços; i * n só do interno
+        self.assertEqual(len(outer.invariants), 1)
+        self.assertEqual(outer.invariants[0].value.operator, '+')
+        self.assertEqual(len(inner.invariants), 1)
+        self.assertEqual(inner.invariants[0].value.left.name, 'i')
+        self.assertEqual(optimizer.hoisted, 2)
+
+    def test_loop_invariants_conservative(self):
+        """Testa que escritas, leituras e operações que podem falhar impedem a retirada"""
+        source = """
+        program test;
+        var n, d, i, total: integer;
+            s: string;
+
+        procedure muda;
+        begin
+            n := n + 1;
+        end;
+
+        begin
+            n := 2; n := n + 1;
+            d := 0; d := d + 0;
+            s := 'a'; s := s + 'b';
+            total := 0;
+            for i := 1 to 3 do
+            begin
+                total := total + n * 2;
+                muda;
+            end;
+            for i := 1 to n - 10 do
+                total := total + n div d + s * n;
+            while total < 100 do
+            begin
+                total := total + d * 3;
+                readln(d);
+            end;
+        end.
+        """
+
+        optimizer = Optimizer()
+        statements = optimizer.optimize(self.parse_source(source)).body.statements
+        loops = [stmt for stmt in statements if isinstance(stmt, (ForStatement, WhileStatement))]
+
+        self.assertEqual(len(loops), 3)
+        self.assertTrue(all(loop.invariants == [] for loop in loops))
+        self.assertEqual(optimizer.hoisted, 0)
+
+    def test_loop_invariants_all_backends(self):
+        """Testa que os temporários funcionam em todos os backends, inclusive com recursão"""
+        source = """
+        program test;
+        var n, k, t, i: integer;
+            r: real;
+
+        function f(d: integer): integer;
+        begin
+            t := 0;
+            for k := 1 to 3 do
+            begin
+                t := t + d * 2 + n;
+                if d > 0 then
+                    t := t + f(d - 1);
+            end;
+            return t;
+        end;
+
+        begin
+            n := 1; n := n + 1;
+            r := 1.5; r := r * 1.0;
+            for i := 1 to 2 do
+                writeln(f(n + 1), ' ', r * 2.0 / 4, ' ', i * (n - 1));
+        end.
+        """
+
+        for backend_class in (Interpreter, ClosureInterpreter, VirtualMachine, TranspiledInterpreter):
+            outputs = []
+            for optimize in (False, True):
+                interpreter = backend_class()
+                ast = self.optimize(source) if optimize else self.parse_source(source)
+                interpreter.interpret(ast)
+                outputs.append(interpreter.get_output())
+
+            self.assertEqual(outputs[0], outputs[1])
+            self.assertEqual(outputs[1], ['348 0.75 1', '348 0.75 2'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Testes unitários para a saída bufferizada do writeln
+"""
+
+import io
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.vm import VirtualMachine
+from compiler.transpiler import TranspiledInterpreter
+from compiler.output import OutputSink
+
+BACKENDS = (Interpreter, ClosureInterpreter, VirtualMachine, TranspiledInterpreter)
+
+class TestOutputSink(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def test_capture_modes(self):
+        """Testa get_output() com captura completa, circular e desativada"""
+        sinks = {
+            'full': OutputSink('full', stream=io.StringIO()),
+            'ring': OutputSink('ring', ring_lines=2, stream=io.StringIO()),
+            'none': OutputSink('none', stream=io.StringIO()),
+        }
+        for sink in sinks.values():
+            for line in ('a', '', 'c'):
+                sink.write(line)
+            sink.flush()
+            # A captura não muda o que é escrito
+            self.assertEqual(sink.stream.getvalue(), 'a\n\nc\n')
+
+        self.assertEqual(sinks['full'].get_output(), ['a', '', 'c'])
+        self.assertEqual(sinks['ring'].get_output(), ['', 'c'])
+        self.assertEqual(sinks['none'].get_output(), [])
+
+        sinks['full'].clear()
+        self.assertEqual(sinks['full'].get_output(), [])
+
+        with self.assertRaises(ValueError):
+            OutputSink('last')
+        with self.assertRaises(ValueError):
+            OutputSink('ring', ring_lines=0)
+
+    def test_flush_policies(self):
+        """Testa as políticas de descarga line, block e auto"""
+        stream = io.StringIO()
+        sink = OutputSink(flush='block', buffer_size=10, stream=stream)
+        sink.write('abc')
+        sink.write('def')
+        self.assertEqual(stream.getvalue(), '')
+        # 'ghi' completa 12 caracteres pendentes, acima do limite
+        sink.write('ghi')
+        self.assertEqual(stream.getvalue(), 'abc\ndef\nghi\n')
+        sink.write('jkl')
+        sink.flush()
+        self.assertEqual(stream.getvalue(), 'abc\ndef\nghi\njkl\n')
+
+        stream = io.StringIO()
+        sink = OutputSink(flush='line', stream=stream)
+        sink.write('abc')
+        self.assertEqual(stream.getvalue(), 'abc\n')
+
+        # Fora de um terminal, auto acumula a saída em blocos
+        self.assertEqual(OutputSink(stream=io.StringIO()).flush_policy, 'block')
+        with self.assertRaises(ValueError):
+            OutputSink(flush='never')
+
+    def test_backends_write_to_sink(self):
+        """Testa que todos os backends escrevem no sink, com a captura escolhida"""
+        source = """
+        program test;
+        var i: integer;
+        begin
+            for i := 1 to 5 do
+                writeln('linha ', i);
+            writeln;
+        end.
+        """
+
+        for backend_class in BACKENDS:
+            stream = io.StringIO()
+            interpreter = backend_class(OutputSink('ring', ring_lines=2, stream=stream))
+            interpreter.interpret(self.parse_source(source))
+
+            self.assertEqual(stream.getvalue(), ''.join(f"linha {i}\n" for i in range(1, 6)) + '\n')
+            self.assertEqual(interpreter.get_output(), ['linha 5', ''])
+
+    def test_flush_on_error(self):
+        """Testa que a saída anterior a um erro de execução é descarregada"""
+        source = """
+        program test;
+        var x: integer;
+        begin
+            writeln('antes');
+            x := 1 div 0;
+            writeln('depois');
+        end.
+        """
+
+        for backend_class in BACKENDS:
+            stream = io.StringIO()
+            interpreter = backend_class(OutputSink(flush='block', stream=stream))
+            with self.assertRaises(RuntimeError):
+                interpreter.interpret(self.parse_source(source))
+            self.assertEqual(stream.getvalue(), 'antes\n')
+
+    def test_flush_before_readln(self):
+        """Testa que a saída pendente é descarregada antes de cada prompt do readln"""
+        source = """
+        program test;
+        var x: integer;
+            v: array[2] of integer;
+        begin
+            writeln('primeiro');
+            readln(x);
+            writeln('segundo ', x);
+            readln(v[1]);
+            writeln('terceiro ', v[1]);
+        end.
+        """
+
+        for backend_class in BACKENDS:
+            stream = io.StringIO()
+            seen = []
+
+            def fake_input(prompt):
+                seen.append(stream.getvalue())
+                return str(len(seen))
+
+            interpreter = backend_class(OutputSink(flush='block', stream=stream))
+            with mock.patch('builtins.input', fake_input):
+                interpreter.interpret(self.parse_source(source))
+
+            self.assertEqual(seen, ['primeiro\n', 'primeiro\nsegundo 1\n'])
+            self.assertEqual(stream.getvalue(), 'primeiro\nsegundo 1\nterceiro 2\n')
+
+if __name__ == '__main__':
+    unittest.main()
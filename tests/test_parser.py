@@ -9,7 +9,7 @@ import os
 # Adicionar o diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from compiler.lexer import Lexer
+from compiler.lexer import Lexer, TokenType
 from compiler.parser import Parser
 from compiler.ast_nodes import *
 
@@ -143,5 +143,71 @@ class TestParser(unittest.TestCase):
         self.assertIsInstance(stmt.end, NumberLiteral)
         self.assertIsInstance(stmt.body, WritelnStatement)
 
+    def test_streaming_tokens(self):
+        """Testa que o parser consome tokens sob demanda com lookahead limitado"""
+        body = "x := x + 1;\n" * 2000
+        source = f"program test;\nvar x: integer;\nbegin\n{body}end.\n"
+        pending = []
+
+        def stream():
+            # Registra quantos tokens foram gerados e ainda não consumidos
+            for token in Lexer(source).iter_tokens():
+                yield token
+                pending.append(len(pending) - parser.current)
+
+        parser = Parser(stream())
+        ast = parser.parse()
+
+        self.assertEqual(len(ast.body.statements), 2000)
+        self.assertLessEqual(max(pending), 2)
+
+    def test_peek_token(self):
+        """Testa peek_token sobre um gerador de tokens"""
+        parser = Parser(Lexer("x := 1").iter_tokens())
+
+        self.assertEqual(parser.peek_token(0).value, "x")
+        self.assertEqual(parser.peek_token(2).value, "1")
+        self.assertEqual(parser.peek_token(4).type, TokenType.EOF)
+        self.assertEqual(parser.advance().value, "x")
+        self.assertEqual(parser.current_token().type, TokenType.ASSIGN)
+
+        with self.assertRaises(ValueError):
+            parser.peek_token(100)
+
+    def test_node_positions(self):
+        """Testa a linha de origem gravada em cada nó"""
+        source = """program test;
+var x: integer;
+begin
+    x := 1 + 2;
+
+    if x > 2 then
+        writeln(x)
+end.
+"""
+
+        ast = self.parse_source(source)
+        assignment, if_stmt = ast.body.statements
+
+        self.assertEqual(ast.line, 1)
+        self.assertEqual(ast.declarations[0].line, 2)
+        self.assertEqual(assignment.line, 4)
+        self.assertEqual(assignment.value.line, 4)
+        self.assertEqual(assignment.value.right.line, 4)
+        self.assertEqual(if_stmt.line, 6)
+        self.assertEqual(if_stmt.then_stmt.line, 7)
+
+    def test_compact_nodes(self):
+        """Testa que os nós não têm __dict__ e que nomes repetidos são compartilhados"""
+        ast = self.parse_source("program test; var total: integer; begin total := total + 1; end.")
+        assignment = ast.body.statements[0]
+
+        for node in (ast, assignment, assignment.target, assignment.value):
+            self.assertFalse(hasattr(node, '__dict__'))
+        with self.assertRaises(AttributeError):
+            assignment.value.unknown = 1
+
+        self.assertIs(assignment.target.name, assignment.value.left.name)
+
 if __name__ == '__main__':
     unittest.main()
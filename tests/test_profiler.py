@@ -0,0 +1,137 @@
+"""
+Testes unitários para o profiler de linhas
+"""
+
+import io
+import unittest
+import sys
+import os
+import itertools
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter
+from compiler.closure_compiler import ClosureCompiler, ClosureInterpreter
+from compiler.output import OutputSink
+from compiler.profiler import LineProfiler, PROFILING_BACKENDS
+
+SOURCE = """program perfil;
+var i, total: integer;
+
+function dobro(x: integer): integer;
+begin
+    return x * 2;
+end;
+
+procedure soma(limite: integer);
+begin
+    for i := 1 to limite do
+        total := total + dobro(i);
+end;
+
+begin
+    total := 0;
+    soma(4);
+    soma(2);
+    writeln(total);
+end.
+"""
+
+class TestLineProfiler(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def profile(self, backend, source=SOURCE, clock=None):
+        """Executa o programa com o profiler e retorna (profiler, saída)"""
+        profiler = LineProfiler(clock) if clock is not None else LineProfiler()
+        interpreter = PROFILING_BACKENDS[backend](OutputSink(stream=io.StringIO()), None, profiler)
+        interpreter.interpret(self.parse_source(source))
+        return profiler, interpreter.get_output()
+
+    def test_hits_per_line(self):
+        """Testa a contagem de execuções por linha nos dois backends"""
+        expected = {6: 6, 11: 2, 12: 6, 16: 1, 17: 1, 18: 1, 19: 1}
+        for backend in PROFILING_BACKENDS:
+            profiler, output = self.profile(backend)
+            self.assertEqual(dict(profiler.hits), expected)
+            self.assertEqual(output, ['26'])
+
+    def test_cumulative_and_exclusive_time(self):
+        """Testa o tempo acumulado por linha e o tempo exclusivo das pilhas"""
+        for backend in PROFILING_BACKENDS:
+            # Relógio que avança 1 a cada leitura torna os tempos determinísticos
+            profiler, _ = self.profile(backend, clock=itertools.count().__next__)
+
+            # O tempo acumulado inclui comandos aninhados e rotinas chamadas
+            self.assertGreater(profiler.times[17] + profiler.times[18], profiler.times[11])
+            self.assertGreater(profiler.times[11], profiler.times[12])
+            self.assertGreater(profiler.times[12], profiler.times[6])
+            # Tempos exclusivos somam o tempo dos comandos do programa principal
+            main_lines = (16, 17, 18, 19)
+            self.assertEqual(sum(profiler.stacks.values()),
+                             sum(profiler.times[line] for line in main_lines))
+
+    def test_recursion_counted_once(self):
+        """Testa que linhas recursivas não somam o mesmo intervalo várias vezes"""
+        source = """program recursao;
+var n: integer;
+
+function fat(k: integer): integer;
+begin
+    if k <= 1 then
+        return 1;
+    return k * fat(k - 1);
+end;
+
+begin
+    n := fat(6);
+    writeln(n);
+end.
+"""
+        for backend in PROFILING_BACKENDS:
+            profiler, output = self.profile(backend, source, clock=itertools.count().__next__)
+            self.assertEqual(output, ['720'])
+            self.assertEqual(profiler.hits[6], 6)
+            self.assertEqual(profiler.hits[8], 5)
+            # A linha recursiva não pode passar do tempo da linha que fez a primeira chamada
+            self.assertLess(profiler.times[8], profiler.times[12])
+
+    def test_reports(self):
+        """Testa a listagem anotada e o formato das pilhas colapsadas"""
+        profiler, _ = self.profile('closure')
+        listing = profiler.annotate(SOURCE).splitlines()
+
+        self.assertEqual(len(listing), len(SOURCE.splitlines()) + 1)
+        self.assertEqual(listing[12].split()[:2], ['12', '6'])
+        self.assertTrue(listing[12].endswith("        total := total + dobro(i);"))
+        self.assertEqual(listing[1].split(), ['1', 'program', 'perfil;'])
+
+        profiler, _ = self.profile('tree', clock=itertools.count().__next__)
+        stacks = profiler.collapsed_stacks()
+        # Cada return de dobro leva um tique do relógio (1 s, gravado em microssegundos)
+        self.assertIn("perfil:17;soma:12;dobro:6 4000000", stacks)
+        self.assertIn("perfil:18;soma:12;dobro:6 2000000", stacks)
+        for line in stacks:
+            frames, value = line.rsplit(' ', 1)
+            self.assertTrue(value.isdigit())
+            self.assertTrue(frames.startswith("perfil:"))
+
+    def test_no_overhead_when_off(self):
+        """Testa que os backends normais não passam pelo profiler"""
+        self.assertIs(ClosureInterpreter.compiler_class, ClosureCompiler)
+        for backend_class in (Interpreter, ClosureInterpreter):
+            interpreter = backend_class(OutputSink(stream=io.StringIO()))
+            interpreter.interpret(self.parse_source(SOURCE))
+            self.assertFalse(hasattr(interpreter, 'profiler'))
+            self.assertEqual(interpreter.get_output(), ['26'])
+
+if __name__ == '__main__':
+    unittest.main()
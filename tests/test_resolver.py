@@ -0,0 +1,176 @@
+"""
+Testes unitários para a resolução estática de escopo
+"""
+
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.ast_nodes import Variable, ForStatement, iter_child_nodes
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.resolver import Resolver, ScopeAnalysis, GLOBAL, DYNAMIC
+
+class TestResolver(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_interpreter(self, source, backend_class=Interpreter):
+        """Helper para executar código"""
+        interpreter = backend_class()
+        interpreter.interpret(self.parse_source(source))
+        return interpreter.get_output()
+
+    def find_nodes(self, node, node_type):
+        """Helper que coleta os nós de um tipo em pré-ordem"""
+        found = [node] if isinstance(node, node_type) else []
+        for child in iter_child_nodes(node):
+            found.extend(self.find_nodes(child, node_type))
+        return found
+
+    def test_slots(self):
+        """Testa slots de globais, parâmetros e variáveis de for"""
+        source = """
+        program test;
+        var x, y: integer;
+        function dobro(n: integer): integer;
+        var i: integer;
+        begin
+            for i := 1 to 2 do
+                n := n + i;
+            return n * 2;
+        end;
+        begin
+            y := dobro(x);
+        end.
+        """
+
+        program = Resolver().resolve(self.parse_source(source))
+        self.assertEqual(program.global_slots, {'x': 0, 'y': 1})
+
+        function = program.declarations[2]
+        self.assertEqual(function.frame_size, 2)
+        loop = self.find_nodes(function.body, ForStatement)[0]
+        self.assertEqual(loop.slot, 1)
+
+        variables = {(v.name, v.depth, v.slot) for v in self.find_nodes(function.body, Variable)}
+        self.assertEqual(variables, {('n', 0, 0), ('i', 0, 1)})
+
+        y, x = self.find_nodes(program.body, Variable)
+        self.assertEqual((y.depth, y.slot), (GLOBAL, 1))
+        # Argumento é avaliado no frame novo: x fica um frame acima
+        self.assertEqual((x.depth, x.slot), (GLOBAL, 0))
+
+    def test_dynamic_names(self):
+        """Testa que nomes possivelmente ligados por quem chama ficam dinâmicos"""
+        source = """
+        program test;
+        var i, total: integer;
+        procedure acumular;
+        begin
+            total := total + i;
+        end;
+        begin
+            for i := 1 to 4 do
+                acumular;
+            writeln(total);
+        end.
+        """
+
+        program = self.parse_source(source)
+        analysis = ScopeAnalysis(program)
+        self.assertEqual(analysis.dynamic_names(program.declarations[2]), {'i'})
+
+        Resolver().resolve(program)
+        depths = {v.name: v.depth for v in self.find_nodes(program.declarations[2].body, Variable)}
+        self.assertEqual(depths, {'total': GLOBAL, 'i': DYNAMIC})
+        self.assertEqual(self.run_interpreter(source), ['10'])
+
+    def test_dynamic_scope_preserved(self):
+        """Testa escopo dinâmico, sombra do for e argumentos no frame novo"""
+        source = """
+        program test;
+        var a, k: integer;
+        procedure mostra;
+        begin
+            writeln(a, ' ', k);
+        end;
+        function soma(a, b: integer): integer;
+        begin
+            mostra;
+            return a + b;
+        end;
+        procedure externo(k: integer);
+        begin
+            for a := 1 to 2 do
+                mostra;
+            writeln(soma(k, a));
+        end;
+        begin
+            a := 10;
+            k := 5;
+            externo(3);
+            for k := 7 to 7 do
+                writeln(soma(k, a));
+            writeln(a, ' ', k);
+        end.
+        """
+
+        expected = ['1 3', '2 3', '3 3', '6', '7 7', '14', '10 5']
+        self.assertEqual(self.run_interpreter(source), expected)
+        self.assertEqual(self.run_interpreter(source, ClosureInterpreter), expected)
+
+    def test_recursion_uses_fresh_frames(self):
+        """Testa que cada ativação recursiva tem seus próprios slots"""
+        source = """
+        program test;
+        function fat(n: integer): integer;
+        begin
+            if n <= 1 then
+                return 1;
+            return n * fat(n - 1);
+        end;
+        procedure linha(n: integer);
+        var i: integer;
+        begin
+            if n = 0 then
+                return;
+            for i := 1 to n do
+                linha(n - 1);
+            writeln(n);
+        end;
+        begin
+            writeln(fat(10));
+            linha(2);
+        end.
+        """
+
+        expected = ['3628800', '1', '1', '2']
+        self.assertEqual(self.run_interpreter(source), expected)
+        self.assertEqual(self.run_interpreter(source, ClosureInterpreter), expected)
+
+    def test_undefined_variables(self):
+        """Testa que nomes não resolvidos mantêm o erro em tempo de execução"""
+        sources = [
+            "program t; begin w := 3; end.",
+            "program t; var i: integer; begin for i := 1 to 2 do writeln(j); end.",
+            "program t; procedure p; begin writeln(q); end; begin p; end.",
+        ]
+
+        for source in sources:
+            with self.assertRaises(RuntimeError) as context:
+                self.run_interpreter(source)
+            self.assertIn("Variável não definida", str(context.exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+"""
+Testes unitários para o servidor do interpretador e o cliente client.py
+"""
+
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.server import StreamedOutput, StreamedInput, encode
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+COMPILER = os.path.join(ROOT, 'compiler.py')
+CLIENT = os.path.join(ROOT, 'client.py')
+
+SOMA = """program soma;
+var a, b: integer;
+begin
+    readln(a);
+    readln(b);
+    writeln('soma: ', a + b);
+end.
+"""
+
+LACO = """program laco;
+var i: integer;
+begin
+    i := 0;
+    while true do
+        i := i + 1;
+end.
+"""
+
+SINTAXE = """program sintaxe;
+begin
+    writeln(1
+end.
+"""
+
+def decode(messages):
+    return [json.loads(line) for line in b''.join(messages).splitlines()]
+
+class TestStreams(unittest.TestCase):
+
+    def test_streamed_output_and_input(self):
+        """Testa a saída enviada em blocos e os pedidos de entrada ao cliente"""
+        sent = []
+        stdout = StreamedOutput(sent.append, chunk_size=8)
+        stdout.write('abc')
+        stdout.write('def')
+        self.assertEqual(sent, [])
+        stdout.write('gh\n')
+        stdout.flush()
+        self.assertEqual(decode(sent), [{'stdout': 'abcdefgh\n'}])
+        self.assertFalse(stdout.isatty())
+
+        # Cada leitura sem dados guardados envia antes a saída pendente (o prompt)
+        sent.clear()
+        replies = io.BytesIO(encode({'stdin': 'um\ndo'}) + encode({'stdin': 'is\ntrês'})
+                             + encode({'stdin': ''}))
+        stdin = StreamedInput(sent.append, replies, stdout)
+        stdout.write('Digite: ')
+        self.assertEqual(stdin.readline(), 'um\n')
+        self.assertEqual(decode(sent), [{'stdout': 'Digite: '}, {'read': True}])
+
+        self.assertEqual(stdin.readline(), 'dois\n')
+        self.assertEqual(stdin.read(2), 'tr')
+        self.assertEqual(stdin.read(), 'ês')
+        self.assertEqual(stdin.readline(), '')
+        self.assertEqual(decode(sent).count({'read': True}), 3)
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "o servidor requer sockets Unix")
+class TestServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.socket_path = os.path.join(cls.directory.name, 'servidor.sock')
+        cls.server = subprocess.Popen(
+            [sys.executable, COMPILER, 'serve', f'--socket={cls.socket_path}', '--workers=2'],
+            stdout=subprocess.PIPE, stdin=subprocess.DEVNULL, text=True, cwd=ROOT)
+        # A primeira linha é escrita quando o servidor já aceita conexões
+        cls.banner = cls.server.stdout.readline()
+
+        for name, text in (('soma.pas', SOMA), ('laco.pas', LACO), ('sintaxe.pas', SINTAXE)):
+            with open(os.path.join(cls.directory.name, name), 'w', encoding='utf-8') as file:
+                file.write(text)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.communicate(timeout=10)
+        cls.directory.cleanup()
+
+    def run_command(self, script, args, stdin='', socket_path=None):
+        """Executa compiler.py ou client.py e retorna (código de saída, saída)"""
+        command = [sys.executable, script] + args
+        if script == CLIENT:
+            command.append(f'--socket={socket_path or self.socket_path}')
+        result = subprocess.run(command, input=stdin, capture_output=True, text=True,
+                                cwd=self.directory.name, timeout=30)
+        return result.returncode, result.stdout
+
+    def test_client_matches_compiler(self):
+        """Testa saída e código de saída iguais aos de compiler.py e o lote executado localmente"""
+        self.assertIn(self.socket_path, self.banner)
+        hello = os.path.join(ROOT, 'examples', 'hello.pas')
+        cases = [
+            ['--no-cache', hello],
+            ['--no-cache', '--backend=closure', '-O', hello],
+            ['--no-cache', 'sintaxe.pas'],
+            ['ausente.pas'],
+            ['--backend=jit', hello],
+            ['--help'],
+        ]
+        for args in cases:
+            expected = self.run_command(COMPILER, args)
+            self.assertEqual(self.run_command(CLIENT, args), expected, args)
+        self.assertEqual(self.run_command(CLIENT, ['sintaxe.pas', '--no-cache'])[0], 1)
+
+        # O lote cria um pool de processos: o cliente o executa localmente
+        with open(os.path.join(self.directory.name, 'lote.txt'), 'w', encoding='utf-8') as file:
+            file.write(f"{hello}\n")
+        code, output = self.run_command(CLIENT, ['batch', '--workers=1', '--report=lote.jsonl', 'lote.txt'])
+        self.assertEqual(code, 0, output)
+        self.assertIn('ok: 1', output)
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'lote.jsonl')))
+
+        # e o servidor recusa um pedido de lote enviado direto pelo socket
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(self.socket_path)
+            connection.sendall(encode({'args': ['batch', 'lote.txt'], 'cwd': self.directory.name}))
+            with connection.makefile('rb') as responses:
+                messages = [json.loads(line) for line in responses]
+        self.assertEqual(messages[-1], {'exit': 1})
+        self.assertIn("O lote não é executado pelo servidor", messages[0]['stdout'])
+
+    def test_standard_input(self):
+        """Testa a entrada padrão repassada ao readln, com prompts e com --input=-"""
+        for args in (['--no-cache', 'soma.pas'], ['--no-cache', '--input=-', 'soma.pas']):
+            code, output = self.run_command(CLIENT, args, stdin='40\n2\n')
+            self.assertEqual((code, output), self.run_command(COMPILER, args, stdin='40\n2\n'))
+            self.assertIn('soma: 42', output)
+
+        # Programas que não leem a entrada não esperam pelo fim dela
+        client = subprocess.Popen([sys.executable, CLIENT, f'--socket={self.socket_path}',
+                                   os.path.join(ROOT, 'examples', 'hello.pas')],
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=self.directory.name)
+        try:
+            self.assertEqual(client.wait(timeout=30), 0)
+        finally:
+            client.stdin.close()
+            client.stdout.close()
+
+    def test_concurrent_clients_and_disconnect(self):
+        """Testa mais clientes que processos e a troca do processo de um cliente desconectado"""
+        # A entrada de cada cliente já está completa em um arquivo: com 2 processos,
+        # os primeiros atendidos podem ser quaisquer 2 dos 5, conforme a ordem de conexão
+        clients = []
+        for n in range(5):
+            path = os.path.join(self.directory.name, f'entrada{n}.txt')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(f"{n} 100")
+            with open(path, 'r', encoding='utf-8') as stdin:
+                clients.append(subprocess.Popen([sys.executable, CLIENT, f'--socket={self.socket_path}',
+                                                 '--no-cache', '--input=-', 'soma.pas'],
+                                                stdin=stdin, stdout=subprocess.PIPE, text=True,
+                                                cwd=self.directory.name))
+        for n, client in enumerate(clients):
+            output, _ = client.communicate(timeout=30)
+            self.assertEqual(client.returncode, 0)
+            self.assertIn(f"soma: {n + 100}", output)
+
+        # Um cliente encerrado no meio de um laço infinito libera seu lugar no pool
+        for _ in range(2):
+            client = subprocess.Popen([sys.executable, CLIENT, f'--socket={self.socket_path}', 'laco.pas'],
+                                      stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                      cwd=self.directory.name)
+            time.sleep(0.5)
+            client.kill()
+            client.wait()
+        code, output = self.run_command(CLIENT, ['--input=-', 'soma.pas'], stdin='1 2')
+        self.assertEqual(code, 0)
+        self.assertIn('soma: 3', output)
+
+    def test_fallback_without_server(self):
+        """Testa que sem servidor no socket o cliente executa o próprio compiler.py"""
+        missing = os.path.join(self.directory.name, 'nenhum.sock')
+        code, output = self.run_command(CLIENT, ['--input=-', 'soma.pas'], '5 6', missing)
+        self.assertEqual(code, 0)
+        self.assertIn('soma: 11', output)
+
+if __name__ == '__main__':
+    unittest.main()
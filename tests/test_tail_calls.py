@@ -0,0 +1,191 @@
+"""
+Testes unitários para as chamadas de cauda e o limite de profundidade da VM
+"""
+
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.bytecode import BytecodeCompiler, CALL, TAIL_CALL
+from compiler.vm import VirtualMachine
+
+class TestTailCalls(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def call_opcodes(self, source):
+        """Opcodes de chamada gerados, na ordem do código"""
+        code = BytecodeCompiler().compile(self.parse_source(source))
+        return [opcode for opcode in code.opcodes if opcode in (CALL, TAIL_CALL)]
+
+    def run_vm(self, source, max_depth=None):
+        """Helper para executar código na VM"""
+        vm = VirtualMachine() if max_depth is None else VirtualMachine(max_depth=max_depth)
+        vm.interpret(self.parse_source(source))
+        return vm
+
+    def test_tail_positions(self):
+        """Testa que só chamadas em return f(...) de rotinas viram TAIL_CALL"""
+        source = """
+        program test;
+        function f(n: integer): integer;
+        begin
+            if n = 0 then
+                return 0;
+            return f(n - 1);
+        end;
+
+        function g(n: integer): integer;
+        begin
+            return 1 + f(n);
+        end;
+
+        begin
+            writeln(f(3), ' ', g(3));
+        end.
+        """
+
+        # main: f, g; g: f (não é cauda); f: f (cauda)
+        self.assertEqual(self.call_opcodes(source), [CALL, CALL, CALL, TAIL_CALL])
+        self.assertEqual(self.run_vm(source).get_output(), ['0 1'])
+
+    def test_million_tail_calls(self):
+        """Testa 10^5 chamadas de cauda, diretas e mútuas, com profundidade constante"""
+        source = """
+        program test;
+        function acumula(s, n: integer): integer;
+        begin
+            if n = 0 then
+                return s;
+            return acumula(s + n, n - 1);
+        end;
+
+        function par(n: integer): boolean;
+        begin
+            if n = 0 then
+                return true;
+            return impar(n - 1);
+        end;
+
+        function impar(n: integer): boolean;
+        begin
+            if n = 0 then
+                return false;
+            return par(n - 1);
+        end;
+
+        begin
+            writeln(acumula(0, 100000));
+            writeln(par(100001));
+        end.
+        """
+
+        # Com um registro de ativação por vez, um limite de 2 chamadas basta
+        vm = self.run_vm(source, max_depth=2)
+        self.assertEqual(vm.get_output(), [str(sum(range(100001))), 'False'])
+
+    def test_max_depth(self):
+        """Testa o erro de execução ao passar da profundidade máxima"""
+        source = """
+        program test;
+        function soma(n: integer): integer;
+        begin
+            if n = 0 then
+                return 0;
+            return n + soma(n - 1);
+        end;
+        begin
+            writeln(soma(100));
+        end.
+        """
+
+        self.assertEqual(self.run_vm(source, max_depth=101).get_output(), ['5050'])
+        with self.assertRaises(RuntimeError) as context:
+            self.run_vm(source, max_depth=100)
+        self.assertEqual(str(context.exception), "Profundidade máxima de recursão excedida (100 chamadas)")
+
+    def test_dynamic_scope_keeps_frame(self):
+        """Testa que a chamada continua normal se a rotina chamada lê um nome da atual"""
+        source = """
+        program test;
+        var n: integer;
+
+        function le_n(k: integer): integer;
+        begin
+            return k + n;
+        end;
+
+        function indireta(k: integer): integer;
+        begin
+            return le_n(k);
+        end;
+
+        function f(n: integer): integer;
+        begin
+            return indireta(1);
+        end;
+
+        function h(m: integer): integer;
+        begin
+            return le_n(m);
+        end;
+
+        begin
+            n := 100;
+            writeln(f(5), ' ', h(5));
+        end.
+        """
+
+        interpreter = Interpreter()
+        interpreter.interpret(self.parse_source(source))
+        self.assertEqual(interpreter.get_output(), ['6 105'])
+        self.assertEqual(self.run_vm(source).get_output(), ['6 105'])
+
+        # f liga n, lido por le_n através de indireta: só indireta e h usam TAIL_CALL
+        self.assertEqual(self.call_opcodes(source).count(TAIL_CALL), 2)
+
+    def test_same_output_as_tree_walker(self):
+        """Testa chamadas de cauda dentro de laços, com argumentos que leem parâmetros"""
+        source = """
+        program test;
+        var i: integer;
+
+        function mdc(a, b: integer): integer;
+        begin
+            if b = 0 then
+                return a;
+            return mdc(b, a mod b);
+        end;
+
+        function primeiro_multiplo(k, limite: integer): integer;
+        begin
+            for i := 1 to limite do
+                if i mod k = 0 then
+                    return mdc(i, k * 2);
+            return 0;
+        end;
+
+        begin
+            writeln(mdc(1071, 462), ' ', primeiro_multiplo(7, 20), ' ', primeiro_multiplo(50, 20));
+            writeln(i);
+        end.
+        """
+
+        interpreter = Interpreter()
+        interpreter.interpret(self.parse_source(source))
+        self.assertEqual(self.run_vm(source).get_output(), interpreter.get_output())
+        self.assertEqual(self.call_opcodes(source).count(TAIL_CALL), 2)
+
+if __name__ == '__main__':
+    unittest.main()
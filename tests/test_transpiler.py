@@ -0,0 +1,154 @@
+"""
+Testes unitários para o tradutor de Pascal para Python
+"""
+
+import unittest
+import sys
+import os
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.transpiler import PythonTranspiler, TranspiledInterpreter, TranspileError
+
+class TestTranspiler(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def run_backend(self, backend_class, source):
+        """Helper para executar código em um backend"""
+        interpreter = backend_class()
+        interpreter.interpret(self.parse_source(source))
+        return interpreter.get_output()
+
+    def test_generated_source(self):
+        """Testa que rotinas viram funções e for vira range"""
+        source = """
+        program test;
+        var v: array[3] of integer;
+        var i: integer;
+        function dobro(x: integer): integer;
+        begin
+            return x * 2;
+        end;
+        begin
+            for i := 0 to 2 do
+                v[i] := dobro(i);
+        end.
+        """
+
+        generated = PythonTranspiler().transpile(self.parse_source(source))
+        self.assertIn('def f_dobro(v_x):', generated)
+        self.assertIn('def _main():', generated)
+        self.assertIn('in _range(0, 2):', generated)
+        self.assertIn("v_v = _array('integer', 3)", generated)
+        compile(generated, '<test>', 'exec')
+
+    def test_same_output_as_tree_walker(self):
+        """Testa controle de fluxo, arrays e recursão contra o tree-walker"""
+        source = """
+        program test;
+        var v: array[6] of integer;
+        var i, j, temp: integer;
+
+        function fib(n: integer): integer;
+        begin
+            if n < 2 then
+                return n;
+            return fib(n - 1) + fib(n - 2);
+        end;
+
+        procedure mostrar(k: integer);
+        begin
+            if k > 4 then
+                return;
+            writeln('v[', k, '] = ', v[k], ' ', k / 2, ' ', k mod 2 = 0);
+        end;
+
+        begin
+            for i := 0 to 5 do
+                v[i] := fib(i + 3) mod 7;
+            for i := 0 to 4 do
+                for j := 0 to 4 - i do
+                    if v[j] > v[j + 1] then
+                    begin
+                        temp := v[j];
+                        v[j] := v[j + 1];
+                        v[j + 1] := temp;
+                    end;
+            i := 0;
+            while not (i > 5) do
+            begin
+                mostrar(i);
+                i := i + 1;
+            end;
+            writeln(i, ' ', (i > 3) and (i < 10), ' ', -i);
+        end.
+        """
+
+        expected = self.run_backend(Interpreter, source)
+        self.assertEqual(self.run_backend(TranspiledInterpreter, source), expected)
+
+    def test_arguments_see_previous_parameters(self):
+        """Testa que argumentos enxergam parâmetros já definidos, como no tree-walker"""
+        source = """
+        program test;
+        var a, x: integer;
+        procedure p(a, b: integer);
+        begin
+            writeln(a, ' ', b);
+        end;
+        begin
+            a := 1;
+            x := 7;
+            p(x, a + 1);
+        end.
+        """
+
+        expected = self.run_backend(Interpreter, source)
+        self.assertEqual(self.run_backend(TranspiledInterpreter, source), expected)
+
+    def test_dynamic_scope_rejected(self):
+        """Testa que dependências de escopo dinâmico são recusadas"""
+        source = """
+        program test;
+        var i, total: integer;
+        procedure acumular;
+        begin
+            total := total + i;
+        end;
+        begin
+            for i := 1 to 4 do
+                acumular;
+        end.
+        """
+
+        with self.assertRaises(TranspileError):
+            PythonTranspiler().transpile(self.parse_source(source))
+
+    def test_runtime_errors(self):
+        """Testa erros de execução com as mesmas mensagens"""
+        sources = [
+            "program t; var a: array[2] of integer; begin writeln(a[-1]); end.",
+            "program t; var x: real; begin x := 1 / 0; end.",
+            "program t; begin w := 3; end.",
+            "program t; var i: integer; begin for i := 1 to 2.5 do writeln(i); end.",
+        ]
+
+        for source in sources:
+            with self.assertRaises(RuntimeError) as expected:
+                self.run_backend(Interpreter, source)
+            with self.assertRaises(RuntimeError) as actual:
+                self.run_backend(TranspiledInterpreter, source)
+            self.assertEqual(str(actual.exception), str(expected.exception))
+
+if __name__ == '__main__':
+    unittest.main()
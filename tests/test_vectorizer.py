@@ -0,0 +1,237 @@
+"""
+Testes unitários para a vetorização de laços
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Adicionar o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compiler.lexer import Lexer
+from compiler.parser import Parser
+from compiler.interpreter import Interpreter, RuntimeError
+from compiler.closure_compiler import ClosureInterpreter
+from compiler.vm import VirtualMachine
+from compiler.transpiler import PythonTranspiler, TranspiledInterpreter
+from compiler.optimizer import Optimizer
+from compiler.runtime import PascalArray
+from compiler import vectorizer
+from compiler.vectorizer import MIN_VECTOR_LENGTH, load_numpy, run_vectorized
+from compiler.ast_nodes import *
+
+BACKENDS = (Interpreter, ClosureInterpreter, VirtualMachine, TranspiledInterpreter)
+
+class TestVectorizer(unittest.TestCase):
+
+    def parse_source(self, source):
+        """Helper para parsing"""
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        return parser.parse()
+
+    def optimize(self, source):
+        """Helper que retorna a AST otimizada"""
+        return Optimizer().optimize(self.parse_source(source))
+
+    def run_all_backends(self, source, error=None):
+        """Executa com e sem -O em todos os backends e retorna a saída comum"""
+        outputs = []
+        for backend_class in BACKENDS:
+            for optimize in (False, True):
+                interpreter = backend_class()
+                ast = self.optimize(source) if optimize else self.parse_source(source)
+                if error is None:
+                    interpreter.interpret(ast)
+                else:
+                    with self.assertRaises(RuntimeError) as context:
+                        interpreter.interpret(ast)
+                    self.assertEqual(str(context.exception), error)
+                outputs.append(interpreter.get_output())
+
+        for output in outputs[1:]:
+            self.assertEqual(output, outputs[0])
+        return outputs[0]
+
+    def test_recognized_loops(self):
+        """Testa o kernel gerado para laços elemento a elemento"""
+        source = """
+        program test;
+        var n, i, k: integer;
+            a, b, c: array[100] of integer;
+            x, y: array[100] of real;
+        begin
+            n := 100;
+            k := 1;
+            k := k + 2;
+            for i := 0 to n - 1 do
+                a[i] := b[i] * k + c[i];
+            for i := 1 to n - 2 do
+            begin
+                x[i] := (y[i - 1] + y[i + 1]) / 2.0;
+                a[i] := -a[i] + i;
+            end;
+        end.
+        """
+
+        optimizer = Optimizer()
+        program = optimizer.optimize(self.parse_source(source))
+        first, second = program.body.statements[3:5]
+
+        self.assertEqual(optimizer.vectorized, 2)
+        self.assertEqual([operand.name for operand in first.vector.operands], ['a', 'b', 'k', 'c'])
+        self.assertEqual(first.vector.kernel, (
+            ('a', 'b', 'k', 'c'),
+            ((0, ('+', ('*', ('element', 1, 0), ('scalar', 2)), ('element', 3, 0))),),
+        ))
+        self.assertEqual(second.vector.kernel[1][0][1],
+                         ('/', ('+', ('element', 1, -1), ('element', 1, 1)), ('const', 2.0)))
+        self.assertEqual(second.vector.kernel[1][1][1], ('+', ('neg', ('element', 2, 0)), ('index',)))
+
+        # O laço normal continua no código gerado, para quando a vetorização não se aplica
+        code = PythonTranspiler().transpile(program)
+        self.assertIn("if not _vector(", code)
+        self.assertIn("in _range(_t", code)
+
+    def test_rejected_loops(self):
+        """Testa que laços com dependências, chamadas ou outros tipos não são vetorizados"""
+        source = """
+        program test;
+        var n, i, k: integer;
+            a, b: array[100] of integer;
+            f: array[100] of boolean;
+            s: array[100] of string;
+
+        function g(v: integer): integer;
+        begin
+            return v;
+        end;
+
+        begin
+            n := 100;
+            for i := 1 to n - 1 do
+                a[i] := a[i - 1] + b[i];
+            for i := 0 to n - 1 do
+                a[i] := g(b[i]);
+            for i := 0 to n - 1 do
+                a[i] := b[i] div 2;
+            for i := 0 to n - 1 do
+                a[2 * i] := b[i];
+            for i := 0 to n - 1 do
+                f[i] := b[i] > 0;
+            for i := 0 to n - 1 do
+                s[i] := 'x';
+            for i := 0 to n - 1 do
+            begin
+                a[i] := b[i];
+                k := k + a[i];
+            end;
+            for i := 0 to n - 1 do
+                a[i] := b[i] + m;
+        end.
+        """
+
+        optimizer = Optimizer()
+        program = optimizer.optimize(self.parse_source(source))
+        loops = [stmt for stmt in program.body.statements if isinstance(stmt, ForStatement)]
+
+        self.assertEqual(len(loops), 8)
+        self.assertTrue(all(loop.vector is None for loop in loops))
+        self.assertEqual(optimizer.vectorized, 0)
+
+    def test_same_output_all_backends(self):
+        """Testa que a saída é igual com e sem vetorização, inclusive nos casos que recaem no laço normal"""
+        source = """
+        program test;
+        var n, i, k, big: integer;
+            r: real;
+            a, b, c: array[100] of integer;
+            x, y: array[100] of real;
+        begin
+            n := 100;
+            k := 3;
+            r := 0.5;
+            big := 4611686018427387904;
+            for i := 0 to n - 1 do
+            begin
+                b[i] := i * 7 - 300;
+                c[i] := i mod 13;
+                y[i] := i / 8;
+            end;
+            for i := 0 to n - 1 do
+                a[i] := b[i] * k + c[i];
+            for i := 1 to n - 2 do
+            begin
+                x[i] := y[i - 1] * r + y[i + 1] / 3.0 - i;
+                c[i] := a[i] - c[i];
+                a[i] := -c[i] + i * 2;
+            end;
+            for i := 0 to 3 do
+                b[i] := b[i] * 2;
+            for i := 0 to 40 do
+                b[i] := b[i] * big;
+            for i := 0 to n - 1 do
+                a[i] := a[i] + 0.5;
+            x := y;
+            for i := 1 to n - 1 do
+                x[i] := y[i - 1] + 1.0;
+            writeln(a[7], ' ', a[98], ' ', b[2], ' ', b[40], ' ', c[77], ' ', x[9], ' ', y[50]);
+            for i := 0 to n do
+                c[i] := c[i] * 2;
+        end.
+        """
+
+        output = self.run_all_backends(source, "Índice do array fora dos limites: 100")
+        self.assertEqual(output, ['767.5 -961.5 -2637884402540465881088 -92233720368547758080 717 9.0 50.0'])
+
+    def test_fallback_without_numpy(self):
+        """Testa que, sem NumPy, os laços vetorizados executam pelo caminho normal"""
+        source = """
+        program test;
+        var i: integer;
+            a: array[64] of integer;
+        begin
+            for i := 0 to 63 do
+                a[i] := i * i;
+            writeln(a[63]);
+        end.
+        """
+
+        with mock.patch.object(vectorizer, 'load_numpy', return_value=None):
+            self.assertFalse(run_vectorized(((), ()), 0, 63, []))
+            self.assertEqual(self.run_all_backends(source), ['3969'])
+
+    @unittest.skipIf(load_numpy() is None, "NumPy não está instalado")
+    def test_vector_execution(self):
+        """Testa a execução com NumPy e as condições que devolvem o laço ao caminho normal"""
+        n = MIN_VECTOR_LENGTH * 2
+        a, b = PascalArray('integer', n), PascalArray('integer', n)
+        x = PascalArray('real', n)
+        for i in range(n):
+            b.store(i, i - 10)
+
+        # a[i] := b[i] * k + i; x[i] := a[i] / 4
+        kernel = (('a', 'b', 'k', 'x'), (
+            (0, ('+', ('*', ('element', 1, 0), ('scalar', 2)), ('index',))),
+            (3, ('/', ('element', 0, 0), ('const', 4))),
+        ))
+        self.assertTrue(run_vectorized(kernel, 0, n - 1, [a, b, 3, x]))
+        self.assertEqual(list(a), [(i - 10) * 3 + i for i in range(n)])
+        self.assertEqual(list(x), [((i - 10) * 3 + i) / 4 for i in range(n)])
+        self.assertIsInstance(a[0], int)
+
+        before = (list(a), list(x))
+        # Índice fora dos limites, poucas iterações, estouro de 64 bits,
+        # tipo do escalar, array escrito com dois nomes
+        self.assertFalse(run_vectorized(kernel, 1, n, [a, b, 3, x]))
+        self.assertFalse(run_vectorized(kernel, 0, MIN_VECTOR_LENGTH - 2, [a, b, 3, x]))
+        self.assertFalse(run_vectorized(kernel, 0, n - 1, [a, b, 2 ** 62, x]))
+        self.assertFalse(run_vectorized(kernel, 0, n - 1, [a, b, 1.5, x]))
+        self.assertFalse(run_vectorized(kernel, 0, n - 1, [a, a, 3, x]))
+        self.assertEqual((list(a), list(x)), before)
+
+if __name__ == '__main__':
+    unittest.main()